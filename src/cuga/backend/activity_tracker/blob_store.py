@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from loguru import logger
+
+BLOB_DIR_NAME = "blobs"
+BLOB_REF_PREFIX = f"{BLOB_DIR_NAME}/"
+# Recently stored images whose refs are kept, so consecutive steps sharing a screenshot aren't decoded again
+MAX_CACHED_REFS = 16
+
+_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp", "image/gif": "gif"}
+
+
+def is_blob_ref(value: Optional[str]) -> bool:
+    return bool(value) and value.startswith(BLOB_REF_PREFIX)
+
+
+class ImageBlobStore:
+    """
+    Content-addressed store for step screenshots, kept next to the trajectory files.
+
+    A ``data:image/...;base64,`` URL is decoded and written once to ``blobs/<sha256>.<ext>``;
+    steps then carry the relative ref instead of megabytes of base64 per step.
+    """
+
+    def __init__(self):
+        self._refs: "OrderedDict[str, str]" = OrderedDict()
+
+    def put(self, trajectory_dir: str, image: Optional[str]) -> Optional[str]:
+        """Store ``image`` and return its ref; anything that isn't a base64 data URL is returned as is."""
+        if not image or not image.startswith("data:image") or ";base64," not in image:
+            return image
+        # Keyed by a digest of the data URL, so the cache doesn't hold on to the screenshots themselves
+        cache_key = (trajectory_dir, hashlib.sha256(image.encode("ascii", "replace")).hexdigest())
+        ref = self._refs.get(cache_key)
+        if ref is not None:
+            self._refs.move_to_end(cache_key)
+            return ref
+
+        header, encoded = image.split(";base64,", 1)
+        extension = _EXTENSIONS.get(header[len("data:") :], "bin")
+        try:
+            content = base64.b64decode(encoded)
+        except ValueError as e:
+            logger.warning(f"Keeping undecodable image inline: {e}")
+            return image
+        ref = f"{BLOB_REF_PREFIX}{hashlib.sha256(content).hexdigest()}.{extension}"
+        path = os.path.join(trajectory_dir, ref)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        self._refs[cache_key] = ref
+        if len(self._refs) > MAX_CACHED_REFS:
+            self._refs.popitem(last=False)
+        return ref
+
+    @staticmethod
+    def load(trajectory_dir: str, ref: Optional[str]) -> Optional[str]:
+        """Resolve a ref written by ``put`` back into a data URL (other values are returned as is)."""
+        if not is_blob_ref(ref):
+            return ref
+        extension = ref.rsplit(".", 1)[-1]
+        mime = next(
+            (mime for mime, ext in _EXTENSIONS.items() if ext == extension), "application/octet-stream"
+        )
+        with open(os.path.join(trajectory_dir, ref), "rb") as f:
+            return f"data:{mime};base64,{base64.b64encode(f.read()).decode('ascii')}"
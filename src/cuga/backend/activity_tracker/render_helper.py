@@ -5,9 +5,10 @@ import re
 from json import JSONDecodeError
 from pathlib import Path
 
-from cuga.backend.cuga_graph.nodes.browser.browser_planner_agent.browser_planner_agent import (
-    BrowserPlannerAgent,
-)
+from cuga.backend.activity_tracker.trajectory_writer import load_trajectory, resolve_image
+
+# Name of the steps the browser planner collects (its plan is in the step's data)
+BROWSER_PLANNER_STEP = "BrowserPlannerAgent"
 
 
 HTML_TEMPLATE = """
@@ -55,9 +56,12 @@ class RenderHelper(object):
     """Helper class to render text and image observations and meta data in the trajectory"""
 
     def __init__(self, config_file: str, result_dir: str, light_version: bool = False) -> None:
-        with open(config_file, "r") as f:
-            self._config = json.load(f)
-            task_id = self._config["task_id"]
+        # Includes the steps still in the trajectory's segment
+        self._config = load_trajectory(config_file)
+        if self._config is None:
+            raise FileNotFoundError(config_file)
+        task_id = self._config["task_id"]
+        self._trajectory_dir = os.path.dirname(config_file)
         os.makedirs(result_dir, exist_ok=True)
         self.render_file = open(Path(result_dir) / f"render_{task_id}.html", "a+")
         self.render_file.truncate(0)
@@ -80,14 +84,14 @@ class RenderHelper(object):
             step,
         ) in enumerate(self._config['steps']):
             new_content += f"<h3 class='step_name' style='background-color:lightblue'>Step {index + 1} : {step['name']}</h3>"
-            if step['name'] == BrowserPlannerAgent:
+            if step['name'] == BROWSER_PLANNER_STEP:
                 new_content += (
                     f"<div class='current_url'><pre>Current URL: {step['current_url']}</pre><div>\n"
                 )
 
                 if render_screenshot:
-                    # image observation
-                    img = step["image_before"]
+                    # image observation, stored as a blob ref relative to the trajectory
+                    img = resolve_image(self._trajectory_dir, step["image_before"])
                     new_content += f"<img src='{img}' style='width:50vw; height:auto;'/>\n"
 
                 text_obs = step["observation_before"]
@@ -102,7 +106,7 @@ class RenderHelper(object):
                     f"</div>\n"
                 )
 
-                new_content += f"<div class='prev_action' style='background-color:pink'>{print_keys(json.loads(step['plan']))}</div>\n"
+                new_content += f"<div class='prev_action' style='background-color:pink'>{print_keys(json.loads(step.get('plan') or step['data']))}</div>\n"
 
             if step['name'] == "ActionAgent":
                 action_str = f"<div class='parsed_action' style='background-color:yellow'><pre>{step['action_formatted']}</pre></div>"
@@ -1,7 +1,8 @@
-import copy
+import asyncio
 import json
 import os
 import shutil
+from collections import deque
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -10,14 +11,26 @@ import pandas as pd
 
 from cuga.backend.cuga_graph.nodes.api.code_agent.model import CodeAgentOutput
 
+from cuga.backend.activity_tracker.trajectory_writer import (
+    append_records,
+    load_trajectory,
+    meta_record,
+    segment_path,
+    step_record,
+    trajectory_writer,
+)
 from cuga.backend.tools_env.registry.utils.types import AppDefinition
 from cuga.backend.utils.id_utils import mask_with_timestamp, random_id_with_timestamp
+from cuga.backend.utils.session_scope import SessionScoped
 from cuga.config import TRAJECTORY_DATA_DIR, settings
 from langchain_core.tools import StructuredTool
 from loguru import logger
 from mcp.types import CallToolResult, TextContent
 from pydantic import BaseModel, Field
 
+# Screenshots kept in memory; only the latest is ever read back, older ones live in the blob store
+MAX_RETAINED_IMAGES = 5
+
 AGENT_ANALYTICS = True
 try:
     from agent_analytics.instrumentation.utils import AIEventRecorder
@@ -59,8 +72,27 @@ class TasksMetadata(BaseModel):
     created_at: str
 
 
-class ActivityTracker(object):
+class ActivityTracker(SessionScoped):
     _instance = None
+    # Task-level state kept per server session; experiment, tools and apps are shared
+    _session_fields = {
+        "user_id": str,
+        "intent": str,
+        "session_id": str,
+        "prompts": list,
+        "current_date": lambda: None,
+        "pi": lambda: None,
+        "eval": lambda: None,
+        "final_answer": lambda: None,
+        "task_id": lambda: "default",
+        "actions_count": int,
+        "token_usage": int,
+        "steps": list,
+        "images": lambda: deque(maxlen=MAX_RETAINED_IMAGES),
+        "score": float,
+        "_persisted_steps": int,
+        "_persisted_meta": lambda: None,
+    }
     user_id: str = ""
     intent: str = ""
     session_id: str = ""
@@ -74,7 +106,7 @@ class ActivityTracker(object):
     actions_count: int = 0
     token_usage: int = 0
     steps: List[Step] = []
-    images: List[str] = []
+    images: "deque[str]" = deque(maxlen=MAX_RETAINED_IMAGES)
     score: float = 0.0
     tools: Dict[str, List[StructuredTool]] = {}
     apps: List[AppDefinition] = []
@@ -82,10 +114,16 @@ class ActivityTracker(object):
     tasks: Dict[str, Dict[str, Any]] = {}
     experiment_folder: Optional[str] = None
     tasks_metadata: Optional[TasksMetadata] = None
+    # How much of the current task is already in its trajectory segment
+    _persisted_steps: int = 0
+    _persisted_meta: Optional[Dict[str, Any]] = None
     if settings.advanced_features.enable_memory:
+        from cuga.backend.memory.ingestion import create_step_ingestion_queue
         from cuga.backend.memory.memory import Memory
 
         memory = Memory()
+        # Steps are posted to the memory service in the background so collect_step never waits on it
+        memory_ingestion = create_step_ingestion_queue(memory, settings.memory_ingestion)
 
     # Base directory configuration
     _base_dir: str = TRAJECTORY_DATA_DIR
@@ -370,7 +408,9 @@ class ActivityTracker(object):
         self.pi = None
         self.prompts = []
         self.steps = []
-        self.images = []
+        self._persisted_steps = 0
+        self._persisted_meta = None
+        self.images = deque(maxlen=MAX_RETAINED_IMAGES)
         self.actions_count = 0
         self.final_answer = None
         self.task_id = task_id
@@ -379,7 +419,7 @@ class ActivityTracker(object):
 
     def reload_steps(self, task_id: Optional[str] = None) -> bool:
         """
-        Reload steps from the current experiment's task JSON file.
+        Reload steps from the current experiment's task trajectory (compacted JSON plus appended segment).
 
         Args:
             task_id (str, optional): Task ID to reload. If None, uses current task_id.
@@ -402,14 +442,13 @@ class ActivityTracker(object):
             logger.error(f"No trajectory path found for task_id: {target_task_id}")
             return False
 
-        if not os.path.exists(trajectory_path):
-            logger.error(f"Trajectory file does not exist: {trajectory_path}")
-            return False
-
         try:
-            # Read the JSON file
-            with open(trajectory_path, 'r', encoding='utf-8') as f:
-                trajectory_data = json.load(f)
+            # Steps collected by this process may still be queued for the writer
+            trajectory_writer.flush()
+            trajectory_data = load_trajectory(trajectory_path, resolve_images=True)
+            if trajectory_data is None:
+                logger.error(f"Trajectory file does not exist: {trajectory_path}")
+                return False
 
             # Extract steps from the JSON
             steps_data = trajectory_data.get('steps', [])
@@ -426,6 +465,8 @@ class ActivityTracker(object):
 
             # Update current steps
             self.steps = reloaded_steps
+            self._persisted_steps = len(reloaded_steps)
+            self._persisted_meta = self._trajectory_meta()
 
             logger.info(f"Successfully reloaded {len(reloaded_steps)} steps for task_id: {target_task_id}")
             return True
@@ -491,6 +532,38 @@ class ActivityTracker(object):
 
         return self.experiment_folder
 
+    def resume_experiment(self, experiment_folder: str) -> List[str]:
+        """
+        Continue an experiment started earlier: results are appended to its folder again.
+
+        Args:
+            experiment_folder (str): Name of the experiment folder under the base directory
+
+        Returns:
+            List[str]: IDs of the tasks already finished according to its .progress file
+        """
+        experiment_dir = os.path.join(self._base_dir, experiment_folder)
+        if not os.path.isdir(experiment_dir):
+            raise FileNotFoundError(f"Experiment folder not found: {experiment_dir}")
+
+        self.experiment_folder = experiment_folder
+        metadata_path = os.path.join(experiment_dir, "metadata.json")
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                self.tasks_metadata = TasksMetadata(**json.load(f))
+
+        self.tasks = {}
+        results_json_path = os.path.join(experiment_dir, "results.json")
+        if os.path.exists(results_json_path):
+            with open(results_json_path, 'r', encoding='utf-8') as f:
+                self.tasks = json.load(f)
+
+        progress_path = os.path.join(experiment_dir, ".progress")
+        if not os.path.exists(progress_path):
+            return []
+        with open(progress_path, 'r', encoding='utf-8') as f:
+            return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
     def _initialize_experiment_files(self, experiment_dir: str) -> None:
         """Initialize empty result files for the experiment."""
         # Define column order for CSV
@@ -562,20 +635,16 @@ class ActivityTracker(object):
         if settings.advanced_features.enable_memory:
             from cuga.backend.memory.agentic_memory.utils.prompts import prompts
 
-            self.memory.add_step(
+            self.memory_ingestion.add_step(
                 namespace_id='memory',
                 run_id=self.experiment_folder,
                 step=step.model_dump(),
                 prompt=prompts[step.name],
             )
 
-        # Attach any collected prompts to this step so they are persisted
-        if getattr(self, "prompts", None):
-            try:
-                step.prompts = list(self.prompts)
-            except Exception:
-                # Ensure prompts never break logging
-                step.prompts = []
+        # Attach any collected prompts to this step so they are persisted (Prompt objects are never
+        # mutated after collection, so the step can share them instead of deep-copying)
+        step.prompts = list(self.prompts or [])
         # Attach the most recent captured image (if any) to the step
         if getattr(self, "images", None):
             try:
@@ -650,13 +719,12 @@ class ActivityTracker(object):
                         annotation_title="Image",
                         annotation_content=f"{step.image_before}",
                     )
-        step.prompts = copy.deepcopy(self.prompts)
         self.prompts = []
         self.steps.append(step)
 
         if settings.advanced_features.enable_memory and step.name == "FinalAnswerAgent":
-            # End run and execute any background processing.
-            self.memory.end_run(namespace_id="memory", run_id=self.experiment_folder)
+            # End run (after its queued steps are ingested) and execute any background processing.
+            self.memory_ingestion.end_run(namespace_id="memory", run_id=self.experiment_folder)
 
         if settings.advanced_features.tracker_enabled:
             self.to_file()
@@ -692,7 +760,7 @@ class ActivityTracker(object):
                 )
                 return
 
-            step.prompts = copy.deepcopy(self.prompts)
+            step.prompts = list(self.prompts)
             self.prompts = []
             self.steps.append(step)
             self._to_file_external_append(full_path, step)
@@ -703,66 +771,17 @@ class ActivityTracker(object):
 
     def _to_file_external_append(self, full_path: str, new_step: Step):
         """
-        Append a new step to an existing JSON file or create a new file if it doesn't exist.
+        Append a new step to the trajectory's append-only segment.
 
-        This method reads the existing file, appends the new step, and saves it back.
+        The write is a single append (no read/rewrite of the file), so it stays cheap however long
+        the trajectory gets and is safe while the agent process appends to the same task.
 
         Args:
-            full_path (str): The full file path to save/append to.
+            full_path (str): The trajectory JSON path; the step goes to its ``.jsonl`` segment.
             new_step (Step): The new step to append.
         """
         try:
-            # Check if file exists and read existing data
-            if os.path.exists(full_path):
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    try:
-                        existing_data = json.load(f)
-                        # Ensure the existing data has the expected structure
-                        if not isinstance(existing_data, dict) or 'steps' not in existing_data:
-                            logger.warning(f"Invalid JSON structure in {full_path}, creating new file")
-                            existing_data = None
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Invalid JSON in {full_path}, creating new file: {e}")
-                        existing_data = None
-            else:
-                existing_data = None
-
-            # If no valid existing data, create new structure
-            if existing_data is None:
-                data_to_save = {
-                    "intent": self.intent,
-                    "dataset_name": self.dataset_name,
-                    "actions_count": self.actions_count,
-                    "task_id": self.task_id,
-                    "eval": self.eval,
-                    "steps": [new_step.model_dump()],
-                    "score": self.score,
-                }
-            else:
-                # Update existing data with new step
-                existing_data["steps"].append(new_step.model_dump())
-                # Update other fields that might have changed
-                existing_data.update(
-                    {
-                        "intent": self.intent,
-                        "dataset_name": self.dataset_name,
-                        "actions_count": self.actions_count,
-                        "task_id": self.task_id,
-                        "eval": self.eval,
-                        "score": self.score,
-                    }
-                )
-                data_to_save = existing_data
-
-            # Write the updated data back to file
-            with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    data_to_save,
-                    f,
-                    ensure_ascii=False,
-                    indent=4,
-                )
-
+            append_records(full_path, [step_record(new_step.model_dump())])
         except Exception as e:
             logger.error(f"Failed to append step to file {full_path}: {e}")
             raise
@@ -784,8 +803,7 @@ class ActivityTracker(object):
         """
         pass
 
-    def to_file(self):
-        """Save current task data to file in the experiment directory."""
+    def _trajectory_file_path(self) -> str:
         if self.experiment_folder:
             # Save to experiment directory
             source_dir = os.path.join(self._base_dir, self.experiment_folder)
@@ -793,26 +811,47 @@ class ActivityTracker(object):
             # Fallback to original behavior
             source_dir = "logging{}".format("_" + self.dataset_name if self.dataset_name else "")
 
-        os.makedirs(source_dir, exist_ok=True)
-
         filename = self.task_id if self.task_id != "default" else self.session_id
-        filepath = os.path.join(source_dir, f"{filename}.json")
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(
-                {
-                    "intent": self.intent,
-                    "dataset_name": self.dataset_name,
-                    "actions_count": self.actions_count,
-                    "task_id": self.task_id,
-                    "eval": self.eval,
-                    "steps": [d.model_dump() for d in self.steps],
-                    "score": self.score,
-                },
-                f,
-                ensure_ascii=False,
-                indent=4,
-            )
+        return os.path.join(source_dir, f"{filename}.json")
+
+    def _trajectory_meta(self) -> Dict[str, Any]:
+        return {
+            "intent": self.intent,
+            "dataset_name": self.dataset_name,
+            "actions_count": self.actions_count,
+            "task_id": self.task_id,
+            "eval": self.eval,
+            "score": self.score,
+        }
+
+    def to_file(self):
+        """
+        Persist the current task's new steps and changed fields to its trajectory segment.
+
+        Only what changed since the last call is appended (by the background writer), so the cost
+        per step doesn't grow with the trajectory. The writer folds it into ``<task>.json`` every few
+        steps and when idle, and ``flush_trajectory`` does so when the task finishes.
+        """
+        filepath = self._trajectory_file_path()
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        # The first write of a task replaces what an earlier attempt of the same task_id left behind
+        replace = self._persisted_steps == 0 and self._persisted_meta is None
+        records = []
+        meta = self._trajectory_meta()
+        if meta != self._persisted_meta:
+            records.append(meta_record(meta))
+            self._persisted_meta = meta
+        for step in self.steps[self._persisted_steps :]:
+            # The writer stores the screenshot as a blob and puts its ref in the record, not in the step
+            records.append(step_record(step.model_dump()))
+        self._persisted_steps = len(self.steps)
+        trajectory_writer.append(filepath, records, replace=replace)
+
+    def flush_trajectory(self) -> None:
+        """Write out pending records and compact the current task's segment into ``<task>.json``."""
+        trajectory_writer.flush()
+        trajectory_writer.compact(self._trajectory_file_path())
 
     def finish_task(
         self,
@@ -863,11 +902,25 @@ class ActivityTracker(object):
 
         # Update result files only if tracker is enabled
         if settings.advanced_features.tracker_enabled:
+            self.flush_trajectory()
             self._update_result_files()
             self._add_to_progress_file(task_id)
 
         return task_id
 
+    async def flush_memory(self) -> None:
+        """
+        Wait, off the event loop, until the steps queued for the memory service have been sent.
+
+        Awaited when a task finishes, so its run is ingested before the next task looks up memory.
+        Waits at most ``memory_ingestion.flush_timeout`` seconds (0 = no limit).
+        """
+        if not settings.advanced_features.enable_memory:
+            return
+        timeout = settings.memory_ingestion.flush_timeout or None
+        if not await asyncio.to_thread(self.memory_ingestion.flush, timeout):
+            logger.warning(f"Memory ingestion did not finish within {timeout}s, continuing in the background")
+
     def _update_result_files(self) -> None:
         """Update both JSON and CSV result files."""
         if not self.experiment_folder:
@@ -1185,12 +1238,16 @@ class ActivityTracker(object):
                 source_dir = os.path.join(base_dir, folder_name)
                 source_file = os.path.join(source_dir, f"{task_id}.json")
 
-                if os.path.exists(source_file):
+                if os.path.exists(source_file) or os.path.exists(segment_path(source_file)):
                     target_file = os.path.join(target_dir, f"{task_id}.json")
 
                     try:
-                        # Copy the file
-                        shutil.copy2(source_file, target_file)
+                        if os.path.exists(segment_path(source_file)):
+                            # Steps not compacted yet are only in the segment: write the merged trajectory
+                            with open(target_file, 'w', encoding='utf-8') as f:
+                                json.dump(load_trajectory(source_file), f, ensure_ascii=False, indent=4)
+                        else:
+                            shutil.copy2(source_file, target_file)
                         logger.debug(f"Copied {task_id}.json from {folder_name}")
                         copied_files += 1
                         file_found = True
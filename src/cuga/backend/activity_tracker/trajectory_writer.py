@@ -0,0 +1,248 @@
+import atexit
+import json
+import os
+import queue
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from cuga.backend.activity_tracker.blob_store import ImageBlobStore
+from cuga.config import settings
+
+SEGMENT_SUFFIX = ".jsonl"
+COMPACTING_SUFFIX = ".compacting"
+
+# Field order of the compacted trajectory JSON, as written by ActivityTracker before segments existed
+TRAJECTORY_FIELDS = {
+    "intent": "",
+    "dataset_name": "",
+    "actions_count": 0,
+    "task_id": "",
+    "eval": None,
+    "steps": [],
+    "score": 0.0,
+}
+
+
+def segment_path(trajectory_path: str) -> str:
+    """Append-only segment (JSON lines) that accompanies a ``<task>.json`` trajectory file."""
+    return os.path.splitext(trajectory_path)[0] + SEGMENT_SUFFIX
+
+
+def meta_record(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {"kind": "meta", "fields": fields}
+
+
+def step_record(step: Dict[str, Any]) -> Dict[str, Any]:
+    return {"kind": "step", "step": step}
+
+
+def append_records(trajectory_path: str, records: List[Dict[str, Any]]):
+    """
+    Append records to the trajectory's segment in a single ``O_APPEND`` write.
+
+    Safe to call from several processes (the agent and the registry both append to the same task).
+    """
+    if not records:
+        return
+    payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    with open(segment_path(trajectory_path), "a", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def remove_trajectory(trajectory_path: str):
+    """Delete a trajectory's ``<task>.json`` file and its segments (before a task is run again)."""
+    segment = segment_path(trajectory_path)
+    for path in (trajectory_path, segment, segment + COMPACTING_SUFFIX):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _replay_segment(path: str, data: Dict[str, Any]):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A writer died mid-line; everything before it is still valid
+                logger.warning(f"Skipping truncated trajectory record in {path}")
+                continue
+            if record.get("kind") == "meta":
+                data.update(record.get("fields", {}))
+            elif record.get("kind") == "step":
+                data["steps"].append(record["step"])
+
+
+def _empty_trajectory() -> Dict[str, Any]:
+    return {
+        key: (list(value) if isinstance(value, list) else value) for key, value in TRAJECTORY_FIELDS.items()
+    }
+
+
+def _load(trajectory_path: str, segments: List[str]) -> Dict[str, Any]:
+    data = _empty_trajectory()
+    if os.path.exists(trajectory_path):
+        with open(trajectory_path, "r", encoding="utf-8") as f:
+            data.update(json.load(f))
+        data.setdefault("steps", [])
+    for path in segments:
+        _replay_segment(path, data)
+    return data
+
+
+def load_trajectory(trajectory_path: str, resolve_images: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Read a trajectory, merging the compacted ``.json`` file with any segment records appended after it.
+
+    Screenshots are stored as blob refs relative to the trajectory's directory; with
+    ``resolve_images`` they are turned back into data URLs. Returns None when neither file exists.
+    """
+    segments = [
+        path
+        for path in (segment_path(trajectory_path) + COMPACTING_SUFFIX, segment_path(trajectory_path))
+        if os.path.exists(path)
+    ]
+    if not segments and not os.path.exists(trajectory_path):
+        return None
+    data = _load(trajectory_path, segments)
+    if resolve_images:
+        trajectory_dir = os.path.dirname(trajectory_path)
+        for step in data["steps"]:
+            if isinstance(step, dict) and step.get("image_before"):
+                step["image_before"] = resolve_image(trajectory_dir, step["image_before"])
+    return data
+
+
+def resolve_image(trajectory_dir: str, image: Optional[str]) -> Optional[str]:
+    """A step's screenshot as a data URL; a blob that is missing is logged and its ref kept."""
+    try:
+        return ImageBlobStore.load(trajectory_dir, image)
+    except OSError as e:
+        logger.warning(f"Could not load screenshot {image}: {e}")
+        return image
+
+
+def compact_trajectory(trajectory_path: str) -> bool:
+    """
+    Fold the segment into the ``<task>.json`` file (same layout as before segments existed).
+
+    The segment is renamed before it is read, so records appended concurrently land in a new
+    segment instead of being lost. Returns True if anything was compacted.
+    """
+    segment = segment_path(trajectory_path)
+    compacting = segment + COMPACTING_SUFFIX
+    if not os.path.exists(segment) and not os.path.exists(compacting):
+        return False
+    if os.path.exists(segment) and not os.path.exists(compacting):
+        os.replace(segment, compacting)
+
+    # Records appended after the rename stay in the new segment for the next compaction
+    data = _load(trajectory_path, [compacting])
+
+    directory = os.path.dirname(trajectory_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, trajectory_path)
+    os.remove(compacting)
+    return True
+
+
+class TrajectoryWriter:
+    """
+    Background writer for trajectory segments.
+
+    ``ActivityTracker`` hands over records for each collected step; a daemon thread appends them,
+    so the agent never waits on trajectory I/O. ``flush`` blocks until everything queued is on disk.
+    The thread also moves step screenshots into the trajectory's blob store, leaving refs in the records.
+
+    So that readers of ``<task>.json`` that don't go through ``load_trajectory`` (the trajectory
+    viewer, copies of experiment folders) see a running task too, the thread also compacts a
+    trajectory once ``compact_every`` steps have been appended to its segment, and compacts every
+    pending trajectory after ``compact_idle`` seconds without new records (0 disables either).
+    """
+
+    def __init__(self, compact_every: int = 0, compact_idle: float = 0):
+        self.compact_every = compact_every
+        self.compact_idle = compact_idle
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Guards compaction, which runs both on the writer thread and in ActivityTracker.flush_trajectory
+        self._compact_lock = threading.Lock()
+        # Steps appended per trajectory since it was last compacted
+        self._uncompacted: Dict[str, int] = {}
+        self._image_store = ImageBlobStore()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trajectory-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                trajectory_path, records, replace = self._queue.get(
+                    timeout=self.compact_idle if self._uncompacted and self.compact_idle else None
+                )
+            except queue.Empty:
+                for trajectory_path in list(self._uncompacted):
+                    self.compact(trajectory_path)
+                continue
+            try:
+                self._store_images(trajectory_path, records)
+                with self._compact_lock:
+                    if replace:
+                        self._uncompacted.pop(trajectory_path, None)
+                        remove_trajectory(trajectory_path)
+                    append_records(trajectory_path, records)
+                    steps = self._uncompacted.get(trajectory_path, 0)
+                    steps += sum(1 for record in records if record.get("kind") == "step")
+                    self._uncompacted[trajectory_path] = steps
+                if self.compact_every and steps >= self.compact_every:
+                    self.compact(trajectory_path)
+            except Exception as e:
+                logger.error(f"Failed to append trajectory records to {trajectory_path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _store_images(self, trajectory_path: str, records: List[Dict[str, Any]]):
+        trajectory_dir = os.path.dirname(trajectory_path)
+        for record in records:
+            step = record.get("step") if record.get("kind") == "step" else None
+            if step and step.get("image_before"):
+                step["image_before"] = self._image_store.put(trajectory_dir, step["image_before"])
+
+    def compact(self, trajectory_path: str) -> bool:
+        """Fold the trajectory's segment into ``<task>.json`` (see ``compact_trajectory``)."""
+        with self._compact_lock:
+            self._uncompacted.pop(trajectory_path, None)
+            try:
+                return compact_trajectory(trajectory_path)
+            except Exception as e:
+                logger.error(f"Failed to compact trajectory {trajectory_path}: {e}")
+                return False
+
+    def append(self, trajectory_path: str, records: List[Dict[str, Any]], replace: bool = False):
+        """Queue records for the trajectory; with ``replace``, whatever it held before is dropped first."""
+        if not records and not replace:
+            return
+        self._ensure_started()
+        self._queue.put((trajectory_path, records, replace))
+
+    def flush(self):
+        if self._thread is not None:
+            self._queue.join()
+
+
+trajectory_writer = TrajectoryWriter(
+    compact_every=settings.trajectory.compact_every, compact_idle=settings.trajectory.compact_idle
+)
+atexit.register(trajectory_writer.flush)
@@ -22,10 +22,6 @@ from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page, Playwright
 
 from cuga.backend.browser_env.browser.chat_async import Chat
-from cuga.backend.browser_env.browser.gym_obs.obs_async import (
-    _post_extract,
-    extract_screenshot,
-)
 from cuga.backend.browser_env.browser.open_ended_async import AbstractBrowserTask
 from cuga.backend.browser_env.browser.utils_async import _get_global_playwright_async
 from cuga.backend.browser_env.page_understanding.pu_extractor import PageUnderstandingExtractor
@@ -662,15 +658,13 @@ class BrowserEnvGymAsync(gym.Env, ABC):
         focused_element_bid = ""
 
         if self.enable_browser:
-            # post-extraction cleanup of temporary info in dom
-            await _post_extract(self.page)
-
-            # Get browser-specific information
-            screenshot = await extract_screenshot(self.page)
+            # Get browser-specific information; the extractor cleans up its DOM marks itself
             pu_output = await self.pu_processor.extract(page=self.page, context=self.context)
+            # Same capture as the extractor's images, decoded to an array only if read
+            screenshot = pu_output.capture
             url = self.page.url
             open_pages_urls = [page.url for page in self.context.pages]
-            open_pages_titles = [await page.title() for page in self.context.pages]
+            open_pages_titles = list(await asyncio.gather(*(page.title() for page in self.context.pages)))
             active_page_index = np.asarray([self.context.pages.index(self.page)])
 
             # Extract pu_output fields
@@ -6,7 +6,10 @@ from cuga.backend.browser_env.page_understanding.pu_transform import PuAnswer
 from cuga.backend.browser_env.page_understanding.tranformer_utils.dom_transform_utils import (
     flatten_domtree_to_str,
 )
-from cuga.backend.browser_env.page_understanding.tranformer_utils.transform_utils import flatten_axtree_to_str
+from cuga.backend.browser_env.page_understanding.tranformer_utils.transform_utils import (
+    cached_flatten,
+    flatten_axtree_to_str,
+)
 
 
 from typing import Dict
@@ -42,14 +45,16 @@ class ExtensionProcessor:
 
         dom_tree = pu_extracted.dom_tree
         if dom_tree is not None:
-            rep = flatten_domtree_to_str(
-                dom_tree=dom_tree,
+            rep = cached_flatten(
+                flatten_domtree_to_str,
+                dom_tree,
                 extra_properties=pu_extracted.extra_properties or {},
                 filter_visible_only=kwargs.get("filter_visible_only", False),
             )
         else:
-            rep = flatten_axtree_to_str(
-                AX_tree=pu_extracted.accessibility_tree,
+            rep = cached_flatten(
+                flatten_axtree_to_str,
+                pu_extracted.accessibility_tree,
                 extra_properties=pu_extracted.extra_properties or {},
                 filter_visible_only=kwargs.get("filter_visible_only", False),
             )
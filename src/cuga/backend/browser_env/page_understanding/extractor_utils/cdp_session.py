@@ -0,0 +1,71 @@
+"""
+One Chrome DevTools Protocol session per page, shared by the extraction utilities.
+
+Opening a CDP session is a round-trip to the browser (and detaching another), which every
+extraction helper used to pay on every observation. ``get_cdp_session`` opens the session once per
+page and keeps it until the page closes; ``cdp_send`` sends through it and reopens it once if the
+browser dropped it (e.g. after a renderer crash). CDP handles several in-flight commands on one
+session, so concurrent helpers can share it.
+"""
+
+import asyncio
+import weakref
+
+import playwright.async_api
+from loguru import logger
+
+# Errors meaning the session itself is gone, rather than the command failing
+_CLOSED_SESSION_ERRORS = ("Target closed", "Session closed", "has been closed", "No session with given id")
+
+_sessions: "weakref.WeakKeyDictionary[playwright.async_api.Page, asyncio.Future]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_cdp_session(page: playwright.async_api.Page) -> playwright.async_api.CDPSession:
+    """Return the page's CDP session, opening it on first use (concurrent callers share one)."""
+    session = _sessions.get(page)
+    if session is None or (session.done() and session.exception() is not None):
+        session = _sessions[page] = asyncio.ensure_future(_open(page))
+    return await asyncio.shield(session)
+
+
+async def _open(page: playwright.async_api.Page) -> playwright.async_api.CDPSession:
+    session = await page.context.new_cdp_session(page)
+    page.once("close", lambda _: _sessions.pop(page, None))
+    return session
+
+
+def _cached(page: playwright.async_api.Page):
+    future = _sessions.get(page)
+    if future is None or not future.done() or future.exception() is not None:
+        return None
+    return future.result()
+
+
+async def detach_cdp_session(page: playwright.async_api.Page):
+    """Detach and forget the page's session; the next ``get_cdp_session`` opens a new one."""
+    session = _cached(page)
+    _sessions.pop(page, None)
+    if session is None:
+        return
+    try:
+        await session.detach()
+    except playwright.async_api.Error as e:
+        logger.debug(f"Error detaching CDP session: {e}")
+
+
+async def cdp_send(page: playwright.async_api.Page, method: str, params: dict = None) -> dict:
+    """Send a CDP command through the page's cached session."""
+    session = await get_cdp_session(page)
+    try:
+        return await session.send(method, params or {})
+    except playwright.async_api.Error as e:
+        if not any(message in str(e) for message in _CLOSED_SESSION_ERRORS) or page.is_closed():
+            raise
+        logger.debug(f"CDP session of {page.url} was closed, reopening it: {e}")
+        # Another command may have reopened it already
+        if _cached(page) is session:
+            del _sessions[page]
+        session = await get_cdp_session(page)
+        return await session.send(method, params or {})
@@ -1,14 +1,17 @@
+import asyncio
 import base64
 import io
 import logging
 import pkgutil
 import re
+from functools import cached_property
 from typing import Literal
 
 import numpy as np
 import PIL.Image
 import playwright
 from loguru import logger
+from cuga.backend.browser_env.page_understanding.extractor_utils.cdp_session import cdp_send
 from cuga.backend.utils.consts import BROWSERGYM_ID_ATTRIBUTE as BID_ATTR
 from cuga.backend.utils.consts import BROWSERGYM_SETOFMARKS_ATTRIBUTE as SOM_ATTR
 from cuga.backend.utils.consts import BROWSERGYM_VISIBILITY_ATTRIBUTE as VIS_ATTR
@@ -171,13 +174,8 @@ async def extract_all_frame_axtrees(page: playwright.async_api.Page):
         A dictionnary of AXTrees (as returned by Chrome DevTools Protocol) indexed by frame IDs.
 
     """
-    cdp = await page.context.new_cdp_session(page)
-
     # extract the frame tree
-    frame_tree = await cdp.send(
-        "Page.getFrameTree",
-        {},
-    )
+    frame_tree = await cdp_send(page, "Page.getFrameTree")
 
     # extract all frame IDs into a list
     # (breadth-first-search through the frame tree)
@@ -191,16 +189,11 @@ async def extract_all_frame_axtrees(page: playwright.async_api.Page):
         frame_id = frame["frame"]["id"]
         frame_ids.append(frame_id)
 
-    # extract the AXTree of each frame
-    frame_axtrees = {
-        frame_id: await cdp.send(
-            "Accessibility.getFullAXTree",
-            {"frameId": frame_id},
-        )
-        for frame_id in frame_ids
-    }
-
-    await cdp.detach()
+    # extract the AXTree of each frame, all frames at once
+    axtrees = await asyncio.gather(
+        *(cdp_send(page, "Accessibility.getFullAXTree", {"frameId": frame_id}) for frame_id in frame_ids)
+    )
+    frame_axtrees = dict(zip(frame_ids, axtrees))
 
     # extract browsergym data from ARIA attributes
     for ax_tree in frame_axtrees.values():
@@ -255,8 +248,8 @@ async def extract_dom_snapshot(
         DOM tree is flattened.
 
     """
-    cdp = await page.context.new_cdp_session(page)
-    dom_snapshot = await cdp.send(
+    dom_snapshot = await cdp_send(
+        page,
         "DOMSnapshot.captureSnapshot",
         {
             "computedStyles": computed_styles,
@@ -264,7 +257,6 @@ async def extract_dom_snapshot(
             "includePaintOrder": include_paint_order,
         },
     )
-    await cdp.detach()
 
     # if requested, remove temporary data stored in the ARIA attributes of each node
     if temp_data_cleanup:
@@ -274,39 +266,65 @@ async def extract_dom_snapshot(
     return dom_snapshot
 
 
-async def extract_screenshot(page: playwright.async_api.Page):
+class PageScreenshot:
+    """
+    A single PNG screenshot of the page, shared by every representation of one observation.
+
+    Chrome DevTools Protocol returns the PNG base64-encoded, so ``base64`` costs nothing; the raw
+    PNG bytes and the RGB array are only decoded when first asked for. The object is array-like
+    (``np.asarray(screenshot)`` gives the (height, width, rgb) array).
     """
-    Extracts the screenshot image of a Playwright page using Chrome DevTools Protocol.
+
+    def __init__(self, png_base64: str):
+        self.base64 = png_base64
+
+    @cached_property
+    def png(self) -> bytes:
+        return base64.b64decode(self.base64)
+
+    @cached_property
+    def array(self) -> np.ndarray:
+        with io.BytesIO(self.png) as f:
+            # load png as a PIL image, convert to RGB (3 channels), then to a numpy array
+            return np.array(PIL.Image.open(f).convert(mode="RGB"))
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+
+async def capture_screenshot(page: playwright.async_api.Page) -> PageScreenshot:
+    """
+    Captures the viewport of a Playwright page using Chrome DevTools Protocol.
 
     Args:
         page: the playwright page of which to extract the screenshot.
 
     Returns:
-        A screenshot of the page, in the form of a 3D array (height, width, rgb).
+        A ``PageScreenshot``; its decoded formats are computed lazily.
 
     """
-
-    cdp = await page.context.new_cdp_session(page)
-    cdp_answer = await cdp.send(
+    cdp_answer = await cdp_send(
+        page,
         "Page.captureScreenshot",
         {
             "format": "png",
         },
     )
-    await cdp.detach()
+    return PageScreenshot(cdp_answer["data"])
 
-    # bytes of a png file
-    png_base64 = cdp_answer["data"]
-    png_bytes = base64.b64decode(png_base64)
-    with io.BytesIO(png_bytes) as f:
-        # load png as a PIL image
-        img = PIL.Image.open(f)
-        # convert to RGB (3 channels)
-        img = img.convert(mode="RGB")
-        # convert to a numpy array
-        img = np.array(img)
 
-    return img
+async def extract_screenshot(page: playwright.async_api.Page):
+    """
+    Extracts the screenshot image of a Playwright page using Chrome DevTools Protocol.
+
+    Args:
+        page: the playwright page of which to extract the screenshot.
+
+    Returns:
+        A screenshot of the page, in the form of a 3D array (height, width, rgb).
+
+    """
+    return (await capture_screenshot(page)).array
 
 
 async def extract_screenshot_base64(page: playwright.async_api.Page):
@@ -373,37 +391,39 @@ async def extract_merged_axtree(page: playwright.async_api.Page):
     """
     frame_axtrees = await extract_all_frame_axtrees(page)
 
-    cdp = await page.context.new_cdp_session(page)
-
     # merge all AXTrees into one
     merged_axtree = {"nodes": []}
+    iframe_nodes = []
     for ax_tree in frame_axtrees.values():
         merged_axtree["nodes"].extend(ax_tree["nodes"])
-        # connect each iframe node to the corresponding AXTree root node
-        for node in ax_tree["nodes"]:
-            if node["role"]["value"] == "Iframe":
-                frame_id = (
-                    (await cdp.send("DOM.describeNode", {"backendNodeId": node["backendDOMNodeId"]}))
-                    .get("node", {})
-                    .get("frameId", None)
-                )
-                if not frame_id:
-                    logger.warning(
-                        f"AXTree merging: unable to recover frameId of node with backendDOMNodeId {repr(node['backendDOMNodeId'])}, skipping"
-                    )
-                # it seems Page.getFrameTree() from CDP omits certain Frames (empty frames?)
-                # if a frame is not found in the extracted AXTrees, we just ignore it
-                elif frame_id in frame_axtrees:
-                    # root node should always be the first node in the AXTree
-                    frame_root_node = frame_axtrees[frame_id]["nodes"][0]
-                    assert frame_root_node["frameId"] == frame_id
-                    node["childIds"].append(frame_root_node["nodeId"])
-                else:
-                    logger.warning(
-                        f"AXTree merging: extracted AXTree does not contain frameId '{frame_id}', skipping"
-                    )
+        iframe_nodes.extend(node for node in ax_tree["nodes"] if node["role"]["value"] == "Iframe")
 
-    await cdp.detach()
+    # look up the frame of every iframe node at once
+    descriptions = await asyncio.gather(
+        *(
+            cdp_send(page, "DOM.describeNode", {"backendNodeId": node["backendDOMNodeId"]})
+            for node in iframe_nodes
+        )
+    )
+
+    # connect each iframe node to the corresponding AXTree root node
+    for node, description in zip(iframe_nodes, descriptions):
+        frame_id = description.get("node", {}).get("frameId", None)
+        if not frame_id:
+            logger.warning(
+                f"AXTree merging: unable to recover frameId of node with backendDOMNodeId {repr(node['backendDOMNodeId'])}, skipping"
+            )
+        # it seems Page.getFrameTree() from CDP omits certain Frames (empty frames?)
+        # if a frame is not found in the extracted AXTrees, we just ignore it
+        elif frame_id in frame_axtrees:
+            # root node should always be the first node in the AXTree
+            frame_root_node = frame_axtrees[frame_id]["nodes"][0]
+            assert frame_root_node["frameId"] == frame_id
+            node["childIds"].append(frame_root_node["nodeId"])
+        else:
+            logger.warning(
+                f"AXTree merging: extracted AXTree does not contain frameId '{frame_id}', skipping"
+            )
 
     return merged_axtree
 
@@ -6,18 +6,19 @@ from loguru import logger
 from playwright.async_api import BrowserContext
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 from cuga.backend.utils.consts import EXTRACT_OBS_MAX_TRIES
 from cuga.backend.browser_env.page_understanding.extractor_utils.extract_async import (
     MarkingError,
+    PageScreenshot,
     _post_extract,
     _pre_extract,
+    capture_screenshot,
     extract_dom_extra_properties,
     extract_dom_snapshot,
     extract_focused_element_bid,
     extract_merged_axtree,
-    extract_screenshot_base64,
 )
 from cuga.backend.browser_env.page_understanding.nocodeui_pu_utils.model import AnalyzePageResponse
 from cuga.backend.browser_env.page_understanding.nocodeui_pu_utils.nocode_utils import (
@@ -26,6 +27,8 @@ from cuga.backend.browser_env.page_understanding.nocodeui_pu_utils.nocode_utils
 
 
 class PUExtracted(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     accessibility_tree: Optional[Dict] = None
     dom_object: Optional[Dict] = None
     focused_element_bid: Optional[str] = None
@@ -34,6 +37,8 @@ class PUExtracted(BaseModel):
     nocodeui_pu: Optional[AnalyzePageResponse] = None
     page_content_as_str: Optional[str] = None
     screenshot: str
+    # The capture ``img`` and ``screenshot`` come from, for consumers that need it decoded
+    capture: Optional[PageScreenshot] = Field(default=None, exclude=True)
 
 
 class PageUnderstandingExtractor:
@@ -47,23 +52,32 @@ class PageUnderstandingExtractor:
         dom = None
         axtree = None
         extra_properties = None
-        nocodeui_pu = None
+        nocodeui_result = None
         focused_element_bid = None
-        img = None
+        capture = None
         page_content = None
         for retries_left in reversed(range(EXTRACT_OBS_MAX_TRIES)):
             try:
                 # pre-extraction, mark dom elements (set bid, set dynamic attributes like value and checked)
                 await _pre_extract(page, tags_to_mark=self.tags_to_mark, lenient=(retries_left == 0))
-                dom = await extract_dom_snapshot(page)
-                axtree = await extract_merged_axtree(page)
-                focused_element_bid = await extract_focused_element_bid(page)
+                # The queries are independent of each other, so they run concurrently; marking only
+                # adds attributes, so the screenshot taken here is the one used for every representation
+                results = await asyncio.gather(
+                    extract_dom_snapshot(page),
+                    extract_merged_axtree(page),
+                    extract_focused_element_bid(page),
+                    capture_screenshot(page),
+                    page.inner_html("body"),
+                    analyze_current_page_async(context) if nocodeui_pu else asyncio.sleep(0),
+                    # Let every query finish before a retry re-marks the page
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+                dom, axtree, focused_element_bid, capture, body_html, nocodeui_result = results
                 extra_properties = extract_dom_extra_properties(dom)
-                h = html2text.HTML2Text()
-                img = await extract_screenshot_base64(page)
-                page_content = h.handle(await page.inner_html("body"))
-                if nocodeui_pu:
-                    nocodeui_pu = await analyze_current_page_async(context)
+                page_content = html2text.HTML2Text().handle(body_html)
             except (PlaywrightError, MarkingError) as e:
                 err_msg = str(e)
                 # try to add robustness to async events (detached / deleted frames)
@@ -85,14 +99,14 @@ class PageUnderstandingExtractor:
                     raise e
             break
         await _post_extract(page)
-        screenshot = await extract_screenshot_base64(page)
         return PUExtracted(
-            screenshot=screenshot,
+            screenshot=capture.base64,
             dom_object=dom,
             focused_element_bid=focused_element_bid,
             extra_properties=extra_properties,
-            img=img,
+            img=capture.base64,
+            capture=capture,
             page_content_as_str=page_content,
-            nocodeui_pu=nocodeui_pu,
+            nocodeui_pu=nocodeui_result,
             accessibility_tree=axtree,
         )
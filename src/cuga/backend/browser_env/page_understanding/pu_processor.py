@@ -1,5 +1,5 @@
 import importlib
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
 
@@ -37,3 +37,9 @@ class PageUnderstandingProcessor:
         if self.transformer is None:
             raise ValueError("No transformer has been loaded. Load a transformer first.")
         return await self.transformer.transform(self._data, **transformer_params)
+
+    def reset_page_history(self, history: Optional[str] = None) -> None:
+        """Forget the observations the transformer diffs against (for one page history, or all)."""
+        reset = getattr(self.transformer, "reset_page_history", None)
+        if reset is not None:
+            reset(history)
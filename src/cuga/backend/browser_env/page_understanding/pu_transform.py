@@ -1,10 +1,31 @@
 import logging
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from pydantic import BaseModel
 
 from cuga.backend.browser_env.page_understanding.pu_extractor import PUExtracted
-from cuga.backend.browser_env.page_understanding.tranformer_utils.transform_utils import flatten_axtree_to_str
+from cuga.backend.browser_env.page_understanding.tranformer_utils.diff_utils import (
+    PageDelta,
+    PageSnapshot,
+    diff_pages,
+)
+from cuga.backend.browser_env.page_understanding.tranformer_utils.transform_utils import (
+    cached_flatten,
+    flatten_axtree_to_str,
+)
+from cuga.config import settings
+
+REPRESENTATIONS = ("full", "delta")
+
+# A delta is only sent when it is at most this fraction of the full rendering (e.g. not after navigation)
+DELTA_MAX_RATIO = 0.5
+
+# Page history used when the caller does not name one (a single task driving the browser)
+DEFAULT_PAGE_HISTORY = "default"
+
+# Page histories (e.g. one per server session) kept to diff against; the least recently used are dropped
+MAX_PAGE_HISTORIES = 64
 
 
 class PuAnswer(BaseModel):
@@ -13,20 +34,54 @@ class PuAnswer(BaseModel):
     focused_element_bid: Optional[str] = None
     img: str
     page_content: str
+    # Set in "delta" mode to the changes since the previous observation; string_representation stays the
+    # full tree, since the prompts do not carry the earlier observations
+    delta: Optional[PageDelta] = None
 
 
 class PageUnderstandingV1:
     def __init__(self):
-        pass
+        # Last extraction seen per (page history, rendering options), with its snapshot and answer, to diff
+        # the next one against
+        self._previous: "OrderedDict[Tuple, Tuple[PUExtracted, PageSnapshot, PuAnswer]]" = OrderedDict()
 
-    async def transform(self, pu_extracted: PUExtracted, filter_visible_only=True) -> PuAnswer:
+    def reset_page_history(self, history: Optional[str] = None) -> None:
+        """Forget the previous observations of ``history`` (all of them when None), e.g. on a new task."""
+        if history is None:
+            self._previous.clear()
+            return
+        for key in [key for key in self._previous if key[0] == history]:
+            del self._previous[key]
+
+    async def transform(
+        self,
+        pu_extracted: PUExtracted,
+        filter_visible_only=True,
+        representation: Optional[str] = None,
+        history: str = DEFAULT_PAGE_HISTORY,
+    ) -> PuAnswer:
+        """
+        Render the extracted page for the agents.
+
+        ``representation`` (default: ``page_understanding.representation``) is "full" for the whole
+        tree, or "delta" to also set ``delta`` to the elements and text that changed since the previous
+        observation of the same ``history`` (a task or a session). ``string_representation`` and
+        ``page_content`` are always the full page. The first observation, and one that changed too much
+        for a delta to be smaller than the page, get no delta.
+        """
         if pu_extracted is None:
             err_msg = "Extracted pu is None please call `.extract()` first"
             logging.error(err_msg)
             raise Exception(err_msg)
-        return PuAnswer(
-            string_representation=flatten_axtree_to_str(
-                AX_tree=pu_extracted.accessibility_tree,
+        representation = representation or settings.page_understanding.representation
+        if representation not in REPRESENTATIONS:
+            raise ValueError(
+                f"Unknown page representation '{representation}', expected one of {REPRESENTATIONS}"
+            )
+        answer = PuAnswer(
+            string_representation=cached_flatten(
+                flatten_axtree_to_str,
+                pu_extracted.accessibility_tree,
                 extra_properties=pu_extracted.extra_properties,
                 filter_visible_only=filter_visible_only,
             ),
@@ -35,3 +90,23 @@ class PageUnderstandingV1:
             img="data:image/png;base64,{}".format(pu_extracted.img),
             key_value_map={},
         )
+        if representation == "delta":
+            answer = self._delta_answer(pu_extracted, answer, key=(history, filter_visible_only))
+        return answer
+
+    def _delta_answer(self, pu_extracted: PUExtracted, answer: PuAnswer, key: Tuple) -> PuAnswer:
+        previous = self._previous.get(key)
+        if previous is not None and previous[0] is pu_extracted:
+            # The same observation rendered again: the previous one is still the reference
+            self._previous.move_to_end(key)
+            return previous[2]
+        snapshot = PageSnapshot.from_rendering(answer.string_representation, answer.page_content)
+        if previous is not None:
+            delta = diff_pages(previous[1], snapshot)
+            if len(delta.to_str()) <= DELTA_MAX_RATIO * len(answer.string_representation):
+                answer.delta = delta
+        self._previous[key] = (pu_extracted, snapshot, answer)
+        self._previous.move_to_end(key)
+        while len(self._previous) > MAX_PAGE_HISTORIES:
+            self._previous.popitem(last=False)
+        return answer
@@ -0,0 +1,115 @@
+"""
+Structural diffs between two consecutive observations of a page.
+
+A ``PageSnapshot`` is built from the flattened tree (``flatten_axtree_to_str`` /
+``flatten_domtree_to_str``) and the page text. It groups the lines by element bid. Each line with a
+``[bid]`` starts an element, together with its nearest bid'ed ancestor and the bid-less lines nested
+under it (static text, generic containers). ``diff_pages`` compares two snapshots element by element
+and the page text line by line. ``PageDelta.to_str`` renders only what was added, removed or changed.
+"""
+
+import difflib
+import re
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+# Key of the lines that come before any bid'ed element (e.g. the root web area)
+PAGE_ROOT = ""
+
+_LINE = re.compile(r"^(\t*)(?:\[([^\]\s]+)\] )?")
+
+
+class PageSnapshot:
+    """The elements of one observation, by bid, in document order."""
+
+    def __init__(self, elements: Dict[str, Tuple[Optional[str], List[str]]], content_lines: List[str]):
+        # bid -> (parent bid, the element's line followed by its bid-less lines, re-indented)
+        self.elements = elements
+        self.content_lines = content_lines
+
+    @classmethod
+    def from_rendering(cls, tree_str: str, page_content: Optional[str] = "") -> "PageSnapshot":
+        elements: Dict[str, Tuple[Optional[str], List[str]]] = {PAGE_ROOT: (None, [])}
+        # (depth, bid) of the bid'ed ancestors of the current line
+        ancestors: List[Tuple[int, str]] = []
+        for line in tree_str.split("\n") if tree_str else ():
+            match = _LINE.match(line)
+            depth = len(match.group(1))
+            bid = match.group(2)
+            while ancestors and ancestors[-1][0] >= depth:
+                ancestors.pop()
+            owner_depth, owner = ancestors[-1] if ancestors else (-1, PAGE_ROOT)
+            if bid is None or bid in elements:
+                elements[owner][1].append("\t" * (depth - owner_depth - 1) + line[depth:])
+                continue
+            elements[bid] = (owner, [line[match.end() :]])
+            ancestors.append((depth, bid))
+        if not elements[PAGE_ROOT][1]:
+            del elements[PAGE_ROOT]
+        return cls(elements, page_content.split("\n") if page_content else [])
+
+
+class PageDelta(BaseModel):
+    """What changed between two observations of a page."""
+
+    added: List[str] = Field(default_factory=list, description="Lines of the elements that appeared")
+    removed: List[str] = Field(default_factory=list, description="Lines of the elements that disappeared")
+    changed: List[str] = Field(
+        default_factory=list, description="Current lines of the elements that changed or moved"
+    )
+    unchanged: int = 0
+    content_added: List[str] = Field(default_factory=list)
+    content_removed: List[str] = Field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.content_added or self.content_removed)
+
+    def to_str(self) -> str:
+        if self.empty:
+            return "No changes since the previous observation."
+        sections = [
+            f"Changes since the previous observation ({self.unchanged} unchanged elements not shown):"
+        ]
+        for title, lines in (
+            ("Added elements", self.added),
+            ("Changed elements", self.changed),
+            ("Removed elements", self.removed),
+            ("Added text", [f"+ {line}" for line in self.content_added]),
+            ("Removed text", [f"- {line}" for line in self.content_removed]),
+        ):
+            if lines:
+                sections.append(f"{title}:\n" + "\n".join(lines))
+        return "\n".join(sections)
+
+
+def diff_pages(previous: PageSnapshot, current: PageSnapshot) -> PageDelta:
+    delta = PageDelta()
+    for bid, element in current.elements.items():
+        previous_element = previous.elements.get(bid)
+        if previous_element is None:
+            delta.added.extend(_element_lines(bid, element))
+        elif previous_element != element:
+            delta.changed.extend(_element_lines(bid, element))
+        else:
+            delta.unchanged += 1
+    for bid, element in previous.elements.items():
+        if bid not in current.elements:
+            # the element's own line is enough to tell which one went away
+            delta.removed.extend(_element_lines(bid, element)[:1])
+
+    matcher = difflib.SequenceMatcher(None, previous.content_lines, current.content_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ("delete", "replace"):
+            delta.content_removed.extend(line for line in previous.content_lines[i1:i2] if line.strip())
+        if tag in ("insert", "replace"):
+            delta.content_added.extend(line for line in current.content_lines[j1:j2] if line.strip())
+    return delta
+
+
+def _element_lines(bid: str, element: Tuple[Optional[str], List[str]]) -> List[str]:
+    _, lines = element
+    if bid == PAGE_ROOT:
+        return lines
+    return [f"[{bid}] {lines[0]}"] + [f"\t{line}" for line in lines[1:]]
@@ -14,6 +14,12 @@ IGNORED_DOM_ATTRIBUTES = (
     "data-react-checksum",
 )
 
+# Attributes a node's name is taken from, in order of preference
+NAME_DOM_ATTRIBUTES = ("title", "alt", "placeholder", "value", "aria-label", "id", "class")
+
+# Boolean attributes printed by name only, when set
+FLAG_DOM_ATTRIBUTES = frozenset(("required", "disabled", "checked", "selected"))
+
 REMOVE_ATTRIBUTES = True
 
 
@@ -39,158 +45,141 @@ def flatten_domtree_to_str(
     include_xpath: bool = False,
 ) -> str:
     """Formats the DOM tree into a string text similar to accessibility tree format"""
-
-    def dfs(node_id: str, depth: int, parent_node_filtered: bool, parent_node_name: str) -> str:
-        tree_str = ""
+    ignored_tags = frozenset(ignored_tags)
+    skipped_attributes = frozenset(ignored_attributes) | frozenset(NAME_DOM_ATTRIBUTES)
+    # the node's own attributes are only printed when REMOVE_ATTRIBUTES is off, or to tell generic divs apart
+    collect_attributes = not REMOVE_ATTRIBUTES or skip_generic
+    bid_options = dict(
+        extra_properties=extra_properties,
+        with_visible=with_visible,
+        with_clickable=with_clickable,
+        with_center_coords=with_center_coords,
+        with_bounding_box_coords=with_bounding_box_coords,
+        with_som=with_som,
+        filter_visible_only=filter_visible_only,
+        filter_with_bid_only=filter_with_bid_only,
+        filter_som_only=filter_som_only,
+        coord_decimals=coord_decimals,
+    )
+
+    lines = []
+    # depth-first, children pushed in reverse so they are visited in document order
+    stack = [(dom_tree.root_id, 0, False, "")]
+    while stack:
+        node_id, depth, parent_node_filtered, parent_node_name = stack.pop()
         node = dom_tree.get_node(node_id)
         if node is None:
-            return tree_str
-
-        indent = "\t" * depth
-        skip_node = False  # node will not be printed, with no effect on children nodes
-        filter_node = False  # node will not be printed, possibly along with its children nodes
+            continue
 
         # Handle text nodes
         if isinstance(node, TextNodeData):
             node_text = node.text.strip()
             if not node_text:
-                skip_node = True
+                continue
             elif parent_node_filtered:
-                skip_node = True
+                continue
             elif remove_redundant_text and node_text in parent_node_name:
-                skip_node = True
+                continue
             elif filter_visible_only and not node.is_visible:
-                skip_node = True
-
-            if not skip_node:
-                tree_str += f'{indent}text "{node_text}"'
-            return tree_str
+                continue
+            lines.append("\t" * depth + f'text "{node_text}"')
+            continue
 
         # Handle element nodes
-        elif isinstance(node, NodeData):
-            node_tag = node.tag_name.lower()
-            node_name = ""
-            node_value = None
-
-            # Extract name from various attributes
-            if "title" in node.attributes and node.attributes["title"]:
-                node_name = node.attributes["title"]
-            elif "alt" in node.attributes and node.attributes["alt"]:
-                node_name = node.attributes["alt"]
-            elif "placeholder" in node.attributes and node.attributes["placeholder"]:
-                node_name = node.attributes["placeholder"]
-            elif "value" in node.attributes and node.attributes["value"]:
-                node_value = node.attributes["value"]
-                node_name = node_value
-            elif "aria-label" in node.attributes and node.attributes["aria-label"]:
-                node_name = node.attributes["aria-label"]
-            elif "id" in node.attributes and node.attributes["id"]:
-                node_name = node.attributes["id"]
-            elif "class" in node.attributes and node.attributes["class"]:
-                node_name = node.attributes["class"]
-
-            # Check if we should skip this tag
-            if node_tag in ignored_tags:
-                skip_node = True
-
-            # Extract bid (assuming it might be in attributes or highlight_index)
-            bid = node.dom_tree_id if node.dom_tree_id is not None else None
-
-            # Extract node attributes
-            attributes = []
-            for attr_name, attr_value in node.attributes.items():
-                if attr_name in ignored_attributes or attr_value is None:
+        if not isinstance(node, NodeData):
+            continue
+        skip_node = False  # node will not be printed, with no effect on children nodes
+        node_tag = node.tag_name.lower()
+        node_attributes = node.attributes
+        node_name = ""
+        node_value = None
+
+        # Extract name from various attributes
+        for attr_name in NAME_DOM_ATTRIBUTES:
+            if node_attributes.get(attr_name):
+                node_name = node_attributes[attr_name]
+                if attr_name == "value":
+                    node_value = node_name
+                break
+
+        # Check if we should skip this tag
+        if node_tag in ignored_tags:
+            skip_node = True
+
+        # Extract bid (assuming it might be in attributes or highlight_index)
+        bid = node.dom_tree_id
+
+        # Extract node attributes
+        attributes = []
+        if collect_attributes:
+            for attr_name, attr_value in node_attributes.items():
+                if attr_value is None or attr_name in ignored_attributes:
                     continue
-                elif attr_name in ("required", "disabled", "checked", "selected"):
+                elif attr_name in FLAG_DOM_ATTRIBUTES:
                     if attr_value == "true" or attr_value == attr_name:
                         attributes.append(attr_name)
-                elif attr_name not in ("title", "alt", "placeholder", "value", "aria-label", "id", "class"):
+                elif attr_name not in skipped_attributes:
                     # Only include non-name attributes
                     attributes.append(f"{attr_name}={repr(attr_value)}")
 
-            # Add DOM-specific attributes
-            if node.is_interactive:
-                attributes.append("interactive")
-            if include_xpath:
-                attributes.append(f'xpath="{node.xpath}"')
-
-            if not node.highlight_index:
-                skip_node = True
-
-            if skip_generic and node_tag == "div" and not attributes and not node_name:
-                skip_node = True
-
-            if hide_all_children and parent_node_filtered:
-                skip_node = True
-
-            # Process bid-related filtering and attributes
-            filter_node, extra_attributes_to_print = _process_bid_dom(
-                bid,
-                node,
-                extra_properties=extra_properties,
-                with_visible=with_visible,
-                with_clickable=with_clickable,
-                with_center_coords=with_center_coords,
-                with_bounding_box_coords=with_bounding_box_coords,
-                with_som=with_som,
-                filter_visible_only=filter_visible_only,
-                filter_with_bid_only=filter_with_bid_only,
-                filter_som_only=filter_som_only,
-                coord_decimals=coord_decimals,
-            )
+        # Add DOM-specific attributes
+        if node.is_interactive:
+            attributes.append("interactive")
+        if include_xpath:
+            attributes.append(f'xpath="{node.xpath}"')
 
-            # if either is True, skip the node
-            skip_node = skip_node or filter_node
-
-            # insert extra attributes before regular attributes
-            attributes = extra_attributes_to_print + attributes
-
-            # actually print the node string
-            if not skip_node:
-                if not node_name:
-                    node_str = f"{node_tag}"
-                else:
-                    node_str = f"{node_tag} {repr(node_name.strip())}"
-
-                if not (
-                    hide_all_bids
-                    or bid is None
-                    or (
-                        hide_bid_if_invisible
-                        and extra_properties
-                        and extra_properties.get(bid, {}).get("visibility", 0) < 0.5
-                    )
-                ):
-                    node_str = f"[{bid}] " + node_str
-
-                if node_value is not None and node_value != node_name:
-                    node_str += f' value={repr(node_value)}'
-
-                if not REMOVE_ATTRIBUTES and attributes:
-                    node_str += ", ".join([""] + attributes)
-
-                tree_str += f"{indent}{node_str}"
-
-            # Process children
-            for child_id in node.children:
-                if child_id == node_id:  # avoid self-reference
-                    continue
-                child_depth = depth if skip_node else (depth + 1)
-                child_str = dfs(
-                    child_id,
-                    child_depth,
-                    parent_node_filtered=filter_node,
-                    parent_node_name=node_name,
+        if not node.highlight_index:
+            skip_node = True
+
+        if skip_generic and node_tag == "div" and not attributes and not node_name:
+            skip_node = True
+
+        if hide_all_children and parent_node_filtered:
+            skip_node = True
+
+        # Process bid-related filtering and attributes
+        filter_node, extra_attributes_to_print = _process_bid_dom(bid, node, **bid_options)
+
+        # if either is True, skip the node
+        skip_node = skip_node or filter_node
+
+        # insert extra attributes before regular attributes
+        attributes = extra_attributes_to_print + attributes
+
+        # actually print the node string
+        if not skip_node:
+            if not node_name:
+                node_str = f"{node_tag}"
+            else:
+                node_str = f"{node_tag} {repr(node_name.strip())}"
+
+            if not (
+                hide_all_bids
+                or bid is None
+                or (
+                    hide_bid_if_invisible
+                    and extra_properties
+                    and extra_properties.get(bid, {}).get("visibility", 0) < 0.5
                 )
-                if child_str:
-                    if tree_str:
-                        tree_str += "\n"
-                    tree_str += child_str
+            ):
+                node_str = f"[{bid}] " + node_str
+
+            if node_value is not None and node_value != node_name:
+                node_str += f" value={repr(node_value)}"
+
+            if not REMOVE_ATTRIBUTES and attributes:
+                node_str += ", ".join([""] + attributes)
+
+            lines.append("\t" * depth + node_str)
 
-        return tree_str
+        # Process children
+        child_depth = depth if skip_node else (depth + 1)
+        for child_id in reversed(node.children):
+            if child_id == node_id:  # avoid self-reference
+                continue
+            stack.append((child_id, child_depth, filter_node, node_name))
 
-    tree_str = dfs(dom_tree.root_id, 0, False, "")
-    return tree_str
+    return "\n".join(lines)
 
 
 def _process_bid_dom(
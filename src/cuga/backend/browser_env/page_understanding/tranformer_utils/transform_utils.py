@@ -3,6 +3,7 @@
 # Licensed under the Apache License, Version 2.0
 
 import ast
+from collections import OrderedDict
 
 IGNORED_AXTREE_ROLES = ["LineBreak"]
 
@@ -16,6 +17,59 @@ IGNORED_AXTREE_PROPERTIES = (
     "focusable",
 )
 
+# Boolean properties printed by name only, when true
+FLAG_AXTREE_PROPERTIES = frozenset(("required", "focused", "atomic"))
+
+# Flattened strings kept by ``cached_flatten``, one per (tree, parameters)
+FLATTEN_CACHE_SIZE = 8
+
+
+class _FlattenCache:
+    """
+    Small LRU of flattened trees, keyed by the identity of the tree (one extraction, i.e. one revision
+    of the page) and of the parameters. Entries hold on to the objects they are keyed by, so an id
+    can't be reused by another tree while its entry is alive. Trees must not be mutated once flattened.
+    """
+
+    def __init__(self, maxsize: int = FLATTEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def _key(flatten, tree, params: dict):
+        return (
+            flatten.__name__,
+            id(tree),
+            tuple(
+                # containers by identity, except empty ones (e.g. a fresh ``extra_properties or {}``)
+                (name, id(value) if isinstance(value, (dict, list, set)) and value else repr(value))
+                for name, value in sorted(params.items())
+            ),
+        )
+
+    def get_or_flatten(self, flatten, tree, **params) -> str:
+        key = self._key(flatten, tree, params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+        tree_str = flatten(tree, **params)
+        self._entries[key] = (tree_str, tree, params)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return tree_str
+
+    def clear(self):
+        self._entries.clear()
+
+
+flatten_cache = _FlattenCache()
+
+
+def cached_flatten(flatten, tree, **params) -> str:
+    """``flatten(tree, **params)``, reusing the result when the same tree is rendered the same way again."""
+    return flatten_cache.get_or_flatten(flatten, tree, **params)
+
 
 def flatten_axtree_to_str(
     AX_tree,
@@ -38,14 +92,32 @@ def flatten_axtree_to_str(
     hide_all_bids: bool = False,
 ) -> str:
     """Formats the accessibility tree into a string text"""
-    node_id_to_idx = {}
-    for idx, node in enumerate(AX_tree["nodes"]):
-        node_id_to_idx[node["nodeId"]] = idx
-
-    def dfs(node_idx: int, depth: int, parent_node_filtered: bool, parent_node_name: str) -> str:
-        tree_str = ""
-        node = AX_tree["nodes"][node_idx]
-        indent = "\t" * depth
+    nodes = AX_tree["nodes"]
+    node_id_to_idx = {node["nodeId"]: idx for idx, node in enumerate(nodes)}
+    ignored_roles = frozenset(ignored_roles)
+    ignored_properties = frozenset(ignored_properties)
+
+    # bid-based attributes and filters only do something when one of these is requested
+    bid_options = dict(
+        with_visible=with_visible,
+        with_clickable=with_clickable,
+        with_center_coords=with_center_coords,
+        with_bounding_box_coords=with_bounding_box_coords,
+        with_som=with_som,
+        filter_visible_only=filter_visible_only,
+        filter_with_bid_only=filter_with_bid_only,
+        filter_som_only=filter_som_only,
+    )
+    process_bids = any(bid_options.values())
+    if process_bids and extra_properties is None:
+        raise ValueError("extra_properties argument required")
+
+    lines = []
+    # depth-first, children pushed in reverse so they are visited in document order
+    stack = [(0, 0, False, "")] if nodes else []
+    while stack:
+        node_idx, depth, parent_node_filtered, parent_node_name = stack.pop()
+        node = nodes[node_idx]
         skip_node = False  # node will not be printed, with no effect on children nodes
         filter_node = False  # node will not be printed, possibly along with its children nodes
         node_role = node["role"]["value"]
@@ -53,10 +125,8 @@ def flatten_axtree_to_str(
 
         if node_role in ignored_roles:
             skip_node = True
-            pass
         elif "name" not in node:
             skip_node = True
-            pass
         else:
             node_name = node["name"]["value"]
             if "value" in node and "value" in node["value"]:
@@ -69,18 +139,16 @@ def flatten_axtree_to_str(
 
             # extract node attributes
             attributes = []
-            for property in node.get("properties", []):
-                if "value" not in property:
-                    continue
-                if "value" not in property["value"]:
-                    continue
-
+            for property in node.get("properties", ()):
                 prop_name = property["name"]
-                prop_value = property["value"]["value"]
-
                 if prop_name in ignored_properties:
                     continue
-                elif prop_name in ("required", "focused", "atomic"):
+                prop_value = property.get("value")
+                if prop_value is None or "value" not in prop_value:
+                    continue
+                prop_value = prop_value["value"]
+
+                if prop_name in FLAG_AXTREE_PROPERTIES:
                     if prop_value:
                         attributes.append(prop_name)
                 else:
@@ -97,19 +165,12 @@ def flatten_axtree_to_str(
                     skip_node = True
                 elif remove_redundant_static_text and node_name in parent_node_name:
                     skip_node = True
-            else:
+            elif process_bids:
                 filter_node, extra_attributes_to_print = _process_bid(
                     bid,
                     extra_properties=extra_properties,
-                    with_visible=with_visible,
-                    with_clickable=with_clickable,
-                    with_center_coords=with_center_coords,
-                    with_bounding_box_coords=with_bounding_box_coords,
-                    with_som=with_som,
-                    filter_visible_only=filter_visible_only,
-                    filter_with_bid_only=filter_with_bid_only,
-                    filter_som_only=filter_som_only,
                     coord_decimals=coord_decimals,
+                    **bid_options,
                 )
 
                 # if either is True, skip the node
@@ -133,33 +194,22 @@ def flatten_axtree_to_str(
                     node_str = f"[{bid}] " + node_str
 
                 if node_value is not None:
-                    node_str += f' value={repr(node["value"]["value"])}'
+                    node_str += f" value={repr(node_value)}"
 
                 if attributes:
                     node_str += ", ".join([""] + attributes)
 
-                tree_str += f"{indent}{node_str}"
+                lines.append("\t" * depth + node_str)
 
-        for child_node_id in node["childIds"]:
-            if child_node_id not in node_id_to_idx or child_node_id == node["nodeId"]:
+        # mark this to save some tokens
+        child_depth = depth if skip_node else (depth + 1)
+        node_id = node["nodeId"]
+        for child_node_id in reversed(node["childIds"]):
+            if child_node_id not in node_id_to_idx or child_node_id == node_id:
                 continue
-            # mark this to save some tokens
-            child_depth = depth if skip_node else (depth + 1)
-            child_str = dfs(
-                node_id_to_idx[child_node_id],
-                child_depth,
-                parent_node_filtered=filter_node,
-                parent_node_name=node_name,
-            )
-            if child_str:
-                if tree_str:
-                    tree_str += "\n"
-                tree_str += child_str
-
-        return tree_str
+            stack.append((node_id_to_idx[child_node_id], child_depth, filter_node, node_name))
 
-    tree_str = dfs(0, 0, False, "")
-    return tree_str
+    return "\n".join(lines)
 
 
 def _process_bid(
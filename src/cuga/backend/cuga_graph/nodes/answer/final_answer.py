@@ -42,7 +42,7 @@ class HumanInTheLoopHandler:
             return self._action_handlers[action_id](state, node_name)
 
         # Default fallback
-        return Command(update=state.model_dump(), goto=NodeNames.END)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.END)
 
     def add_action_handler(self, action_id: str, handler: Callable):
         """Add a custom action handler"""
@@ -52,12 +52,12 @@ class HumanInTheLoopHandler:
         """Handle save/reuse action - get more utterances"""
         state.hitl_action = create_get_more_utterances()
         state.sender = node_name
-        return Command(update=state.model_dump(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
 
     def _handle_save_reuse_intent(self, state: AgentState, node_name: str) -> Command:
         """Handle save/reuse intent - go to reuse agent"""
         state.sender = node_name
-        return Command(update=state.model_dump(), goto=NodeNames.REUSE_AGENT)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.REUSE_AGENT)
 
 
 class FinalAnswerNode(BaseNode):
@@ -91,7 +91,7 @@ class FinalAnswerNode(BaseNode):
             )
             state.messages.append(AIMessage(content=final_answer_output.model_dump_json(), name=name))
             tracker.collect_step(step=Step(name=name, data=final_answer_output.model_dump_json()))
-            return Command(update=state.model_dump(), goto=NodeNames.END)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.END)
 
         # Handle TaskAnalyzerAgent when final_answer is already set (no apps matched)
         if state.sender == NodeNames.TASK_ANALYZER_AGENT and state.final_answer:
@@ -104,7 +104,7 @@ class FinalAnswerNode(BaseNode):
             )
             state.messages.append(AIMessage(content=final_answer_output.model_dump_json(), name=name))
             tracker.collect_step(step=Step(name=name, data=final_answer_output.model_dump_json()))
-            return Command(update=state.model_dump(), goto=NodeNames.END)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.END)
         if state.sender == NodeNames.CUGA_LITE:
             state.sender = name
             state.final_answer = state.final_answer
@@ -115,7 +115,7 @@ class FinalAnswerNode(BaseNode):
             )
             state.messages.append(AIMessage(content=final_answer_output.model_dump_json(), name=name))
             tracker.collect_step(step=Step(name=name, data=final_answer_output.model_dump_json()))
-            return Command(update=state.model_dump(), goto=NodeNames.END)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.END)
         # Main processing: generate final answer
         await FinalAnswerNode._generate_final_answer(state, agent, name)
 
@@ -123,9 +123,9 @@ class FinalAnswerNode(BaseNode):
         if ENABLE_SAVE_REUSE and state.sender == NodeNames.PLAN_CONTROLLER_AGENT:
             state.hitl_action = create_save_reuse_action()
             state.sender = name
-            return Command(update=state.model_dump(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
         else:
-            return Command(update=state.model_dump(), goto=NodeNames.END)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.END)
 
     @staticmethod
     async def _generate_final_answer(state: AgentState, agent: FinalAnswerAgent, name: str):
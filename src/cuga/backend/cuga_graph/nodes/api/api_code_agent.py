@@ -62,4 +62,4 @@ class ApiCoder(BaseNode):
                 namespace_id="memory", content=variables_string, metadata={"user_id": state.user_id}
             )
 
-        return Command(update=state.model_dump(), goto="APIPlannerAgent")
+        return Command(update=state.model_dump_changes(), goto="APIPlannerAgent")
@@ -48,11 +48,11 @@ class ApiCodePlanner(BaseNode):
             state.api_planner_history[-1].agent_output = CoderAgentHistoricalOutput(
                 final_output=missing_apis_msg + "\n *Please use ApiShortlistingAgent with refined task*",
             )
-            return Command(update=state.model_dump(), goto="APIPlannerAgent")
+            return Command(update=state.model_dump_changes(), goto="APIPlannerAgent")
 
         else:
             state.api_planner_codeagent_plan = res.content
             logger.debug(f"\ncode_planner_plan:\n {res.content}")
             tracker.collect_step(step=Step(name=name, data=res.content))
             state.messages.append(AIMessage(content=json.dumps({"data": res.content})))
-            return Command(update=state.model_dump(), goto="CodeAgent")
+            return Command(update=state.model_dump_changes(), goto="CodeAgent")
@@ -172,7 +172,7 @@ class ApiPlanner(BaseNode):
                     logger.info(
                         f"Tool count ({tool_count}) below threshold ({threshold}) - routing to CugaLite"
                     )
-                    return Command(update=state.model_dump(), goto="CugaLite")
+                    return Command(update=state.model_dump_changes(), goto="CugaLite")
 
         # Handle human consultation response (only if HITL is enabled)
         if settings.advanced_features.api_planner_hitl:
@@ -261,7 +261,7 @@ class ApiPlanner(BaseNode):
                 state=state, action=res.action.value, step=res.action_input_coder_agent
             )
 
-            return Command(update=state.model_dump(), goto="APICodePlannerAgent")
+            return Command(update=state.model_dump_changes(), goto="APICodePlannerAgent")
 
         if res.action == ActionName.API_FILTERING_AGENT:
             state.api_last_step = ActionName.API_FILTERING_AGENT
@@ -273,7 +273,7 @@ class ApiPlanner(BaseNode):
             state.shortlister_relevant_apps = [res.action_input_shortlisting_agent.app_name]
             state.shortlister_query = f"**Input task**: {res.action_input_shortlisting_agent.task_description}\n\nTask context:{state.sub_task}"
             logger.debug(state.model_dump())
-            return Command(update=state.model_dump(), goto="ShortlisterAgent")
+            return Command(update=state.model_dump_changes(), goto="ShortlisterAgent")
 
         if res.action == ActionName.CONCLUDE_TASK:
             state.api_last_step = ActionName.CONCLUDE_TASK
@@ -291,7 +291,7 @@ class ApiPlanner(BaseNode):
             )
             state.last_planner_answer = res.action_input_conclude_task.final_response
             state.sender = "APIPlannerAgent"
-            return Command(update=state.model_dump(), goto="PlanControllerAgent")
+            return Command(update=state.model_dump_changes(), goto="PlanControllerAgent")
 
         if settings.advanced_features.api_planner_hitl and res.action == ActionName.CONSULT_WITH_HUMAN:
             state.api_last_step = ActionName.CONSULT_WITH_HUMAN
@@ -330,9 +330,9 @@ class ApiPlanner(BaseNode):
                 options=options,
             )
             state.sender = name
-            return Command(update=state.model_dump(), goto="SuggestHumanActions")
+            return Command(update=state.model_dump_changes(), goto="SuggestHumanActions")
 
-        return Command(update=state.model_dump(), goto="APICodePlannerAgent")
+        return Command(update=state.model_dump_changes(), goto="APICodePlannerAgent")
 
         # state.api_planner_codeagent_filtered_schemas_plan = res.content
         # return state
@@ -86,4 +86,4 @@ class ApiShortlister(BaseNode):
         tracker.collect_step(step=Step(name=name, data=current_shortlisted.model_dump_json()))
         logger.debug("\n" + current_shortlisted.model_dump_json(indent=2))
         state.messages.append(AIMessage(content=current_shortlisted.model_dump_json()))
-        return Command(update=state.model_dump(), goto="APIPlannerAgent")
+        return Command(update=state.model_dump_changes(), goto="APIPlannerAgent")
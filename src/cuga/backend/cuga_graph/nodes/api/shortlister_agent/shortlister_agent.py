@@ -104,9 +104,9 @@ class ShortlisterAgent(BaseAgent):
         # memory integration
         rtrvd_tips_formatted = None
         if settings.advanced_features.enable_memory:
-            from cuga.backend.memory.agentic_memory.utils.memory_tips_formatted import get_formatted_tips
+            from cuga.backend.memory.agentic_memory.utils.memory_tips_formatted import aget_formatted_tips
 
-            rtrvd_tips_formatted = get_formatted_tips(
+            rtrvd_tips_formatted = await aget_formatted_tips(
                 namespace_id="memory",
                 agent_id='APIShortlisterAgent',
                 query=input_variables.shortlister_query,
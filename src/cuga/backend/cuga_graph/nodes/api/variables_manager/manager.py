@@ -1,20 +1,214 @@
 import json
+import os
+import pickle
+import uuid
+import weakref
+from itertools import islice
 from typing import Any, Dict, Optional
 from datetime import datetime
 from pathlib import Path
 import traceback
-import inspect
-from loguru import logger
-from cuga.config import settings
+from cuga.backend.cuga_graph.nodes.api.variables_manager.operation_log import (
+    OperationLog,
+    caller_info,
+    open_operation_log,
+)
+from cuga.backend.tools_env.code_sandbox.variables import SandboxVariables
+from cuga.backend.utils.session_scope import SessionScoped
+from cuga.config import CACHE_DIR, settings
+
+DEFAULT_PREVIEW_LENGTH = 5000
+# Distinct preview lengths memoized per variable
+MAX_CACHED_PREVIEWS = 4
+
+
+def value_preview(value: Any, max_length: int = DEFAULT_PREVIEW_LENGTH) -> str:
+    """Get a structured preview of the value, truncating nested content when large.
+
+    This preserves high-level structure (e.g., dict keys) while shortening
+    long strings and large lists/tuples nested within.
+    """
+
+    # First try full representation to see if it fits
+    try:
+        full_repr = repr(value)
+        if len(full_repr) <= max_length:
+            return full_repr
+    except Exception:
+        pass  # Fall back to smart truncation if repr fails
+
+    # Tunable preview thresholds
+    max_string_chars = max(50, min(200, max_length // 4))
+    max_list_items = 10
+    max_depth = 6  # Increased from 4 to allow deeper nesting when it fits
+
+    def shorten(val: Any, depth: int = 0, current_length: int = 0) -> str:
+        # Try full representation first if we're not too deep and it might fit
+        if depth < max_depth:
+            try:
+                full_val_repr = repr(val)
+                if current_length + len(full_val_repr) <= max_length:
+                    return full_val_repr
+            except Exception:
+                pass
+
+        if depth >= max_depth:
+            return "..."
+
+        # Strings: cap length and show as repr
+        if isinstance(val, str):
+            if len(val) <= max_string_chars:
+                return repr(val)
+            truncated = val[:max_string_chars] + "..."
+            return repr(truncated)
+
+        # Lists/Tuples: show first N items, then indicate remainder
+        if isinstance(val, (list, tuple)):
+            open_b, close_b = ("[", "]") if isinstance(val, list) else ("(", ")")
+            items: list[str] = []
+            total = len(val)
+            running_length = current_length + 2  # Account for brackets
+
+            for index, item in enumerate(val):
+                if index >= max_list_items:
+                    remaining = total - index
+                    items.append(f"... (+{remaining} more)")
+                    break
+
+                item_repr = shorten(item, depth + 1, running_length)
+                if running_length + len(item_repr) + 2 > max_length:  # +2 for ", "
+                    remaining = total - index
+                    items.append(f"... (+{remaining} more)")
+                    break
+
+                items.append(item_repr)
+                running_length += len(item_repr) + 2  # +2 for ", "
+
+            return f"{open_b}{', '.join(items)}{close_b}"
+
+        # Dicts: preserve keys and shorten nested values
+        if isinstance(val, dict):
+            if not val:
+                return "{}"
+
+            parts: list[str] = []
+            running_length = current_length + 2  # Account for braces
+
+            for key, nested in val.items():
+                key_repr = repr(key)
+
+                # Try to fit at least the key with a truncated value
+                nested_repr = shorten(nested, depth + 1, running_length + len(key_repr) + 2)
+                part = f"{key_repr}: {nested_repr}"
+
+                # If even the key won't fit, just show ellipsis
+                if running_length + len(key_repr) + 5 > max_length:  # +5 for ": ..."
+                    if not parts:  # If no parts yet, at least show one key
+                        parts.append(f"{key_repr}: ...")
+                    else:
+                        parts.append("...")
+                    break
+
+                # If the full part won't fit, truncate the nested value more aggressively
+                if running_length + len(part) + 2 > max_length:
+                    if depth + 1 < max_depth:
+                        # Try with just "..." for the nested value
+                        part = f"{key_repr}: ..."
+                        if running_length + len(part) + 2 <= max_length:
+                            parts.append(part)
+                    break
+
+                parts.append(part)
+                running_length += len(part) + 2  # +2 for ", "
+
+            return "{" + ", ".join(parts) + "}"
+
+        # Fallback for other types
+        return repr(val)
+
+    preview = shorten(value, 0, 0)
+    if len(preview) > max_length:
+        return preview[:max_length] + "..."
+    return preview
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 class VariableMetadata:
     def __init__(self, value: Any, description: Optional[str] = None, created_at: Optional[datetime] = None):
-        self.value = value
+        self._value = value
+        self._spill_path: Optional[str] = None
+        self._previews: Dict[tuple, str] = {}
         self.description = description or ""
         self.type = type(value).__name__
         self.created_at = created_at if created_at is not None else datetime.now()
         self.count_items = self._calculate_count(value)
+        # Computed once here so building prompts never re-walks the value
+        self.preview(DEFAULT_PREVIEW_LENGTH)
+
+    @property
+    def value(self) -> Any:
+        if self._spill_path is not None:
+            with open(self._spill_path, "rb") as f:
+                return pickle.load(f)
+        return self._value
+
+    @value.setter
+    def value(self, value: Any):
+        self._value = value
+        self._spill_path = None
+        self._previews = {}
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_path is not None
+
+    def preview(self, max_length: int = DEFAULT_PREVIEW_LENGTH) -> str:
+        """Structured preview of the value (see ``value_preview``), memoized per length."""
+        return self._memoized(("repr", max_length), lambda value: value_preview(value, max_length=max_length))
+
+    def _memoized(self, key: tuple, compute) -> str:
+        cached = self._previews.get(key)
+        if cached is None:
+            cached = compute(self.value)
+            if len(self._previews) >= MAX_CACHED_PREVIEWS:
+                self._previews.pop(next(iter(self._previews)))
+            self._previews[key] = cached
+        return cached
+
+    def spill(self, directory: str, threshold: int) -> bool:
+        """Move the value to a pickle under ``directory`` if it serializes to more than ``threshold`` bytes."""
+        if self._spill_path is not None or threshold <= 0:
+            return False
+        try:
+            payload = pickle.dumps(self._value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if len(payload) <= threshold:
+            return False
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.pkl")
+        with open(path, "wb") as f:
+            f.write(payload)
+        self._spill_path = path
+        self._value = None
+        weakref.finalize(self, _remove_file, path)
+        return True
+
+    def pickled(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> Optional[bytes]:
+        """The value as a pickle (a spilled value's file as is), or None if it can't be pickled."""
+        if self._spill_path is not None:
+            with open(self._spill_path, "rb") as f:
+                return f.read()
+        try:
+            return pickle.dumps(self._value, protocol=protocol)
+        except Exception:
+            return None
 
     def _calculate_count(self, value: Any) -> int:
         """Calculate the count of items in the value based on its type."""
@@ -45,16 +239,20 @@ class VariableMetadata:
         if include_value:
             result["value"] = self.value
         if include_value_preview:
-            result["value_preview"] = str(self.value)[:max_preview_length]
+            result["value_preview"] = self._memoized(
+                ("str", max_preview_length), lambda value: str(value)[:max_preview_length]
+            )
         return result
 
 
-class VariablesManager(object):
+class VariablesManager(SessionScoped):
     _instance = None
+    # Each server session sees its own variables
+    _session_fields = {"variables": dict, "variable_counter": int}
+    # Insertion ordered, so it doubles as the creation order
     variables: Dict[str, VariableMetadata] = {}
     variable_counter: int = 0
-    _creation_order: list = []  # Track creation order
-    _log_file: Optional[Path] = None
+    _operation_log: Optional[OperationLog] = None
     _session_start: Optional[datetime] = None
 
     def __new__(cls, *args, **kwargs):
@@ -64,54 +262,31 @@ class VariablesManager(object):
                 cls._instance._initialize_logging()
         return cls._instance
 
+    @property
+    def _creation_order(self) -> list[str]:
+        return list(self.variables)
+
     def _initialize_logging(self):
-        """Initialize the markdown log file."""
+        """Initialize the JSON-lines operation log."""
         log_dir = Path("logging/variables_manager")
         log_dir.mkdir(parents=True, exist_ok=True)
 
         self._session_start = datetime.now()
         timestamp = self._session_start.strftime("%Y%m%d_%H%M%S")
-        self._log_file = log_dir / f"variables_log_{timestamp}.md"
-
-        # Write header
-        with open(self._log_file, 'w') as f:
-            f.write("# Variables Manager Log\n\n")
-            f.write(f"**Session Started:** {self._session_start.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("---\n\n")
-
-    def _get_caller_info(self, skip_frames=2) -> str:
-        """Get information about the caller function."""
-        try:
-            stack = inspect.stack()
-            if len(stack) > skip_frames:
-                frame = stack[skip_frames]
-                filename = Path(frame.filename).name
-                function = frame.function
-                line = frame.lineno
-                return f"{filename}:{function}:{line}"
-            return "Unknown caller"
-        except Exception:
-            return "Unknown caller"
+        self._operation_log = open_operation_log(str(log_dir / f"variables_log_{timestamp}.jsonl"))
+        self._operation_log.write({"time": self._session_start.isoformat(), "operation": "session_started"})
 
-    def _log_operation(self, operation: str, details: str, extra_info: Optional[str] = None):
-        """Log an operation to the markdown file."""
-        if not settings.advanced_features.tracker_enabled or not self._log_file:
+    def _log_operation(self, operation: str, with_stack: bool = False, **fields: Any):
+        """Queue a structured record; caller info (and stack for resets) only when log_callers is on."""
+        if not settings.advanced_features.tracker_enabled or self._operation_log is None:
             return
 
-        try:
-            timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-            caller = self._get_caller_info(skip_frames=3)
-
-            with open(self._log_file, 'a') as f:
-                f.write(f"## {operation}\n\n")
-                f.write(f"- **Time:** {timestamp}\n")
-                f.write(f"- **Caller:** `{caller}`\n")
-                f.write(f"- **Details:** {details}\n")
-                if extra_info:
-                    f.write(f"\n{extra_info}\n")
-                f.write("\n---\n\n")
-        except Exception as e:
-            logger.warning(f"Failed to write to variables log: {e}")
+        record = {"time": datetime.now().isoformat(timespec="milliseconds"), "operation": operation, **fields}
+        if settings.variables_manager.log_callers:
+            record["caller"] = caller_info(skip_frames=2)
+            if with_stack:
+                record["stack"] = "".join(traceback.format_stack()[:-2])
+        self._operation_log.write(record)
 
     def add_variable(self, value: Any, name: Optional[str] = None, description: Optional[str] = None) -> str:
         """
@@ -143,33 +318,28 @@ class VariablesManager(object):
             if name in self.variables:
                 is_new = False
 
-        self.variables[name] = VariableMetadata(value, description)
-
-        # Track creation order
-        if name not in self._creation_order:
-            self._creation_order.append(name)
-
-        # Log the operation
-        operation = "➕ Variable Added" if is_new else "🔄 Variable Updated"
-        value_preview = self._get_value_preview(value, max_length=200)
-        details = f"**{name}** = `{type(value).__name__}` ({len(str(value))} chars)"
-
-        extra_info = f"""
-### Variable Info
-- **Name:** `{name}` {'(auto-generated)' if original_name is None else '(explicit)'}
-- **Type:** `{type(value).__name__}`
-- **Description:** {description or 'N/A'}
-- **Value Preview:**
-```python
-{value_preview}
-```
-
-### Current State
-- **Total Variables:** {len(self.variables)}
-- **Variable Counter:** {self.variable_counter}
-- **All Variables:** {', '.join(f'`{v}`' for v in self._creation_order)}
-"""
-        self._log_operation(operation, details, extra_info)
+        metadata = VariableMetadata(value, description)
+        if settings.variables_manager.spill_threshold:
+            metadata.spill(
+                settings.variables_manager.spill_dir or os.path.join(CACHE_DIR, "variables"),
+                settings.variables_manager.spill_threshold,
+            )
+        # Re-assigning an existing name keeps its original position in the creation order
+        self.variables[name] = metadata
+
+        if not settings.advanced_features.tracker_enabled or self._operation_log is None:
+            return name
+
+        self._log_operation(
+            "added" if is_new else "updated",
+            name=name,
+            auto_generated=original_name is None,
+            type=metadata.type,
+            description=description,
+            preview=metadata.preview(200),
+            total_variables=len(self.variables),
+            variable_counter=self.variable_counter,
+        )
 
         return name
 
@@ -235,49 +405,17 @@ class VariablesManager(object):
         if not self.variables:
             return "# No variables stored"
 
-        # Determine which variables to include
+        # Determine which variables to include, in creation order
         if last_n is not None:
-            # Get the last n variables based on creation order
             if last_n <= 0:
                 return "# Invalid last_n value: must be greater than 0"
-
-            # Get the last n variable names from creation order
-            last_n_names = (
-                self._creation_order[-last_n:]
-                if len(self._creation_order) >= last_n
-                else self._creation_order[:]
-            )
-            filtered_variables = {
-                name: metadata for name, metadata in self.variables.items() if name in last_n_names
-            }
-
-            # Sort by creation order to maintain chronological order
-            sorted_vars = [
-                (name, filtered_variables[name]) for name in last_n_names if name in filtered_variables
-            ]
-
+            selected_names = self.get_last_n_variable_names(last_n)
         elif variable_names is not None:
-            filtered_variables = {
-                name: metadata for name, metadata in self.variables.items() if name in variable_names
-            }
-
-            # Check if any requested variables were not found
-            missing_vars = set(variable_names) - set(filtered_variables.keys())
-            if missing_vars:
-                # You might want to handle this differently based on your needs
-                pass  # Could log warning or raise exception
-
-            # Sort by creation order for consistency
-            sorted_vars = [
-                (name, filtered_variables[name])
-                for name in self._creation_order
-                if name in filtered_variables
-            ]
+            requested = set(variable_names)
+            selected_names = [name for name in self.variables if name in requested]
         else:
-            # Use creation order for all variables
-            sorted_vars = [
-                (name, self.variables[name]) for name in self._creation_order if name in self.variables
-            ]
+            selected_names = list(self.variables)
+        sorted_vars = [(name, self.variables[name]) for name in selected_names]
 
         if not sorted_vars:
             return "# No matching variables found"
@@ -302,7 +440,7 @@ class VariablesManager(object):
                 f"- Items: {metadata.count_items}",
                 f"- Description: {metadata.description or 'No description'}",
                 f"- Created: {metadata.created_at.strftime('%Y-%m-%d %H:%M:%S')}",
-                f"- Value Preview: {self._get_value_preview(metadata.value, max_length=max_length)}",
+                f"- Value Preview: {metadata.preview(max_length)}",
                 "",
             ]
             summary_lines.extend(lines)
@@ -310,113 +448,7 @@ class VariablesManager(object):
         return '\n'.join(summary_lines)
 
     def _get_value_preview(self, value: Any, max_length: int = 5000) -> str:
-        """Get a structured preview of the value, truncating nested content when large.
-
-        This preserves high-level structure (e.g., dict keys) while shortening
-        long strings and large lists/tuples nested within.
-        """
-
-        # First try full representation to see if it fits
-        try:
-            full_repr = repr(value)
-            if len(full_repr) <= max_length:
-                return full_repr
-        except Exception:
-            pass  # Fall back to smart truncation if repr fails
-
-        # Tunable preview thresholds
-        max_string_chars = max(50, min(200, max_length // 4))
-        max_list_items = 10
-        max_depth = 6  # Increased from 4 to allow deeper nesting when it fits
-
-        def shorten(val: Any, depth: int = 0, current_length: int = 0) -> str:
-            # Try full representation first if we're not too deep and it might fit
-            if depth < max_depth:
-                try:
-                    full_val_repr = repr(val)
-                    if current_length + len(full_val_repr) <= max_length:
-                        return full_val_repr
-                except Exception:
-                    pass
-
-            if depth >= max_depth:
-                return "..."
-
-            # Strings: cap length and show as repr
-            if isinstance(val, str):
-                if len(val) <= max_string_chars:
-                    return repr(val)
-                truncated = val[:max_string_chars] + "..."
-                return repr(truncated)
-
-            # Lists/Tuples: show first N items, then indicate remainder
-            if isinstance(val, (list, tuple)):
-                open_b, close_b = ("[", "]") if isinstance(val, list) else ("(", ")")
-                items: list[str] = []
-                total = len(val)
-                running_length = current_length + 2  # Account for brackets
-
-                for index, item in enumerate(val):
-                    if index >= max_list_items:
-                        remaining = total - index
-                        items.append(f"... (+{remaining} more)")
-                        break
-
-                    item_repr = shorten(item, depth + 1, running_length)
-                    if running_length + len(item_repr) + 2 > max_length:  # +2 for ", "
-                        remaining = total - index
-                        items.append(f"... (+{remaining} more)")
-                        break
-
-                    items.append(item_repr)
-                    running_length += len(item_repr) + 2  # +2 for ", "
-
-                return f"{open_b}{', '.join(items)}{close_b}"
-
-            # Dicts: preserve keys and shorten nested values
-            if isinstance(val, dict):
-                if not val:
-                    return "{}"
-
-                parts: list[str] = []
-                running_length = current_length + 2  # Account for braces
-
-                for key, nested in val.items():
-                    key_repr = repr(key)
-
-                    # Try to fit at least the key with a truncated value
-                    nested_repr = shorten(nested, depth + 1, running_length + len(key_repr) + 2)
-                    part = f"{key_repr}: {nested_repr}"
-
-                    # If even the key won't fit, just show ellipsis
-                    if running_length + len(key_repr) + 5 > max_length:  # +5 for ": ..."
-                        if not parts:  # If no parts yet, at least show one key
-                            parts.append(f"{key_repr}: ...")
-                        else:
-                            parts.append("...")
-                        break
-
-                    # If the full part won't fit, truncate the nested value more aggressively
-                    if running_length + len(part) + 2 > max_length:
-                        if depth + 1 < max_depth:
-                            # Try with just "..." for the nested value
-                            part = f"{key_repr}: ..."
-                            if running_length + len(part) + 2 <= max_length:
-                                parts.append(part)
-                        break
-
-                    parts.append(part)
-                    running_length += len(part) + 2  # +2 for ", "
-
-                return "{" + ", ".join(parts) + "}"
-
-            # Fallback for other types
-            return repr(val)
-
-        preview = shorten(value, 0, 0)
-        if len(preview) > max_length:
-            return preview[:max_length] + "..."
-        return preview
+        return value_preview(value, max_length=max_length)
 
     def get_variables_formatted(self) -> str:
         """
@@ -436,6 +468,15 @@ class VariablesManager(object):
 
         return '\n'.join(formatted_lines)
 
+    def get_variables_for_sandbox(self) -> SandboxVariables:
+        """
+        All variables, to be injected into a sandbox execution instead of being formatted as source.
+
+        Returns:
+            SandboxVariables: Values (or pickles of them) are only produced when the sandbox needs them
+        """
+        return SandboxVariables(self.variables)
+
     def get_variables_as_json(self) -> str:
         """
         Get all variables formatted as JSON strings.
@@ -468,11 +509,8 @@ class VariablesManager(object):
         if not self.variables:
             return None, None
 
-        # Get the last key from creation order
-        last_key = self._creation_order[-1] if self._creation_order else None
-        if last_key and last_key in self.variables:
-            return last_key, self.variables[last_key]
-        return None, None
+        last_key = next(reversed(self.variables))
+        return last_key, self.variables[last_key]
 
     def present_variable(self, variable_name):
         """
@@ -580,10 +618,8 @@ class VariablesManager(object):
         if not self.variables:
             return None, None
 
-        last_key = self._creation_order[-1] if self._creation_order else None
-        if last_key and last_key in self.variables:
-            return last_key, self.variables[last_key]
-        return None, None
+        last_key = next(reversed(self.variables))
+        return last_key, self.variables[last_key]
 
     def get_variable_names(self) -> list[str]:
         """
@@ -606,7 +642,7 @@ class VariablesManager(object):
         """
         if n <= 0:
             return []
-        return self._creation_order[-n:] if len(self._creation_order) >= n else self._creation_order[:]
+        return list(islice(reversed(self.variables), n))[::-1]
 
     def remove_variable(self, name: str) -> bool:
         """
@@ -620,28 +656,16 @@ class VariablesManager(object):
         """
         if name in self.variables:
             var_type = self.variables[name].type
-            var_value_preview = self._get_value_preview(self.variables[name].value, max_length=100)
+            var_value_preview = self.variables[name].preview(100) if self._operation_log is not None else None
 
             del self.variables[name]
-            # Also remove from creation order
-            if name in self._creation_order:
-                self._creation_order.remove(name)
-
-            details = f"Removed **{name}** (`{var_type}`)"
-            extra_info = f"""
-### Removed Variable
-- **Name:** `{name}`
-- **Type:** `{var_type}`
-- **Value Preview:** `{var_value_preview}`
-
-### Remaining State
-- **Total Variables:** {len(self.variables)}
-- **Variables:** {', '.join(f'`{v}`' for v in self._creation_order) if self._creation_order else 'None'}
-"""
-            self._log_operation("➖ Variable Removed", details, extra_info)
+
+            self._log_operation(
+                "removed", name=name, type=var_type, preview=var_value_preview, remaining=len(self.variables)
+            )
             return True
         else:
-            self._log_operation("⚠️ Remove Failed", f"Variable **{name}** not found", None)
+            self._log_operation("remove_failed", name=name)
             return False
 
     def update_variable_description(self, name: str, description: str) -> bool:
@@ -685,27 +709,14 @@ class VariablesManager(object):
         """
         Reset the variables manager, clearing all variables and counter.
         """
-        # Log before reset
-        variables_before = list(self._creation_order)
-        count_before = len(self.variables)
-
-        details = f"Clearing **{count_before}** variables"
-        extra_info = f"""
-### 🗑️ Reset Operation
-
-**Variables Cleared:**
-{chr(10).join(f'- `{name}`: {self.variables[name].type}' for name in variables_before) if variables_before else '- None'}
-
-### Stack Trace
-```python
-{''.join(traceback.format_stack()[:-1])}
-```
-"""
-        self._log_operation("🔄 RESET", details, extra_info)
+        self._log_operation(
+            "reset",
+            with_stack=True,
+            cleared={name: metadata.type for name, metadata in self.variables.items()},
+        )
 
         self.variables = {}
         self.variable_counter = 0
-        self._creation_order = []
 
     def reset_keep_last_n(self, n: int) -> None:
         """
@@ -724,8 +735,8 @@ class VariablesManager(object):
         max_variable_counter = 0
 
         # Identify the last 'n' variables and their metadata
-        names_to_keep = self._creation_order[-n:]
-        names_to_remove = [name for name in self._creation_order if name not in names_to_keep]
+        names_to_keep = self.get_last_n_variable_names(n)
+        names_to_remove = list(self.variables)[: len(self.variables) - len(names_to_keep)]
 
         for name in names_to_keep:
             if name in self.variables:
@@ -735,35 +746,16 @@ class VariablesManager(object):
                 if name.startswith("variable_") and name[9:].isdigit():
                     max_variable_counter = max(max_variable_counter, int(name[9:]))
 
-        details = f"Keeping last **{n}** variables, removing **{len(names_to_remove)}** variables"
-        extra_info = f"""
-### 🔄 Partial Reset (Keep Last {n})
+        self._log_operation(
+            "partial_reset",
+            with_stack=True,
+            keep_last=n,
+            kept={name: self.variables[name].type for name in names_to_keep},
+            removed={name: self.variables[name].type for name in names_to_remove},
+        )
 
-**Variables Kept:**
-{chr(10).join(f'- ✅ `{name}`: {self.variables[name].type}' for name in names_to_keep) if names_to_keep else '- None'}
-
-**Variables Removed:**
-{chr(10).join(f'- ❌ `{name}`: {self.variables[name].type}' for name in names_to_remove) if names_to_remove else '- None'}
-
-### Stack Trace
-```python
-{''.join(traceback.format_stack()[:-1])}
-```
-"""
-        self._log_operation("🔄 PARTIAL RESET", details, extra_info)
-
-        # Perform the reset (this will log again, but that's ok)
-        self.variables = {}
-        self.variable_counter = 0
-        self._creation_order = []
-
-        # Re-add the identified variables
-        for name in original_creation_order:
-            metadata = variables_to_keep[name]
-            self.variables[name] = VariableMetadata(
-                metadata.value, description=metadata.description, created_at=metadata.created_at
-            )
-            self._creation_order.append(name)
+        # Keep the existing metadata objects so their memoized previews (and spilled files) survive
+        self.variables = {name: variables_to_keep[name] for name in original_creation_order}
 
         # Set the variable counter to ensure future auto-generated names don't conflict
         self.variable_counter = max_variable_counter
@@ -0,0 +1,73 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+def caller_info(skip_frames: int = 1) -> str:
+    """``file:function:line`` of a caller ``skip_frames`` above the function calling this one."""
+    try:
+        frame = sys._getframe(skip_frames + 1)
+    except ValueError:
+        return "Unknown caller"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+class OperationLog:
+    """
+    JSON-lines log of ``VariablesManager`` operations.
+
+    Records are queued and a daemon thread appends whatever has piled up in one write, so logging
+    never blocks the code agent on file I/O. ``flush`` blocks until everything queued is on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="variables-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                payload = "".join(
+                    json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch
+                )
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(payload)
+            except Exception as e:
+                logger.warning(f"Failed to write to variables log: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def write(self, record: Dict[str, Any]):
+        self._ensure_started()
+        self._queue.put(record)
+
+    def flush(self):
+        if self._thread is not None:
+            self._queue.join()
+
+
+def open_operation_log(path: str) -> OperationLog:
+    operation_log = OperationLog(path)
+    atexit.register(operation_log.flush)
+    return operation_log
@@ -0,0 +1,116 @@
+import gc
+import json
+import os
+import pickle
+from unittest.mock import patch
+
+from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager, settings
+from cuga.backend.cuga_graph.nodes.api.variables_manager.operation_log import OperationLog
+
+
+class CountingRepr:
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "CountingRepr()"
+
+
+class TestVariableStore:
+    """Ordering, memoized previews and disk spilling of stored variables."""
+
+    def test_preview_is_computed_once(self):
+        vm = VariablesManager()
+        vm.reset()
+        value = CountingRepr()
+        vm.add_variable(value, name="counted")
+        calls_after_insert = value.calls
+
+        for _ in range(5):
+            assert "CountingRepr()" in vm.get_variables_summary(last_n=1)
+        assert value.calls == calls_after_insert
+
+    def test_creation_order_survives_updates_and_removals(self):
+        vm = VariablesManager()
+        vm.reset()
+        for name in ("a", "b", "c", "d"):
+            vm.add_variable(name, name=name)
+        vm.add_variable("updated", name="b")
+        vm.remove_variable("c")
+
+        assert vm.get_last_n_variable_names(2) == ["b", "d"]
+        assert vm.get_last_n_variable_names(10) == ["a", "b", "d"]
+        assert vm.get_last_variable()[0] == "d"
+        summary = vm.get_variables_summary(variable_names=["d", "a"])
+        assert summary.index("## a") < summary.index("## d")
+
+    def test_large_values_spill_to_disk(self, tmp_path):
+        vm = VariablesManager()
+        vm.reset()
+        big = [{"id": i, "name": f"item {i}"} for i in range(1000)]
+        with (
+            patch.object(settings.variables_manager, "spill_threshold", 1024),
+            patch.object(settings.variables_manager, "spill_dir", str(tmp_path)),
+        ):
+            name = vm.add_variable(big, description="big list")
+            small = vm.add_variable([1, 2, 3])
+
+        metadata = vm.get_variable_metadata(name)
+        assert metadata.spilled
+        assert not vm.get_variable_metadata(small).spilled
+        assert vm.get_variable(name) == big
+        assert metadata.count_items == 1000
+        assert "'item 0'" in vm.get_variables_summary(variable_names=[name])
+
+        spilled_files = os.listdir(tmp_path)
+        assert len(spilled_files) == 1
+        vm.remove_variable(name)
+        del metadata
+        gc.collect()
+        assert os.listdir(tmp_path) == []
+
+    def test_variables_for_sandbox_pass_spilled_pickles_through(self, tmp_path):
+        vm = VariablesManager()
+        vm.reset()
+        big = [{"id": i} for i in range(1000)]
+        with (
+            patch.object(settings.variables_manager, "spill_threshold", 1024),
+            patch.object(settings.variables_manager, "spill_dir", str(tmp_path)),
+        ):
+            spilled = vm.add_variable(big)
+            small = vm.add_variable({"a": 1})
+        unpicklable = vm.add_variable(lambda: None)
+
+        variables = vm.get_variables_for_sandbox()
+        payloads, leftovers = variables.payloads()
+
+        with open(os.path.join(tmp_path, os.listdir(tmp_path)[0]), "rb") as f:
+            assert payloads[spilled] == f.read()
+        assert pickle.loads(payloads[small]) == {"a": 1}
+        assert list(leftovers) == [unpicklable]
+        values = variables.values()
+        # sandboxed code gets copies, so it can't change the stored values
+        assert values[small] == {"a": 1}
+        assert values[small] is not vm.get_variable_metadata(small).value
+        assert values[spilled] == big
+
+    def test_operation_log_is_structured_and_buffered(self, tmp_path):
+        vm = VariablesManager()
+        vm.reset()
+        operation_log = OperationLog(str(tmp_path / "variables_log.jsonl"))
+        with (
+            patch.object(vm, "_operation_log", operation_log),
+            patch.object(settings.advanced_features, "tracker_enabled", True),
+            patch.object(settings.variables_manager, "log_callers", True),
+        ):
+            name = vm.add_variable({"flights": 3}, description="search result")
+            vm.remove_variable(name)
+            vm.remove_variable(name)
+        operation_log.flush()
+
+        with open(operation_log.path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [record["operation"] for record in records] == ["added", "removed", "remove_failed"]
+        assert records[0]["preview"] == "{'flights': 3}"
+        assert records[0]["caller"].startswith("test_variable_store.py:test_operation_log_is_structured")
@@ -75,17 +75,17 @@ class PlannerNode(BaseNode):
             )
             state.last_planner_answer = next_instruction
             state.stm_steps_history.append(next_instruction)
-            return Command(update=state.model_dump(), goto="PlanControllerAgent")
+            return Command(update=state.model_dump_changes(), goto="PlanControllerAgent")
         elif next_step_plan.next_agent == "QaAgent":
             state.last_question = next_instruction
             state.stm_steps_history.append("(QaAgent): " + next_instruction)
         elif next_step_plan.next_agent == "MemorizeAgent":
             state.last_planner_answer = next_instruction
             state.stm_steps_history.append("(MemorizeAgent): " + next_instruction)
-            return Command(update=state.model_dump(), goto="BrowserPlannerAgent")
+            return Command(update=state.model_dump_changes(), goto="BrowserPlannerAgent")
         elif next_step_plan.next_agent == "ActionAgent":
             state.stm_steps_history.append("(ActionAgent): " + next_instruction)
         else:
             raise Exception("Unhandled agent")
 
-        return Command(update=state.model_dump(), goto=next_step_plan.next_agent)
+        return Command(update=state.model_dump_changes(), goto=next_step_plan.next_agent)
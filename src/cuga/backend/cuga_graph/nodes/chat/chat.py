@@ -46,7 +46,7 @@ class ChatHumanInTheLoopHandler:
             return self._action_handlers[action_id](state, node_name)
 
         # Default fallback for chat - continue to final answer
-        return Command(update=state.model_dump(), goto=NodeNames.FINAL_ANSWER_AGENT)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.FINAL_ANSWER_AGENT)
 
     def add_action_handler(self, action_id: str, handler: Callable):
         """Add a custom action handler"""
@@ -55,12 +55,12 @@ class ChatHumanInTheLoopHandler:
     def _handle_tool_execute(self, state: AgentState, node_name: str) -> Command:
         """Handle tool execution approval"""
         state.sender = node_name
-        return Command(update=state.model_dump(), goto=NodeNames.WAIT_FOR_RESPONSE)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.WAIT_FOR_RESPONSE)
 
     def _handle_chat_continue(self, state: AgentState, node_name: str) -> Command:
         """Handle continuing chat conversation"""
         state.sender = node_name
-        return Command(update=state.model_dump(), goto=NodeNames.FINAL_ANSWER_AGENT)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.FINAL_ANSWER_AGENT)
 
 
 class ChatNode(BaseNode):
@@ -131,7 +131,7 @@ class ChatNode(BaseNode):
             )
             state.sender = "ChatAgentTool"
             state.last_planner_answer = var_manager.present_variable(var_name)
-            return Command(update=state.model_dump(), goto="FinalAnswerAgent")
+            return Command(update=state.model_dump_changes(), goto="FinalAnswerAgent")
 
         if (
             state.sender == NodeNames.WAIT_FOR_RESPONSE
@@ -141,11 +141,11 @@ class ChatNode(BaseNode):
             tool = ToolCall(**state.hitl_response.additional_data.tool)
             state.input = tool.get("args").get("user_task")
             state.sender = "ChatAgent"
-            return Command(update=state.model_dump(), goto="TaskAnalyzerAgent")
+            return Command(update=state.model_dump_changes(), goto="TaskAnalyzerAgent")
 
         # If chat feature is disabled, go directly to task analyzer
         if not settings.features.chat:
-            return Command(update=state.model_dump(), goto=NodeNames.TASK_ANALYZER_AGENT)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.TASK_ANALYZER_AGENT)
 
         # Process chat input
         state.sender = name
@@ -157,13 +157,13 @@ class ChatNode(BaseNode):
             state.final_answer = state.chat_agent_messages[-1].content
             state.sender = name
             state.hitl_action = create_new_flow_approve(tool=res.tool_calls[0])
-            return Command(update=state.model_dump(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
 
         if ENABLE_SAVE_REUSE and res.tool_calls:
             state.final_answer = state.chat_agent_messages[-1].content
             state.sender = name
             state.hitl_action = create_flow_approve(tool=res.tool_calls[0])
-            return Command(update=state.model_dump(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
+            return Command(update=state.model_dump_changes(), goto=NodeNames.SUGGEST_HUMAN_ACTIONS)
 
         if (
             not ENABLE_SAVE_REUSE
@@ -180,7 +180,7 @@ class ChatNode(BaseNode):
                 )
             else:
                 state.input = res.tool_calls[0].get("args").get("task")
-            return Command(update=state.model_dump(), goto="TaskAnalyzerAgent")
+            return Command(update=state.model_dump_changes(), goto="TaskAnalyzerAgent")
         # Regular chat response - add to messages and continue+
         res.content = var_manager.replace_variables_placeholders(res.content)
         state.messages.append(res)
@@ -193,4 +193,4 @@ class ChatNode(BaseNode):
         )
         state.final_answer = state.chat_agent_messages[-1].content
 
-        return Command(update=state.model_dump(), goto=NodeNames.FINAL_ANSWER_AGENT)
+        return Command(update=state.model_dump_changes(), goto=NodeNames.FINAL_ANSWER_AGENT)
@@ -5,7 +5,6 @@ Core CUGA agent that works with different tool providers through a unified inter
 """
 
 import asyncio
-import contextlib
 import io
 import time
 import types
@@ -27,6 +26,7 @@ except ImportError:
 from cuga.backend.cuga_graph.nodes.api.code_agent.code_act_agent import create_codeact
 from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
 from cuga.backend.llm.models import LLMManager
+from cuga.backend.tools_env.code_sandbox.output_capture import redirect_stdout
 from cuga.backend.cuga_graph.nodes.cuga_lite.tool_provider_interface import (
     ToolProviderInterface,
     AppDefinition,
@@ -582,7 +582,8 @@ async def eval_with_tools_async(code: str, _locals: dict[str, Any]) -> tuple[str
     original_keys = set(_locals.keys())
 
     try:
-        with contextlib.redirect_stdout(io.StringIO()) as f:
+        # Output is captured per task, so concurrent executions on one loop don't mix
+        with redirect_stdout(io.StringIO()) as f:
             # Wrap the generated code in an async function and execute it
             # This allows the LLM to generate code with await statements
             # Indent the code properly - all lines including empty ones need to be indented
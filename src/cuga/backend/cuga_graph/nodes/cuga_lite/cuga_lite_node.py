@@ -199,13 +199,13 @@ class CugaLiteNode(BaseNode):
                 state.last_planner_answer = answer
                 state.sender = "CugaLiteNode"
                 logger.info("CugaLite sub-task execution failed, returning error to PlanControllerAgent")
-                return Command(update=state.model_dump(), goto="PlanControllerAgent")
+                return Command(update=state.model_dump_changes(), goto="PlanControllerAgent")
             else:
                 # For regular execution, set final answer with error
                 state.final_answer = answer  # Contains error message
                 state.sender = self.name
                 logger.info("CugaLite execution failed, proceeding to FinalAnswerAgent with error")
-                return Command(update=state.model_dump(), goto="FinalAnswerAgent")
+                return Command(update=state.model_dump_changes(), goto="FinalAnswerAgent")
 
         # Update chat_messages with the updated messages from execution
         if updated_messages:
@@ -296,10 +296,10 @@ class CugaLiteNode(BaseNode):
             state.last_planner_answer = answer
             state.sender = "CugaLiteNode"
             logger.info("CugaLite sub-task execution successful, proceeding to PlanControllerAgent")
-            return Command(update=state.model_dump(), goto="PlanControllerAgent")
+            return Command(update=state.model_dump_changes(), goto="PlanControllerAgent")
         else:
             # Regular execution - proceed to FinalAnswerAgent
             state.final_answer = answer
             state.sender = self.name
             logger.info("CugaLite execution successful, proceeding to FinalAnswerAgent")
-            return Command(update=state.model_dump(), goto="FinalAnswerAgent")
+            return Command(update=state.model_dump_changes(), goto="FinalAnswerAgent")
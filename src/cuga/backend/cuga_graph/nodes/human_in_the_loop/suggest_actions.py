@@ -24,4 +24,4 @@ class SuggestHumanActions(BaseNode):
     async def node_handler(state: AgentState, name: str) -> Command[Literal["WaitForResponse"]]:
         state.messages.append(AIMessage(content=state.hitl_action.model_dump_json()))
         tracker.collect_step(Step(name=name, data=state.hitl_action.model_dump_json()))
-        return Command(update=state.model_dump(), goto="WaitForResponse")
+        return Command(update=state.model_dump_changes(), goto="WaitForResponse")
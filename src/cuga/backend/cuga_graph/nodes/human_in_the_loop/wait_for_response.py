@@ -33,4 +33,4 @@ class WaitForResponse(BaseNode):
         state.sender = "WaitForResponse"
         state.hitl_response.additional_data = state.hitl_action.additional_data
         state.hitl_action = None
-        return Command(update=state.model_dump(), goto=prev_sender)
+        return Command(update=state.model_dump_changes(), goto=prev_sender)
@@ -34,4 +34,4 @@ class SaveReuseNode(BaseNode):
         state.sender = name
         state.messages.append(AIMessage(content=json.dumps({"data": res.content})))
         tracker.collect_step(Step(name=name, data=json.dumps({"data": res.content})))
-        return Command(update=state.model_dump(), goto="__end__")
+        return Command(update=state.model_dump_changes(), goto="__end__")
@@ -30,6 +30,6 @@ class LocationSolver(BaseNode):
             state.task_analyzer_output.resolved_intent = res.content
         return state
         # if attrs.requires_location_search:
-        #     return Command(update=state.model_dump(),goto="LocationResolverAgent")
+        #     return Command(update=state.model_dump_changes(),goto="LocationResolverAgent")
         # else:
-        #     return Command(update=state.model_dump(),goto="TaskDecompositionAgent")
+        #     return Command(update=state.model_dump_changes(),goto="TaskDecompositionAgent")
@@ -69,7 +69,19 @@ class TaskAnalyzer(BaseNode):
         intent = state.input
         # Common initialization
         if mode == 'api' or mode == 'hybrid':
+            # memory integration: retrieve tips while the app list is being fetched
+            tips_task = None
+            if settings.advanced_features.enable_memory and len(settings.features.forced_apps) == 0:
+                from cuga.backend.memory.agentic_memory.utils.memory_tips_formatted import (
+                    prefetch_formatted_tips,
+                )
+
+                tips_task = prefetch_formatted_tips(
+                    namespace_id="memory", agent_id='TaskAnalyzerAgent', query=intent, limit=3
+                )
             apps = await get_apps()
+            if len(apps) == 1 and tips_task is not None:
+                tips_task.cancel()
             if mode == 'api' and len(apps) == 1:
                 return [
                     AnalyzeTaskAppsOutput(
@@ -85,16 +97,7 @@ class TaskAnalyzer(BaseNode):
                 ], AppMatch(relevant_apps=[apps[0].name, web_app_name], thoughts="")
             logger.debug(f"All available apps: {[p for p in apps]}")
             if len(settings.features.forced_apps) == 0:
-                # memory integration
-                rtrvd_tips_formatted = None
-                if settings.advanced_features.enable_memory:
-                    from cuga.backend.memory.agentic_memory.utils.memory_tips_formatted import (
-                        get_formatted_tips,
-                    )
-
-                    rtrvd_tips_formatted = get_formatted_tips(
-                        namespace_id="memory", agent_id='TaskAnalyzerAgent', query=intent, limit=3
-                    )
+                rtrvd_tips_formatted = await tips_task if tips_task is not None else None
                 res: AppMatch = await agent.match_apps_task.ainvoke(
                     input={
                         "inp": {
@@ -175,7 +178,7 @@ class TaskAnalyzer(BaseNode):
         # var_manager.reset()
         if await TaskAnalyzer.should_use_fast_mode_early(state):
             logger.info("Fast mode enabled - checking tool threshold")
-            return Command(update=state.model_dump(), goto="CugaLite")
+            return Command(update=state.model_dump_changes(), goto="CugaLite")
 
         if not settings.features.chat:
             var_manager.reset()
@@ -229,7 +232,7 @@ class TaskAnalyzer(BaseNode):
                             ),
                         )
                     )
-                    return Command(update=state.model_dump(), goto=NodeNames.FINAL_ANSWER_AGENT)
+                    return Command(update=state.model_dump_changes(), goto=NodeNames.FINAL_ANSWER_AGENT)
                 except Exception as e:
                     logger.warning(f"Failed to get all apps: {e}")
                     message = (
@@ -238,7 +241,7 @@ class TaskAnalyzer(BaseNode):
                     )
                     state.final_answer = message
                     state.sender = name
-                    return Command(update=state.model_dump(), goto=NodeNames.FINAL_ANSWER_AGENT)
+                    return Command(update=state.model_dump_changes(), goto=NodeNames.FINAL_ANSWER_AGENT)
             data_representation = json.dumps([p.model_dump() for p in state.api_intent_relevant_apps])
             try:
                 if settings.advanced_features.benchmark == "appworld":
@@ -261,11 +264,11 @@ class TaskAnalyzer(BaseNode):
                 and (state.sites and len(state.sites) == 1)
             ):
                 logger.debug("Intent has implicit locations")
-                return Command(update=state.model_dump(), goto="LocationResolver")
+                return Command(update=state.model_dump_changes(), goto="LocationResolver")
 
-            return Command(update=state.model_dump(), goto="TaskDecompositionAgent")
+            return Command(update=state.model_dump_changes(), goto="TaskDecompositionAgent")
         # We arrived from LocationResolver
         if state.sender == "LocationResolver" and state.task_analyzer_output.resolved_intent:
             state.input = state.task_analyzer_output.resolved_intent
-            return Command(update=state.model_dump(), goto="TaskDecompositionAgent")
-        return Command(update=state.model_dump(), goto="TaskDecompositionAgent")
+            return Command(update=state.model_dump_changes(), goto="TaskDecompositionAgent")
+        return Command(update=state.model_dump_changes(), goto="TaskDecompositionAgent")
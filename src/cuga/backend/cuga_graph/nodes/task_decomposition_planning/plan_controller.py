@@ -101,10 +101,10 @@ class PlanControllerNode(BaseNode):
                     )
                 )
                 if state.sub_task_type == 'web':
-                    return Command(update=state.model_dump(), goto="BrowserPlannerAgent")
+                    return Command(update=state.model_dump_changes(), goto="BrowserPlannerAgent")
                 else:
                     state.api_planner_history = []
-                    return Command(update=state.model_dump(), goto="APIPlannerAgent")
+                    return Command(update=state.model_dump_changes(), goto="APIPlannerAgent")
         state.sender = name
 
         # Else is loop return
@@ -124,7 +124,7 @@ class PlanControllerNode(BaseNode):
                 )
             )
             logger.debug("ignore controller use last planner or api answer")
-            return Command(update=state.model_dump(), goto="FinalAnswerAgent")
+            return Command(update=state.model_dump_changes(), goto="FinalAnswerAgent")
 
         result: AIMessage = await agent.run(state)
         plan_controller_output = PlanControllerOutput(**json.loads(result.content))
@@ -138,7 +138,7 @@ class PlanControllerNode(BaseNode):
             and plan_controller_output.next_subtask == ""
         ):
             state.last_planner_answer = plan_controller_output.conclude_final_answer
-            return Command(update=state.model_dump(), goto="FinalAnswerAgent")
+            return Command(update=state.model_dump_changes(), goto="FinalAnswerAgent")
         else:
             if "open application" in plan_controller_output.next_subtask:
                 app = find_substring(
@@ -153,7 +153,7 @@ class PlanControllerNode(BaseNode):
                         final_answer="The application opened successfully",
                     )
                 )
-                return Command(update=state.model_dump(), goto="InterruptToolNode")
+                return Command(update=state.model_dump_changes(), goto="InterruptToolNode")
 
             # Updates current sub task for UI, API Planners
             state.sub_task = plan_controller_output.next_subtask
@@ -195,7 +195,7 @@ class PlanControllerNode(BaseNode):
                 state.stm_steps_history = []
 
             if plan_controller_output.next_subtask_type == 'web':
-                return Command(update=state.model_dump(), goto="BrowserPlannerAgent")
+                return Command(update=state.model_dump_changes(), goto="BrowserPlannerAgent")
             else:
                 state.api_planner_history = []
-                return Command(update=state.model_dump(), goto="APIPlannerAgent")
+                return Command(update=state.model_dump_changes(), goto="APIPlannerAgent")
@@ -51,22 +51,24 @@ class TaskDecompositionAgent(BaseAgent):
         return result
 
     async def run(self, input_variables: AgentState) -> AIMessage:
-        data = input_variables.model_dump()
-        data["instructions"] = instructions_manager.get_instructions(self.name)
-        data["decomposition_strategy"] = settings.advanced_features.decomposition_strategy
-
-        # memory integration
-        rtrvd_tips_formatted = None
+        # memory integration: retrieve tips while the prompt input is being prepared
+        tips_task = None
         if settings.advanced_features.enable_memory:
-            from cuga.backend.memory.agentic_memory.utils.memory_tips_formatted import get_formatted_tips
+            from cuga.backend.memory.agentic_memory.utils.memory_tips_formatted import (
+                prefetch_formatted_tips,
+            )
 
-            rtrvd_tips_formatted = get_formatted_tips(
+            tips_task = prefetch_formatted_tips(
                 namespace_id="memory",
                 agent_id='TaskDecompositionAgent',
                 query=input_variables.shortlister_query,
                 limit=3,
             )
-        data['memory'] = rtrvd_tips_formatted
+
+        data = input_variables.model_dump()
+        data["instructions"] = instructions_manager.get_instructions(self.name)
+        data["decomposition_strategy"] = settings.advanced_features.decomposition_strategy
+        data['memory'] = await tips_task if tips_task is not None else None
 
         if input_variables.sites is not None and len(input_variables.sites) > 1:
             out = await self.chain_multi.ainvoke(data)
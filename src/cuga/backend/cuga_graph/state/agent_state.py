@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal, Set
 
 from langchain_core.messages import AIMessage, BaseMessage
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from cuga.backend.cuga_graph.nodes.api.api_planner_agent.prompts.load_prompt import ApiDescription
 from cuga.backend.cuga_graph.nodes.human_in_the_loop.followup_model import FollowUpAction, ActionResponse
@@ -42,6 +42,38 @@ class AnalyzeTaskAppsOutput(BaseModel):
     type: Literal['api', 'web'] = 'web'
 
 
+def _fingerprint(value: Any, keep_alive: list, visiting: Optional[Set[int]] = None) -> Any:
+    """
+    Identity-based snapshot of ``value`` and everything nested in it, much cheaper than dumping it.
+
+    Any in-place change (an assigned attribute, a set key, an appended item) at any depth replaces
+    an id somewhere in the snapshot; objects other than models and builtin containers are opaque.
+    """
+    keep_alive.append(value)  # keeps ids from being reused while the snapshot is compared against
+    if isinstance(value, BaseModel):
+        items = value.__dict__.items()
+    elif isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple)):
+        items = enumerate(value)
+    elif isinstance(value, (set, frozenset)):
+        keep_alive.extend(value)
+        return id(value), frozenset(id(item) for item in value)
+    else:
+        return id(value)
+    visiting = visiting if visiting is not None else set()
+    if id(value) in visiting:  # a reference cycle
+        return id(value)
+    visiting.add(id(value))
+    snapshot = id(value), tuple((key, _fingerprint(item, keep_alive, visiting)) for key, item in items)
+    visiting.discard(id(value))
+    return snapshot
+
+
+def _is_container(value: Any) -> bool:
+    return isinstance(value, (BaseModel, dict, list, tuple))
+
+
 class AgentState(BaseModel):
     next: Optional[str] = ""  # The 'next' field indicates where to route to next
     # pages: Annotated[Sequence[str], operator.add]  # List of pages traversed
@@ -87,6 +119,7 @@ class AgentState(BaseModel):
     actions: Optional[str] = ""  # The chosen actions
     url: str  # The URL of the current page
     elements_as_string: Optional[str] = ""
+    page_changes: Optional[str] = ""  # What changed since the previous observation ("delta" representation)
     focused_element_bid: Optional[str] = None
     elements: str = ""  # The elements on the page
     messages: Optional[List[AIMessage]] = Field(
@@ -108,6 +141,59 @@ class AgentState(BaseModel):
     env_policy: List[dict] = Field(default_factory=list)
     tool_call: Optional[dict] = None
 
+    # Fields assigned since the state was built, and fingerprints of its containers at that point,
+    # so nodes can hand LangGraph only what they changed (see ``model_dump_changes``)
+    _dirty_fields: Set[str] = PrivateAttr(default_factory=set)
+    _baseline: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _baseline_refs: List[Any] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, context: Any) -> None:
+        self.mark_clean()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dirty_fields.add(name)
+
+    def mark_clean(self):
+        """Treat the current values as the baseline that later changes are measured against."""
+        self._dirty_fields = set()
+        self._baseline_refs = []
+        self._baseline = {
+            name: _fingerprint(value, self._baseline_refs)
+            for name, value in self.__dict__.items()
+            if _is_container(value)
+        }
+
+    def mark_dirty(self, *names: str):
+        """Flag fields changed in place inside objects the fingerprints can't look into."""
+        self._dirty_fields.update(names)
+
+    def changed_fields(self) -> Set[str]:
+        """Fields that were assigned or mutated in place since the baseline."""
+        changed = set(self._dirty_fields)
+        scratch = []
+        for name, value in self.__dict__.items():
+            if name in changed or not _is_container(value):
+                continue
+            if self._baseline.get(name) != _fingerprint(value, scratch):
+                changed.add(name)
+        return changed
+
+    def model_dump_changes(self) -> Dict[str, Any]:
+        """``model_dump()`` restricted to the changed fields, used as the update of a graph node."""
+        changed = self.changed_fields()
+        return self.model_dump(include=changed) if changed else {}
+
+    @classmethod
+    def from_update(cls, update: Dict[str, Any]) -> "AgentState":
+        """Validate only the fields present in a node update; the others are left unset."""
+        state = cls.model_construct()
+        for name, value in update.items():
+            if name in cls.model_fields:
+                cls.__pydantic_validator__.validate_assignment(state, name, value)
+        return state
+
     # def add_api_output_to_last_step(
     #     self,
     #     output: AgentOutputHistory
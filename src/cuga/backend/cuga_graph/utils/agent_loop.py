@@ -286,7 +286,13 @@ class AgentLoop:
         logger.info("Current Node: {}".format(first_key))
         if first_key == "__interrupt__":
             return StreamEvent(name=str(first_key), data="")
-        state_obj = AgentState(**event[first_key])
+        # Nodes only emit the fields they changed; fall back to the checkpoint for anything else
+        update = event[first_key] or {}
+        needed = {"messages", "previous_steps"} if first_key == "BrowserPlannerAgent" else {"messages"}
+        if needed <= update.keys():
+            state_obj = AgentState.from_update({name: update[name] for name in needed})
+        else:
+            state_obj = self.get_state()
         messages = state_obj.messages
         if messages:
             event_val = messages[-1].content
@@ -325,10 +331,11 @@ class AgentLoop:
             return self.langfuse_handler.last_trace_id
         return None
 
+    def get_state(self) -> AgentState:
+        return AgentState(**self.graph.get_state({"configurable": {"thread_id": self.thread_id}}).values)
+
     def get_output(self, event):
-        state: AgentState = AgentState(
-            **self.graph.get_state({"configurable": {"thread_id": self.thread_id}}).values
-        )
+        state: AgentState = self.get_state()
         msg: AIMessage = state.messages[-1] if len(state.messages) > 0 else None
         logger.info("Calling get output {}".format(",".join(list(event.keys()))))
 
@@ -156,6 +156,7 @@ class AgentRunner:
         state.current_app = get_app_name_from_url(state.url)
         pu_answer = await self.env.pu_processor.transform(transformer_params={"filter_visible_only": False})
         state.elements_as_string = pu_answer.string_representation
+        state.page_changes = pu_answer.delta.to_str() if pu_answer.delta else ""
         state.focused_element_bid = pu_answer.focused_element_bid
         tracker.collect_image(pu_answer.img)
         state.read_page = pu_answer.page_content
@@ -175,6 +176,9 @@ class AgentRunner:
             goal=goal if goal else self.obs['goal'],
         )
         state.sites = sites
+        if self.browser_enabled:
+            # A new task: its first observation is not diffed against the previous task's pages
+            self.env.pu_processor.reset_page_history()
         await self.browser_update_state(state)
         thread_id = "1"
 
@@ -216,7 +220,9 @@ class AgentRunner:
                 if eval_mode and reward == 1.0 or len(tracker.steps) >= settings.evaluation.max_steps:
                     break
                 await self.browser_update_state(state)
-                agent_loop_obj.graph.update_state({"configurable": {"thread_id": thread_id}}, state)
+                agent_loop_obj.graph.update_state(
+                    {"configurable": {"thread_id": thread_id}}, state.model_dump_changes()
+                )
                 agent_response = await agent_loop_obj.run(state=None)
             elif agent_response.end:
                 tracker.final_answer = agent_response.answer
@@ -273,6 +279,9 @@ class AgentRunner:
             goal=goal if goal else self.obs['goal'],
         )
         state.sites = sites
+        if self.browser_enabled:
+            # A new task: its first observation is not diffed against the previous task's pages
+            self.env.pu_processor.reset_page_history()
         await self.browser_update_state(state)
         thread_id = "1"
 
@@ -323,7 +332,9 @@ class AgentRunner:
                         if eval_mode and reward == 1.0 or len(tracker.steps) >= settings.evaluation.max_steps:
                             break  # Break to handle final result outside the loop
                         await self.browser_update_state(state)
-                        agent_loop_obj.graph.update_state({"configurable": {"thread_id": thread_id}}, state)
+                        agent_loop_obj.graph.update_state(
+                            {"configurable": {"thread_id": thread_id}}, state.model_dump_changes()
+                        )
                         # Break out of the async for loop to restart with new agent_response
                         break
                     elif event.end:
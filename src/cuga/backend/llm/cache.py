@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from loguru import logger
+
+from cuga.config import CACHE_DIR, settings
+
+# Message fields that differ between otherwise identical calls (run ids, provider response ids)
+_VOLATILE_MESSAGE_FIELDS = {"id", "response_metadata", "usage_metadata"}
+
+
+def _strip_volatile(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _strip_volatile(v) for k, v in obj.items() if k not in _VOLATILE_MESSAGE_FIELDS}
+    if isinstance(obj, list):
+        return [_strip_volatile(item) for item in obj]
+    return obj
+
+
+def normalize_prompt(prompt: str) -> Any:
+    """Parse LangChain's serialized messages and drop per-call noise so equal prompts share a key."""
+    try:
+        return _strip_volatile(json.loads(prompt))
+    except (TypeError, ValueError):
+        return prompt
+
+
+class LLMResponseCache(BaseCache):
+    """
+    SQLite-backed LangChain response cache used by models handed out by ``LLMManager``.
+
+    Entries are keyed on the normalized messages together with LangChain's ``llm_string`` (model,
+    temperature, max tokens and bound tools / structured-output schema). Each entry also records
+    the hash of the first message (the agent's system prompt), so everything produced by one prompt
+    template can be dropped with ``clear(prefix_key=...)`` when that template changes.
+
+    Entries expire after ``ttl`` seconds (0 = never) and the least recently used ones are evicted
+    beyond ``max_entries``.
+    """
+
+    def __init__(self, path: str, ttl: float = 0, max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, prefix_key TEXT, llm_string TEXT, response TEXT, "
+            "created_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_prefix ON llm_cache (prefix_key)")
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def make_keys(self, prompt: str, llm_string: str) -> tuple:
+        """Return (exact key, prompt-prefix key) for a serialized prompt and model configuration."""
+        messages = normalize_prompt(prompt)
+        exact_key = self._digest({"messages": messages, "llm": llm_string})
+        prefix = messages[0] if isinstance(messages, list) and messages else messages
+        return exact_key, self._digest(prefix)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key, _ = self.make_keys(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        try:
+            return loads(row[0])
+        except Exception as e:
+            logger.warning(f"Dropping unreadable LLM cache entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key, prefix_key = self.make_keys(prompt, llm_string)
+        response = dumps(return_val)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, prefix_key, llm_string, response, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        if self.ttl:
+            self.evictions += self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+        overflow = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self.evictions += self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+
+    def clear(self, prefix_key: Optional[str] = None, **kwargs: Any) -> None:
+        with self._lock:
+            if prefix_key:
+                self._conn.execute("DELETE FROM llm_cache WHERE prefix_key = ?", (prefix_key,))
+            else:
+                self._conn.execute("DELETE FROM llm_cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide response cache, or None unless ``[llm_cache] enabled`` is set."""
+    global _llm_cache
+    if not settings.llm_cache.enabled:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            path = settings.llm_cache.path or os.path.join(CACHE_DIR, "llm_cache.sqlite")
+            _llm_cache = LLMResponseCache(
+                path, ttl=settings.llm_cache.ttl, max_entries=settings.llm_cache.max_entries
+            )
+            logger.info(f"LLM response cache enabled at {path}")
+    return _llm_cache
@@ -9,6 +9,8 @@ from langchain_ibm import ChatWatsonx
 from langchain_core.language_models.chat_models import BaseChatModel
 from loguru import logger
 
+from cuga.backend.llm.cache import get_llm_response_cache
+
 try:
     from langchain_groq import ChatGroq
 except ImportError:
@@ -106,6 +108,18 @@ class LLMManager:
         logger.debug(f"Updated model parameters: temperature={temperature}, max_tokens={max_tokens}")
         return model
 
+    def _attach_response_cache(self, model: BaseChatModel) -> BaseChatModel:
+        """Attach the opt-in response cache (``[llm_cache]`` settings) unless the model has its own"""
+        response_cache = get_llm_response_cache()
+        if response_cache is not None and model.cache is None:
+            model.cache = response_cache
+        return model
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss counters of the response cache, or None when it is disabled"""
+        response_cache = get_llm_response_cache()
+        return response_cache.get_stats() if response_cache is not None else None
+
     def clear_pre_instantiated_model(self) -> None:
         """Clear the pre-instantiated model and return to normal model creation"""
         self._pre_instantiated_model = None
@@ -382,7 +396,7 @@ class LLMManager:
             updated_model = self._update_model_parameters(
                 self._pre_instantiated_model, temperature=0.1, max_tokens=max_tokens
             )
-            return updated_model
+            return self._attach_response_cache(updated_model)
 
         # Get resolved values for logging and cache key
         platform = model_settings.get('platform', 'unknown')
@@ -407,7 +421,7 @@ class LLMManager:
         logger.debug(
             f"Creating new model: {platform}/{model_name} (api_version={api_version}, base_url={base_url})"
         )
-        model = self._create_llm_instance(model_settings)
+        model = self._attach_response_cache(self._create_llm_instance(model_settings))
         self._models[cache_key] = model
 
         # Update parameters for the task
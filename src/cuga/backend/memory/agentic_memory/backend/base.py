@@ -5,7 +5,7 @@ from collections.abc import Generator
 from abc import ABC, abstractmethod
 
 from cuga.backend.memory.agentic_memory.db.sqlite_manager import SQLiteManager
-from cuga.backend.memory.agentic_memory.schema import Fact, RecordedFact, Message, Run, Namespace
+from cuga.backend.memory.agentic_memory.schema import Fact, RecordedFact, Message, Run, Namespace, StepInput
 from cuga.backend.memory.agentic_memory.utils.logging import Logging
 from cuga.backend.memory.agentic_memory.llm.tips.cuga_tips import extract_cuga_tips_from_data
 
@@ -53,6 +53,10 @@ class BaseMemoryBackend(ABC):
     def create_and_store_fact(self, namespace_id: str, fact: Fact) -> str:
         pass
 
+    def store_facts_bulk(self, namespace_id: str, facts: list[Fact], **kwargs) -> list[str]:
+        """Store many facts. Backends with batched embedding override this."""
+        return [self.create_and_store_fact(namespace_id, fact) for fact in facts]
+
     @abstractmethod
     def search_for_facts(
         self, namespace_id: str, query: str | None = None, filters: dict | None = None, limit: int = 10
@@ -79,6 +83,16 @@ class BaseMemoryBackend(ABC):
     def add_step(self, namespace_id: str, run_id: str, step: dict, prompt: str):
         pass
 
+    def add_steps(self, namespace_id: str, run_id: str, steps: list[StepInput]) -> list:
+        """Add steps in order. Backends that can batch the extraction or insert should override this."""
+        return [self.add_step(namespace_id, run_id, item.step, item.prompt) for item in steps]
+
+    def add_steps_bulk(
+        self, namespace_id: str, runs: dict[str, list[StepInput]], **kwargs
+    ) -> dict[str, list]:
+        """Add the steps of many runs (e.g. a backfill). Backends with batched embedding override this."""
+        return {run_id: self.add_steps(namespace_id, run_id, steps) for run_id, steps in runs.items()}
+
     @abstractmethod
     def get_run(self, namespace_id: str, run_id: str) -> Run:
         pass
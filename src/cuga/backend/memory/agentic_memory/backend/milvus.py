@@ -8,7 +8,15 @@ from fastapi import HTTPException
 from cuga.backend.memory.agentic_memory.backend.base import BaseMemoryBackend
 from cuga.backend.memory.agentic_memory.config import milvus_config
 from cuga.backend.memory.agentic_memory.db.sqlite_manager import SQLiteManager
-from cuga.backend.memory.agentic_memory.schema import fact_schema, Fact, RecordedFact, Message, Namespace, Run
+from cuga.backend.memory.agentic_memory.schema import (
+    fact_schema,
+    Fact,
+    RecordedFact,
+    Message,
+    Namespace,
+    Run,
+    StepInput,
+)
 from cuga.backend.memory.agentic_memory.utils.fact_extraction import process_messages
 from cuga.backend.memory.agentic_memory.utils.logging import Logging
 from cuga.backend.memory.agentic_memory.utils.utils import (
@@ -20,6 +28,9 @@ from collections.abc import Generator
 
 logger = Logging.get_logger()
 
+# LLM calls per step before giving up on parsing its extraction as JSON
+EXTRACTION_ATTEMPTS = 3
+
 
 class MilvusMemoryBackend(BaseMemoryBackend):
     milvus = get_milvus_client()
@@ -151,16 +162,9 @@ class MilvusMemoryBackend(BaseMemoryBackend):
     def add_step(self, namespace_id: str, run_id: str, step: dict, prompt: str):
         self.validate_namespace(namespace_id)
         llm = get_chat_model(milvus_config.step_processing)
-        messages = [
-            {
-                "role": "system",
-                "content": prompt
-                + '\n\nHere is the actual step you are working on:\n'
-                + json.dumps(step, indent=4),
-            }
-        ]
+        messages = self._step_messages(step, prompt)
 
-        for attempt in range(3):
+        for attempt in range(EXTRACTION_ATTEMPTS):
             extraction = llm.invoke(messages).content
             try:
                 parsed_extraction = json.loads(extraction)
@@ -187,6 +191,119 @@ class MilvusMemoryBackend(BaseMemoryBackend):
         else:
             raise HTTPException(status_code=500, detail="Unable to add step.")
 
+    def add_steps(self, namespace_id: str, run_id: str, steps: list[StepInput]) -> list[str]:
+        return self.add_steps_bulk(namespace_id, {run_id: steps})[run_id]
+
+    def add_steps_bulk(
+        self,
+        namespace_id: str,
+        runs: dict[str, list[StepInput]],
+        max_concurrency: int = 8,
+        encode_batch_size: int = 64,
+        insert_chunk_size: int = 512,
+    ) -> dict[str, list[str]]:
+        """Add the steps of many runs at once.
+
+        The LLM extractions run concurrently (at most ``max_concurrency`` at a time, failed parses
+        are retried), all summaries are embedded together and the rows are inserted in chunks.
+        Steps whose extraction never parses are skipped and logged; the ids of the inserted steps
+        are returned per run, in step order.
+        """
+        self.validate_namespace(namespace_id)
+        items = [(run_id, item) for run_id, steps in runs.items() for item in steps]
+        extractions = self._extract_steps(
+            [self._step_messages(item.step, item.prompt) for _, item in items], max_concurrency
+        )
+
+        rows, row_runs = [], []
+        for (run_id, item), parsed_extraction in zip(items, extractions):
+            if parsed_extraction is None:
+                logger.warning(f"Skipping a step of run {run_id}: unable to parse the LLM extraction")
+                continue
+            rows.append(
+                {
+                    'content': parsed_extraction['summary'],
+                    'metadata': {**parsed_extraction, 'run_id': run_id, 'step': item.step},
+                }
+            )
+            row_runs.append(run_id)
+
+        ids = self._insert_rows(namespace_id, rows, encode_batch_size, insert_chunk_size)
+        added: dict[str, list[str]] = {run_id: [] for run_id in runs}
+        for run_id, step_id in zip(row_runs, ids):
+            added[run_id].append(step_id)
+        return added
+
+    def store_facts_bulk(
+        self,
+        namespace_id: str,
+        facts: list[Fact],
+        encode_batch_size: int = 64,
+        insert_chunk_size: int = 512,
+    ) -> list[str]:
+        """Store many facts with one batched embedding pass and chunked inserts."""
+        self.validate_namespace(namespace_id)
+        rows = []
+        for fact in facts:
+            fact_data = fact.model_dump()
+            if fact_data.get('metadata') is None:
+                fact_data['metadata'] = {}
+            rows.append(fact_data)
+        return self._insert_rows(namespace_id, rows, encode_batch_size, insert_chunk_size)
+
+    @staticmethod
+    def _step_messages(step: dict, prompt: str) -> list[dict]:
+        return [
+            {
+                "role": "system",
+                "content": prompt
+                + '\n\nHere is the actual step you are working on:\n'
+                + json.dumps(step, indent=4),
+            }
+        ]
+
+    def _extract_steps(self, messages: list[list[dict]], max_concurrency: int) -> list[dict | None]:
+        """Run the step extraction prompts concurrently, retrying only the ones that didn't parse."""
+        llm = get_chat_model(milvus_config.step_processing)
+        results: list[dict | None] = [None] * len(messages)
+        pending = list(range(len(messages)))
+        for attempt in range(EXTRACTION_ATTEMPTS):
+            if not pending:
+                break
+            outputs = llm.batch(
+                [messages[i] for i in pending],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+            failed = []
+            for i, output in zip(pending, outputs):
+                try:
+                    results[i] = json.loads(output.content)
+                except (AttributeError, TypeError, JSONDecodeError):
+                    failed.append(i)
+            pending = failed
+        return results
+
+    def _insert_rows(
+        self, namespace_id: str, rows: list[dict], encode_batch_size: int, insert_chunk_size: int
+    ) -> list[str]:
+        if not rows:
+            return []
+        # One vectorized pass over all contents instead of one encode call per row
+        embeddings = self.embedding_model.encode(
+            [row['content'] for row in rows], batch_size=encode_batch_size, convert_to_numpy=True
+        )
+        ids = []
+        for start in range(0, len(rows), insert_chunk_size):
+            chunk = [
+                {**row, 'embedding': embedding}
+                for row, embedding in zip(
+                    rows[start : start + insert_chunk_size], embeddings[start : start + insert_chunk_size]
+                )
+            ]
+            ids.extend(str(i) for i in self.milvus.insert(collection_name=namespace_id, data=chunk)['ids'])
+        return ids
+
     def get_run(self, namespace_id: str, run_id: str) -> Run:
         self.validate_namespace(namespace_id)
         steps = [
@@ -0,0 +1,140 @@
+"""
+Backfill agentic memory from the trajectories saved under ``TRAJECTORY_DATA_DIR``.
+
+Every ``<experiment>/<task>.json`` trajectory (with its ``.jsonl`` segment) becomes one run. Runs
+are ingested in batches through the backend's bulk API, so step extraction runs concurrently and
+embeddings and inserts are batched. A batch's runs are recorded as open before its steps are added
+and ended once they are all in, so an interrupted backfill can simply be restarted: ended runs are
+skipped, and runs left open are deleted and ingested again. With ``end_runs=False`` the runs are
+only recorded after their steps are in, and every recorded run is skipped.
+"""
+
+import asyncio
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from cuga.backend.activity_tracker.trajectory_writer import SEGMENT_SUFFIX, load_trajectory
+from cuga.backend.memory.agentic_memory.backend.base import BaseMemoryBackend
+from cuga.backend.memory.agentic_memory.db.sqlite_manager import SQLiteManager
+from cuga.backend.memory.agentic_memory.schema import StepInput
+from cuga.backend.memory.agentic_memory.utils.logging import Logging
+from cuga.backend.memory.agentic_memory.utils.prompts import prompts
+
+logger = Logging.get_logger()
+
+
+@dataclass
+class BackfillStats:
+    runs: int = 0
+    skipped_runs: int = 0
+    steps: int = 0
+    failed_runs: list[str] = field(default_factory=list)
+
+
+def get_memory_backend() -> BaseMemoryBackend:
+    """The backend configured by ``features.memory_provider``, created in-process."""
+    from cuga.config import settings
+
+    if settings.features.memory_provider == "milvus":
+        from cuga.backend.memory.agentic_memory.backend.milvus import MilvusMemoryBackend
+
+        return MilvusMemoryBackend()
+    from cuga.backend.memory.agentic_memory.backend.mem0_backend import Mem0MemoryBackend
+
+    return Mem0MemoryBackend()
+
+
+def iter_trajectory_files(root: str) -> Iterator[str]:
+    """Paths of the ``<task>.json`` trajectories under ``root``, including ones only in a segment."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        stems = {os.path.splitext(name)[0] for name in filenames if name.endswith((".json", SEGMENT_SUFFIX))}
+        for stem in sorted(stems):
+            yield os.path.join(dirpath, f"{stem}.json")
+
+
+def trajectory_run_id(root: str, path: str) -> str:
+    """Stable run id derived from the trajectory's path relative to ``root``."""
+    relative = os.path.splitext(os.path.relpath(path, root))[0]
+    return "backfill_" + re.sub(r"[^a-zA-Z0-9_]", "_", relative)
+
+
+def trajectory_steps(trajectory: dict) -> list[StepInput]:
+    """The steps as ``ActivityTracker.collect_step`` sends them live: without prompts or screenshots."""
+    return [
+        StepInput(step={**step, "prompts": [], "image_before": ""}, prompt=prompts[step.get("name")])
+        for step in trajectory.get("steps", [])
+        if isinstance(step, dict)
+    ]
+
+
+def backfill(
+    backend: BaseMemoryBackend,
+    namespace_id: str,
+    root: str,
+    runs_per_batch: int = 32,
+    max_concurrency: int = 8,
+    end_runs: bool = True,
+    analyze: bool = False,
+) -> BackfillStats:
+    """Ingest every trajectory under ``root`` into ``namespace_id``, ``runs_per_batch`` runs at a time."""
+    stats = BackfillStats()
+    batch: dict[str, list[StepInput]] = {}
+    with SQLiteManager() as db_manager:
+        existing = {run.id for run in db_manager.all_runs(namespace_id)}
+        complete = {run.id for run in db_manager.all_runs(namespace_id, ended=True)} if end_runs else existing
+
+    def ingest():
+        try:
+            # Steps of runs an earlier backfill left open would otherwise be ingested twice
+            for run_id in existing.intersection(batch):
+                backend.delete_run(namespace_id, run_id)
+            if end_runs:
+                with SQLiteManager() as db_manager:
+                    db_manager.create_runs(namespace_id, batch)
+            added = backend.add_steps_bulk(namespace_id, batch, max_concurrency=max_concurrency)
+        except Exception as e:
+            logger.error(f"Failed to ingest {len(batch)} runs: {e}")
+            stats.failed_runs.extend(batch)
+            # Drop the half-ingested runs so that the next backfill picks them up again
+            for run_id in batch:
+                try:
+                    backend.delete_run(namespace_id, run_id)
+                except Exception as cleanup_error:
+                    logger.warning(f"Failed to delete run {run_id}: {cleanup_error}")
+            return
+        with SQLiteManager() as db_manager:
+            if end_runs:
+                db_manager.end_runs(namespace_id, added)
+            else:
+                db_manager.create_runs(namespace_id, added)
+        for run_id, step_ids in added.items():
+            stats.runs += 1
+            stats.steps += len(step_ids)
+            if analyze:
+                asyncio.run(backend.analyze_run(namespace_id=namespace_id, run_id=run_id))
+        logger.info(f"Backfilled {stats.runs} runs ({stats.steps} steps)")
+
+    for path in iter_trajectory_files(root):
+        run_id = trajectory_run_id(root, path)
+        if run_id in complete:
+            stats.skipped_runs += 1
+            continue
+        try:
+            trajectory = load_trajectory(path)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable trajectory {path}: {e}")
+            continue
+        steps = trajectory_steps(trajectory or {})
+        if not steps:
+            continue
+
+        batch[run_id] = steps
+        if len(batch) >= runs_per_batch:
+            ingest()
+            batch = {}
+    if batch:
+        ingest()
+    return stats
@@ -3,6 +3,9 @@ V1 Memory Client for Self-Hosted Service
 This client interfaces with the self-hosted Memory v1 API endpoints.
 """
 
+import asyncio
+import weakref
+
 import httpx
 from typing import List, Dict, Optional, Any
 
@@ -39,13 +42,19 @@ class V1MemoryClient:
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
 
+        self._headers = headers
+        self._timeout = httpx.Timeout(timeout, connect=10.0)  # configurable timeout, 10s connect timeout
+
         # Initialize httpx client with headers and timeout configuration
         self.client = httpx.Client(
             base_url=self.base_url,
             headers=headers,
-            timeout=httpx.Timeout(timeout, connect=10.0),  # configurable timeout, 10s connect timeout
+            timeout=self._timeout,
             transport=httpx.HTTPTransport(retries=3),
         )
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     def __enter__(self):
         """Context manager entry."""
@@ -60,6 +69,12 @@ class V1MemoryClient:
         if hasattr(self, 'client'):
             self.client.close()
 
+    async def aclose(self):
+        """Close the async client opened on the running event loop, if any."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Any:
         """
         Make a request to the Memory v1 service.
@@ -78,36 +93,63 @@ class V1MemoryClient:
             FactNotFoundException: If fact is not found (404)
         """
         try:
-            response = self.client.request(method, endpoint, **kwargs)
-
-            # Handle specific error cases
-            if response.status_code == 404:
-                if '/namespaces/' in endpoint and '/facts/' in endpoint:
-                    raise FactNotFoundException(f"Fact not found: {endpoint}")
-                elif '/namespaces/' in endpoint:
-                    raise NamespaceNotFoundException(f"Namespace not found: {endpoint}")
-
-            response.raise_for_status()
-
-            # Handle different response types
-            if response.status_code == 204:  # No content
-                return None
+            return self._parse_response(self.client.request(method, endpoint, **kwargs), endpoint)
+        except Exception as e:
+            self._raise_request_error(e)
 
-            # Try to parse as JSON, fall back to text
-            try:
-                return response.json()
-            except ValueError:
-                return response.text
+    async def _amake_request(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Async counterpart of ``_make_request``, sharing a pooled ``httpx.AsyncClient`` per event loop."""
+        try:
+            response = await self._get_async_client().request(method, endpoint, **kwargs)
+            return self._parse_response(response, endpoint)
+        except Exception as e:
+            self._raise_request_error(e)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # Async connections belong to the loop that opened them, so keep one pool per loop
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                timeout=self._timeout,
+                transport=httpx.AsyncHTTPTransport(retries=3),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _parse_response(response: httpx.Response, endpoint: str) -> Any:
+        # Handle specific error cases
+        if response.status_code == 404:
+            if '/namespaces/' in endpoint and '/facts/' in endpoint:
+                raise FactNotFoundException(f"Fact not found: {endpoint}")
+            elif '/namespaces/' in endpoint:
+                raise NamespaceNotFoundException(f"Namespace not found: {endpoint}")
+
+        response.raise_for_status()
+
+        # Handle different response types
+        if response.status_code == 204:  # No content
+            return None
+
+        # Try to parse as JSON, fall back to text
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
 
-        except httpx.RequestError as e:
+    @staticmethod
+    def _raise_request_error(e: Exception):
+        if isinstance(e, (NamespaceNotFoundException, FactNotFoundException)):
+            # Re-raise these specific exceptions as-is
+            raise e
+        if isinstance(e, httpx.RequestError):
             raise APIRequestException(f"Memory v1 API request failed: {e}")
-        except httpx.HTTPStatusError as e:
+        if isinstance(e, httpx.HTTPStatusError):
             raise APIRequestException(f"Memory v1 API returned error status {e.response.status_code}: {e}")
-        except (NamespaceNotFoundException, FactNotFoundException):
-            # Re-raise these specific exceptions as-is
-            raise
-        except Exception as e:
-            raise APIRequestException(f"Unexpected error during Memory v1 API request: {e}")
+        raise APIRequestException(f"Unexpected error during Memory v1 API request: {e}")
 
     def health_check(self) -> bool:
         """
@@ -240,6 +282,21 @@ class V1MemoryClient:
         # Convert raw dicts to RecordedFact objects
         return [RecordedFact.model_validate(fact) for fact in results]
 
+    async def asearch_for_facts(
+        self, namespace_id: str, query: Optional[str] = None, filters: dict | None = None, limit: int = 10
+    ) -> List[RecordedFact]:
+        """
+        Async version of ``search_for_facts`` for use inside agent nodes.
+        """
+        json = {k: v for k, v in {"query": query, "filters": filters}.items() if v is not None}
+        params = {"limit": limit}
+
+        results = await self._amake_request(
+            "POST", f"/v1/namespaces/{namespace_id}/facts", json=json, params=params
+        )
+
+        return [RecordedFact.model_validate(fact) for fact in results]
+
     def get_all_facts(
         self, namespace_id: str, filters: dict | None = None, limit: int = 100
     ) -> List[RecordedFact]:
@@ -395,6 +452,21 @@ class V1MemoryClient:
             },
         )
 
+    def add_steps(self, namespace_id: str, run_id: str, steps: list[dict]) -> list[str]:
+        """
+        Save the results of several steps into memory with a single request
+        Args:
+            namespace_id: The namespace containing the run
+            run_id: The ID of the run
+            steps: Dictionaries with a ``step`` and a ``prompt`` key, in the order they happened
+        Returns:
+        """
+        return self._make_request(
+            "POST",
+            f"/v1/namespaces/{namespace_id}/runs/{run_id}/steps/batch",
+            json={"steps": steps},
+        )
+
     def search_runs(
         self, namespace_id: str, query: str | None = None, filters: dict[str, str] | None = None
     ) -> Run | None:
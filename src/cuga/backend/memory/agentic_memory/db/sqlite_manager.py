@@ -1,60 +1,179 @@
 import datetime
 import logging
 import os
+import queue
 import sqlite3
 import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 
 from cuga.backend.memory.agentic_memory.schema import Namespace, Run
 from cuga.config import DBS_DIR
 
 logger = logging.getLogger(__name__)
 
+# Idle connections kept open per database file; more are opened under load and closed when returned
+POOL_SIZE = 8
+# Prepared statements sqlite3 keeps per connection, so pooled connections reuse them across requests
+STATEMENT_CACHE_SIZE = 256
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS namespaces (
+        id           TEXT PRIMARY KEY,
+        created_at   TIMESTAMP NOT NULL,
+        user_id      TEXT,
+        agent_id     TEXT,
+        app_id       TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        namespace_id TEXT NOT NULL,
+        id           TEXT NOT NULL,
+        created_at   TIMESTAMP NOT NULL,
+        ended        BOOLEAN NOT NULL,
+
+        PRIMARY KEY (namespace_id, id),
+        FOREIGN KEY (namespace_id) REFERENCES namespaces (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS runs_namespace_ended ON runs (namespace_id, ended)",
+)
+
+INSERT_NAMESPACE = "INSERT INTO namespaces (id, created_at, user_id, agent_id, app_id) VALUES (?, ?, ?, ?, ?)"
+INSERT_RUN = "INSERT INTO runs (namespace_id, id, created_at, ended) VALUES (?, ?, ?, ?)"
+SELECT_NAMESPACE = "SELECT id, created_at, user_id, agent_id, app_id FROM namespaces WHERE id = ?"
+SELECT_ALL_NAMESPACES = "SELECT id, created_at, user_id, agent_id, app_id FROM namespaces ORDER BY id ASC"
+SELECT_RUN = "SELECT namespace_id, id, created_at, ended FROM runs WHERE namespace_id = ? AND id = ?"
+SELECT_RUNS = "SELECT namespace_id, id, created_at, ended FROM runs WHERE namespace_id = ? ORDER BY id ASC"
+SELECT_RUNS_BY_ENDED = "SELECT namespace_id, id, created_at, ended FROM runs WHERE namespace_id = ? AND ended = ? ORDER BY id ASC"
+END_RUN = "UPDATE runs SET ended = ? WHERE namespace_id = ? AND id = ?"
+DELETE_NAMESPACE = "DELETE FROM namespaces WHERE id = ?"
+DELETE_RUN = "DELETE FROM runs WHERE namespace_id = ? AND id = ?"
+
+
+class _ConnectionPool:
+    """Open connections to one database file, shared by every ``SQLiteManager`` in the process."""
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Ensure parent directory exists
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        except Exception:
+            pass
+        # Autocommit mode: transactions are opened explicitly by SQLiteManager._transaction
+        connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        # WAL lets readers run while a write is in progress
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    create_schema(connection)
+                    self._schema_ready = True
+        return connection
+
+    def release(self, connection: sqlite3.Connection):
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.put_nowait(connection)
+        except (queue.Full, sqlite3.Error):
+            connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: dict[str, _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(db_path: str) -> _ConnectionPool:
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _ConnectionPool(db_path)
+        return pool
+
+
+def close_connection_pools():
+    """Close every idle pooled connection (connections in use are closed when they are returned)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def create_schema(connection: sqlite3.Connection):
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.execute("COMMIT")
+    except Exception as e:
+        connection.execute("ROLLBACK")
+        logger.error(f"Failed to create tables: {e}")
+        raise
+
 
 class SQLiteManager:
-    """A database for any resources that can't be generalized across backends."""
+    """A database for any resources that can't be generalized across backends.
+
+    Entering the context borrows a pooled connection (WAL journaling, prepared statement cache)
+    and leaving it returns the connection, so short-lived managers don't reopen the file.
+    """
 
     def __init__(self, db_path: str = os.path.join(DBS_DIR, 'agentic.db')):
         self.db_path = db_path
+        self.connection: sqlite3.Connection | None = None
+        self._pool: _ConnectionPool | None = None
+        self._lock = threading.RLock()
 
-    def _create_namespace_table(self):
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front instead of failing when a read transaction upgrades
         with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
             try:
-                self.connection.execute("BEGIN")
-                self.connection.execute("""
-                    CREATE TABLE IF NOT EXISTS namespaces (
-                        id           TEXT PRIMARY KEY,
-                        created_at   TIMESTAMP NOT NULL,
-                        user_id      TEXT,
-                        agent_id     TEXT,
-                        app_id       TEXT
-                    )
-                """)
-                self.connection.execute("COMMIT")
-            except Exception as e:
+                yield self.connection
+            except BaseException:
                 self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to create namespaces table: {e}")
                 raise
+            self.connection.execute("COMMIT")
 
-    def _create_run_table(self):
+    def _fetch(self, row_factory, sql: str, params: tuple, one: bool = False):
         with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute("""
-                    CREATE TABLE IF NOT EXISTS runs (
-                        namespace_id TEXT NOT NULL,
-                        id           TEXT NOT NULL,
-                        created_at   TIMESTAMP NOT NULL,
-                        ended        BOOLEAN NOT NULL,
-                        
-                        PRIMARY KEY (namespace_id, id),
-                        FOREIGN KEY (namespace_id) REFERENCES namespaces (id)
-                    )
-                """)
-                self.connection.execute("COMMIT")
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to create runs table: {e}")
-                raise
+            cursor: sqlite3.Cursor = self.connection.cursor()
+            cursor.row_factory = row_factory
+            cursor.execute(sql, params)
+            return cursor.fetchone() if one else cursor.fetchall()
 
     def create_namespace(
         self,
@@ -64,31 +183,14 @@ class SQLiteManager:
         app_id: str | None = None,
     ) -> Namespace:
         created_at = datetime.datetime.now(datetime.timezone.utc)
-        with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute(
-                    """
-                    INSERT INTO namespaces (
-                        id, created_at, user_id, agent_id, app_id
-                    )
-                    VALUES (?, ?, ?, ?, ?)
-                """,
-                    (
-                        namespace_id,
-                        created_at,
-                        user_id,
-                        agent_id,
-                        app_id,
-                    ),
-                )
-                self.connection.execute("COMMIT")
-            except sqlite3.IntegrityError as e:
-                raise RuntimeError(f'Namespace "{namespace_id}" already exists.') from e
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to create namespace: {e}")
-                raise
+        try:
+            with self._transaction() as connection:
+                connection.execute(INSERT_NAMESPACE, (namespace_id, created_at, user_id, agent_id, app_id))
+        except sqlite3.IntegrityError as e:
+            raise RuntimeError(f'Namespace "{namespace_id}" already exists.') from e
+        except Exception as e:
+            logger.error(f"Failed to create namespace: {e}")
+            raise
         return Namespace(
             id=namespace_id,
             created_at=created_at,
@@ -102,84 +204,39 @@ class SQLiteManager:
         namespace_id: str,
         run_id: str,
     ) -> Run:
+        return self.create_runs(namespace_id, [run_id])[0]
+
+    def create_runs(self, namespace_id: str, run_ids: Iterable[str]) -> list[Run]:
+        """Create several runs in a single transaction."""
+        run_ids = list(run_ids)
         created_at = datetime.datetime.now(datetime.timezone.utc)
-        with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute(
-                    """
-                    INSERT INTO runs (
-                        namespace_id, id, created_at, ended
-                    )
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (namespace_id, run_id, created_at, False),
+        try:
+            with self._transaction() as connection:
+                connection.executemany(
+                    INSERT_RUN, [(namespace_id, run_id, created_at, False) for run_id in run_ids]
                 )
-                self.connection.execute("COMMIT")
-            except sqlite3.IntegrityError as e:
-                raise RuntimeError(f'Run "{run_id}" already exists.') from e
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to create run: {e}")
-                raise
-        return Run(id=run_id, created_at=created_at, steps=[], ended=False)
+        except sqlite3.IntegrityError as e:
+            existing = run_ids[0] if len(run_ids) == 1 else ', '.join(run_ids)
+            raise RuntimeError(f'Run "{existing}" already exists.') from e
+        except Exception as e:
+            logger.error(f"Failed to create run: {e}")
+            raise
+        return [Run(id=run_id, created_at=created_at, steps=[], ended=False) for run_id in run_ids]
 
     def get_namespace(self, namespace_id: str) -> Namespace | None:
-        with self._lock:
-            cursor: sqlite3.Cursor = self.connection.cursor()
-            cursor.row_factory = Namespace.row_factory
-            cursor.execute(
-                """
-                    SELECT id, created_at, user_id, agent_id, app_id
-                    FROM namespaces
-                    WHERE id = ?
-                """,
-                (namespace_id,),
-            )
-            return cursor.fetchone()
+        return self._fetch(Namespace.row_factory, SELECT_NAMESPACE, (namespace_id,), one=True)
 
     def get_run(self, namespace_id: str, run_id: str) -> Run | None:
-        with self._lock:
-            cursor: sqlite3.Cursor = self.connection.cursor()
-            cursor.row_factory = Run.row_factory
-            cursor.execute(
-                """
-                    SELECT namespace_id, id, created_at, ended
-                    FROM runs
-                    WHERE namespace_id = ? AND id = ?
-                """,
-                (
-                    namespace_id,
-                    run_id,
-                ),
-            )
-            return cursor.fetchone()
+        return self._fetch(Run.row_factory, SELECT_RUN, (namespace_id, run_id), one=True)
 
     def all_namespaces(self) -> list[Namespace]:
-        with self._lock:
-            cursor: sqlite3.Cursor = self.connection.cursor()
-            cursor.row_factory = Namespace.row_factory
-            cursor.execute("""
-                SELECT id, created_at, user_id, agent_id, app_id
-                FROM namespaces
-                ORDER BY id ASC
-            """)
-            return cursor.fetchall()
-
-    def all_runs(self, namespace_id: str) -> list[Run]:
-        with self._lock:
-            cursor: sqlite3.Cursor = self.connection.cursor()
-            cursor.row_factory = Run.row_factory
-            cursor.execute(
-                """
-                    SELECT namespace_id, id, created_at, ended
-                    FROM runs
-                    WHERE namespace_id = ?
-                    ORDER BY id ASC
-                """,
-                (namespace_id,),
-            )
-            return cursor.fetchall()
+        return self._fetch(Namespace.row_factory, SELECT_ALL_NAMESPACES, ())
+
+    def all_runs(self, namespace_id: str, ended: bool | None = None) -> list[Run]:
+        """Runs of a namespace, optionally only the ended (or still open) ones."""
+        if ended is None:
+            return self._fetch(Run.row_factory, SELECT_RUNS, (namespace_id,))
+        return self._fetch(Run.row_factory, SELECT_RUNS_BY_ENDED, (namespace_id, ended))
 
     def search_namespaces(
         self,
@@ -193,84 +250,52 @@ class SQLiteManager:
             for k, v in {"user_id": user_id, "agent_id": agent_id, "app_id": app_id}.items()
             if v is not None
         }
-        sql = ' AND '.join([f"{k} = ?" for k, v in query.keys()])
-        params = list(query.values()) + [limit]
+        sql = ' AND '.join([f"{k} = ?" for k in query.keys()])
+        params = tuple(query.values()) + (limit,)
         if not sql:
             raise ValueError('At least one of the parameters must not be `None`.')
-        with self._lock:
-            cursor: sqlite3.Cursor = self.connection.cursor()
-            cursor.row_factory = Namespace.row_factory
-            cursor = self.connection.execute(
-                f"""
-                    SELECT id, created_at, user_id, agent_id, app_id
-                    FROM namespaces
-                    WHERE {sql}
-                    LIMIT ?
-                """,
-                params,
-            )
-            return cursor.fetchall()
+        return self._fetch(
+            Namespace.row_factory,
+            f"SELECT id, created_at, user_id, agent_id, app_id FROM namespaces WHERE {sql} LIMIT ?",
+            params,
+        )
 
     def end_run(self, namespace_id: str, run_id: str):
-        with self._lock:
-            self.connection.execute("BEGIN")
-            self.connection.execute(
-                "UPDATE runs SET ended = ? WHERE namespace_id = ? AND id = ?",
-                (
-                    True,
-                    namespace_id,
-                    run_id,
-                ),
-            )
-            self.connection.execute("COMMIT")
+        self.end_runs(namespace_id, [run_id])
+
+    def end_runs(self, namespace_id: str, run_ids: Iterable[str]):
+        """Mark several runs ended in a single transaction."""
+        with self._transaction() as connection:
+            connection.executemany(END_RUN, [(True, namespace_id, run_id) for run_id in run_ids])
 
     def delete_namespace(self, namespace_id: str):
-        with self._lock:
-            self.connection.execute("BEGIN")
-            self.connection.execute("DELETE FROM namespaces WHERE id = ?", (namespace_id,))
-            self.connection.execute("COMMIT")
+        with self._transaction() as connection:
+            connection.execute(DELETE_NAMESPACE, (namespace_id,))
 
     def delete_run(self, namespace_id: str, run_id: str):
-        with self._lock:
-            self.connection.execute("BEGIN")
-            self.connection.execute(
-                "DELETE FROM runs WHERE namespace_id = ? AND id = ?",
-                (
-                    namespace_id,
-                    run_id,
-                ),
-            )
-            self.connection.execute("COMMIT")
+        with self._transaction() as connection:
+            connection.execute(DELETE_RUN, (namespace_id, run_id))
 
     def reset(self) -> None:
         """Drop and recreate every table."""
-        with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute("DROP TABLE IF EXISTS namespaces")
-                self.connection.execute("DROP TABLE IF EXISTS runs")
-                self.connection.execute("COMMIT")
-                self._create_namespace_table()
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to reset tables: {e}")
-                raise
+        try:
+            with self._transaction() as connection:
+                connection.execute("DROP TABLE IF EXISTS namespaces")
+                connection.execute("DROP TABLE IF EXISTS runs")
+        except Exception as e:
+            logger.error(f"Failed to reset tables: {e}")
+            raise
+        create_schema(self.connection)
 
     def close(self) -> None:
-        if self.connection:
-            self.connection.close()
+        """Return the connection to the pool."""
+        if getattr(self, "connection", None) is not None:
+            self._pool.release(self.connection)
             self.connection = None
 
     def __enter__(self) -> "SQLiteManager":
-        # Ensure parent directory exists
-        try:
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        except Exception:
-            pass
-        self.connection: sqlite3.Connection = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._lock = threading.Lock()
-        self._create_namespace_table()
-        self._create_run_table()
+        self._pool = _get_pool(self.db_path)
+        self.connection = self._pool.acquire()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
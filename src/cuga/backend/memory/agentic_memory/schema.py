@@ -60,6 +60,13 @@ class Message(BaseModel):
     content: str = Field(description='The actual message.')
 
 
+class StepInput(BaseModel):
+    """A step to be recorded into a run, together with the prompt used to parse it."""
+
+    step: dict = Field(description='The step, an arbitrary JSON object.')
+    prompt: str = Field(description='The prompt used by an LLM to parse a step.')
+
+
 class Namespace(BaseModel):
     """Details of a namespace containing memories."""
 
@@ -1,25 +1,115 @@
+import asyncio
 import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
 from langchain_core.prompts import PromptTemplate
 from cuga.backend.memory.memory import Memory
+from cuga.config import settings
+
+TIPS_INCLUSION_PROMPT = os.path.join(os.path.dirname(__file__), "../llm/tips/prompts/tips_inclusion.jinja2")
+
+TipsKey = Tuple[str, str, Optional[str], int]
+
+
+class _TipsCache:
+    """Formatted tips per (namespace, agent, query, limit), kept for ``ttl`` seconds (0 disables)."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[TipsKey, Tuple[float, Optional[str]]]" = OrderedDict()
+
+    def get(self, key: TipsKey) -> Tuple[bool, Optional[str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def put(self, key: TipsKey, tips_str: Optional[str]):
+        if not self.ttl:
+            return
+        self._entries[key] = (time.monotonic(), tips_str)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_tips_cache = _TipsCache(settings.memory_tips.cache_ttl, settings.memory_tips.cache_max_entries)
+# Retrievals in progress, so concurrent requests for the same tips share one HTTP call
+_in_flight: Dict[TipsKey, "asyncio.Task[Optional[str]]"] = {}
+
+
+@lru_cache(maxsize=1)
+def _tips_inclusion_template() -> PromptTemplate:
+    return PromptTemplate.from_file(TIPS_INCLUSION_PROMPT, template_format="jinja2", encoding='utf-8')
+
+
+def _format_tips(rtrvd_tips: List[str]) -> Optional[str]:
+    if len(rtrvd_tips) == 0:
+        return None
+    return _tips_inclusion_template().format(tips=rtrvd_tips)
 
 
 def get_formatted_tips(namespace_id: str, agent_id: str, query: str, limit: int):
     """
     Fetch the tips for a given query for a specific agent and return a formatted string that can directly be embedded in existing prompt.
     """
-    tips_str = None
+    key = (namespace_id, agent_id, query, limit)
+    hit, tips_str = _tips_cache.get(key)
+    if hit:
+        return tips_str
 
-    memory = Memory()
-    rtrvd_tips = memory.get_matching_tips(
+    rtrvd_tips = Memory().get_matching_tips(
         namespace_id=namespace_id, agent_id=agent_id, query=query, limit=limit
     )
+    tips_str = _format_tips(rtrvd_tips)
+    _tips_cache.put(key, tips_str)
+    return tips_str
+
+
+async def aget_formatted_tips(namespace_id: str, agent_id: str, query: str, limit: int) -> Optional[str]:
+    """
+    Async version of ``get_formatted_tips`` for agent nodes: it does not block the event loop, reuses
+    recently retrieved tips and joins a retrieval of the same tips that is already running.
+    """
+    key = (namespace_id, agent_id, query, limit)
+    hit, tips_str = _tips_cache.get(key)
+    if hit:
+        return tips_str
 
-    if len(rtrvd_tips) > 0:
-        current_dir = os.path.dirname(__file__)
-        prompt_file = os.path.join(current_dir, "../llm/tips/prompts/tips_inclusion.jinja2")
-        tips_inclusion_inst = PromptTemplate.from_file(
-            prompt_file, template_format="jinja2", encoding='utf-8'
+    task = _in_flight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_retrieve_tips(key))
+        _in_flight[key] = task
+        task.add_done_callback(
+            lambda done: _in_flight.pop(key, None) if _in_flight.get(key) is done else None
         )
-        prompt_input = {"tips": rtrvd_tips}
-        tips_str = tips_inclusion_inst.format(**prompt_input)
+    # One caller being cancelled must not cancel the retrieval for the others
+    return await asyncio.shield(task)
+
+
+async def _retrieve_tips(key: TipsKey) -> Optional[str]:
+    namespace_id, agent_id, query, limit = key
+    rtrvd_tips = await Memory().aget_matching_tips(
+        namespace_id=namespace_id, agent_id=agent_id, query=query, limit=limit
+    )
+    tips_str = _format_tips(rtrvd_tips)
+    _tips_cache.put(key, tips_str)
     return tips_str
+
+
+def prefetch_formatted_tips(
+    namespace_id: str, agent_id: str, query: str, limit: int
+) -> "asyncio.Task[Optional[str]]":
+    """Start retrieving tips in the background; await the returned task where the tips are needed."""
+    return asyncio.ensure_future(aget_formatted_tips(namespace_id, agent_id, query, limit))
@@ -0,0 +1,150 @@
+import atexit
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# Queue item kinds
+_STEP = "step"
+_END_RUN = "end_run"
+
+
+class _Lane:
+    """One worker thread and its FIFO; every item of a given run goes through the same lane."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queue: "queue.Queue[Tuple[str, str, str, Optional[dict]]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+
+
+class StepIngestionQueue:
+    """
+    Sends trajectory steps to the agentic-memory service off the agent's critical path.
+
+    ``add_step`` and ``end_run`` only enqueue. Runs are spread over ``workers`` lanes by run id, so
+    the steps of a run stay in order and its ``end_run`` is sent after all of them, while different
+    runs are ingested in parallel. Steps of one run that are waiting together are sent as a single
+    batch request of at most ``batch_size`` steps.
+
+    At most ``max_pending`` steps wait to be sent. When the service falls behind, ``add_step``
+    drops the step with a warning rather than waiting for room, since it runs on the agent's event
+    loop; ``end_run`` is never dropped. ``flush`` blocks until everything queued has been sent.
+    """
+
+    def __init__(
+        self,
+        memory: Any,
+        workers: int = 2,
+        max_pending: int = 256,
+        batch_size: int = 16,
+    ):
+        self.memory = memory
+        self.batch_size = max(1, batch_size)
+        self.dropped = 0
+        self._pending = threading.BoundedSemaphore(max(1, max_pending))
+        self._lanes = [_Lane(f"memory-ingestion-{i}") for i in range(max(1, workers))]
+        self._lock = threading.Lock()
+
+    def _lane_for(self, run_id: str) -> _Lane:
+        lane = self._lanes[zlib.crc32(str(run_id).encode()) % len(self._lanes)]
+        with self._lock:
+            if lane.thread is None or not lane.thread.is_alive():
+                lane.thread = threading.Thread(target=self._run, args=(lane,), name=lane.name, daemon=True)
+                lane.thread.start()
+        return lane
+
+    def add_step(self, namespace_id: str, run_id: str, step: dict, prompt: str) -> bool:
+        """Queue a step for ingestion. Returns False if it was dropped because the queue is full."""
+        if not self._pending.acquire(blocking=False):
+            self.dropped += 1
+            logger.warning(
+                f"Memory ingestion queue is full, dropping step {step.get('name')} of run {run_id} "
+                f"({self.dropped} dropped so far)"
+            )
+            return False
+        self._lane_for(run_id).queue.put((_STEP, namespace_id, run_id, {"step": step, "prompt": prompt}))
+        return True
+
+    def end_run(self, namespace_id: str, run_id: str):
+        """Queue the end of a run; it is sent once every step queued before it has been ingested."""
+        self._lane_for(run_id).queue.put((_END_RUN, namespace_id, run_id, None))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued step and run end has been sent (or failed), or ``timeout`` seconds.
+        Returns False if items were still waiting when the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for lane in self._lanes:
+            if lane.thread is None:
+                continue
+            with lane.queue.all_tasks_done:
+                while lane.queue.unfinished_tasks:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    lane.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self, lane: _Lane):
+        while True:
+            items = [lane.queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(lane.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process(items)
+            finally:
+                for kind, *_ in items:
+                    if kind == _STEP:
+                        self._pending.release()
+                    lane.queue.task_done()
+
+    def _process(self, items: List[Tuple[str, str, str, Optional[dict]]]):
+        # Group the steps per run (runs sharing a lane interleave); a run's end is sent after its steps
+        batches: Dict[Tuple[str, str], List[dict]] = {}
+        for kind, namespace_id, run_id, payload in items:
+            key = (namespace_id, run_id)
+            if kind == _STEP:
+                batches.setdefault(key, []).append(payload)
+                continue
+            if key in batches:
+                self._send_steps(namespace_id, run_id, batches.pop(key))
+            self._send_end_run(namespace_id, run_id)
+        for (namespace_id, run_id), steps in batches.items():
+            self._send_steps(namespace_id, run_id, steps)
+
+    def _send_steps(self, namespace_id: str, run_id: str, steps: List[dict]):
+        try:
+            if len(steps) == 1:
+                self.memory.add_step(namespace_id, run_id, steps[0]["step"], steps[0]["prompt"])
+            else:
+                self.memory.add_steps(namespace_id, run_id, steps)
+        except Exception as e:
+            logger.warning(f"Failed to add {len(steps)} step(s) to memory run {run_id}: {e}")
+
+    def _send_end_run(self, namespace_id: str, run_id: str):
+        try:
+            self.memory.end_run(namespace_id=namespace_id, run_id=run_id)
+        except Exception as e:
+            logger.warning(f"Failed to end memory run {run_id}: {e}")
+
+
+def create_step_ingestion_queue(memory: Any, config: Any = None) -> StepIngestionQueue:
+    """Build a queue from the ``[memory_ingestion]`` settings and flush it at interpreter exit."""
+    kwargs = {}
+    if config is not None:
+        kwargs = {
+            "workers": config.get("workers", 2),
+            "max_pending": config.get("max_pending", 256),
+            "batch_size": config.get("batch_size", 16),
+        }
+    ingestion_queue = StepIngestionQueue(memory, **kwargs)
+    atexit.register(ingestion_queue.flush)
+    return ingestion_queue
@@ -90,7 +90,23 @@ class Memory:
         recorded_facts = self.search_for_facts(
             namespace_id=namespace_id, query=query, limit=limit, filters={"agent": agent_id, "user_id": "100"}
         )
+        return self._tips_from_facts(query, recorded_facts)
 
+    async def aget_matching_tips(
+        self,
+        namespace_id: str,
+        agent_id: str,
+        query: str,
+        limit: int = 3,
+    ) -> list[str]:
+        """Async version of ``get_matching_tips`` on the client's pooled async connection."""
+        recorded_facts = await self.memory_client.asearch_for_facts(
+            namespace_id=namespace_id, query=query, limit=limit, filters={"agent": agent_id, "user_id": "100"}
+        )
+        return self._tips_from_facts(query, recorded_facts)
+
+    @staticmethod
+    def _tips_from_facts(query: str, recorded_facts: List[RecordedFact]) -> list[str]:
         # Extract facts from the response (assuming similar structure to old implementation)
         facts = [fact.content for fact in recorded_facts]
 
@@ -128,6 +144,10 @@ class Memory:
         """Add a new step into a run."""
         return self.memory_client.add_step(namespace_id, run_id, step, prompt)
 
+    def add_steps(self, namespace_id: str, run_id: str, steps: list[dict]) -> list[str]:
+        """Add several steps (dicts with ``step`` and ``prompt``) into a run in one request."""
+        return self.memory_client.add_steps(namespace_id, run_id, steps)
+
     def _get_user_id(self, state: "AgentState") -> str:
         """Extract or generate user ID for memory scoping"""
         # Use the pi field from AgentState
@@ -5,8 +5,7 @@ import re
 import shutil
 import os
 import subprocess
-import uuid
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 from typing import List, Dict, Any, Union, Optional
 from cuga.backend.utils.id_utils import random_id_with_timestamp, mask_with_timestamp
 import traceback
@@ -17,7 +16,6 @@ from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_core.messages import AIMessage
 from loguru import logger
-from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
 
 from cuga.backend.activity_tracker.tracker import ActivityTracker
 from cuga.cli import start_extension_browser_if_configured
@@ -33,10 +31,11 @@ from cuga.backend.cuga_graph.utils.event_porcessors.action_agent_event_processor
     ActionAgentEventProcessor,
 )
 from cuga.backend.cuga_graph.nodes.human_in_the_loop.followup_model import ActionResponse
-from cuga.backend.cuga_graph.state.agent_state import AgentState, default_state
+from cuga.backend.cuga_graph.state.agent_state import AgentState
 from cuga.backend.browser_env.browser.gym_env_async import BrowserEnvGymAsync
 from cuga.backend.browser_env.browser.open_ended_async import OpenEndedTaskAsync
 from cuga.backend.cuga_graph.utils.agent_loop import AgentLoop, AgentLoopAnswer, StreamEvent, OutputFormat
+from cuga.backend.server.session_manager import Session, SessionLimitError, SessionManager
 from cuga.config import (
     get_app_name_from_url,
     get_user_data_path,
@@ -103,12 +102,18 @@ class AppState:
         self.obs: Optional[Any] = None
         self.info: Optional[Dict[str, Any]] = None
         self.env: Optional[BrowserEnvGymAsync | ExtensionEnv] = None
-        self.state: Optional[AgentState] = None
         self.agent: Optional[DynamicAgentGraph] = (
             None  # Replace Any with your Agent's class type if available
         )
-        self.thread_id: Optional[str] = None
-        self.stop_agent: bool = False
+        # Per-user agent state, graph thread, tracker and variables, keyed by the X-Session-ID header
+        self.sessions: SessionManager = SessionManager(
+            graph_getter=lambda: self.agent.graph if self.agent else None,
+            max_sessions=settings.server_sessions.max_sessions,
+            idle_timeout=settings.server_sessions.idle_timeout,
+            on_evict=self._drop_session_thread,
+        )
+        # There is a single browser, so browser-mode sessions take turns driving it
+        self.env_lock: asyncio.Lock = asyncio.Lock()
         self.output_format: OutputFormat = (
             OutputFormat.WXO if settings.advanced_features.wxo_integration else OutputFormat.DEFAULT
         )
@@ -139,6 +144,15 @@ class AppState:
         self.save_reuse_process: Optional[asyncio.subprocess.Process] = None
         self.initialize_sdk()
 
+    def _drop_session_thread(self, session: Session):
+        """Free the checkpoints of an evicted session's graph thread, and its page history."""
+        checkpointer = getattr(self.agent.graph, "checkpointer", None) if self.agent else None
+        if checkpointer is not None:
+            checkpointer.delete_thread(session.thread_id)
+        pu_processor = getattr(self.env, "pu_processor", None)
+        if pu_processor is not None:
+            pu_processor.reset_page_history(session.session_id)
+
     def initialize_sdk(self):
         """Initializes the analytics SDK and logging."""
         logs_dir_path = TRACES_DIR
@@ -244,11 +258,8 @@ async def lifespan(app: FastAPI):
     await asyncio.sleep(3)
     app_state.tracker.start_experiment(task_ids=['demo'], experiment_name='demo', description="")
     app_state.obs, app_state.info = await app_state.env.reset()
-    app_state.stop_agent = False  # Reset stop flag on startup
-    app_state.state = default_state(page=None, observation=None, goal="")
     app_state.agent = DynamicAgentGraph(None)
     await app_state.agent.build_graph()
-    app_state.thread_id = str(uuid.uuid4())
 
     logger.info("Application finished starting up...")
     url = f"http://localhost:{settings.server_ports.demo}?t={random_id_with_timestamp()}"
@@ -327,25 +338,37 @@ async def setup_page_info(state: AgentState, env: ExtensionEnv | BrowserEnvGymAs
     state.current_app_description = f"web application for '{title}' and url '{url_app_name}'"
 
 
-async def event_stream(query: str, api_mode=False, resume=None):
+async def event_stream(query: str, api_mode=False, resume=None, session: Optional[Session] = None):
     """Handles the main agent event stream."""
-    app_state.stop_agent = False
+    session = session or app_state.sessions.get_or_create()
+    session.activate()
+    async with session.lock, nullcontext() if api_mode else app_state.env_lock:
+        async for event in _session_event_stream(session, query, api_mode=api_mode, resume=resume):
+            yield event
+
+
+async def _session_event_stream(session: Session, query: str, api_mode=False, resume=None):
+    session.stop_agent = False
     if not resume:
-        app_state.state.input = query
+        session.state.input = query
         app_state.tracker.intent = query
 
     if not api_mode:
+        if not resume:
+            # A new task: its first observation is not diffed against the previous task's pages
+            app_state.env.pu_processor.reset_page_history(session.session_id)
         app_state.obs, _, _, _, app_state.info = await app_state.env.step("")
         pu_answer = await app_state.env.pu_processor.transform(
-            transformer_params={"filter_visible_only": True}
+            transformer_params={"filter_visible_only": True, "history": session.session_id}
         )
         app_state.tracker.collect_image(pu_answer.img)
-        app_state.state.elements_as_string = pu_answer.string_representation
-        app_state.state.focused_element_bid = pu_answer.focused_element_bid
-        app_state.state.read_page = pu_answer.page_content
-        app_state.state.url = app_state.env.get_url()
-        await setup_page_info(app_state.state, app_state.env)
-    app_state.tracker.task_id = 'demo'
+        session.state.elements_as_string = pu_answer.string_representation
+        session.state.page_changes = pu_answer.delta.to_str() if pu_answer.delta else ""
+        session.state.focused_element_bid = pu_answer.focused_element_bid
+        session.state.read_page = pu_answer.page_content
+        session.state.url = app_state.env.get_url()
+        await setup_page_info(session.state, app_state.env)
+    app_state.tracker.task_id = session.task_id
 
     langfuse_handler = (
         CallbackHandler()
@@ -360,10 +383,10 @@ async def event_stream(query: str, api_mode=False, resume=None):
         print("Note: Trace ID will be available after the first LLM operation")
 
     agent_loop_obj = AgentLoop(
-        graph=app_state.agent.graph, langfuse_handler=langfuse_handler, thread_id=app_state.thread_id
+        graph=app_state.agent.graph, langfuse_handler=langfuse_handler, thread_id=session.thread_id
     )
     logger.debug(f"Resume: {resume.model_dump_json() if resume else ''}")
-    agent_stream_gen = agent_loop_obj.run_stream(state=app_state.state if not resume else None, resume=resume)
+    agent_stream_gen = agent_loop_obj.run_stream(state=session.state if not resume else None, resume=resume)
 
     # Print initial trace ID status
     if langfuse_handler and settings.advanced_features.langfuse_tracing:
@@ -375,14 +398,14 @@ async def event_stream(query: str, api_mode=False, resume=None):
 
     try:
         while True:
-            if app_state.stop_agent:
+            if session.stop_agent:
                 logger.info("Agent execution stopped by user")
                 yield StreamEvent(name="Stopped", data="Agent execution was stopped by user.").format()
                 return
 
             async for event in agent_stream_gen:
                 # await asyncio.sleep(0.5)
-                if app_state.stop_agent:
+                if session.stop_agent:
                     logger.info("Agent execution stopped by user during event processing")
                     yield StreamEvent(name="Stopped", data="Agent execution was stopped by user.").format()
                     return
@@ -394,17 +417,13 @@ async def event_stream(query: str, api_mode=False, resume=None):
                         await app_state.agent.chat.chat_agent.setup()
 
                     if event.interrupt and not event.has_tools:
-                        app_state.state = AgentState(
-                            **app_state.agent.graph.get_state(
-                                {"configurable": {"thread_id": app_state.thread_id}}
-                            ).values
-                        )
+                        session.invalidate_state()
                         return
                     if event.end:
                         app_state.tracker.finish_task(
-                            intent=app_state.state.input,
+                            intent=session.state.input,
                             site="",
-                            task_id="demo",
+                            task_id=session.task_id,
                             eval="",
                             score=1.0,
                             agent_answer=event.answer,
@@ -412,6 +431,7 @@ async def event_stream(query: str, api_mode=False, resume=None):
                             num_steps=0,
                             agent_v="",
                         )
+                        await app_state.tracker.flush_memory()
                         logger.debug("!!!!!!!Task is done!!!!!!!")
 
                         # Get variables metadata from var_manager
@@ -429,13 +449,9 @@ async def event_stream(query: str, api_mode=False, resume=None):
                             else json.dumps({"data": event.answer, "variables": variables_metadata})
                             if event.answer
                             else "Done.",
-                        ).format(app_state.output_format, thread_id=app_state.thread_id)
+                        ).format(app_state.output_format, thread_id=session.thread_id)
 
-                        app_state.state = AgentState(
-                            **app_state.agent.graph.get_state(
-                                {"configurable": {"thread_id": app_state.thread_id}}
-                            ).values
-                        )
+                        session.invalidate_state()
                         try:
                             await copy_file_async(
                                 TRACE_LOG_PATH,
@@ -447,61 +463,59 @@ async def event_stream(query: str, api_mode=False, resume=None):
                             logger.warning(e)
                         return
                     elif event.has_tools:
-                        app_state.state = AgentState(
-                            **app_state.agent.graph.get_state(
-                                {"configurable": {"thread_id": app_state.thread_id}}
-                            ).values
-                        )
-                        msg: AIMessage = app_state.state.messages[-1]
+                        session.invalidate_state()
+                        msg: AIMessage = session.state.messages[-1]
                         yield StreamEvent(name="tool_call", data=format_tools(msg.tool_calls)).format()
 
                         feedback = await AgentRunner.process_event_async(
-                            app_state.state.messages[-1].tool_calls,
-                            app_state.state.elements,
+                            session.state.messages[-1].tool_calls,
+                            session.state.elements,
                             None if api_mode else app_state.env.page,
                             app_state.env.tool_implementation_provider,
-                            session_id="demo",
+                            session_id=session.session_id,
                             page_data=app_state.obs,
                             communicator=getattr(app_state.env, "extension_communicator", None),
                         )
-                        app_state.state.feedback += feedback
+                        session.state.feedback += feedback
 
                         if not api_mode:
                             app_state.obs, _, _, _, app_state.info = await app_state.env.step("")
                             pu_answer = await app_state.env.pu_processor.transform(
-                                transformer_params={"filter_visible_only": True}
+                                transformer_params={
+                                    "filter_visible_only": True,
+                                    "history": session.session_id,
+                                }
                             )
                             app_state.tracker.collect_image(pu_answer.img)
-                            app_state.state.elements_as_string = pu_answer.string_representation
-                            app_state.state.focused_element_bid = pu_answer.focused_element_bid
-                            app_state.state.read_page = pu_answer.page_content
-                            app_state.state.url = app_state.env.get_url()
+                            session.state.elements_as_string = pu_answer.string_representation
+                            session.state.page_changes = pu_answer.delta.to_str() if pu_answer.delta else ""
+                            session.state.focused_element_bid = pu_answer.focused_element_bid
+                            session.state.read_page = pu_answer.page_content
+                            session.state.url = app_state.env.get_url()
 
                         app_state.agent.graph.update_state(
-                            {"configurable": {"thread_id": app_state.thread_id}}, app_state.state.model_dump()
+                            {"configurable": {"thread_id": session.thread_id}},
+                            session.state.model_dump_changes(),
                         )
+                        session.invalidate_state()
                         agent_stream_gen = agent_loop_obj.run_stream(state=None)
                         break
                 else:
                     logger.debug("Yield {}".format(event))
-                    app_state.state = AgentState(
-                        **app_state.agent.graph.get_state(
-                            {"configurable": {"thread_id": app_state.thread_id}}
-                        ).values
-                    )
+                    session.invalidate_state()
                     name = ((event.split("\n")[0]).split(":")[1]).strip()
                     logger.debug("Yield {}".format(event))
                     if name not in ["ChatAgent"]:
                         yield StreamEvent(name=name, data=event).format(
-                            app_state.output_format, thread_id=app_state.thread_id
+                            app_state.output_format, thread_id=session.thread_id
                         )
     except Exception as e:
         logger.exception(e)
         logger.error(traceback.format_exc())
         app_state.tracker.finish_task(
-            intent=app_state.state.input,
+            intent=session.state.input,
             site="",
-            task_id="demo",
+            task_id=session.task_id,
             eval="",
             score=0.0,
             agent_answer="",
@@ -509,6 +523,7 @@ async def event_stream(query: str, api_mode=False, resume=None):
             num_steps=0,
             agent_v="",
         )
+        await app_state.tracker.flush_memory()
         yield StreamEvent(name="Error", data=str(e)).format()
 
 
@@ -559,6 +574,7 @@ if getattr(settings.advanced_features, "use_extension", False):
         request_id = body.get("request_id", None)
         if not query:
             return JSONResponse({"type": "agent_error", "message": "Missing query"}, status_code=400)
+        session = get_session(request)
 
         async def event_gen():
             # Initial processing message
@@ -577,6 +593,7 @@ if getattr(settings.advanced_features, "use_extension", False):
                     query,
                     api_mode=settings.advanced_features.mode == "api",
                     resume=query if isinstance(query, ActionResponse) else None,
+                    session=session,
                 ):
                     if chunk.strip():
                         # Remove 'data: ' prefix if present
@@ -601,37 +618,54 @@ if getattr(settings.advanced_features, "use_extension", False):
         return StreamingResponse(event_gen(), media_type="application/jsonlines")
 
 
+def get_session(request: Request) -> Session:
+    """Returns the caller's session, taken from the X-Session-ID header or `session_id` query parameter."""
+    session_id = request.headers.get("X-Session-ID") or request.query_params.get("session_id")
+    try:
+        return app_state.sessions.get_or_create(session_id)
+    except SessionLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
 @app.post("/stream")
 async def stream(request: Request):
     """Endpoint to start the agent stream."""
     query = await get_query(request)
+    session = get_session(request)
     return StreamingResponse(
         event_stream(
             query if isinstance(query, str) else None,
             api_mode=settings.advanced_features.mode == "api",
             resume=query if isinstance(query, ActionResponse) else None,
+            session=session,
         ),
         media_type="text/event-stream",
+        headers={"X-Session-ID": session.session_id},
     )
 
 
 @app.post("/stop")
-async def stop():
+async def stop(request: Request):
     """Endpoint to stop the agent execution."""
     logger.info("Received stop request")
-    app_state.stop_agent = True
+    get_session(request).stop_agent = True
     return {"status": "success", "message": "Stop request received"}
 
 
 @app.post("/reset")
-async def reset_agent_state():
+async def reset_agent_state(request: Request):
     """Endpoint to reset the agent state to default values."""
     logger.info("Received reset request")
     try:
-        # Reset agent state to default
-        app_state.state = default_state(page=None, observation=None, goal="")
-        app_state.stop_agent = False
-        app_state.thread_id = str(uuid.uuid4())
+        # Reset the caller's agent state, graph thread, trajectory and variables
+        session = get_session(request)
+        app_state._drop_session_thread(session)
+        session.reset()
+
+        # The graph and environment are shared, so they are only rebuilt when no other session uses them
+        if len(app_state.sessions) > 1:
+            logger.info("Agent state reset successfully")
+            return {"status": "success", "message": "Agent state reset successfully"}
 
         # Reset observation and info
         app_state.obs = None
@@ -646,11 +680,10 @@ async def reset_agent_state():
         if app_state.env:
             app_state.obs, app_state.info = await app_state.env.reset()
 
-        # Reset tracker experiment if enabled
-        var_manger = VariablesManager()
-        var_manger.reset()
         logger.info("Agent state reset successfully")
         return {"status": "success", "message": "Agent state reset successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to reset agent state: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to reset agent state: {str(e)}")
@@ -0,0 +1,152 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional
+
+from loguru import logger
+
+from cuga.backend.activity_tracker.tracker import ActivityTracker
+from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
+from cuga.backend.cuga_graph.state.agent_state import AgentState, default_state
+
+DEFAULT_SESSION_ID = "default"
+
+
+class SessionLimitError(Exception):
+    """Raised when every session slot is taken by a session that is still running."""
+
+
+class Session:
+    """
+    Everything one demo-server user owns: agent state, LangGraph thread, stop flag, and the
+    per-session views of the tracker and variables manager. The compiled graph, browser env and
+    tool registry stay shared by all sessions.
+    """
+
+    def __init__(self, session_id: str, graph_getter: Callable[[], Any]):
+        self.session_id = session_id
+        self._graph_getter = graph_getter
+        # Serializes requests of the same session; different sessions run concurrently
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        self.thread_id = str(uuid.uuid4())
+        self.stop_agent = False
+        self._state: Optional[AgentState] = default_state(page=None, observation=None, goal="")
+        self._state_stale = False
+        self.tracker_scope = ActivityTracker.new_session_scope()
+        self.variables_scope = VariablesManager.new_session_scope()
+
+    @property
+    def task_id(self) -> str:
+        return "demo" if self.session_id == DEFAULT_SESSION_ID else f"demo_{self.session_id}"
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+    @property
+    def state(self) -> Optional[AgentState]:
+        """The agent state, re-read from the graph checkpoint only when accessed after going stale."""
+        graph = self._graph_getter()
+        if self._state_stale and graph is not None:
+            self._state = AgentState(
+                **graph.get_state({"configurable": {"thread_id": self.thread_id}}).values
+            )
+            self._state_stale = False
+        return self._state
+
+    @state.setter
+    def state(self, value: Optional[AgentState]):
+        self._state = value
+        self._state_stale = False
+
+    def invalidate_state(self):
+        """Mark the cached state as outdated after the graph advanced; it is reloaded on next access."""
+        self._state_stale = True
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def activate(self):
+        """Bind the tracker and variables manager singletons to this session in the current context."""
+        self.touch()
+        ActivityTracker.activate_session_scope(self.tracker_scope)
+        VariablesManager.activate_session_scope(self.variables_scope)
+
+
+class SessionManager:
+    """
+    Sessions keyed by the client's session id, least recently used first. Sessions idle for
+    longer than ``idle_timeout`` seconds are dropped, and when ``max_sessions`` is reached the least
+    recently used idle session makes room for a new one.
+    """
+
+    def __init__(
+        self,
+        graph_getter: Callable[[], Any],
+        max_sessions: int = 100,
+        idle_timeout: float = 1800,
+        on_evict: Optional[Callable[[Session], None]] = None,
+    ):
+        self._graph_getter = graph_getter
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.on_evict = on_evict
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: str) -> Optional[Session]:
+        return self._sessions.get(session_id)
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        session_id = session_id or DEFAULT_SESSION_ID
+        self.evict_idle()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            session.touch()
+            return session
+
+        if len(self._sessions) >= self.max_sessions:
+            victim = next((s for s in self._sessions.values() if not s.busy), None)
+            if victim is None:
+                raise SessionLimitError(f"All {self.max_sessions} sessions are busy")
+            logger.info(f"Session limit reached, evicting least recently used session {victim.session_id}")
+            self.remove(victim.session_id)
+
+        session = Session(session_id, self._graph_getter)
+        self._sessions[session_id] = session
+        logger.debug(f"Created session {session_id} ({len(self._sessions)} active)")
+        return session
+
+    def remove(self, session_id: str) -> Optional[Session]:
+        session = self._sessions.pop(session_id, None)
+        if session is not None and self.on_evict is not None:
+            try:
+                self.on_evict(session)
+            except Exception as e:
+                logger.warning(f"Failed to clean up session {session_id}: {e}")
+        return session
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        if not self.idle_timeout:
+            return []
+        now = time.monotonic() if now is None else now
+        expired = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if not session.busy and now - session.last_active > self.idle_timeout
+        ]
+        for session_id in expired:
+            logger.info(f"Evicting idle session {session_id}")
+            self.remove(session_id)
+        return expired
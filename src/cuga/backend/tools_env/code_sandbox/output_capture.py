@@ -0,0 +1,109 @@
+"""
+Context-local replacements for ``contextlib.redirect_stdout``/``redirect_stderr``.
+
+``contextlib`` swaps the process-global ``sys.stdout``, so two executions running concurrently
+on one event loop steal each other's output. Here, while any capture is active, ``sys.stdout``/
+``sys.stderr`` are replaced by a router that writes to the capture registered in a ``ContextVar``,
+falling back to the original stream; the original streams are restored when the last capture exits.
+
+asyncio tasks copy their context when created, so each task (and anything it spawns) captures only
+its own output. A task that outlives the capture it was spawned in writes to the enclosing capture
+(or the original stream) from then on, never to a buffer that was already handed back.
+"""
+
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, TextIO
+
+
+class _Capture:
+    """A buffer registered by ``redirect_stdout``/``redirect_stderr`` and whether it still collects output."""
+
+    __slots__ = ("stream", "parent", "active")
+
+    def __init__(self, stream: TextIO, parent: Optional["_Capture"]):
+        self.stream = stream
+        self.parent = parent
+        self.active = True
+
+
+_stdout_target: ContextVar[Optional[_Capture]] = ContextVar("cuga_stdout_target", default=None)
+_stderr_target: ContextVar[Optional[_Capture]] = ContextVar("cuga_stderr_target", default=None)
+
+# Captures active in any context; the router is installed only while there are some
+_active_captures = 0
+_router_lock = threading.Lock()
+
+
+class ContextRoutedStream:
+    """File-like proxy that writes to the current context's active capture, or to ``fallback``."""
+
+    def __init__(self, target: ContextVar, fallback: TextIO):
+        self._target = target
+        self.fallback = fallback
+
+    def _stream(self) -> TextIO:
+        capture = self._target.get()
+        while capture is not None and not capture.active:
+            capture = capture.parent
+        return capture.stream if capture is not None else self.fallback
+
+    def write(self, s: str) -> int:
+        return self._stream().write(s)
+
+    def writelines(self, lines):
+        self._stream().writelines(lines)
+
+    def flush(self):
+        self._stream().flush()
+
+    def __getattr__(self, name):
+        # encoding, isatty, fileno, ... of whichever stream is active
+        return getattr(self._stream(), name)
+
+
+def install_output_router():
+    """Route ``sys.stdout``/``sys.stderr`` through context-aware proxies (idempotent)."""
+    if not isinstance(sys.stdout, ContextRoutedStream):
+        sys.stdout = ContextRoutedStream(_stdout_target, sys.stdout)
+    if not isinstance(sys.stderr, ContextRoutedStream):
+        sys.stderr = ContextRoutedStream(_stderr_target, sys.stderr)
+
+
+def uninstall_output_router():
+    """Put the original streams back (a stream replaced by someone else since is left alone)."""
+    if isinstance(sys.stdout, ContextRoutedStream):
+        sys.stdout = sys.stdout.fallback
+    if isinstance(sys.stderr, ContextRoutedStream):
+        sys.stderr = sys.stderr.fallback
+
+
+@contextmanager
+def _redirect(target: ContextVar, new_target: TextIO) -> Iterator[TextIO]:
+    global _active_captures
+    with _router_lock:
+        _active_captures += 1
+        install_output_router()
+    capture = _Capture(new_target, target.get())
+    token = target.set(capture)
+    try:
+        yield new_target
+    finally:
+        capture.active = False
+        target.reset(token)
+        with _router_lock:
+            _active_captures -= 1
+            if _active_captures == 0:
+                uninstall_output_router()
+
+
+def redirect_stdout(new_target: TextIO):
+    """Like ``contextlib.redirect_stdout``, but only for the current context/task."""
+    return _redirect(_stdout_target, new_target)
+
+
+def redirect_stderr(new_target: TextIO):
+    """Like ``contextlib.redirect_stderr``, but only for the current context/task."""
+    return _redirect(_stderr_target, new_target)
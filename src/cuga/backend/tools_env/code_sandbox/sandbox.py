@@ -1,21 +1,25 @@
 import os
-from contextlib import redirect_stdout, redirect_stderr
-from io import StringIO
 from typing import Any
 from urllib.parse import quote
 
 from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
 from cuga.backend.activity_tracker.tracker import ActivityTracker
 from cuga.backend.utils.id_utils import mask_with_timestamp
-
-
-import sys
-import importlib
+from cuga.backend.tools_env.code_sandbox.worker import (
+    ExecutionResult,
+    base_namespace,
+    compile_source,
+    execute_in_namespace,
+)
+from cuga.backend.tools_env.code_sandbox.worker_pool import (
+    ContainerBackend,
+    InProcessBackend,
+    get_sandbox_pool,
+)
 
 from datetime import datetime
 from loguru import logger
 from cuga.config import settings, LOGGING_DIR
-import docker
 
 
 tracker = ActivityTracker()
@@ -29,7 +33,8 @@ def time_timestamp():
 
 
 try:
-    from llm_sandbox import SandboxSession
+    # Imported up front so a missing container sandbox fails at start-up; ContainerBackend uses it
+    from llm_sandbox import SandboxSession  # noqa: F401
 
     logger.info("Successfully imported SandboxSession from llm_sandbox")
 except ImportError as e:
@@ -74,15 +79,17 @@ structured_tools_invocation = """
 """
 
 
-def get_premable(is_local=False, current_date=None):
+def get_premable(is_local=False, current_date=None, structured_tools=None):
     registry_host = (
         f"http://host.docker.internal:{str(settings.server_ports.registry)}/functions/call?trajectory_path={quote(tracker.get_current_trajectory_path())}"
         if not is_local
         else f"http://localhost:{str(settings.server_ports.registry)}/functions/call?trajectory_path={quote(tracker.get_current_trajectory_path())}"
     )
 
-    # Check if structured tools should be enabled
-    if settings.features.local_sandbox and tracker.tools is not None and len(tracker.tools) > 0:
+    # Check if structured tools should be enabled (they call the in-process tracker directly)
+    if structured_tools is None:
+        structured_tools = settings.features.local_sandbox
+    if structured_tools and tracker.tools is not None and len(tracker.tools) > 0:
         tool_import_code = structured_tools_import
         tool_init_code = structured_tools_init
         tool_invocation_code = structured_tools_invocation
@@ -172,107 +179,8 @@ async def call_api(app_name, api_name, args=None):
     return preamble
 
 
-class ExecutionResult:
-    def __init__(self, exit_code, stdout, stderr):
-        self.exit_code = exit_code
-        self.stdout = stdout
-        self.stderr = stderr
-
-
 async def run_local(code_content: str) -> ExecutionResult:
-    stdout_buffer = StringIO()
-    stderr_buffer = StringIO()
-    exit_code = 0
-
-    import asyncio
-    import concurrent.futures
-
-    # Create a namespace that allows dynamic imports
-    namespace = {
-        '__builtins__': __builtins__,
-        '__name__': '__main__',
-        '__file__': '<string>',
-        '__doc__': None,
-        '__package__': None,
-        '__import__': __import__,
-        'importlib': importlib,
-        'asyncio': asyncio,
-        'concurrent': concurrent,
-    }
-
-    # Add all currently loaded modules to the namespace
-    # This ensures that any modules already imported in the main program are available
-    namespace.update(sys.modules)
-
-    try:
-        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-            # Use compile to get better error reporting and validate syntax
-            try:
-                compiled_code = compile(code_content, '<string>', 'exec')
-            except SyntaxError as se:
-                # Provide detailed syntax error information
-                error_msg = "Syntax Error in generated code:\n"
-                error_msg += f"  Line {se.lineno}: {se.text.strip() if se.text else 'N/A'}\n"
-                error_msg += f"  {' ' * (se.offset - 1) if se.offset else ''}^\n"
-                error_msg += f"  {se.msg}\n"
-                raise SyntaxError(error_msg) from se
-
-            exec(compiled_code, namespace, namespace)
-
-            # Now get the wrapper function from namespace and await it
-            if '__cuga_async_wrapper__' in namespace and asyncio.iscoroutinefunction(
-                namespace['__cuga_async_wrapper__']
-            ):
-                await namespace['__cuga_async_wrapper__']()
-    except SystemExit as e:
-        exit_code = e.code if e.code is not None else 0
-        logger.warning("=" * 80)
-        logger.warning(f"SystemExit caught in code execution: exit_code={exit_code}")
-        logger.warning("=" * 80)
-        stderr_buffer.write(f"Generated Code called exit with code : {exit_code}")
-    except SyntaxError as e:
-        import traceback
-
-        exit_code = 1
-        error_details = traceback.format_exc()
-
-        logger.error("=" * 80)
-        logger.error("SYNTAX ERROR IN GENERATED CODE")
-        logger.error("=" * 80)
-        logger.error(f"Error Message: {str(e)}")
-        logger.error("=" * 80)
-        logger.error("Full Stack Trace:")
-        logger.error(error_details)
-        logger.error("=" * 80)
-
-        # Write detailed error with traceback to stderr
-        stderr_buffer.write(f"Error during execution: {type(e).__name__}(\"{str(e)}\")\n")
-        stderr_buffer.write("Traceback (most recent call last):\n")
-        stderr_buffer.write(error_details)
-    except Exception as e:
-        import traceback
-
-        exit_code = 1
-        error_details = traceback.format_exc()
-
-        logger.error("=" * 80)
-        logger.error("EXCEPTION DURING CODE EXECUTION")
-        logger.error("=" * 80)
-        logger.error(f"Exception Type: {type(e).__name__}")
-        logger.error(f"Exception Message: {str(e)}")
-        logger.error("=" * 80)
-        logger.error("Full Stack Trace:")
-        logger.error(error_details)
-        logger.error("=" * 80)
-
-        # Write detailed error with traceback to stderr
-        stderr_buffer.write(f"Error during execution: {type(e).__name__}(\"{str(e)}\")\n")
-        stderr_buffer.write("Traceback (most recent call last):\n")
-        stderr_buffer.write(error_details)
-
-    return ExecutionResult(
-        exit_code=exit_code, stdout=stdout_buffer.getvalue(), stderr=stderr_buffer.getvalue()
-    )
+    return await execute_in_namespace(code_content, base_namespace())
 
 
 def validate_and_clean_code(code: str) -> tuple[str, str | None]:
@@ -283,9 +191,9 @@ def validate_and_clean_code(code: str) -> tuple[str, str | None]:
         tuple: (cleaned_code, error_message)
                If error_message is not None, the code has issues.
     """
-    # Try to compile the code to check for syntax errors
+    # Try to compile the code to check for syntax errors; in-process execution reuses the result
     try:
-        compile(code, '<validation>', 'exec')
+        compile_source(code)
     except SyntaxError as e:
         error_msg = "Syntax Error in generated code before execution:\n"
         error_msg += f"  Line {e.lineno}: {e.text.strip() if e.text else 'N/A'}\n"
@@ -304,7 +212,8 @@ async def run_code(code: str, _locals: dict[str, Any] = None) -> tuple[str, dict
     :param libraries: The libraries to use, it is optional.
     :return: The output of the code.
     """
-    variables = var_manager.get_variables_formatted()
+    # Variables are handed to the sandbox as objects/pickles, never compiled as part of the code
+    variables = var_manager.get_variables_for_sandbox()
     python_file_dir = f"./code/{tracker.experiment_folder}/{tracker.task_id}"
     os.makedirs(python_file_dir, exist_ok=True)
     python_file_dir = os.path.join(LOGGING_DIR, python_file_dir)
@@ -316,70 +225,47 @@ async def run_code(code: str, _locals: dict[str, Any] = None) -> tuple[str, dict
 
     wrapped_code_with_call = wrapped_code + "\nimport asyncio\nasyncio.run(__cuga_async_wrapper__())\n"
 
-    code_content = (
-        get_premable(is_local=settings.features.local_sandbox, current_date=tracker.current_date)
-        + "\n"
-        + variables
-        + "\n"
-        + (wrapped_code if settings.features.local_sandbox else wrapped_code_with_call)
+    pool = get_sandbox_pool()
+    backend_name = pool.backend_factory.name
+    in_container = backend_name == ContainerBackend.name
+    preamble = get_premable(
+        is_local=not in_container,
+        current_date=tracker.current_date,
+        structured_tools=backend_name == InProcessBackend.name,
     )
+    # Pooled in-process and subprocess workers await the wrapper themselves
+    task_code = wrapped_code_with_call if in_container else wrapped_code
 
     # Validate code after wrapping (since LLM generates code with await statements)
-    _, validation_error = validate_and_clean_code(code_content)
+    _, validation_error = validate_and_clean_code(task_code)
     if validation_error:
         logger.error(f"Code validation failed:\n{validation_error}")
         logger.error(f"Original code:\n{code}")
         return validation_error, {}
 
-    code_content_for_saving = (
-        get_premable(is_local=settings.features.local_sandbox, current_date=tracker.current_date)
-        + "\n"
-        + variables
-        + "\n"
-        + wrapped_code_with_call
-    )
-
     if settings.advanced_features.tracker_enabled:
+        # The saved file stays a standalone script, so only here are variables written out as source
+        code_content_for_saving = (
+            get_premable(is_local=settings.features.local_sandbox, current_date=tracker.current_date)
+            + "\n"
+            + var_manager.get_variables_formatted()
+            + "\n"
+            + wrapped_code_with_call
+        )
         os.makedirs(python_file_dir, exist_ok=True)
         with open(file_path, 'w') as f:
             f.write(code_content_for_saving)
             logger.debug(f"Wrote python file at {file_path}")
 
-    if settings.features.local_sandbox:
-        from cuga.backend.utils.code_generator import process_python_file
+    result = await pool.run(preamble, task_code, variables)
+    if settings.advanced_features.benchmark == "appworld":
+        if in_container:
+            from evaluation.code_generator import process_python_file
+        else:
+            from cuga.backend.utils.code_generator import process_python_file
 
-        result = await run_local(code_content)
-        if settings.advanced_features.benchmark == "appworld":
-            process_python_file(file_path, tracker.task_id)
+        process_python_file(file_path, tracker.task_id)
 
-        if result.exit_code != 0:
-            logger.error(f"Code execution failed:\n{result.stderr}")
-        return result.stdout if result.exit_code == 0 else result.stderr, {}
-    else:
-        # Check for Podman socket first, fall back to Docker/Rancher Desktop
-        podman_socket = f"/run/user/{os.getuid()}/podman/podman.sock"
-        docker_socket = os.path.expanduser("~/.rd/docker.sock")
-
-        if os.path.exists(podman_socket):
-            socket_path = podman_socket
-        elif os.path.exists(docker_socket):
-            socket_path = docker_socket
-        else:
-            # Try default Docker socket as last resort
-            socket_path = "/var/run/docker.sock"
-        docker_client = docker.DockerClient(base_url=f"unix://{socket_path}")
-        with SandboxSession(
-            client=docker_client,
-            image="python:3.12-slim",
-            keep_template=False,
-            commit_container=False,
-            lang="python",
-            verbose=True,
-        ) as session:
-            result = session.run(code_content)
-            logger.debug(session.config)
-            if settings.advanced_features.benchmark == "appworld":
-                from evaluation.code_generator import process_python_file
-
-                process_python_file(file_path, tracker.task_id)
-            return result.stdout if result.exit_code == 0 else result.stderr, {}
+    if result.exit_code != 0:
+        logger.error(f"Code execution failed:\n{result.stderr}")
+    return result.stdout if result.exit_code == 0 else result.stderr, {}
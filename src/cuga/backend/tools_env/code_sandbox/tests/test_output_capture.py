@@ -0,0 +1,76 @@
+import asyncio
+import io
+import sys
+
+import pytest
+
+from cuga.backend.tools_env.code_sandbox.output_capture import redirect_stdout
+from cuga.backend.tools_env.code_sandbox.sandbox import run_local
+
+INTERLEAVED_CODE = """
+async def __cuga_async_wrapper__():
+    for i in range(5):
+        print("{name}", i)
+        await asyncio.sleep(0.01)
+"""
+
+
+class TestOutputCapture:
+    """Test suite for per-task stdout/stderr capture."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_run_local_outputs_are_isolated(self):
+        """Concurrent executions on one loop each see only their own prints."""
+        names = ["alpha", "beta", "gamma"]
+        results = await asyncio.gather(*(run_local(INTERLEAVED_CODE.format(name=name)) for name in names))
+
+        for name, result in zip(names, results):
+            assert result.exit_code == 0
+            assert result.stdout == "".join(f"{name} {i}\n" for i in range(5))
+
+    @pytest.mark.asyncio
+    async def test_output_outside_capture_reaches_original_stream(self):
+        async def capture(buffer):
+            with redirect_stdout(buffer):
+                print("captured")
+                await asyncio.sleep(0.01)
+
+        outer = io.StringIO()
+        inner = io.StringIO()
+        with redirect_stdout(outer):
+            task = asyncio.create_task(capture(inner))
+            await asyncio.sleep(0)
+            print("outer")
+            await task
+        print("not captured", file=sys.stdout)
+
+        assert inner.getvalue() == "captured\n"
+        assert outer.getvalue() == "outer\n"
+
+    @pytest.mark.asyncio
+    async def test_task_outliving_its_capture_writes_to_the_enclosing_one(self):
+        async def spawned(released):
+            print("captured")
+            await released.wait()
+            print("late")
+
+        outer = io.StringIO()
+        inner = io.StringIO()
+        released = asyncio.Event()
+        with redirect_stdout(outer):
+            with redirect_stdout(inner):
+                task = asyncio.create_task(spawned(released))
+                await asyncio.sleep(0)
+            released.set()
+            await task
+
+        assert inner.getvalue() == "captured\n"
+        assert outer.getvalue() == "late\n"
+
+    def test_original_streams_are_restored_after_the_last_capture(self):
+        original = sys.stdout
+        with redirect_stdout(io.StringIO()):
+            with redirect_stdout(io.StringIO()):
+                assert sys.stdout is not original
+            assert sys.stdout is not original
+        assert sys.stdout is original
@@ -0,0 +1,243 @@
+import asyncio
+import os
+import pickle
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cuga.backend.tools_env.code_sandbox.variables import SandboxVariables
+from cuga.backend.tools_env.code_sandbox.worker_pool import (
+    CONTAINER_RESET_COMMAND,
+    ContainerBackend,
+    InProcessBackend,
+    SandboxBackend,
+    SandboxWorkerPool,
+    SubprocessBackend,
+)
+
+PREAMBLE = """
+import json
+preamble_runs = globals().get("preamble_runs", 0) + 1
+
+async def call_api(app_name, api_name, args=None):
+    return {"app": app_name, "api": api_name}
+"""
+
+TASK = """
+async def __cuga_async_wrapper__():
+    result = await call_api("crm", "list_accounts")
+    print(json.dumps(result))
+"""
+
+
+class StoredVariable:
+    """Stands in for ``VariableMetadata``."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def pickled(self, protocol):
+        try:
+            return pickle.dumps(self.value, protocol=protocol)
+        except Exception:
+            return None
+
+
+class ReprOnly(list):
+    """Can't be pickled, but its repr is valid source."""
+
+    def __reduce_ex__(self, protocol):
+        raise TypeError("not picklable")
+
+
+class LocalOnlyClass:
+    """Pickles fine here, but the worker process can't import this module to unpickle it."""
+
+
+class FakeContainerSession:
+    """Stands in for an ``llm_sandbox`` session."""
+
+    def __init__(self):
+        self.commands = []
+        self.closed = False
+
+    def run(self, code):
+        return SimpleNamespace(exit_code=0, stdout="ran", stderr="")
+
+    def execute_command(self, command):
+        self.commands.append(command)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContainerBackend(ContainerBackend):
+    def _open(self):
+        self._session = FakeContainerSession()
+
+
+def sandbox_variables(**values):
+    return SandboxVariables({name: StoredVariable(value) for name, value in values.items()})
+
+
+class TestSandboxWorkerPool:
+    """Test suite for the pre-warmed sandbox worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_in_process_reuses_preamble_and_resets_state(self):
+        pool = SandboxWorkerPool(InProcessBackend, size=1)
+        try:
+            first = await pool.run(PREAMBLE, TASK + "\nleaked = 1\n")
+            second = await pool.run(PREAMBLE, "print('leaked' in globals(), preamble_runs)")
+        finally:
+            await pool.close()
+
+        assert first.exit_code == 0
+        assert '"app": "crm"' in first.stdout
+        assert second.stdout.strip() == "False 1"
+
+    @pytest.mark.asyncio
+    async def test_in_process_reports_errors(self):
+        pool = SandboxWorkerPool(InProcessBackend, size=1)
+        try:
+            result = await pool.run(PREAMBLE, "print('before')\nraise ValueError('boom')")
+        finally:
+            await pool.close()
+
+        assert result.exit_code == 1
+        assert "before" in result.stdout
+        assert "boom" in result.stderr
+
+    @pytest.mark.asyncio
+    async def test_subprocess_worker_stays_warm(self):
+        pool = SandboxWorkerPool(SubprocessBackend, size=1)
+        try:
+            await pool.warm()
+            start = time.perf_counter()
+            results = [await pool.run(PREAMBLE, TASK) for _ in range(5)]
+            elapsed = time.perf_counter() - start
+        finally:
+            await pool.close()
+
+        assert all(result.exit_code == 0 for result in results)
+        assert all('"api": "list_accounts"' in result.stdout for result in results)
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_subprocess_worker_is_restarted_after_exit(self):
+        pool = SandboxWorkerPool(SubprocessBackend, size=1)
+        try:
+            crashed = await pool.run(PREAMBLE, "import os\nos._exit(3)")
+            recovered = await pool.run(PREAMBLE, "print('alive')")
+        finally:
+            await pool.close()
+
+        assert crashed.exit_code == 1
+        assert "Sandbox worker failed" in crashed.stderr
+        assert recovered.exit_code == 0
+        assert recovered.stdout.strip() == "alive"
+
+    @pytest.mark.asyncio
+    async def test_subprocess_timeout_comes_from_settings(self):
+        with patch("cuga.backend.tools_env.code_sandbox.worker_pool.settings.sandbox_pool.timeout", 0.5):
+            pool = SandboxWorkerPool(SubprocessBackend, size=1)
+            try:
+                slow = await pool.run(PREAMBLE, "import time\ntime.sleep(5)")
+                recovered = await pool.run(PREAMBLE, "print('alive')")
+            finally:
+                await pool.close()
+
+        assert slow.exit_code == 1
+        assert "timed out" in slow.stderr
+        assert recovered.stdout.strip() == "alive"
+        with patch("cuga.backend.tools_env.code_sandbox.worker_pool.settings.sandbox_pool.timeout", 0):
+            assert SubprocessBackend().timeout is None
+
+    @pytest.mark.asyncio
+    async def test_in_process_injects_copies_of_variables(self):
+        accounts = [{"id": i} for i in range(3)]
+        numbers = ReprOnly([1, 2])
+        pool = SandboxWorkerPool(InProcessBackend, size=1)
+        try:
+            result = await pool.run(
+                PREAMBLE,
+                "accounts.append({'id': 3})\naccounts[0]['id'] = 9\nnumbers.append(3)\nprint(len(accounts))",
+                sandbox_variables(accounts=accounts, numbers=numbers),
+            )
+        finally:
+            await pool.close()
+
+        assert result.stdout.strip() == "4"
+        assert accounts == [{"id": 0}, {"id": 1}, {"id": 2}]
+        # neither picklable nor copyable: the stored object itself
+        assert numbers == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_subprocess_receives_variables_as_pickles(self):
+        variables = sandbox_variables(
+            accounts=[{"id": i, "name": "x" * 100} for i in range(5000)],
+            numbers=ReprOnly([1, 2]),
+            unloadable=LocalOnlyClass(),
+        )
+        pool = SandboxWorkerPool(SubprocessBackend, size=1)
+        try:
+            first = await pool.run(
+                PREAMBLE, "print(len(accounts), numbers, 'unloadable' in globals())", variables
+            )
+            second = await pool.run(PREAMBLE, "print('accounts' in globals())")
+        finally:
+            await pool.close()
+
+        assert first.exit_code == 0, first.stderr
+        assert first.stdout.strip() == "5000 [1, 2] False"
+        assert second.stdout.strip() == "False"
+
+    def test_backends_must_implement_execute(self):
+        with pytest.raises(TypeError):
+            SandboxBackend()
+
+    @pytest.mark.asyncio
+    async def test_in_process_tasks_are_not_capped_by_pool_size(self):
+        pool = SandboxWorkerPool(InProcessBackend, size=1)
+        task = "async def __cuga_async_wrapper__():\n    await asyncio.sleep(0.3)\n    print('done')\n"
+        try:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(pool.run("import asyncio", task) for _ in range(4)))
+            elapsed = time.perf_counter() - start
+        finally:
+            await pool.close()
+
+        assert all(result.stdout.strip() == "done" for result in results)
+        assert elapsed < 0.9
+
+    def test_workers_of_a_previous_event_loop_are_closed(self):
+        pool = SandboxWorkerPool(SubprocessBackend, size=1)
+
+        async def worker_pid():
+            await pool.run(PREAMBLE, "print('alive')")
+            return pool._workers[0]._process.pid
+
+        old_pid = asyncio.run(worker_pid())
+        try:
+            new_pid = asyncio.run(worker_pid())
+        finally:
+            asyncio.run(pool.close())
+
+        assert new_pid != old_pid
+        with pytest.raises(ProcessLookupError):
+            os.kill(old_pid, 0)
+
+    @pytest.mark.asyncio
+    async def test_container_worker_is_reset_between_tasks(self):
+        pool = SandboxWorkerPool(FakeContainerBackend, size=1)
+        await pool.warm()
+        session = pool._workers[0]._session
+
+        result = await pool.run(PREAMBLE, "print('hello')")
+        await pool.close()
+
+        assert result.stdout == "ran"
+        assert session.commands == [CONTAINER_RESET_COMMAND]
+        assert session.closed
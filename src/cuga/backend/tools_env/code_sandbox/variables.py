@@ -0,0 +1,104 @@
+"""
+Hand-off of stored variables to sandboxed code without turning them into source text.
+
+In-process workers get copies of the values injected into the execution namespace, so code that
+mutates them leaves the stored variables (and their memoized previews) untouched. Subprocess and
+container workers receive one binary blob: a pickled ``{name: pickled value}`` mapping, so each value
+is unpickled on its own and one that can't be loaded (e.g. a class missing inside the container)
+doesn't take the others with it. Values that can't be pickled at all fall back to ``name = repr(value)``
+lines, which is how every variable used to be passed.
+"""
+
+import copy
+import pickle
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from loguru import logger
+
+# Readable by the container image's interpreter as well as ours
+PICKLE_PROTOCOL = 5
+
+# Where the blob is copied inside a container sandbox
+CONTAINER_VARIABLES_PATH = "/tmp/cuga_variables.pkl"
+
+# Prepended to container code: the container has no cuga installed, so this mirrors ``load_variables``
+CONTAINER_VARIABLES_LOADER = f"""
+import pickle as __cuga_pickle, sys as __cuga_sys
+with open({CONTAINER_VARIABLES_PATH!r}, "rb") as __cuga_file:
+    for __cuga_name, __cuga_payload in __cuga_pickle.load(__cuga_file).items():
+        try:
+            globals()[__cuga_name] = __cuga_pickle.loads(__cuga_payload)
+        except Exception as __cuga_error:
+            print(f"Could not load variable {{__cuga_name}}: {{__cuga_error}}", file=__cuga_sys.stderr)
+"""
+
+
+class SandboxVariables:
+    """
+    The variables of a ``VariablesManager`` prepared for one code execution.
+
+    Built from the manager's ``{name: VariableMetadata}`` mapping; values and pickles are only
+    produced when a backend asks for them, and spilled variables are passed on as their stored
+    pickle without being loaded.
+    """
+
+    def __init__(self, variables: Mapping[str, Any]):
+        self._variables = dict(variables)
+
+    def __bool__(self) -> bool:
+        return bool(self._variables)
+
+    def values(self) -> Dict[str, Any]:
+        """
+        Copies of the values by name, made from their pickles (or ``deepcopy``). A value that can be
+        neither pickled nor copied (e.g. a client holding a socket) is passed as the stored object.
+        """
+        values = {}
+        for name, metadata in self._variables.items():
+            payload = metadata.pickled(PICKLE_PROTOCOL)
+            if payload is not None:
+                try:
+                    values[name] = pickle.loads(payload)
+                    continue
+                except Exception as e:
+                    logger.debug(f"Could not unpickle variable {name}, copying it instead: {e}")
+            try:
+                values[name] = copy.deepcopy(metadata.value)
+            except Exception:
+                logger.debug(f"Could not copy variable {name}, passing the stored object")
+                values[name] = metadata.value
+        return values
+
+    def payloads(self) -> Tuple[Dict[str, bytes], Dict[str, Any]]:
+        """Pickled values by name, plus the values that couldn't be pickled."""
+        payloads: Dict[str, bytes] = {}
+        unpicklable: Dict[str, Any] = {}
+        for name, metadata in self._variables.items():
+            payload = metadata.pickled(PICKLE_PROTOCOL)
+            if payload is None:
+                unpicklable[name] = metadata.value
+            else:
+                payloads[name] = payload
+        return payloads, unpicklable
+
+
+def pack_variables(payloads: Dict[str, bytes]) -> bytes:
+    return pickle.dumps(payloads, protocol=PICKLE_PROTOCOL)
+
+
+def load_variables(blob: Optional[bytes]) -> Dict[str, Any]:
+    """Unpickle a blob built by ``pack_variables``; values that fail to load are reported and skipped."""
+    if not blob:
+        return {}
+    values = {}
+    for name, payload in pickle.loads(blob).items():
+        try:
+            values[name] = pickle.loads(payload)
+        except Exception as e:
+            logger.warning(f"Could not load variable {name}: {e}")
+    return values
+
+
+def variables_source(values: Dict[str, Any]) -> str:
+    """``name = repr(value)`` lines, for values that can't be handed over as pickles."""
+    return "\n".join(f"{name} = {value!r}" for name, value in values.items())
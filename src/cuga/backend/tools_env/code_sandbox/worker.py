@@ -0,0 +1,222 @@
+"""
+In-process code execution primitives shared by ``run_local`` and the sandbox worker pool.
+
+Running this module (``python -m cuga.backend.tools_env.code_sandbox.worker``) starts a
+long-lived subprocess worker that executes requests read as JSON lines from stdin and
+answers with JSON lines, keeping the executed preamble warm between requests. A request with
+``variables_size`` is followed by that many bytes of pickled variables (see ``variables.py``).
+"""
+
+import asyncio
+import concurrent.futures
+import importlib
+import json
+import os
+import sys
+import traceback
+from functools import lru_cache
+from io import StringIO
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from cuga.backend.tools_env.code_sandbox.output_capture import redirect_stdout, redirect_stderr
+from cuga.backend.tools_env.code_sandbox.variables import load_variables
+
+# Number of distinct preambles (trajectory path / current date combinations) kept warm per worker
+MAX_WARM_PREAMBLES = 8
+# Compiled generated code kept so validation and in-process execution compile it only once
+COMPILED_CODE_CACHE_SIZE = 32
+
+
+class ExecutionResult:
+    def __init__(self, exit_code, stdout, stderr):
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"exit_code": self.exit_code, "stdout": self.stdout, "stderr": self.stderr}
+
+
+def base_namespace() -> Dict[str, Any]:
+    """Create a namespace that allows dynamic imports"""
+    namespace = {
+        '__builtins__': __builtins__,
+        '__name__': '__main__',
+        '__file__': '<string>',
+        '__doc__': None,
+        '__package__': None,
+        '__import__': __import__,
+        'importlib': importlib,
+        'asyncio': asyncio,
+        'concurrent': concurrent,
+    }
+
+    # Add all currently loaded modules to the namespace
+    # This ensures that any modules already imported in the main program are available
+    namespace.update(sys.modules)
+    return namespace
+
+
+@lru_cache(maxsize=COMPILED_CODE_CACHE_SIZE)
+def compile_source(code_content: str):
+    return compile(code_content, '<string>', 'exec')
+
+
+def compile_code(code_content: str):
+    # Use compile to get better error reporting and validate syntax
+    try:
+        return compile_source(code_content)
+    except SyntaxError as se:
+        # Provide detailed syntax error information
+        error_msg = "Syntax Error in generated code:\n"
+        error_msg += f"  Line {se.lineno}: {se.text.strip() if se.text else 'N/A'}\n"
+        error_msg += f"  {' ' * (se.offset - 1) if se.offset else ''}^\n"
+        error_msg += f"  {se.msg}\n"
+        raise SyntaxError(error_msg) from se
+
+
+async def execute_in_namespace(code_content: str, namespace: Dict[str, Any]) -> ExecutionResult:
+    """Execute code in ``namespace``, awaiting ``__cuga_async_wrapper__`` if the code defines it."""
+    stdout_buffer = StringIO()
+    stderr_buffer = StringIO()
+    exit_code = 0
+
+    try:
+        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+            exec(compile_code(code_content), namespace, namespace)
+
+            # Now get the wrapper function from namespace and await it
+            if '__cuga_async_wrapper__' in namespace and asyncio.iscoroutinefunction(
+                namespace['__cuga_async_wrapper__']
+            ):
+                await namespace['__cuga_async_wrapper__']()
+    except SystemExit as e:
+        exit_code = e.code if e.code is not None else 0
+        logger.warning("=" * 80)
+        logger.warning(f"SystemExit caught in code execution: exit_code={exit_code}")
+        logger.warning("=" * 80)
+        stderr_buffer.write(f"Generated Code called exit with code : {exit_code}")
+    except SyntaxError as e:
+        exit_code = 1
+        error_details = traceback.format_exc()
+
+        logger.error("=" * 80)
+        logger.error("SYNTAX ERROR IN GENERATED CODE")
+        logger.error("=" * 80)
+        logger.error(f"Error Message: {str(e)}")
+        logger.error("=" * 80)
+        logger.error("Full Stack Trace:")
+        logger.error(error_details)
+        logger.error("=" * 80)
+
+        # Write detailed error with traceback to stderr
+        stderr_buffer.write(f"Error during execution: {type(e).__name__}(\"{str(e)}\")\n")
+        stderr_buffer.write("Traceback (most recent call last):\n")
+        stderr_buffer.write(error_details)
+    except Exception as e:
+        exit_code = 1
+        error_details = traceback.format_exc()
+
+        logger.error("=" * 80)
+        logger.error("EXCEPTION DURING CODE EXECUTION")
+        logger.error("=" * 80)
+        logger.error(f"Exception Type: {type(e).__name__}")
+        logger.error(f"Exception Message: {str(e)}")
+        logger.error("=" * 80)
+        logger.error("Full Stack Trace:")
+        logger.error(error_details)
+        logger.error("=" * 80)
+
+        # Write detailed error with traceback to stderr
+        stderr_buffer.write(f"Error during execution: {type(e).__name__}(\"{str(e)}\")\n")
+        stderr_buffer.write("Traceback (most recent call last):\n")
+        stderr_buffer.write(error_details)
+
+    return ExecutionResult(
+        exit_code=exit_code, stdout=stdout_buffer.getvalue(), stderr=stderr_buffer.getvalue()
+    )
+
+
+class WarmNamespace:
+    """
+    Namespaces with the preamble already executed, reset between tasks.
+
+    The preamble (imports, ``call_api`` and the date patch) is executed once per distinct preamble
+    text into a template namespace. Every task then runs in a fresh shallow copy of that template,
+    so nothing a task defines leaks into the next one, while imports and helpers are reused.
+    """
+
+    def __init__(self, max_preambles: int = MAX_WARM_PREAMBLES):
+        self.max_preambles = max_preambles
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._module_count = 0
+
+    async def _template(self, preamble: str) -> Optional[Dict[str, Any]]:
+        # Newly imported modules must stay visible to later tasks, as with a fresh namespace
+        if len(sys.modules) != self._module_count:
+            self._templates.clear()
+            self._module_count = len(sys.modules)
+        template = self._templates.get(preamble)
+        if template is None:
+            template = base_namespace()
+            result = await execute_in_namespace(preamble, template)
+            if result.exit_code != 0:
+                return None
+            if len(self._templates) >= self.max_preambles:
+                self._templates.pop(next(iter(self._templates)))
+            self._templates[preamble] = template
+            self._module_count = len(sys.modules)
+        return template
+
+    async def run(
+        self, preamble: str, code: str, variables: Optional[Dict[str, Any]] = None
+    ) -> ExecutionResult:
+        """Run ``code`` after the preamble, with ``variables`` already defined in its namespace."""
+        template = await self._template(preamble)
+        if template is None:
+            # Surface preamble errors exactly as a one-shot execution would
+            namespace = base_namespace()
+            namespace.update(variables or {})
+            return await execute_in_namespace(preamble + "\n" + code, namespace)
+        namespace = dict(template)
+        namespace.update(variables or {})
+        return await execute_in_namespace(code, namespace)
+
+    def clear(self):
+        self._templates.clear()
+
+
+def main():
+    """Subprocess worker loop: one JSON request per stdin line, one JSON result per stdout line."""
+    # Keep the protocol channel private; anything else written to fd 1 goes to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    logger.remove()
+    logger.add(sys.stderr, level=os.environ.get("CUGA_SANDBOX_WORKER_LOG_LEVEL", "WARNING"))
+
+    warm = WarmNamespace()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    stdin = sys.stdin.buffer
+    for line in iter(stdin.readline, b""):
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        variables = (
+            load_variables(stdin.read(request["variables_size"])) if request.get("variables_size") else None
+        )
+        if request.get("op") == "ping":
+            response = {"ok": True}
+        else:
+            result = loop.run_until_complete(
+                warm.run(request.get("preamble", ""), request["code"], variables)
+            )
+            response = result.to_dict()
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+from cuga.backend.tools_env.code_sandbox.variables import (
+    CONTAINER_VARIABLES_LOADER,
+    CONTAINER_VARIABLES_PATH,
+    SandboxVariables,
+    pack_variables,
+    variables_source,
+)
+from cuga.backend.tools_env.code_sandbox.worker import ExecutionResult, WarmNamespace
+from cuga.config import settings
+
+SANDBOX_IMAGE = "python:3.12-slim"
+WORKER_MODULE = "cuga.backend.tools_env.code_sandbox.worker"
+
+# Working directory of a task in a pooled container, removed when the worker is reset
+CONTAINER_WORKDIR = "/tmp/cuga_task"
+CONTAINER_WORKDIR_SETUP = f"""
+import os as __cuga_os
+__cuga_os.makedirs({CONTAINER_WORKDIR!r}, exist_ok=True)
+__cuga_os.chdir({CONTAINER_WORKDIR!r})
+del __cuga_os
+"""
+CONTAINER_RESET_COMMAND = f"rm -rf {CONTAINER_WORKDIR} {CONTAINER_VARIABLES_PATH}"
+
+
+class SandboxBackend(ABC):
+    """
+    A single pre-warmed execution environment.
+
+    ``execute`` receives the preamble separately from the task code so backends can keep the
+    preamble warm, and the stored variables separately so they never go through source text;
+    ``reset`` runs after every task and must leave no task state behind.
+
+    A ``shared`` backend runs every task in its own state already, so the pool hands the same
+    worker to concurrent tasks instead of checking one out per task.
+    """
+
+    name = "base"
+    shared = False
+
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def execute(
+        self, preamble: str, code: str, variables: Optional[SandboxVariables] = None
+    ) -> ExecutionResult: ...
+
+    async def reset(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @property
+    def healthy(self) -> bool:
+        return True
+
+
+class InProcessBackend(SandboxBackend):
+    """
+    Executes code on the calling event loop, reusing a namespace with the preamble already run.
+
+    Variables are put in the namespace as copies (see ``SandboxVariables.values``).
+    Every task gets its own copy of the warm namespace, so tasks run concurrently on one worker.
+    """
+
+    name = "in_process"
+    shared = True
+
+    def __init__(self):
+        self._warm = WarmNamespace()
+
+    async def execute(
+        self, preamble: str, code: str, variables: Optional[SandboxVariables] = None
+    ) -> ExecutionResult:
+        return await self._warm.run(preamble, code, variables.values() if variables else None)
+
+    async def close(self):
+        self._warm.clear()
+
+
+class SubprocessBackend(SandboxBackend):
+    """
+    Executes code in a long-lived Python subprocess (see ``worker.main``).
+
+    The interpreter start-up and imports are paid once per worker; every task runs in a fresh
+    namespace inside it. A worker that dies or times out is restarted on the next task.
+    ``timeout`` (seconds, default ``sandbox_pool.timeout``; 0 for no limit) bounds each task.
+    """
+
+    name = "subprocess"
+
+    def __init__(self, timeout: Optional[float] = None):
+        if timeout is None:
+            timeout = settings.sandbox_pool.timeout
+        self.timeout = timeout or None
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            WORKER_MODULE,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=64 * 1024 * 1024,
+        )
+        await self._request({"op": "ping"})
+
+    @property
+    def healthy(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def _request(self, payload: dict, blob: bytes = b"") -> dict:
+        if blob:
+            payload = {**payload, "variables_size": len(blob)}
+        self._process.stdin.write((json.dumps(payload) + "\n").encode("utf-8"))
+        if blob:
+            self._process.stdin.write(blob)
+        await self._process.stdin.drain()
+        line = await asyncio.wait_for(self._process.stdout.readline(), timeout=self.timeout)
+        if not line:
+            raise RuntimeError(f"Sandbox worker exited with code {self._process.returncode}")
+        return json.loads(line)
+
+    async def execute(
+        self, preamble: str, code: str, variables: Optional[SandboxVariables] = None
+    ) -> ExecutionResult:
+        if not self.healthy:
+            await self.start()
+        code, blob = _pickled_variables(code, variables)
+        try:
+            response = await self._request({"op": "run", "preamble": preamble, "code": code}, blob)
+        except (asyncio.TimeoutError, RuntimeError, BrokenPipeError, ConnectionResetError) as e:
+            await self.close()
+            message = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            return ExecutionResult(exit_code=1, stdout="", stderr=f"Sandbox worker failed: {message}")
+        return ExecutionResult(**response)
+
+    async def close(self):
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        process.kill()
+        await process.wait()
+
+
+class ContainerBackend(SandboxBackend):
+    """
+    Keeps an ``llm_sandbox`` container session open and reuses it across tasks.
+
+    Each ``session.run`` starts a fresh interpreter inside the container, running in
+    ``CONTAINER_WORKDIR``. ``reset`` removes that directory and the variables file, so the next
+    task starts from the same files; a container that can't be reset is replaced on the next task.
+    """
+
+    name = "container"
+
+    def __init__(self, image: str = SANDBOX_IMAGE):
+        self.image = image
+        self._session = None
+
+    @staticmethod
+    def _docker_client():
+        import docker
+
+        # Check for Podman socket first, fall back to Docker/Rancher Desktop
+        podman_socket = f"/run/user/{os.getuid()}/podman/podman.sock"
+        docker_socket = os.path.expanduser("~/.rd/docker.sock")
+
+        if os.path.exists(podman_socket):
+            socket_path = podman_socket
+        elif os.path.exists(docker_socket):
+            socket_path = docker_socket
+        else:
+            # Try default Docker socket as last resort
+            socket_path = "/var/run/docker.sock"
+        return docker.DockerClient(base_url=f"unix://{socket_path}")
+
+    def _open(self):
+        from llm_sandbox import SandboxSession
+
+        session = SandboxSession(
+            client=self._docker_client(),
+            image=self.image,
+            keep_template=True,
+            commit_container=False,
+            lang="python",
+            verbose=True,
+        )
+        session.open()
+        self._session = session
+
+    async def start(self):
+        await asyncio.to_thread(self._open)
+
+    @property
+    def healthy(self) -> bool:
+        return self._session is not None
+
+    def _copy_variables(self, blob: bytes):
+        with tempfile.NamedTemporaryFile(suffix=".pkl") as f:
+            f.write(blob)
+            f.flush()
+            self._session.copy_to_runtime(f.name, CONTAINER_VARIABLES_PATH)
+
+    async def execute(
+        self, preamble: str, code: str, variables: Optional[SandboxVariables] = None
+    ) -> ExecutionResult:
+        if self._session is None:
+            await self.start()
+        code, blob = _pickled_variables(code, variables)
+        try:
+            if blob:
+                await asyncio.to_thread(self._copy_variables, blob)
+                code = CONTAINER_VARIABLES_LOADER + "\n" + code
+            result = await asyncio.to_thread(
+                self._session.run, CONTAINER_WORKDIR_SETUP + "\n" + preamble + "\n" + code
+            )
+        except Exception:
+            # The container is gone or wedged; open a new one for the next task
+            await self.close()
+            raise
+        return ExecutionResult(exit_code=result.exit_code, stdout=result.stdout, stderr=result.stderr)
+
+    async def reset(self):
+        if self._session is None:
+            return
+        try:
+            await asyncio.to_thread(self._session.execute_command, CONTAINER_RESET_COMMAND)
+        except Exception:
+            await self.close()
+            raise
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is not None:
+            try:
+                await asyncio.to_thread(session.close)
+            except Exception as e:
+                logger.debug(f"Error closing sandbox container: {e}")
+
+
+def _pickled_variables(code: str, variables: Optional[SandboxVariables]) -> tuple[str, bytes]:
+    """Split variables into a pickle blob, defining the ones that can't be pickled in ``code`` instead."""
+    if not variables:
+        return code, b""
+    payloads, unpicklable = variables.payloads()
+    if unpicklable:
+        code = variables_source(unpicklable) + "\n" + code
+    return code, pack_variables(payloads) if payloads else b""
+
+
+BACKENDS = {
+    InProcessBackend.name: InProcessBackend,
+    SubprocessBackend.name: SubprocessBackend,
+    ContainerBackend.name: ContainerBackend,
+}
+
+
+class SandboxWorkerPool:
+    """
+    Pool of pre-warmed sandbox workers.
+
+    Workers are created by ``backend_factory``, started on ``warm()`` (or lazily on first use),
+    checked out for a single task and reset before being returned to the pool. A ``shared``
+    backend gets a single worker that runs all tasks concurrently, so ``size`` does not cap it.
+    """
+
+    def __init__(self, backend_factory: Callable[[], SandboxBackend], size: int = 2):
+        self.backend_factory = backend_factory
+        self.size = max(1, size)
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[SandboxBackend] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._warm_lock: Optional[asyncio.Lock] = None
+
+    async def warm(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and locks are bound to the loop that created them, and so are the workers'
+            # processes and streams: close the old workers rather than leaking them
+            stale, self._workers = self._workers, []
+            self._loop = loop
+            self._idle = asyncio.Queue()
+            self._warm_lock = asyncio.Lock()
+            for result in await asyncio.gather(*(worker.close() for worker in stale), return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.debug(f"Error closing sandbox worker of a previous event loop: {result}")
+        async with self._warm_lock:
+            if self._workers:
+                return
+            start = time.perf_counter()
+            size = 1 if self.backend_factory.shared else self.size
+            workers = [self.backend_factory() for _ in range(size)]
+            await asyncio.gather(*(worker.start() for worker in workers))
+            for worker in workers:
+                self._workers.append(worker)
+                self._idle.put_nowait(worker)
+            logger.info(
+                f"Warmed {size} '{workers[0].name}' sandbox workers in "
+                f"{(time.perf_counter() - start) * 1000:.0f}ms"
+            )
+
+    async def run(
+        self, preamble: str, code: str, variables: Optional[SandboxVariables] = None
+    ) -> ExecutionResult:
+        await self.warm()
+        if self.backend_factory.shared:
+            return await self._workers[0].execute(preamble, code, variables)
+        worker = await self._idle.get()
+        try:
+            return await worker.execute(preamble, code, variables)
+        finally:
+            try:
+                await worker.reset()
+            except Exception as e:
+                logger.warning(f"Failed to reset sandbox worker, replacing it: {e}")
+                await worker.close()
+            self._idle.put_nowait(worker)
+
+    async def close(self):
+        workers, self._workers = self._workers, []
+        self._loop = None
+        await asyncio.gather(*(worker.close() for worker in workers), return_exceptions=True)
+
+
+_sandbox_pool: Optional[SandboxWorkerPool] = None
+
+
+def get_sandbox_pool() -> SandboxWorkerPool:
+    """Return the process-wide sandbox pool configured from ``[sandbox_pool]`` settings."""
+    global _sandbox_pool
+    if _sandbox_pool is None:
+        backend = settings.sandbox_pool.backend
+        if backend == "auto":
+            backend = InProcessBackend.name if settings.features.local_sandbox else ContainerBackend.name
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown sandbox backend '{backend}', expected one of {list(BACKENDS)}")
+        _sandbox_pool = SandboxWorkerPool(BACKENDS[backend], size=settings.sandbox_pool.size)
+    return _sandbox_pool
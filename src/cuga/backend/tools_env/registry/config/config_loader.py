@@ -54,6 +54,8 @@ class ServiceConfig(BaseModel):
     env: Optional[Dict[str, str]] = None  # Environment variables for STDIO transport
     type: str = ServiceType.OPENAPI  # type of the service
     transport: Optional[str] = None  # Transport type: 'stdio', 'sse', 'http', or None (auto-detect)
+    max_concurrency: Optional[int] = None  # Max in-flight tool calls per MCP server session
+    startup_timeout: Optional[float] = None  # Seconds allowed for this service to initialize at startup
     name: Optional[str] = None
     description: Optional[str] = None
     auth: Optional[Any] = None  # Auth type not defined in the snippet
@@ -154,6 +156,8 @@ def _create_service_config(service_name: str, config: dict, is_mcp_server: bool
         args=config.get('args'),
         env=config.get('env'),
         transport=config.get('transport'),
+        max_concurrency=config.get('max_concurrency'),
+        startup_timeout=config.get('startup_timeout'),
         auth=auth,
         include=config.get('include'),
         type=service_type,
@@ -3,12 +3,12 @@ import re
 from typing import Any, Dict, List, Literal, Optional, TypeAlias
 from urllib.parse import urlencode
 
-import requests
 from loguru import logger
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel
 
 from cuga.backend.tools_env.registry.config.config_loader import ServiceConfig
+from cuga.backend.tools_env.registry.mcp_manager.http_client import get_http_client_pool
 from cuga.backend.tools_env.registry.mcp_manager.openapi_parser import (
     SimpleOpenAPIParser,
 )
@@ -490,11 +490,12 @@ def apply_authentication(auth, headers: dict, query_params: dict):
 
 def create_handler(api, model, base_url: str, name: str, schemas: Dict[str, ServiceConfig]):
     """
-    Create a handler function for an API that processes parameters,
-    builds the URL, and handles the request.
+    Create an async handler function for an API that processes parameters,
+    builds the URL, and handles the request on the pooled async HTTP client
+    so concurrent tool calls do not block the event loop.
     """
 
-    def handler(params: model, headers: dict = None):
+    async def handler(params: model, headers: dict = None):
         all_params = params.model_dump()
         headers = headers if headers else {}
 
@@ -528,10 +529,11 @@ def create_handler(api, model, base_url: str, name: str, schemas: Dict[str, Serv
             body_params.update(additional_body_params)
             use_json = determine_content_type(api)
 
+            http_pool = get_http_client_pool()
             if use_json:
-                response = requests.request(api.method, final_url, headers=headers, json=body_params)
+                response = await http_pool.request(api.method, final_url, headers=headers, json=body_params)
             else:
-                response = requests.request(api.method, final_url, headers=headers, data=body_params)
+                response = await http_pool.request(api.method, final_url, headers=headers, data=body_params)
 
             response.raise_for_status()
             return response.text
@@ -553,7 +555,7 @@ def create_handler(api, model, base_url: str, name: str, schemas: Dict[str, Serv
                 # Try to get response body for more details
                 try:
                     if e.response.headers.get('content-type', '').startswith('application/json'):
-                        error_response["message"] += f" {json.dumps(response.json())}"
+                        error_response["message"] += f" {json.dumps(e.response.json())}"
                     else:
                         error_response["message"] += f" {e.response.text}"
                 except Exception:
@@ -0,0 +1,96 @@
+import asyncio
+import importlib.util
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from cuga.config import settings
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class AsyncHttpClientPool:
+    """
+    Pooled async HTTP client used by the OpenAPI tool handlers.
+
+    One ``httpx.AsyncClient`` is kept per event loop (the registry loop and each SSE server
+    thread have their own), so connections are kept alive and reused across tool calls.
+    In-flight requests are additionally capped per host. Redirects are followed, like the
+    ``requests`` calls this replaced; a ``timeout`` or ``connect_timeout`` of 0 means no limit.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 100,
+        max_connections_per_host: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+    ):
+        self.timeout = httpx.Timeout(timeout or None, connect=connect_timeout or None)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._host_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+    def get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, http2=self.http2, follow_redirects=True
+            )
+            self._clients[loop] = client
+            logger.debug(f"Created pooled HTTP client (http2={self.http2})")
+        return client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        host_limits = self._host_limits.setdefault(loop, {})
+        host = urlparse(url).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return host_limits[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        client = self.get_client()
+        async with self._host_semaphore(url):
+            return await client.request(method, url, **kwargs)
+
+    async def aclose(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+_http_client_pool: Optional[AsyncHttpClientPool] = None
+
+
+def get_http_client_pool() -> AsyncHttpClientPool:
+    """Return the process-wide HTTP client pool configured from ``[registry_http]`` settings."""
+    global _http_client_pool
+    if _http_client_pool is None:
+        _http_client_pool = AsyncHttpClientPool(
+            timeout=settings.registry_http.timeout,
+            connect_timeout=settings.registry_http.connect_timeout,
+            max_connections=settings.registry_http.max_connections,
+            max_connections_per_host=settings.registry_http.max_connections_per_host,
+            keepalive_expiry=settings.registry_http.keepalive_expiry,
+            http2=settings.registry_http.http2,
+        )
+    return _http_client_pool
@@ -1,10 +1,13 @@
 import requests
 from typing import Dict, Any, List
+import copy
 import json
 import aiohttp
-from cuga.config import PACKAGE_ROOT
+from cuga.config import PACKAGE_ROOT, CACHE_DIR, settings
 import os
 import asyncio
+import time
+import uuid
 
 from mcp.types import TextContent
 
@@ -27,13 +30,29 @@ from urllib.parse import urlparse
 from loguru import logger
 from cuga.backend.tools_env.registry.mcp_manager.openapi_parser_v0 import OpenAPITransformer
 from cuga.backend.tools_env.registry.mcp_manager.response_schema import extract_response_schema
+from cuga.backend.tools_env.registry.mcp_manager.session_pool import MCPSessionPool
+from cuga.backend.tools_env.registry.mcp_manager.http_client import get_http_client_pool
+from cuga.backend.tools_env.registry.mcp_manager.schema_cache import SchemaCache
 import yaml
 from cuga.backend.utils.consts import ServiceType, LOCAL_ORCHESTRATE_URL, LOCAL_TRM_URL
 
+DEFAULT_STARTUP_CONCURRENCY = 8
+DEFAULT_STARTUP_TIMEOUT = 30.0
+
 
 class MCPManager:
-    def __init__(self, config: Dict[str, ServiceConfig]):
+    def __init__(
+        self, config: Dict[str, ServiceConfig], startup_concurrency: int = DEFAULT_STARTUP_CONCURRENCY
+    ):
         self.schema_urls: Dict[str, ServiceConfig] = config
+        self.startup_concurrency = startup_concurrency
+        self.schema_cache = SchemaCache(
+            os.path.join(CACHE_DIR, "openapi_schemas"),
+            enabled=settings.schema_cache.enabled,
+            max_age=settings.schema_cache.max_age,
+            max_entries=settings.schema_cache.max_entries,
+        )
+        self.startup_report: Dict[str, Dict[str, Any]] = {}  # Per-service startup status and timing
         self.servers = {}
         self.threads = {}
         self.tools_by_server = defaultdict(list)
@@ -44,6 +63,13 @@ class MCPManager:
         self.trm_tools = {}
         self.mcp_clients = {}  # Store MCP client connections
         self.fastmcp_client = None  # FastMCP client for standard MCP servers
+        self.session_pool = MCPSessionPool()  # Long-lived sessions to external MCP servers
+        self._http_session = None  # Shared aiohttp session for the legacy call_tool fallback
+        # Transformed API catalogs keyed on (app_name, include_response_schema)
+        self._catalog_cache: Dict[tuple, Dict[str, Any]] = {}
+        self.catalog_version = 0
+        # Distinguishes catalog versions across registry restarts
+        self._catalog_instance = uuid.uuid4().hex[:8]
 
     @staticmethod
     def _get_response_schema_from_tool(
@@ -97,15 +123,47 @@ class MCPManager:
         raise RuntimeError("No free port found in safe range.")
 
     @staticmethod
-    def _fetch_and_parse_schema(url_or_path):
+    def _schema_filter_config(config: ServiceConfig) -> Dict[str, Any]:
+        """Parts of a service config that change the post-filter schema"""
+        return {
+            "include": config.include,
+            "api_overrides": [override.model_dump() for override in (config.api_overrides or [])],
+        }
+
+    def _load_openapi_schema(self, config: ServiceConfig):
+        """
+        Fetch, parse, filter and override an OpenAPI spec, using the on-disk schema cache.
+
+        URLs are revalidated with If-None-Match/If-Modified-Since (or used as-is while younger than
+        ``schema_cache.max_age``); local files are revalidated by mtime and size.
+
+        Returns:
+            Tuple of (filtered schema, SimpleOpenAPIParser over it, whether the source is a URL)
+        """
+        url_or_path = config.url
         parsed = urlparse(url_or_path)
         is_url = parsed.scheme in ('http', 'https')
+        cache_key = self.schema_cache.key_for(url_or_path, self._schema_filter_config(config))
+        entry = self.schema_cache.load(cache_key)
+
         if is_url:
+            if entry and self.schema_cache.is_fresh(entry):
+                return self._schema_from_cache_entry(entry, is_url)
+            headers = {}
+            if entry and entry["validators"].get("etag"):
+                headers["If-None-Match"] = entry["validators"]["etag"]
+            if entry and entry["validators"].get("last_modified"):
+                headers["If-Modified-Since"] = entry["validators"]["last_modified"]
             # Handle HTTP/HTTPS URLs
-            r = requests.get(url_or_path.split('&')[0])
+            r = requests.get(url_or_path.split('&')[0], headers=headers)
+            if r.status_code == 304 and entry:
+                logger.debug(f"OpenAPI spec not modified, using cached copy: {url_or_path}")
+                self.schema_cache.store(cache_key, entry)
+                return self._schema_from_cache_entry(entry, is_url)
             r.raise_for_status()
             ct = r.headers.get("Content-Type", "").lower()
             raw = r.text
+            validators = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
         else:
             # Handle local file paths
             if os.path.isabs(url_or_path):
@@ -113,20 +171,42 @@ class MCPManager:
             else:
                 file_path = os.path.join(PACKAGE_ROOT, url_or_path)
 
+            stat = os.stat(file_path)
+            validators = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            if entry and entry["validators"] == validators:
+                return self._schema_from_cache_entry(entry, is_url)
             with open(file_path, 'r', encoding='utf-8') as f:
                 raw = f.read()
             # Determine content type from file extension
             ct = 'json' if file_path.lower().endswith('.json') else 'yaml'
 
+        digest = self.schema_cache.content_digest(raw)
+        if entry and entry["content_sha256"] == digest:
+            self.schema_cache.store(cache_key, {**entry, "validators": validators})
+            return self._schema_from_cache_entry(entry, is_url)
+
         # Parse based on content type
-        if 'json' in ct:
-            parser = SimpleOpenAPIParser.from_json(raw)
-            schema_data = json.loads(raw)
-        else:
-            parser = SimpleOpenAPIParser.from_yaml(raw)
-            schema_data = yaml.safe_load(raw)
+        schema_data = json.loads(raw) if 'json' in ct else yaml.safe_load(raw)
+
+        # Apply filtering and overrides
+        modified_schema = self._filter_and_override_schema(schema_data, config)
+        # JSON round trip gives the parser the same normalized document SimpleOpenAPIParser.from_yaml/from_json
+        # would build, without dumping the filtered schema back to YAML
+        parser_document = json.loads(json.dumps(modified_schema))
+
+        entry = {
+            "source": url_or_path,
+            "validators": validators,
+            "content_sha256": digest,
+            "schema": modified_schema,
+            "parser_document": parser_document,
+        }
+        self.schema_cache.store(cache_key, entry)
+        return modified_schema, SimpleOpenAPIParser(parser_document), is_url
 
-        return schema_data, parser, is_url
+    @staticmethod
+    def _schema_from_cache_entry(entry: Dict[str, Any], is_url: bool):
+        return entry["schema"], SimpleOpenAPIParser(entry["parser_document"]), is_url
 
     def _create_mcp_server(self, base_url, parser, name):
         return new_mcp_from_custom_parser(base_url, parser, name, self.schema_urls)
@@ -415,7 +495,10 @@ class MCPManager:
         return {"success": trm_output_schema, "failure": {"error": "string"}}
 
     async def _get_trm_tools(self, app_name: str, url: str, app_tools: List[str], auth: Auth):
-        tools = (requests.get(url + '/api/v1/tools/', headers={auth.type: auth.value})).json()
+        response = await asyncio.to_thread(
+            requests.get, url + '/api/v1/tools/', headers={auth.type: auth.value}
+        )
+        tools = response.json()
         for tool in tools:
             if tool['name'] in app_tools:
                 self.trm_tools[app_name + '_' + tool['name']] = {
@@ -472,9 +555,61 @@ class MCPManager:
         tools = {app: self.get_apis_for_application(app, include_response_schema) for app in app_names}
         return tools
 
+    def invalidate_catalog(self, app_name: str = None):
+        """
+        Drop precomputed API catalogs and bump the catalog version.
+
+        Must be called whenever ``self.schemas`` changes (onboarding or schema reload).
+
+        Args:
+            app_name: Application whose catalog should be dropped; all apps when None
+        """
+        if app_name is None:
+            self._catalog_cache.clear()
+        else:
+            for key in [key for key in self._catalog_cache if key[0] == app_name]:
+                del self._catalog_cache[key]
+        self.catalog_version += 1
+        logger.debug(f"Invalidated API catalog for {app_name or 'all apps'} (version {self.catalog_version})")
+
+    @property
+    def catalog_etag(self) -> str:
+        return f"{self._catalog_instance}-{self.catalog_version}"
+
+    def _cached_apis_for_application(self, app_name, include_response_schema=False):
+        key = (app_name, include_response_schema)
+        catalog = self._catalog_cache.get(key)
+        if catalog is None:
+            catalog = self._build_apis_for_application(app_name, include_response_schema)
+            self._catalog_cache[key] = catalog
+        return catalog
+
     def get_apis_for_application(self, app_name, include_response_schema=False):
         if "default" in app_name:
             return self.schemas[app_name]
+        # A copy, so callers can't change the cached catalog behind catalog_version's back
+        return copy.deepcopy(self._cached_apis_for_application(app_name, include_response_schema))
+
+    def get_api_metadata(self, app_name: str, function_name: str) -> Dict[str, Any]:
+        """
+        O(1) lookup of a single API definition from the precomputed catalog.
+
+        Args:
+            app_name: Application that owns the function
+            function_name: Tool/API name as exposed by the registry
+
+        Returns:
+            API definition (a copy), or an empty dict if unknown
+        """
+        if "default" in app_name:
+            apis = self.schemas[app_name]
+        else:
+            apis = self._cached_apis_for_application(app_name)
+        if not isinstance(apis, dict):
+            return {}
+        return copy.deepcopy(apis.get(function_name, {}))
+
+    def _build_apis_for_application(self, app_name, include_response_schema=False):
         is_trm_app = any(app_name in item for item in list(self.trm_tools.keys()))
         if is_trm_app:
             result = {}
@@ -532,10 +667,7 @@ class MCPManager:
                             }
                         else:
                             # Fallback to default if no output schema is defined
-                            api_info["response_schemas"] = {
-                                "success": {"string"},
-                                "failure": {"string"},
-                            }
+                            api_info["response_schemas"] = {"success": "string", "failure": "string"}
 
                     result[tool_name] = api_info
 
@@ -553,80 +685,117 @@ class MCPManager:
         if not mcp_servers:
             return
 
-        try:
-            for name, config in mcp_servers:
-                try:
-                    transport = self._create_transport(name, config)
-                    if not transport:
-                        continue
+        await self._run_startup_tasks("mcp_server", mcp_servers, self._initialize_mcp_server)
 
-                    client = FastMCPClient(transport)
+    async def _initialize_mcp_server(self, name: str, config: ServiceConfig):
+        """Connect to a single MCP server, keep its session open and register its tools"""
+        transport = self._create_transport(name, config)
+        if not transport:
+            return
 
-                    logger.info(f"Fetching tools from {name}...")
+        # The first transport is used for the initial handshake; reconnects build a new one
+        transports = [transport]
 
-                    # Add timeout for tool fetching
-                    async def fetch_tools():
-                        async with client:
-                            return await client.list_tools()
+        def transport_factory(name=name, config=config, transports=transports):
+            return transports.pop() if transports else self._create_transport(name, config)
 
-                    try:
-                        tools = await asyncio.wait_for(fetch_tools(), timeout=15.0)
-                        logger.info(
-                            f"Retrieved {len(tools)} tools from {name}: {[tool.name for tool in tools]}"
-                        )
-                    except asyncio.TimeoutError:
-                        print(f"Timeout fetching tools from {name} after 15 seconds")
-                        raise
-
-                    self.schemas[name] = {
-                        "tools": [
-                            {
-                                "name": tool.name,
-                                "description": tool.description,
-                                "inputSchema": tool.inputSchema if hasattr(tool, 'inputSchema') else {},
-                                "outputSchema": tool.outputSchema if hasattr(tool, 'outputSchema') else {},
-                            }
-                            for tool in tools
-                        ]
-                    }
+        session = self.session_pool.register(name, transport_factory, max_concurrency=config.max_concurrency)
 
-                    for tool in tools:
-                        prefixed_name = f"{name}_{tool.name}"
+        logger.info(f"Fetching tools from {name}...")
+        try:
+            # The session stays open for later tool calls
+            tools = await session.list_tools()
+        except BaseException:
+            await self.session_pool.remove(name)
+            raise
+        logger.info(f"Retrieved {len(tools)} tools from {name}: {[tool.name for tool in tools]}")
 
-                        input_schema = tool.inputSchema if hasattr(tool, 'inputSchema') else {}
-                        flattened_params = self._flatten_tool_parameters(input_schema)
+        self.schemas[name] = {
+            "tools": [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "inputSchema": tool.inputSchema if hasattr(tool, 'inputSchema') else {},
+                    "outputSchema": tool.outputSchema if hasattr(tool, 'outputSchema') else {},
+                }
+                for tool in tools
+            ]
+        }
 
-                        output_schema = tool.outputSchema if hasattr(tool, 'outputSchema') else {}
+        for tool in tools:
+            prefixed_name = f"{name}_{tool.name}"
 
-                        tool_dict = {
-                            "type": "function",
-                            "function": {
-                                "name": prefixed_name,
-                                "description": tool.description,
-                                "parameters": flattened_params,
-                                "outputSchema": output_schema,
-                            },
-                        }
-                        self.tools_by_server[name].append(tool_dict)
-                        self.server_by_tool[prefixed_name] = name
+            input_schema = tool.inputSchema if hasattr(tool, 'inputSchema') else {}
+            flattened_params = self._flatten_tool_parameters(input_schema)
 
-                    print(f"✓ Connected to MCP server '{name}' with {len(tools)} tools")
-                    self.mcp_clients[name] = config.url or config.command
+            output_schema = tool.outputSchema if hasattr(tool, 'outputSchema') else {}
 
-                    if not hasattr(self, 'mcp_transports'):
-                        self.mcp_transports = {}
-                    self.mcp_transports[name] = transport
+            tool_dict = {
+                "type": "function",
+                "function": {
+                    "name": prefixed_name,
+                    "description": tool.description,
+                    "parameters": flattened_params,
+                    "outputSchema": output_schema,
+                },
+            }
+            self.tools_by_server[name].append(tool_dict)
+            self.server_by_tool[prefixed_name] = name
+
+        self.invalidate_catalog(name)
+        print(f"✓ Connected to MCP server '{name}' with {len(tools)} tools")
+        self.mcp_clients[name] = config.url or config.command
+
+    async def _run_startup_tasks(self, service_type: str, services: List[tuple], init_service):
+        """
+        Initialize services concurrently with a bounded fan-out.
+
+        Each service runs under its own timeout and failures are isolated: a dead
+        service is recorded in ``self.startup_report`` and does not abort the others.
+
+        Args:
+            service_type: Label used in the startup report (openapi, mcp_server, trm)
+            services: List of (name, ServiceConfig) tuples
+            init_service: Coroutine function taking (name, config)
+        """
+        semaphore = asyncio.Semaphore(self.startup_concurrency)
 
+        async def run_one(name: str, config: ServiceConfig):
+            async with semaphore:
+                timeout = config.startup_timeout or DEFAULT_STARTUP_TIMEOUT
+                start = time.perf_counter()
+                status, error = "ok", None
+                try:
+                    await asyncio.wait_for(init_service(name, config), timeout=timeout)
+                except asyncio.TimeoutError:
+                    status, error = "timeout", f"timed out after {timeout}s"
                 except Exception as e:
-                    print(f"Error connecting to MCP server {name}: {e}")
-                    import traceback
+                    status, error = "failed", str(e)
+                duration = time.perf_counter() - start
+                self.startup_report[name] = {
+                    "type": service_type,
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 1),
+                    "error": error,
+                }
+                if error:
+                    logger.error(f"Failed to initialize {service_type} service '{name}': {error}")
 
-                    print(f"Traceback: {traceback.format_exc()}")
-                    raise
+        await asyncio.gather(*(run_one(name, config) for name, config in services))
 
-        except Exception as e:
-            logger.error(f"Error initializing MCP servers: {e}")
-            raise
+    def _log_startup_report(self):
+        if not self.startup_report:
+            return
+        lines = [
+            f"  {name:<30} {entry['type']:<11} {entry['status']:<8} {entry['duration_ms']:>9.1f}ms"
+            + (f"  {entry['error']}" if entry['error'] else "")
+            for name, entry in sorted(self.startup_report.items(), key=lambda item: -item[1]['duration_ms'])
+        ]
+        failed = sum(1 for entry in self.startup_report.values() if entry['status'] != "ok")
+        logger.info(
+            f"Registry startup: {len(self.startup_report) - failed}/{len(self.startup_report)} services ready\n"
+            + "\n".join(lines)
+        )
 
     def _create_transport(self, name: str, config: ServiceConfig):
         """Create appropriate transport based on configuration"""
@@ -776,70 +945,75 @@ class MCPManager:
         return flattened
 
     async def _call_mcp_server_tool(self, server_name: str, tool_name: str, args: dict):
-        """Call a tool on an external MCP server using FastMCP client with SSE transport"""
+        """Call a tool on an external MCP server using its pooled FastMCP session"""
         try:
-            if hasattr(self, 'mcp_transports') and server_name in self.mcp_transports:
+            session = self.session_pool.get(server_name)
+            if session:
                 original_tool_name = tool_name.replace(f"{server_name}_", "")
 
-                transport = self.mcp_transports[server_name]
-                client = FastMCPClient(transport)
-
-                async with client:
-                    result = await client.call_tool(original_tool_name, args)
-                    ##TODO add result.structured output if exists and retutn instead of text key  return [TextContent(text=result_text, type='text')]
-                    structured_content = (
-                        result.structured_content if hasattr(result, 'structured_content') else None
-                    )
-                    result_text = (
-                        structured_content
-                        if structured_content
-                        else (result.content[0].text if result.content else str(result))
-                    )
-                    if isinstance(result_text, dict):
-                        result_text = json.dumps(result_text)
-                    return [TextContent(text=result_text, type='text')]
+                result = await session.call_tool(original_tool_name, args)
+                ##TODO add result.structured output if exists and retutn instead of text key  return [TextContent(text=result_text, type='text')]
+                structured_content = (
+                    result.structured_content if hasattr(result, 'structured_content') else None
+                )
+                result_text = (
+                    structured_content
+                    if structured_content
+                    else (result.content[0].text if result.content else str(result))
+                )
+                if isinstance(result_text, dict):
+                    result_text = json.dumps(result_text)
+                return [TextContent(text=result_text, type='text')]
             else:
                 url = self.mcp_clients[server_name]
                 base_url = url.replace('/sse', '')
                 original_tool_name = tool_name.replace(f"{server_name}_", "")
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{base_url}/call_tool", json={"name": original_tool_name, "arguments": args}
-                    ) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            structured_content = result.get('structured_content', None)
-                            result_text = (
-                                structured_content
-                                if structured_content
-                                else (
-                                    result.get('content', [{}])[0].get('text', '')
-                                    if result.get('content')
-                                    else str(result)
-                                )
-                            )
-                            if isinstance(result_text, dict):
-                                result_text = json.dumps(result_text)
-                            return [TextContent(text=result_text, type='text')]
-                        else:
-                            error_msg = f"MCP server call failed with status {response.status}"
-                            structured_content = result.get('structured_content', None)
-                            result_text = (
-                                structured_content
-                                if structured_content
-                                else (
-                                    result.get('content', [{}])[0].get('text', '')
-                                    if result.get('content')
-                                    else str(result)
-                                )
+                session = self._get_http_session()
+                async with session.post(
+                    f"{base_url}/call_tool", json={"name": original_tool_name, "arguments": args}
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        structured_content = result.get('structured_content', None)
+                        result_text = (
+                            structured_content
+                            if structured_content
+                            else (
+                                result.get('content', [{}])[0].get('text', '')
+                                if result.get('content')
+                                else str(result)
                             )
-                            return [TextContent(text=error_msg, type='text')]
+                        )
+                        if isinstance(result_text, dict):
+                            result_text = json.dumps(result_text)
+                        return [TextContent(text=result_text, type='text')]
+                    else:
+                        error_msg = f"MCP server call failed with status {response.status}"
+                        return [TextContent(text=error_msg, type='text')]
 
         except Exception as e:
             error_msg = f"Error calling MCP server tool: {e}"
             return [TextContent(text=error_msg, type='text')]
 
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession()
+        return self._http_session
+
+    def get_mcp_server_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-server call latency and connection state of the pooled MCP sessions"""
+        return self.session_pool.get_stats()
+
+    async def close(self):
+        """Close pooled MCP sessions and the shared HTTP sessions"""
+        await self.session_pool.close()
+        await get_http_client_pool().aclose()
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+
     async def load_tools(self):
         openapi = []
         trm = []
@@ -858,64 +1032,63 @@ class MCPManager:
                 }
             elif config.type == ServiceType.MCP_SERVER:
                 mcp_servers.append((name, config))
-        if openapi and len(openapi) > 0:
+
+        async def start_openapi():
             await self.initialize_servers(openapi)
             await self.run_all_servers()
 
+        async def init_trm(name: str, config: ServiceConfig):
+            data = trm_urls[name]
+            await self._get_trm_tools(name, data["url"], data["tools"], data["auth"])
+
+        # OpenAPI, MCP and TRM services are initialized concurrently
+        startup = []
+        if openapi and len(openapi) > 0:
+            startup.append(start_openapi())
         # Initialize FastMCP client for all MCP servers
         if mcp_servers:
-            await self._initialize_fastmcp_client(mcp_servers)
-
+            startup.append(self._initialize_fastmcp_client(mcp_servers))
         if len(trm_urls) > 0:
-            for name, data in trm_urls.items():
-                await self._get_trm_tools(name, data["url"], data["tools"], data["auth"])
+            startup.append(self._run_startup_tasks("trm", trm, init_trm))
+        await asyncio.gather(*startup)
+
         self.add_trm_tools(trm)
+        self._log_startup_report()
 
     def add_trm_tools(self, services: List[Service]):
         for name, config in services:
             self.auth_config[name] = config.auth
             schemas = []
             for tool_name in config.tools:
-                schema_data = self.trm_tools[name + '_' + tool_name]
+                schema_data = self.trm_tools.get(name + '_' + tool_name)
+                if schema_data is None:
+                    logger.warning(f"TRM tool '{tool_name}' of service '{name}' was not loaded, skipping")
+                    continue
                 schemas.append(schema_data)
             self.schemas[name] = schemas
+            self.invalidate_catalog(name)
 
     async def initialize_servers(self, services: List[Service]):
-        for name, config in services:
-            try:
-                schema_data, parser, is_url = self._fetch_and_parse_schema(config.url)
-                if not is_url:
-                    # this is a path
-                    config.url = schema_data['servers'][0]['url']
-
-                # Apply filtering and overrides
-                modified_schema = self._filter_and_override_schema(schema_data, config)
-
-                self.schemas[name] = modified_schema
-                self.auth_config[name] = config.auth
-                base_url = self._extract_base_url(config.url)
-
-                # Create parser from modified schema
-                has_body_overrides = any(
-                    override.drop_request_body_parameters for override in (config.api_overrides or [])
-                )
-                has_query_overrides = any(
-                    override.drop_query_parameters for override in (config.api_overrides or [])
-                )
+        await self._run_startup_tasks("openapi", services, self._initialize_openapi_server)
+
+    async def _initialize_openapi_server(self, name: str, config: ServiceConfig):
+        try:
+            modified_schema, parser, is_url = await asyncio.to_thread(self._load_openapi_schema, config)
+            if not is_url:
+                # this is a path
+                config.url = modified_schema['servers'][0]['url']
+
+            self.schemas[name] = modified_schema
+            self.invalidate_catalog(name)
+            self.auth_config[name] = config.auth
+            base_url = self._extract_base_url(config.url)
 
-                if config.include or config.api_overrides or has_body_overrides or has_query_overrides:
-                    # Re-create parser with modified schema
-                    schema_json = (
-                        yaml.dump(modified_schema)
-                        if isinstance(modified_schema, dict)
-                        else str(modified_schema)
-                    )
-                    parser = SimpleOpenAPIParser.from_yaml(schema_json)
-                mcp_server = self._create_mcp_server(base_url, parser, name)
-                self.servers[name] = mcp_server
-                await self._register_tools(mcp_server)
-            except Exception as e:
-                print(f"Failed to initialize server for {config.url}: {e}")
+            mcp_server = self._create_mcp_server(base_url, parser, name)
+            self.servers[name] = mcp_server
+            await self._register_tools(mcp_server)
+        except Exception as e:
+            print(f"Failed to initialize server for {config.url}: {e}")
+            raise
 
     async def _register_tools(self, mcp_server):
         response = await mcp_server.list_tools()
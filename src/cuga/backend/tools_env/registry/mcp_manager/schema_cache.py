@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_ENTRIES = 64
+
+
+class SchemaCache:
+    """
+    On-disk cache of fetched and post-processed OpenAPI specs.
+
+    Entries are keyed on the spec source (URL or file path) plus the service's filter/override
+    configuration, and carry the validators needed to detect changes: ``ETag``/``Last-Modified``
+    for URLs, mtime and size for local files. Each entry stores the filtered schema together with
+    the document used by ``SimpleOpenAPIParser``, pickled, so a warm start skips downloading,
+    YAML parsing and the dump/re-parse round trip.
+
+    Every spec or filter change creates a new entry, so beyond ``max_entries`` the entries used
+    least recently (by mtime, which ``load`` refreshes) are deleted when a new one is written.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        enabled: bool = True,
+        max_age: float = 0.0,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.max_age = max_age
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key_for(source: str, filter_config: Dict[str, Any]) -> str:
+        payload = json.dumps({"source": source, "filter": filter_config}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def content_digest(raw: str) -> str:
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable schema cache entry {path}: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get("format_version") != CACHE_FORMAT_VERSION:
+            return None
+        try:
+            os.utime(path)  # Marks the entry as recently used for eviction
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key: str, entry: Dict[str, Any]):
+        if not self.enabled:
+            return
+        entry = {**entry, "format_version": CACHE_FORMAT_VERSION, "fetched_at": time.time()}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write atomically so concurrent registry starts never read a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            logger.warning(f"Failed to write schema cache entry for {entry.get('source')}: {e}")
+            return
+        self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        """Delete the least recently used entries beyond ``max_entries`` (never ``keep``)."""
+        if self.max_entries <= 0:
+            return
+        try:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl") and name != f"{keep}.pkl":
+                    path = os.path.join(self.cache_dir, name)
+                    entries.append((os.path.getmtime(path), path))
+        except OSError as e:
+            logger.debug(f"Could not list schema cache entries: {e}")
+            return
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) + 1 - self.max_entries)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.debug(f"Could not evict schema cache entry {path}: {e}")
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether a URL entry is recent enough to be used without revalidating it."""
+        return self.max_age > 0 and time.time() - entry.get("fetched_at", 0) < self.max_age
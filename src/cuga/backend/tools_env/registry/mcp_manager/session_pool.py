@@ -0,0 +1,209 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+import anyio
+from loguru import logger
+
+try:
+    from fastmcp import Client as FastMCPClient
+    from fastmcp.exceptions import ToolError
+except ImportError:
+    FastMCPClient = None
+    ToolError = None
+
+DEFAULT_MAX_CONCURRENCY = 8
+HEALTH_CHECK_INTERVAL = 30.0
+HEALTH_CHECK_TIMEOUT = 5.0
+
+
+def _request_not_sent(error: BaseException) -> bool:
+    """
+    True when a call failed before its request was written to the session, so replaying it can't
+    run the tool twice: the client was not connected, or its write stream was already closed.
+    """
+    for e in (error, error.__cause__):
+        if isinstance(e, (anyio.ClosedResourceError, anyio.BrokenResourceError)):
+            return True
+        if isinstance(e, RuntimeError) and "not connected" in str(e):
+            return True
+    return False
+
+
+class ServerCallStats:
+    """Latency and error counters for calls made against a single MCP server."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def record(self, latency: float, failed: bool = False):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+            "last_latency_ms": round(self.last_latency * 1000, 2),
+        }
+
+
+class PooledMCPSession:
+    """
+    Long-lived FastMCP client session for a single MCP server.
+
+    The session is opened lazily, kept open between calls, health-checked with a ping
+    when it has been idle, and transparently re-established when it breaks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        transport_factory: Callable[[], Any],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+    ):
+        self.name = name
+        self.transport_factory = transport_factory
+        self.max_concurrency = max_concurrency
+        self.health_check_interval = health_check_interval
+        self.stats = ServerCallStats()
+        self._client = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._connect_lock = asyncio.Lock()
+        self._last_used = 0.0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client is not None and self._client.is_connected()
+
+    async def _connect(self):
+        if not FastMCPClient:
+            raise Exception("FastMCP not available. Please install fastmcp package.")
+        client = FastMCPClient(self.transport_factory())
+        await client.__aenter__()
+        self._client = client
+        self._last_used = time.monotonic()
+        logger.debug(f"Opened pooled MCP session for '{self.name}'")
+
+    async def _ensure_connected(self):
+        async with self._connect_lock:
+            if self.is_connected and time.monotonic() - self._last_used > self.health_check_interval:
+                try:
+                    await asyncio.wait_for(self._client.ping(), timeout=HEALTH_CHECK_TIMEOUT)
+                    self._last_used = time.monotonic()
+                except Exception as e:
+                    logger.warning(f"Health check failed for MCP server '{self.name}': {e}")
+                    await self._close_client()
+            if not self.is_connected:
+                if self._client is not None:
+                    await self._close_client()
+                    self.stats.reconnects += 1
+                await self._connect()
+        return self._client
+
+    async def _close_client(self):
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug(f"Error closing MCP session for '{self.name}': {e}")
+
+    async def _run(self, operation: Callable[[Any], Any], idempotent: bool = False):
+        """
+        Run ``operation(client)`` on the session, reconnecting and running it once more if the
+        session broke. Operations that are not ``idempotent`` (tool calls, which may have side
+        effects) are only run again when the request never reached the session.
+        """
+        async with self._semaphore:
+            for attempt in range(2):
+                client = await self._ensure_connected()
+                try:
+                    result = await operation(client)
+                    self._last_used = time.monotonic()
+                    return result
+                except Exception as e:
+                    if (ToolError and isinstance(e, ToolError)) or attempt == 1:
+                        raise
+                    if not idempotent and not _request_not_sent(e):
+                        # The server may already have run it; the next call reconnects if needed
+                        raise
+                    logger.warning(f"MCP session for '{self.name}' failed ({e}), reconnecting")
+                    async with self._connect_lock:
+                        if self._client is client:
+                            await self._close_client()
+                            self.stats.reconnects += 1
+
+    async def list_tools(self):
+        return await self._run(lambda client: client.list_tools(), idempotent=True)
+
+    async def call_tool(self, tool_name: str, args: dict):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return await self._run(lambda client: client.call_tool(tool_name, args))
+        except Exception:
+            failed = True
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            self.stats.record(latency, failed=failed)
+            logger.debug(f"MCP call {self.name}.{tool_name} took {latency * 1000:.1f}ms")
+
+    async def close(self):
+        async with self._connect_lock:
+            await self._close_client()
+
+
+class MCPSessionPool:
+    """Registry of long-lived MCP sessions, one per configured MCP server."""
+
+    def __init__(self):
+        self.sessions: Dict[str, PooledMCPSession] = {}
+
+    def register(
+        self,
+        name: str,
+        transport_factory: Callable[[], Any],
+        max_concurrency: Optional[int] = None,
+    ) -> PooledMCPSession:
+        session = PooledMCPSession(
+            name, transport_factory, max_concurrency=max_concurrency or DEFAULT_MAX_CONCURRENCY
+        )
+        self.sessions[name] = session
+        return session
+
+    def get(self, name: str) -> Optional[PooledMCPSession]:
+        return self.sessions.get(name)
+
+    async def remove(self, name: str):
+        session = self.sessions.pop(name, None)
+        if session is not None:
+            await session.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                **session.stats.to_dict(),
+                "connected": session.is_connected,
+                "max_concurrency": session.max_concurrency,
+            }
+            for name, session in self.sessions.items()
+        }
+
+    async def close(self):
+        await asyncio.gather(*(session.close() for session in self.sessions.values()), return_exceptions=True)
@@ -0,0 +1,137 @@
+"""
+Test the async OpenAPI tool handlers running on the pooled HTTP client.
+"""
+
+import asyncio
+import functools
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cuga.backend.tools_env.registry.config.config_loader import ServiceConfig
+from cuga.backend.tools_env.registry.mcp_manager.adapter import (
+    build_model,
+    create_handler,
+    extract_field_definitions,
+)
+from cuga.backend.tools_env.registry.mcp_manager import http_client
+from cuga.backend.tools_env.registry.mcp_manager.http_client import AsyncHttpClientPool
+from cuga.backend.tools_env.registry.mcp_manager.openapi_parser import SimpleOpenAPIParser
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pets", "version": "1.0.0"},
+    "servers": [{"url": "http://pets.local"}],
+    "paths": {
+        "/pets/{pet_id}": {
+            "get": {
+                "operationId": "get_pet",
+                "description": "Get a pet",
+                "parameters": [
+                    {"name": "pet_id", "in": "path", "required": True, "schema": {"type": "integer"}}
+                ],
+                "responses": {"200": {"description": "OK"}},
+            }
+        }
+    },
+}
+
+
+async def _slow_pet(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(0.2)
+    pet_id = request.url.path.rsplit("/", 1)[-1]
+    if pet_id == "404":
+        return httpx.Response(404, json={"detail": "not found"})
+    return httpx.Response(200, json={"id": int(pet_id)})
+
+
+@pytest.fixture
+def handler_and_model():
+    parser = SimpleOpenAPIParser.from_json(json.dumps(SPEC))
+    api = next(iter(parser.apis()))
+    model = build_model("GetPetInput", extract_field_definitions(api))
+    handler = create_handler(api, model, "http://pets.local", "pets", {"pets": ServiceConfig(name="pets")})
+    return handler, model
+
+
+@pytest.fixture
+def pool():
+    pool = AsyncHttpClientPool(max_connections_per_host=10)
+    mock_client = httpx.AsyncClient(transport=httpx.MockTransport(_slow_pet))
+    with (
+        patch.object(pool, "get_client", return_value=mock_client),
+        patch(
+            "cuga.backend.tools_env.registry.mcp_manager.adapter.get_http_client_pool",
+            return_value=pool,
+        ),
+    ):
+        yield pool
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_run_in_parallel(handler_and_model, pool):
+    handler, model = handler_and_model
+    start = time.perf_counter()
+    results = await asyncio.gather(*(handler(model(pet_id=i)) for i in range(5)))
+    elapsed = time.perf_counter() - start
+
+    assert [json.loads(r)["id"] for r in results] == list(range(5))
+    assert elapsed < 0.8
+
+
+@pytest.mark.asyncio
+async def test_http_error_is_returned_as_error_response(handler_and_model, pool):
+    handler, model = handler_and_model
+    result = await handler(model(pet_id=404))
+
+    assert result["status"] == "exception"
+    assert result["status_code"] == 404
+    assert "not found" in result["message"]
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_serializes_requests(handler_and_model, pool):
+    handler, model = handler_and_model
+    pool.max_connections_per_host = 1
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(model(pet_id=i)) for i in range(3)))
+    assert time.perf_counter() - start >= 0.6
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_follows_redirects_without_total_timeout():
+    pool = AsyncHttpClientPool(connect_timeout=5)
+    client = pool.get_client()
+    try:
+        assert client.follow_redirects
+        assert client.timeout.read is None and client.timeout.connect == 5
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_redirected_call_returns_final_response(handler_and_model):
+    handler, model = handler_and_model
+
+    async def moved(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/pets/1":
+            return httpx.Response(307, headers={"Location": "http://pets.local/v2/pets/1"})
+        return httpx.Response(200, json={"id": 1, "path": request.url.path})
+
+    pool = AsyncHttpClientPool()
+    # The pool builds its client as usual; only the transport is replaced
+    client_class = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(moved))
+    with (
+        patch.object(http_client.httpx, "AsyncClient", client_class),
+        patch(
+            "cuga.backend.tools_env.registry.mcp_manager.adapter.get_http_client_pool",
+            return_value=pool,
+        ),
+    ):
+        result = await handler(model(pet_id=1))
+    await pool.aclose()
+
+    assert json.loads(result) == {"id": 1, "path": "/v2/pets/1"}
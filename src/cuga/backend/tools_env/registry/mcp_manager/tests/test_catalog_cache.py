@@ -0,0 +1,85 @@
+"""
+Test the precomputed API catalog cache in MCPManager.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from cuga.backend.tools_env.registry.mcp_manager import mcp_manager as mcp_manager_module
+from cuga.backend.tools_env.registry.mcp_manager.mcp_manager import MCPManager
+
+
+def _schema(operation_id: str) -> dict:
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Catalog Test API", "version": "1.0.0"},
+        "servers": [{"url": "http://localhost:9999"}],
+        "paths": {
+            f"/{operation_id}": {
+                "get": {
+                    "operationId": operation_id,
+                    "description": f"Operation {operation_id}",
+                    "responses": {"200": {"description": "OK"}},
+                }
+            }
+        },
+    }
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Test catalog caching and invalidation."""
+
+    def setUp(self):
+        self.manager = MCPManager(config={})
+        self.manager.schemas["shop"] = _schema("list_items")
+
+    def test_transform_runs_once_per_key(self):
+        with patch.object(
+            mcp_manager_module, "OpenAPITransformer", wraps=mcp_manager_module.OpenAPITransformer
+        ) as transformer:
+            first = self.manager.get_apis_for_application("shop")
+            second = self.manager.get_apis_for_application("shop")
+            self.assertEqual(first, second)
+            self.assertEqual(transformer.call_count, 1)
+
+            self.manager.get_apis_for_application("shop", include_response_schema=True)
+            self.assertEqual(transformer.call_count, 2)
+
+    def test_api_metadata_lookup(self):
+        apis = self.manager.get_apis_for_application("shop")
+        api_name = next(iter(apis))
+        self.assertEqual(self.manager.get_api_metadata("shop", api_name), apis[api_name])
+        self.assertEqual(self.manager.get_api_metadata("shop", "missing"), {})
+
+    def test_callers_get_copies_of_the_catalog(self):
+        apis = self.manager.get_apis_for_application("shop")
+        api_name = next(iter(apis))
+        apis[api_name]["description"] = "changed by a caller"
+        apis["injected"] = {}
+        self.manager.get_api_metadata("shop", api_name)["description"] = "changed too"
+
+        version = self.manager.catalog_version
+        fresh = self.manager.get_apis_for_application("shop")
+        self.assertNotIn("injected", fresh)
+        self.assertEqual(fresh[api_name]["description"], "Operation list_items")
+        self.assertEqual(
+            self.manager.get_api_metadata("shop", api_name)["description"], "Operation list_items"
+        )
+        self.assertEqual(self.manager.catalog_version, version)
+
+    def test_invalidate_catalog(self):
+        before = self.manager.get_apis_for_application("shop")
+        version = self.manager.catalog_version
+
+        self.manager.schemas["shop"] = _schema("list_orders")
+        self.assertEqual(self.manager.get_apis_for_application("shop"), before)
+
+        self.manager.invalidate_catalog("shop")
+        after = self.manager.get_apis_for_application("shop")
+        self.assertGreater(self.manager.catalog_version, version)
+        self.assertNotEqual(list(before), list(after))
+        self.assertTrue(any("list_orders" in name for name in after))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Test concurrent, failure-isolated service startup in MCPManager.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from cuga.backend.tools_env.registry.config.config_loader import ServiceConfig
+from cuga.backend.tools_env.registry.mcp_manager.mcp_manager import MCPManager
+
+
+@pytest.mark.asyncio
+async def test_startup_is_concurrent_and_isolated():
+    services = [
+        ("fast_a", ServiceConfig(name="fast_a")),
+        ("fast_b", ServiceConfig(name="fast_b")),
+        ("broken", ServiceConfig(name="broken")),
+        ("hanging", ServiceConfig(name="hanging", startup_timeout=0.3)),
+    ]
+    initialized = []
+
+    async def init_service(name, config):
+        if name == "broken":
+            raise ConnectionError("connection refused")
+        await asyncio.sleep(10 if name == "hanging" else 0.2)
+        initialized.append(name)
+
+    manager = MCPManager(config={})
+    start = time.perf_counter()
+    await manager._run_startup_tasks("mcp_server", services, init_service)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(initialized) == ["fast_a", "fast_b"]
+    assert elapsed < 1.0
+    report = manager.startup_report
+    assert report["fast_a"]["status"] == "ok"
+    assert report["broken"]["status"] == "failed"
+    assert "connection refused" in report["broken"]["error"]
+    assert report["hanging"]["status"] == "timeout"
+    assert all(entry["type"] == "mcp_server" for entry in report.values())
+
+
+@pytest.mark.asyncio
+async def test_startup_fan_out_is_bounded():
+    running = 0
+    peak = 0
+
+    async def init_service(name, config):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    manager = MCPManager(config={}, startup_concurrency=2)
+    services = [(f"svc_{i}", ServiceConfig(name=f"svc_{i}")) for i in range(6)]
+    await manager._run_startup_tasks("openapi", services, init_service)
+
+    assert peak == 2
+    assert len(manager.startup_report) == 6
@@ -0,0 +1,131 @@
+"""
+Test the on-disk OpenAPI schema cache used by MCPManager.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from cuga.backend.tools_env.registry.config.config_loader import ServiceConfig
+from cuga.backend.tools_env.registry.mcp_manager.mcp_manager import MCPManager
+from cuga.backend.tools_env.registry.mcp_manager.schema_cache import SchemaCache
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pets", "version": "1.0.0"},
+    "servers": [{"url": "http://pets.local"}],
+    "paths": {
+        "/pets": {
+            "get": {"operationId": "list_pets", "responses": {"200": {"description": "OK"}}},
+            "post": {"operationId": "create_pet", "responses": {"200": {"description": "OK"}}},
+        }
+    },
+}
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = MCPManager(config={})
+    manager.schema_cache = SchemaCache(str(tmp_path / "cache"))
+    return manager
+
+
+@pytest.fixture
+def spec_file(tmp_path):
+    path = tmp_path / "pets.yaml"
+    path.write_text(yaml.dump(SPEC))
+    return path
+
+
+def test_local_spec_is_parsed_once_and_filtered(manager, spec_file):
+    config = ServiceConfig(name="pets", url=str(spec_file), include=["list_pets"])
+
+    schema, parser, is_url = manager._load_openapi_schema(config)
+    assert not is_url
+    assert [api.operation_id for api in parser.apis()] == ["list_pets"]
+
+    with patch("yaml.safe_load", side_effect=AssertionError("spec was re-parsed")):
+        cached_schema, cached_parser, _ = manager._load_openapi_schema(config)
+    assert cached_schema == schema
+    assert [api.operation_id for api in cached_parser.apis()] == ["list_pets"]
+
+
+def test_local_spec_change_invalidates_entry(manager, spec_file):
+    config = ServiceConfig(name="pets", url=str(spec_file))
+    manager._load_openapi_schema(config)
+
+    spec_file.write_text(yaml.dump({**SPEC, "info": {"title": "Pets v2", "version": "2.0.0"}}))
+    stat = spec_file.stat()
+    os.utime(spec_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    schema, _, _ = manager._load_openapi_schema(config)
+    assert schema["info"]["title"] == "Pets v2"
+
+
+def test_filter_config_is_part_of_the_key(manager, spec_file):
+    manager._load_openapi_schema(ServiceConfig(name="pets", url=str(spec_file), include=["list_pets"]))
+    _, parser, _ = manager._load_openapi_schema(ServiceConfig(name="pets", url=str(spec_file)))
+    assert sorted(api.operation_id for api in parser.apis()) == ["create_pet", "list_pets"]
+
+
+def test_url_spec_is_revalidated_with_etag(manager):
+    url = "http://pets.local/openapi.json"
+    config = ServiceConfig(name="pets", url=url)
+    responses = [
+        _Response(200, yaml.dump(SPEC), {"Content-Type": "application/yaml", "ETag": '"v1"'}),
+        _Response(304),
+    ]
+
+    with patch("requests.get", side_effect=responses) as get:
+        first, _, is_url = manager._load_openapi_schema(config)
+        second, _, _ = manager._load_openapi_schema(config)
+
+    assert is_url
+    assert second == first
+    assert get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_fresh_url_entry_skips_the_request(manager):
+    manager.schema_cache.max_age = 60
+    config = ServiceConfig(name="pets", url="http://pets.local/openapi.json")
+
+    with patch("requests.get", return_value=_Response(200, yaml.dump(SPEC))) as get:
+        manager._load_openapi_schema(config)
+        manager._load_openapi_schema(config)
+
+    assert get.call_count == 1
+
+
+def test_least_recently_used_entries_are_evicted(manager, spec_file):
+    manager.schema_cache.max_entries = 2
+    cache_dir = manager.schema_cache.cache_dir
+    listing, creating, everything = (
+        ServiceConfig(name="pets", url=str(spec_file), include=include)
+        for include in (["list_pets"], ["create_pet"], None)
+    )
+
+    def key(config):
+        return manager.schema_cache.key_for(str(spec_file), manager._schema_filter_config(config))
+
+    manager._load_openapi_schema(listing)
+    manager._load_openapi_schema(creating)
+    for name in os.listdir(cache_dir):
+        os.utime(os.path.join(cache_dir, name), (0, 0))
+    # Using ``listing`` again leaves ``creating`` as the least recently used entry
+    manager._load_openapi_schema(listing)
+    manager._load_openapi_schema(everything)
+
+    assert sorted(os.listdir(cache_dir)) == sorted(f"{key(config)}.pkl" for config in (listing, everything))
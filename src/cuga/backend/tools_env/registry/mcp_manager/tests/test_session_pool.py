@@ -0,0 +1,134 @@
+"""
+Test the pooled FastMCP sessions used for external MCP server calls.
+"""
+
+import asyncio
+
+import anyio
+import pytest
+from fastmcp import FastMCP
+from mcp import McpError
+from mcp.types import CONNECTION_CLOSED, ErrorData
+
+from cuga.backend.tools_env.registry.mcp_manager.session_pool import MCPSessionPool, PooledMCPSession
+
+
+def _make_server() -> FastMCP:
+    server = FastMCP("pool_test")
+
+    @server.tool
+    async def echo(text: str) -> str:
+        await asyncio.sleep(0.01)
+        return text
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_between_calls():
+    server = _make_server()
+    created = []
+
+    def factory():
+        created.append(server)
+        return server
+
+    pool = MCPSessionPool()
+    session = pool.register("pool_test", factory, max_concurrency=2)
+    try:
+        tools = await session.list_tools()
+        assert [tool.name for tool in tools] == ["echo"]
+
+        results = await asyncio.gather(*(session.call_tool("echo", {"text": str(i)}) for i in range(5)))
+        assert [r.content[0].text for r in results] == [str(i) for i in range(5)]
+        assert len(created) == 1
+
+        stats = pool.get_stats()["pool_test"]
+        assert stats["calls"] == 5
+        assert stats["errors"] == 0
+        assert stats["connected"] is True
+        assert stats["max_concurrency"] == 2
+    finally:
+        await pool.close()
+    assert not session.is_connected
+
+
+@pytest.mark.asyncio
+async def test_session_reconnects_after_close():
+    server = _make_server()
+    pool = MCPSessionPool()
+    session = pool.register("pool_test", lambda: server)
+    try:
+        await session.call_tool("echo", {"text": "first"})
+        await session.close()
+        result = await session.call_tool("echo", {"text": "second"})
+        assert result.content[0].text == "second"
+        assert session.is_connected
+    finally:
+        await pool.close()
+
+
+class FlakyClient:
+    """Stands in for a FastMCP client whose first call fails with ``error``."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def call_tool(self, name, args):
+        self.calls.append(name)
+        if self.error is not None:
+            raise self.error
+        return name
+
+    async def list_tools(self):
+        return await self.call_tool("list_tools", {})
+
+
+def flaky_session(first_error):
+    clients = [FlakyClient(first_error), FlakyClient()]
+    session = PooledMCPSession("flaky", transport_factory=lambda: None)
+    connections = iter(clients)
+
+    async def connect():
+        session._client = next(connections)
+
+    session._connect = connect
+    return session, clients
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_not_replayed_after_it_may_have_been_sent():
+    session, clients = flaky_session(McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed")))
+
+    with pytest.raises(McpError):
+        await session.call_tool("send_email", {})
+
+    assert clients[0].calls == ["send_email"]
+    assert clients[1].calls == []
+    assert session.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_retried_when_the_request_was_never_sent():
+    session, clients = flaky_session(anyio.ClosedResourceError())
+
+    assert await session.call_tool("send_email", {}) == "send_email"
+    assert clients[0].closed
+    assert clients[1].calls == ["send_email"]
+    assert session.stats.reconnects == 1
+
+
+@pytest.mark.asyncio
+async def test_listing_tools_is_retried_after_any_session_failure():
+    session, clients = flaky_session(McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed")))
+
+    assert await session.list_tools() == "list_tools"
+    assert clients[1].calls == ["list_tools"]
@@ -20,6 +20,7 @@ class ApiRegistry:
         logger.info("ApiRegistry: Initializing.")
         self.mcp_client = client
         self.auth_manager = None
+        self._catalog: Dict[str, Any] = None
 
     async def start_servers(self):
         """Start servers and load tools"""
@@ -39,6 +40,43 @@ class ApiRegistry:
         #      raise HTTPException(status_code=404, detail=f"Application '{app_name}' not found.")
         return self.mcp_client.get_apis_for_application(app_name, include_response_schema)
 
+    async def get_catalog(self) -> Dict[str, Any]:
+        """
+        Snapshot of all applications, their APIs (with response schemas) and tool counts.
+
+        The snapshot is rebuilt only when the catalog version changes, so the version doubles as an ETag.
+        """
+        version = self.mcp_client.catalog_etag
+        if self._catalog is not None and self._catalog["version"] == version:
+            return self._catalog
+        apps = await self.show_applications()
+        apis = {}
+        for app in apps:
+            try:
+                apis[app.name] = self.mcp_client.get_apis_for_application(app.name, True)
+            except Exception as e:
+                logger.warning(f"ApiRegistry: no APIs for '{app.name}' in catalog snapshot: {e}")
+                apis[app.name] = {}
+        tool_counts = {name: len(app_apis) for name, app_apis in apis.items()}
+        self._catalog = {
+            "version": version,
+            "apps": [app.model_dump() for app in apps],
+            "apis": apis,
+            "tool_counts": tool_counts,
+            "total_tools": sum(tool_counts.values()),
+        }
+        return self._catalog
+
+    async def get_api_info(self, app_name: str, function_name: str) -> Dict[str, Any]:
+        """Returns the cached definition of a single API of a specific app."""
+        return self.mcp_client.get_api_metadata(app_name, function_name)
+
+    def onboard_schemas(self, app_name: str, schemas: List[dict]):
+        """Registers tool schemas for an app and invalidates its cached catalog."""
+        logger.debug(f"ApiRegistry: onboard_schemas(app_name='{app_name}') called.")
+        self.mcp_client.schemas[app_name] = schemas
+        self.mcp_client.invalidate_catalog(app_name)
+
     async def show_all_apis(self, include_response_schema) -> List[Dict[str, str]]:
         """Gets all API definitions."""
         logger.debug("ApiRegistry: show_all_apis() called.")
@@ -2,11 +2,12 @@ import json
 import os
 from contextlib import asynccontextmanager
 from json import JSONDecodeError
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from pathlib import Path
 from mcp.types import TextContent
 from pydantic import BaseModel  # Import BaseModel for request body
 from typing import Dict, Any, List, Optional  # Add Any for flexible args/return
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from cuga.config import PACKAGE_ROOT
 from cuga.backend.activity_tracker.tracker import ActivityTracker, Step
@@ -60,6 +61,7 @@ async def lifespan(app: FastAPI):
     registry = ApiRegistry(client=mcp_manager)
     await registry.start_servers()
     yield
+    await mcp_manager.close()
 
 
 # --- FastAPI Server Setup ---
@@ -84,6 +86,20 @@ async def list_applications():
     return await registry.show_applications()
 
 
+@app.get("/catalog", tags=["Applications"])
+async def get_catalog(request: Request):
+    global registry
+    """
+    Versioned snapshot of all applications, their APIs (with response schemas) and tool counts.
+    Send the returned ETag back as If-None-Match to get a 304 while the catalog is unchanged.
+    """
+    catalog = await registry.get_catalog()
+    etag = f'"{catalog["version"]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content=jsonable_encoder(catalog), headers={"ETag": etag})
+
+
 # -- API Endpoints --
 @app.get("/applications/{app_name}/apis", tags=["APIs"])
 async def list_application_apis(app_name: str, include_response_schema: bool = False):
@@ -124,7 +140,7 @@ async def authenticate_apps(request: AuthAppsRequest):
 @app.post("/functions/onboard", tags=["Functions"])
 async def onboard_function(request: FunctionCallOnboardRequest):
     global registry, mcp_manager
-    mcp_manager.schemas[request.app_name] = request.schemas
+    registry.onboard_schemas(request.app_name, request.schemas)
     return {"status": f"Loaded successfully {len(request.schemas)} tools"}
 
 
@@ -142,8 +158,7 @@ async def call_mcp_function(request: FunctionCallRequest, trajectory_path: Optio
     print(f"Received request to call function: {request.function_name} with args: {request.args}")
     try:
         global mcp_manager
-        apis = await registry.show_apis_for_app(request.app_name)
-        api_info = apis.get(request.function_name, {})
+        api_info = await registry.get_api_info(request.app_name, request.function_name)
         is_secure = api_info.get("secure", False)
         logger.debug(f"is_secure: {is_secure}")
         if trajectory_path:
@@ -195,6 +210,15 @@ async def call_mcp_function(request: FunctionCallRequest, trajectory_path: Optio
         raise HTTPException(status_code=500, detail="Internal server error processing function call.")
 
 
+@app.get("/functions/stats", tags=["Functions"])
+async def get_function_call_stats():
+    global mcp_manager
+    """
+    Per-server call latency and session state of the pooled MCP server connections.
+    """
+    return mcp_manager.get_mcp_server_stats()
+
+
 @app.get("/api/reset")
 async def reset():
     registry.auth_manager = None
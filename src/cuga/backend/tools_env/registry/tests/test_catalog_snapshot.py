@@ -0,0 +1,154 @@
+"""
+Test the versioned /catalog snapshot endpoint and the client-side catalog cache.
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cuga.backend.tools_env.registry.config.config_loader import ServiceConfig
+from cuga.backend.tools_env.registry.mcp_manager.mcp_manager import MCPManager
+from cuga.backend.tools_env.registry.registry import api_registry_server
+from cuga.backend.tools_env.registry.registry.api_registry import ApiRegistry
+from cuga.backend.tools_env.registry.utils import api_utils
+
+SCHEMA = {
+    "openapi": "3.0.0",
+    "info": {"title": "Shop", "version": "1.0.0"},
+    "servers": [{"url": "http://localhost:9999"}],
+    "paths": {
+        "/items": {"get": {"operationId": "list_items", "responses": {"200": {"description": "OK"}}}},
+        "/orders": {"get": {"operationId": "list_orders", "responses": {"200": {"description": "OK"}}}},
+    },
+}
+
+
+@pytest.fixture
+def registry():
+    manager = MCPManager(config={"shop": ServiceConfig(name="shop", url="http://localhost:9999")})
+    manager.schemas["shop"] = SCHEMA
+    registry = ApiRegistry(client=manager)
+    with patch.object(api_registry_server, "registry", registry, create=True):
+        yield registry
+
+
+@pytest.fixture
+def mcp_registry(registry):
+    manager = registry.mcp_client
+    manager.schema_urls["notes"] = ServiceConfig(name="notes", url="http://localhost:9998/mcp", type="mcp")
+    manager.mcp_clients["notes"] = "http://localhost:9998/mcp"
+    # A tool without an outputSchema gets the default response schemas
+    manager.tools_by_server["notes"] = [
+        {
+            "type": "function",
+            "function": {
+                "name": "notes_add_note",
+                "description": "Add a note",
+                "parameters": {"type": "object", "properties": {"text": {"type": "string"}}},
+            },
+        }
+    ]
+    manager.invalidate_catalog()
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_catalog_endpoint_uses_etag(registry):
+    transport = httpx.ASGITransport(app=api_registry_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://registry") as client:
+        response = await client.get("/catalog")
+        assert response.status_code == 200
+        catalog = response.json()
+        assert [app["name"] for app in catalog["apps"]] == ["shop"]
+        assert catalog["tool_counts"] == {"shop": 2}
+        assert catalog["total_tools"] == 2
+        etag = response.headers["ETag"]
+
+        not_modified = await client.get("/catalog", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+
+        registry.onboard_schemas("shop", {**SCHEMA, "paths": {"/items": SCHEMA["paths"]["/items"]}})
+        changed = await client.get("/catalog", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()["total_tools"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_cache_revalidates_by_version(registry):
+    requests = []
+
+    async def catalog(request):
+        snapshot = await registry.get_catalog()
+        etag = f'"{snapshot["version"]}"'
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response(snapshot, headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/catalog", catalog)
+    async with TestServer(app) as server:
+        cache = api_utils.CatalogCache(revalidate_interval=60)
+        with (
+            patch.object(api_utils, "catalog_cache", cache),
+            patch.object(api_utils.settings.server_ports, "registry", server.port),
+            patch.object(api_utils.settings.advanced_features, "registry", True),
+            patch.object(api_utils.tracker, "apps", []),
+            patch.object(api_utils.tracker, "tools", {}),
+        ):
+            assert await api_utils.count_total_tools() == 2
+            assert [app.name for app in await api_utils.get_apps()] == ["shop"]
+            assert len(requests) == 1
+
+            cache.revalidate_interval = 0
+            assert set(await api_utils.get_apis("shop")) == set(cache.catalog["apis"]["shop"])
+            assert len(requests) == 2
+            assert requests[1] is not None
+
+
+@pytest.mark.asyncio
+async def test_catalog_includes_mcp_tools_without_output_schema(mcp_registry):
+    transport = httpx.ASGITransport(app=api_registry_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://registry") as client:
+        response = await client.get("/catalog")
+
+    assert response.status_code == 200
+    catalog = response.json()
+    assert catalog["tool_counts"] == {"shop": 2, "notes": 1}
+    assert catalog["apis"]["notes"]["notes_add_note"]["response_schemas"] == {
+        "success": "string",
+        "failure": "string",
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_falls_back_to_application_endpoints_when_catalog_fails(registry):
+    async def catalog(request):
+        return web.Response(status=500, text="Internal Server Error")
+
+    async def applications(request):
+        return web.json_response([app.model_dump() for app in await registry.show_applications()])
+
+    async def apis(request):
+        return web.json_response(await registry.show_apis_for_app(request.match_info["app"], True))
+
+    app = web.Application()
+    app.router.add_get("/catalog", catalog)
+    app.router.add_get("/applications", applications)
+    app.router.add_get("/applications/{app}/apis", apis)
+    async with TestServer(app) as server:
+        cache = api_utils.CatalogCache(revalidate_interval=60)
+        with (
+            patch.object(api_utils, "catalog_cache", cache),
+            patch.object(api_utils.settings.server_ports, "registry", server.port),
+            patch.object(api_utils.settings.advanced_features, "registry", True),
+            patch.object(api_utils.tracker, "apps", []),
+            patch.object(api_utils.tracker, "tools", {}),
+        ):
+            assert [app.name for app in await api_utils.get_apps()] == ["shop"]
+            assert set(await api_utils.get_apis("shop")) == {"shop_list_items", "shop_list_orders"}
+            assert await api_utils.count_total_tools() == 2
@@ -1,5 +1,6 @@
 import json
-from typing import List
+import time
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
@@ -11,6 +12,91 @@ from cuga.backend.activity_tracker.tracker import ActivityTracker
 tracker = ActivityTracker()
 
 
+class CatalogCache:
+    """
+    In-process copy of the registry's ``/catalog`` snapshot (apps, APIs and tool counts).
+
+    The copy is used without any request for ``revalidate_interval`` seconds, then revalidated
+    with ``If-None-Match``; a 304 keeps it, so routing decisions stay off the network while the
+    registry's catalog is unchanged.
+    """
+
+    def __init__(self, revalidate_interval: float = 5.0):
+        self.revalidate_interval = revalidate_interval
+        self.catalog: Optional[Dict[str, Any]] = None
+        self.etag: Optional[str] = None
+        self._checked_at = 0.0
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the catalog snapshot, or None if the registry has no usable ``/catalog`` endpoint
+        (missing or failing), in which case callers use the per-application endpoints.
+
+        Raises:
+            Exception: If the registry cannot be reached and nothing is cached yet
+        """
+        if self.catalog is not None and time.monotonic() - self._checked_at < self.revalidate_interval:
+            return self.catalog
+
+        url = f'http://127.0.0.1:{settings.server_ports.registry}/catalog'
+        headers = {'accept': 'application/json'}
+        if self.etag and self.catalog is not None:
+            headers['If-None-Match'] = self.etag
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        self._checked_at = time.monotonic()
+                        return self.catalog
+                    if response.status != 200:
+                        if response.status != 404:
+                            error_text = await response.text()
+                            logger.warning(
+                                f"registry /catalog failed with status {response.status}, "
+                                f"using the per-application endpoints: {error_text}"
+                            )
+                        return None
+                    self.catalog = await response.json()
+                    self.etag = response.headers.get('ETag')
+                    self._checked_at = time.monotonic()
+                    logger.debug(f"Fetched registry catalog version {self.catalog.get('version')}")
+                    return self.catalog
+        except aiohttp.ClientError:
+            if self.catalog is not None:
+                logger.warning("registry is not reachable, using last catalog snapshot")
+                return self.catalog
+            raise
+
+
+catalog_cache = CatalogCache(revalidate_interval=settings.catalog_cache.revalidate_interval)
+
+
+async def get_registry_apis(app_name: str) -> Dict[str, Any]:
+    """
+    APIs the registry exposes for ``app_name`` (with response schemas), served from the catalog
+    snapshot when possible.
+
+    Raises:
+        Exception: If the request fails
+    """
+    catalog = await catalog_cache.get()
+    if catalog is not None and app_name in catalog.get('apis', {}):
+        return catalog['apis'][app_name]
+
+    # Older registry without /catalog, or an app missing from the snapshot
+    url = f'http://127.0.0.1:{settings.server_ports.registry}/applications/{app_name}/apis?include_response_schema=true'
+    headers = {'accept': 'application/json'}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, headers=headers) as response:
+            # Check if the request was successful
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Request failed with status {response.status}: {error_text}")
+
+            # Parse JSON response
+            return await response.json()
+
+
 async def get_apis(app_name: str):
     """
     Execute an asynchronous GET request to retrieve Petstore APIs from localhost:8001
@@ -37,22 +123,11 @@ async def get_apis(app_name: str):
         logger.warning(e)
 
     # Get tools from API
-    url = f'http://127.0.0.1:{settings.server_ports.registry}/applications/{app_name}/apis?include_response_schema=true'
-    headers = {'accept': 'application/json'}
-
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                # Check if the request was successful
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Request failed with status {response.status}: {error_text}")
-
-                # Parse JSON response
-                json_data = await response.json()
-                if json_data:
-                    all_tools.update(json_data)
-                return all_tools
+        json_data = await get_registry_apis(app_name)
+        if json_data:
+            all_tools.update(json_data)
+        return all_tools
 
     except Exception as e:
         if len(all_tools) > 0:
@@ -84,6 +159,10 @@ async def get_apps() -> List[AppDefinition]:
         return external_apps
     logger.debug(f"External apps are {external_apps}")
     try:
+        catalog = await catalog_cache.get()
+        if catalog is not None:
+            return [AppDefinition(**p) for p in catalog['apps']] + list(external_apps)
+
         async with aiohttp.ClientSession() as session:
             async with session.get(url, headers=headers) as response:
                 logger.debug("Recieved responses")
@@ -123,7 +202,7 @@ async def count_total_tools() -> int:
             logger.debug(f"Total tracker tools count: {total_count}")
             return total_count
 
-        # Otherwise, count tools from registry
+        # Otherwise, count tools from registry (served from the cached catalog snapshot)
         apps = await get_apps()
         total_count = 0
 
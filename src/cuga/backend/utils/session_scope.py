@@ -0,0 +1,53 @@
+"""
+Per-session overlays for process-wide singletons such as ``ActivityTracker`` and ``VariablesManager``.
+
+Most modules bind those singletons once at import time (``tracker = ActivityTracker()``), so a
+server session cannot simply be handed its own instance. Instead a class declares its per-session
+attributes in ``_session_fields``; while a session scope is active in the current context (asyncio
+task or copied thread context), reads and writes of those attributes on the singleton go to the
+scope, and every other attribute stays shared by the whole process.
+"""
+
+from contextvars import ContextVar, Token
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+
+class SessionScoped:
+    # attribute name -> factory producing its initial per-session value
+    _session_fields: Dict[str, Callable[[], Any]] = {}
+    _session_scope: ContextVar
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._session_scope = ContextVar(f"{cls.__name__}_session_scope", default=None)
+
+    @classmethod
+    def new_session_scope(cls) -> SimpleNamespace:
+        return SimpleNamespace(**{name: factory() for name, factory in cls._session_fields.items()})
+
+    @classmethod
+    def activate_session_scope(cls, scope: Optional[SimpleNamespace]) -> Token:
+        """Route the session fields of the singleton to ``scope`` (None = back to the shared values)."""
+        return cls._session_scope.set(scope)
+
+    @classmethod
+    def current_session_scope(cls) -> Optional[SimpleNamespace]:
+        return cls._session_scope.get()
+
+    def __getattribute__(self, name: str) -> Any:
+        cls = type(self)
+        if name in cls._session_fields:
+            scope = cls._session_scope.get()
+            if scope is not None:
+                return getattr(scope, name)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        cls = type(self)
+        if name in cls._session_fields:
+            scope = cls._session_scope.get()
+            if scope is not None:
+                setattr(scope, name, value)
+                return
+        object.__setattr__(self, name, value)
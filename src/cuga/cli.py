@@ -994,6 +994,55 @@ def viz():
         return False
 
 
+@app.command(
+    help="Backfill agentic memory from saved trajectories", short_help="Backfill memory from trajectories"
+)
+def backfill_memory(
+    trajectory_dir: str = typer.Argument(TRAJECTORY_DATA_DIR, help="Directory with the saved trajectories"),
+    namespace: str = typer.Option("memory", "--namespace", "-n", help="Memory namespace to ingest into"),
+    runs_per_batch: int = typer.Option(32, help="Trajectories ingested per bulk call"),
+    concurrency: int = typer.Option(8, help="Step extraction LLM calls running at the same time"),
+    analyze: bool = typer.Option(False, "--analyze", help="Also extract tips from every backfilled run"),
+):
+    """
+    Ingest the trajectories saved by the activity tracker into agentic memory.
+
+    Each trajectory file becomes one run. Runs already in memory are skipped, so an interrupted
+    backfill can be restarted. Uses the memory backend in-process (features.memory_provider).
+
+    Examples:
+      cuga backfill-memory                        # Backfill everything under the trajectory directory
+      cuga backfill-memory ./logging/trajectory_data/exp1 --analyze
+    """
+    from cuga.backend.memory.agentic_memory.backfill import backfill, get_memory_backend
+
+    if not os.path.isdir(trajectory_dir):
+        logger.error(f"Trajectory directory not found: {trajectory_dir}")
+        raise typer.Exit(1)
+    backend = get_memory_backend()
+    try:
+        backend.get_namespace_details(namespace)
+    except Exception:
+        logger.error(f"Memory namespace '{namespace}' not found; start the agent with memory enabled first")
+        raise typer.Exit(1)
+
+    stats = backfill(
+        backend,
+        namespace,
+        trajectory_dir,
+        runs_per_batch=runs_per_batch,
+        max_concurrency=concurrency,
+        analyze=analyze,
+    )
+    console.print(
+        f"Backfilled [bold]{stats.runs}[/bold] runs ({stats.steps} steps), "
+        f"skipped {stats.skipped_runs} already in memory"
+    )
+    if stats.failed_runs:
+        logger.error(f"{len(stats.failed_runs)} runs failed and were rolled back: {stats.failed_runs}")
+        raise typer.Exit(1)
+
+
 @app.command(help="Show status of services", short_help="Display service status")
 def status(
     service: str = typer.Argument(
@@ -1167,6 +1216,10 @@ def evaluate(
         default="results.json",
         help="Path to your output file, it defaults to 'results.json'",
     ),
+    concurrency: int = typer.Option(1, "--concurrency", "-c", help="Number of test cases run at once"),
+    resume: bool = typer.Option(
+        False, "--resume", help="Skip test cases already recorded by an interrupted run"
+    ),
 ):
     """
     Run Cuga on your test cases.
@@ -1212,6 +1265,9 @@ def evaluate(
                     test_cases_file_path,
                     "-r",
                     output_file_path,
+                    "-c",
+                    str(concurrency),
+                    *(["--resume"] if resume else []),
                 ],
             )
         wait_for_direct_processes()
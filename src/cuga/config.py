@@ -23,6 +23,8 @@ TRAJECTORY_DATA_DIR = os.path.join(LOGGING_DIR, "trajectory_data")
 TRACES_DIR = os.path.join(LOGGING_DIR, "traces")
 # Databases directory (sibling to logging)
 DBS_DIR = os.environ.get("CUGA_DBS_DIR", os.path.join(PACKAGE_ROOT, "./dbs"))
+# Local caches (fetched OpenAPI specs, ...) that are safe to delete
+CACHE_DIR = os.environ.get("CUGA_CACHE_DIR", os.path.join(PACKAGE_ROOT, "./cache"))
 # Define all path variables at the top (with environment variable overrides)
 ENV_FILE_PATH = os.getenv("ENV_FILE_PATH") or os.path.join(PACKAGE_ROOT, "..", "..", ".env")
 
@@ -127,6 +129,37 @@ validators = [
     Validator("advanced_features.decomposition_strategy", default="flexible"),
     Validator("features.chat", default=True),
     Validator("features.memory_provider", default="mem0"),
+    Validator("registry_http.timeout", default=0),
+    Validator("registry_http.connect_timeout", default=10.0),
+    Validator("registry_http.max_connections", default=100),
+    Validator("registry_http.max_connections_per_host", default=20),
+    Validator("registry_http.keepalive_expiry", default=30.0),
+    Validator("registry_http.http2", default=True),
+    Validator("schema_cache.enabled", default=True),
+    Validator("schema_cache.max_age", default=0),
+    Validator("schema_cache.max_entries", default=64),
+    Validator("sandbox_pool.backend", default="auto"),
+    Validator("sandbox_pool.size", default=2),
+    Validator("sandbox_pool.timeout", default=0),
+    Validator("llm_cache.enabled", default=False),
+    Validator("llm_cache.path", default=""),
+    Validator("llm_cache.ttl", default=0),
+    Validator("llm_cache.max_entries", default=10000),
+    Validator("catalog_cache.revalidate_interval", default=5.0),
+    Validator("variables_manager.spill_threshold", default=0),
+    Validator("variables_manager.spill_dir", default=""),
+    Validator("variables_manager.log_callers", default=False),
+    Validator("server_sessions.max_sessions", default=100),
+    Validator("server_sessions.idle_timeout", default=1800),
+    Validator("memory_ingestion.workers", default=2),
+    Validator("memory_ingestion.max_pending", default=256),
+    Validator("memory_ingestion.batch_size", default=16),
+    Validator("memory_ingestion.flush_timeout", default=30),
+    Validator("trajectory.compact_every", default=20),
+    Validator("trajectory.compact_idle", default=5.0),
+    Validator("memory_tips.cache_ttl", default=60),
+    Validator("memory_tips.cache_max_entries", default=256),
+    Validator("page_understanding.representation", default="full"),
     Validator("playwright_args", default=[]),
 ]
 base_settings = Dynaconf(
@@ -23,9 +23,14 @@ Usage:
     
     # Batch evaluate multiple tasks
     python -m cuga.evaluation.evaluate_appworld batch-eval --max-tasks 50 --output results.json
+
+    # Batch evaluate 4 tasks at a time (one process each), then resume after an interruption
+    python -m cuga.evaluation.evaluate_appworld batch-eval --concurrency 4 --processes
+    python -m cuga.evaluation.evaluate_appworld batch-eval --concurrency 4 --processes --resume <experiment folder>
 """
 
 import asyncio
+import functools
 import json
 import os
 import sys
@@ -36,13 +41,13 @@ from dataclasses import dataclass, field
 
 from loguru import logger
 from pydantic import BaseModel
-from tqdm import tqdm
 
 # CUGA imports
 from cuga.backend.activity_tracker.tracker import ActivityTracker
 from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
 from cuga.backend.cuga_graph.utils.controller import AgentRunner, ExperimentResult
 from cuga.config import PROJECT_ROOT, settings
+from cuga.evaluation.parallel_runner import ParallelEvaluationRunner, ResultStore
 
 # AppWorld imports
 try:
@@ -234,6 +239,7 @@ class AppWorldCUGARunner:
                     goal=task_info.instruction,
                     current_datetime=tracker.current_date
                 )
+                await tracker.flush_memory()
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -332,9 +338,22 @@ class AppWorldCUGARunner:
             )
 
 
+async def evaluate_appworld_task(task_id: str, experiment_name: str, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Run and evaluate one task, returning the result as a dict.
+
+    Module-level so batch evaluation can run it in worker processes.
+    """
+    runner = AppWorldCUGARunner(experiment_name=experiment_name)
+    result = await runner.evaluate_task(task_id=task_id, verbose=verbose)
+    return result.model_dump()
+
+
 class AppWorldBatchEvaluator:
     """Batch evaluation of multiple tasks"""
     
+    RESULTS_FILE = "appworld_results.jsonl"
+    
     def __init__(self, experiment_name: str = "appworld_batch"):
         self.experiment_name = experiment_name
         self.runner = AppWorldCUGARunner(experiment_name=experiment_name)
@@ -345,20 +364,39 @@ class AppWorldBatchEvaluator:
         task_ids: Optional[List[str]] = None,
         max_tasks: Optional[int] = None,
         verbose: bool = False,
-        output_file: Optional[str] = None
+        output_file: Optional[str] = None,
+        concurrency: int = 1,
+        use_processes: bool = False,
+        resume_experiment: Optional[str] = None
     ) -> BatchEvaluationReport:
         """
         Evaluate multiple tasks
         
+        Tasks run ``concurrency`` at a time, each with its own tracker and variables state. AppWorld
+        keeps its environment in process-global state, so concurrency > 1 requires ``use_processes``.
+        Every finished task is appended to ``appworld_results.jsonl`` in the experiment folder.
+        
         Args:
             task_ids: Specific task IDs to evaluate (None = all tasks)
             max_tasks: Maximum number of tasks to evaluate
             verbose: Print progress
             output_file: Save results to JSON file
+            concurrency: Number of tasks evaluated at once
+            use_processes: Run each task in a worker process instead of an asyncio task
+            resume_experiment: Experiment folder of an interrupted run; its finished tasks are skipped
             
         Returns:
             BatchEvaluationReport with comprehensive statistics
+
+        Raises:
+            ValueError: If ``concurrency`` > 1 without ``use_processes``
         """
+        if concurrency > 1 and not use_processes:
+            raise ValueError(
+                "AppWorld keeps its environment in process-global state, so concurrent tasks would "
+                "share it: pass use_processes=True (--processes) with concurrency > 1"
+            )
+
         # Get task list
         if task_ids is None:
             task_ids = self.loader.list_all_tasks()
@@ -366,34 +404,31 @@ class AppWorldBatchEvaluator:
         if max_tasks:
             task_ids = task_ids[:max_tasks]
         
-        logger.info(f"Starting batch evaluation of {len(task_ids)} tasks")
+        completed: List[str] = []
+        if resume_experiment:
+            completed = tracker.resume_experiment(resume_experiment)
+        else:
+            tracker.start_experiment(
+                task_ids=task_ids, experiment_name=self.experiment_name, description="AppWorld batch evaluation"
+            )
+        store = ResultStore(os.path.join(tracker.get_base_dir(), tracker.experiment_folder, self.RESULTS_FILE))
         
-        results = []
-        start_time = datetime.now()
+        logger.info(f"Starting batch evaluation of {len(task_ids)} tasks (experiment: {tracker.experiment_folder})")
         
-        for task_id in tqdm(task_ids, desc="Evaluating tasks"):
-            try:
-                result = await self.runner.evaluate_task(
-                    task_id=task_id,
-                    verbose=verbose
-                )
-                results.append(result)
-                
-                if verbose:
-                    status = "✅" if result.correct else "❌"
-                    logger.info(f"{status} {task_id}: {result.pass_count}/{result.total_tests} tests")
-                    
-            except Exception as e:
-                logger.error(f"Failed to evaluate {task_id}: {e}")
-                # Add failed result
-                task_info = self.loader.load_task(task_id)
-                results.append(AppWorldEvaluationResult(
-                    task_id=task_id,
-                    correct=False,
-                    difficulty=task_info.difficulty,
-                    api_calls_count=task_info.api_calls,
-                    error_message=str(e)
-                ))
+        start_time = datetime.now()
+        runner = ParallelEvaluationRunner(
+            store,
+            concurrency=concurrency,
+            use_processes=use_processes,
+            on_result=functools.partial(self._finish_task, verbose=verbose),
+        )
+        records = await runner.run(
+            task_ids,
+            functools.partial(evaluate_appworld_task, experiment_name=self.experiment_name, verbose=verbose),
+            completed=completed,
+        )
+        records_by_id = {record["task_id"]: record for record in records}
+        results = [self._to_result(records_by_id[task_id]) for task_id in task_ids if task_id in records_by_id]
         
         # Generate report
         total_time = (datetime.now() - start_time).total_seconds()
@@ -431,6 +466,39 @@ class AppWorldBatchEvaluator:
             logger.info(f"Results saved to: {output_file}")
         
         return report
+    
+    def _finish_task(self, record: Dict[str, Any], verbose: bool = False):
+        """Record a finished task in the experiment's results and .progress file."""
+        result = self._to_result(record)
+        if verbose:
+            status = "✅" if result.correct else "❌"
+            logger.info(f"{status} {result.task_id}: {result.pass_count}/{result.total_tests} tests")
+        tracker.finish_task(
+            task_id=result.task_id,
+            site="appworld",
+            intent=self.loader.load_task(result.task_id).instruction,
+            agent_answer=result.agent_answer,
+            score=1.0 if result.correct else 0.0,
+            exception=result.error_message is not None,
+        )
+    
+    def _to_result(self, record: Dict[str, Any]) -> AppWorldEvaluationResult:
+        if "error" not in record:
+            return AppWorldEvaluationResult(**record)
+        # The task failed before evaluate_task could build a result
+        try:
+            task_info = self.loader.load_task(record["task_id"])
+            difficulty, api_calls = task_info.difficulty, task_info.api_calls
+        except Exception:
+            difficulty, api_calls = 0, 0
+        return AppWorldEvaluationResult(
+            task_id=record["task_id"],
+            correct=False,
+            difficulty=difficulty,
+            api_calls_count=api_calls,
+            error_message=record["error"],
+            execution_time=record.get("duration", 0.0)
+        )
 
 
 # ============================================================================
@@ -502,7 +570,10 @@ async def run_task_cli(task_id: str, verbose: bool = False):
 async def batch_eval_cli(
     max_tasks: Optional[int] = None,
     output: str = "appworld_results.json",
-    verbose: bool = False
+    verbose: bool = False,
+    concurrency: int = 1,
+    processes: bool = False,
+    resume: Optional[str] = None
 ):
     """CLI: Batch evaluate multiple tasks"""
     evaluator = AppWorldBatchEvaluator()
@@ -510,7 +581,10 @@ async def batch_eval_cli(
     await evaluator.evaluate_batch(
         max_tasks=max_tasks,
         verbose=verbose,
-        output_file=output
+        output_file=output,
+        concurrency=concurrency,
+        use_processes=processes,
+        resume_experiment=resume
     )
 
 
@@ -538,6 +612,9 @@ Examples:
   
   # Batch evaluate 50 tasks
   python -m cuga.evaluation.evaluate_appworld batch-eval --max-tasks 50 --output results.json
+  
+  # Evaluate 4 tasks at a time in worker processes, resuming an interrupted experiment
+  python -m cuga.evaluation.evaluate_appworld batch-eval --concurrency 4 --processes --resume <experiment folder>
         """
     )
     
@@ -561,6 +638,9 @@ Examples:
     batch_parser.add_argument('--max-tasks', type=int, help='Maximum number of tasks to evaluate')
     batch_parser.add_argument('--output', '-o', default='appworld_results.json', help='Output JSON file')
     batch_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    batch_parser.add_argument('--concurrency', '-c', type=int, default=1, help='Number of tasks evaluated at once (> 1 requires --processes)')
+    batch_parser.add_argument('--processes', action='store_true', help='Run each task in a worker process')
+    batch_parser.add_argument('--resume', metavar='EXPERIMENT_FOLDER', help='Skip tasks already finished in this experiment')
     
     args = parser.parse_args()
     
@@ -579,10 +659,15 @@ Examples:
     elif args.command == 'run-task':
         asyncio.run(run_task_cli(args.task_id, verbose=args.verbose))
     elif args.command == 'batch-eval':
+        if args.concurrency > 1 and not args.processes:
+            parser.error("--concurrency > 1 requires --processes (AppWorld state is process-global)")
         asyncio.run(batch_eval_cli(
             max_tasks=args.max_tasks,
             output=args.output,
-            verbose=args.verbose
+            verbose=args.verbose,
+            concurrency=args.concurrency,
+            processes=args.processes,
+            resume=args.resume
         ))
 
 
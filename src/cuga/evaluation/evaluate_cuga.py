@@ -1,12 +1,11 @@
 from cuga.backend.activity_tracker.tracker import ActivityTracker
 from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
 from cuga.backend.cuga_graph.utils.controller import AgentRunner, ExperimentResult
-from loguru import logger
-import traceback
 from pydantic import BaseModel
 from typing import List, Dict, Iterable, Any, Optional
 import json
 import csv
+from cuga.evaluation.parallel_runner import ParallelEvaluationRunner, ResultStore
 from calculate_test_score import evaluate_test_and_details, TestScore, TestScoreDetails, ToolCall
 from statistics import mean
 from pathlib import Path
@@ -133,57 +132,119 @@ def parse_test_cases(json_file_path: str) -> dict[Any, list[Any]]:
     return test_cases
 
 
-async def run_cuga(test_file_path: str, result_file_path: str) -> (List[TestCase], List[ExperimentResult]):
+async def run_test_case(task: TestCase, task_id: str) -> Dict[str, Any]:
+    """Run one test case and return its scored record (see ``ParallelEvaluationRunner``)."""
+    tracker.reset(intent=task.intent, task_id=task_id)
+    var_manager.reset()
+    # Without a browser the runner holds no environment, so a runner per test case is cheap
+    result = await AgentRunner(browser_enabled=False).run_task_generic(
+        eval_mode=False, goal=task.intent, current_datetime=tracker.current_date
+    )
+    await tracker.flush_memory()
+    result.steps = [step for step in result.steps if "api_call" in step.name]
+    test_result = parse_test_results([task], [result])[0]
+    return {
+        "task_id": task_id,
+        "answer": result.answer,
+        "steps": [step.model_dump() for step in result.steps],
+        "test_result": test_result.model_dump(),
+    }
+
+
+def _finish_test_case(record: Dict[str, Any], tasks_by_id: Dict[str, TestCase]) -> None:
+    task = tasks_by_id[record["task_id"]]
+    if "error" in record:
+        score, answer = 0, f"Error: {record['error']}"
+    else:
+        score = mean(
+            [
+                record["test_result"]["score"]["keyword_score"],
+                record["test_result"]["score"]["response_score"],
+                record["test_result"]["score"]["tool_call_score"],
+            ]
+        )
+        answer = record["answer"]
+    tracker.finish_task(
+        intent=task.intent,
+        site="",
+        task_id=record["task_id"],
+        eval="",
+        score=score,
+        agent_answer=answer,
+        exception="error" in record,
+        agent_v="",
+    )
+
+
+def _experiment_result(record: Dict[str, Any]) -> ExperimentResult:
+    if "error" in record:
+        return ExperimentResult(answer=f"Error {record['error']}", score=0, messages=[], steps=[])
+    return ExperimentResult(answer=record["answer"], score=0, messages=[], steps=record["steps"])
+
+
+def _start_or_resume_experiment(app: str, task_ids: List[str], records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Reopen the experiment folder an interrupted run of ``app`` recorded its test cases in, or start one.
+
+    Returns the test cases already finished according to the reopened experiment's ``.progress`` file.
+    """
+    folders = [
+        record["experiment_folder"]
+        for record in records
+        if record.get("task_id") in task_ids and record.get("experiment_folder")
+    ]
+    if folders and os.path.isdir(os.path.join(tracker.get_base_dir(), folders[-1])):
+        return tracker.resume_experiment(folders[-1])
+    tracker.start_experiment(task_ids=task_ids, experiment_name=app, description="")
+    return []
+
+
+async def run_cuga(
+    test_file_path: str, result_file_path: str, concurrency: int = 1, resume: bool = False
+) -> (List[TestCase], List[ExperimentResult]):
+    """
+    Run every test case and write the scored results to ``result_file_path`` (JSON and CSV).
+
+    Test cases run ``concurrency`` at a time, each in its own tracker/variables scope. Every
+    finished test case is appended to ``<result file>.jsonl``; with ``resume`` the test cases
+    already in it are skipped (those that failed run again) and each app's results go to the
+    experiment folder of the interrupted run, so it picks up where it stopped.
+    """
     test_cases = parse_test_cases(test_file_path)
     print(f"test cases: {len(test_cases)}\napps: {list(test_cases.keys())}")
-    agent_runner = AgentRunner(browser_enabled=False)
+    store = ResultStore(os.path.splitext(result_file_path)[0] + ".jsonl")
+    if not resume and os.path.exists(store.path):
+        os.remove(store.path)
+    stored_records = store.load()
+
     results = []
+    test_results = []
     for app in test_cases:
-        task_ids = [f"{app}_{str(i)}" for i in enumerate(test_cases[app])]
-        tracker.start_experiment(task_ids=task_ids, experiment_name=app, description="")
-        for i, task in enumerate(test_cases[app]):
-            try:
-                tracker.reset(intent=task.intent, task_id=f"{app}_{str(i)}")
-                var_manager.reset()
-                result = await agent_runner.run_task_generic(
-                    eval_mode=False, goal=task.intent, current_datetime=tracker.current_date
-                )
-                filtered_steps = [step for step in result.steps if "api_call" in step.name]
-                result.steps = filtered_steps
-                results.append(result)
-                parsed_results = parse_test_results([task], [result])
-                save_test_results(parsed_results, result_file_path)
-
-                tracker.finish_task(
-                    intent=task.intent,
-                    site="",
-                    task_id=f"{app}_{str(i)}",
-                    eval="",
-                    score=mean(
-                        [
-                            parsed_results[0].score.keyword_score,
-                            parsed_results[0].score.response_score,
-                            parsed_results[0].score.tool_call_score,
-                        ]
-                    ),
-                    agent_answer=result.answer,
-                    exception=False,
-                    agent_v="",
-                )
-            except Exception as e:
-                results.append(ExperimentResult(answer=f"Error {e}", score=0, messages=[], steps=[]))
-                tracker.finish_task(
-                    intent=task.intent,
-                    site="",
-                    task_id=f"{app}_{str(i)}",
-                    eval="",
-                    score=0,
-                    agent_answer=f"Error: {e}",
-                    exception=True,
-                    agent_v="",
-                )
-                logger.error(traceback.format_exc())
-                logger.error(e)
+        tasks_by_id = {f"{app}_{i}": task for i, task in enumerate(test_cases[app])}
+        completed = _start_or_resume_experiment(app, list(tasks_by_id), stored_records)
+        runner = ParallelEvaluationRunner(
+            store,
+            concurrency=concurrency,
+            on_result=lambda record, tasks_by_id=tasks_by_id: _finish_test_case(record, tasks_by_id),
+        )
+        records = await runner.run(
+            tasks_by_id,
+            lambda task_id, tasks_by_id=tasks_by_id: run_test_case(tasks_by_id[task_id], task_id),
+            completed=completed,
+        )
+        records_by_id = {record["task_id"]: record for record in records}
+        for task_id in tasks_by_id:
+            record = records_by_id[task_id]
+            results.append(_experiment_result(record))
+            if "error" not in record:
+                test_results.append(TestResult(**record["test_result"]))
+
+    # Written once at the end, in test-case order, instead of rewriting the file after every test
+    for path in (result_file_path, os.path.splitext(result_file_path)[0] + ".csv"):
+        if os.path.exists(path):
+            os.remove(path)
+    if test_results:
+        save_test_results(test_results, result_file_path)
     return test_cases, results
 
 
@@ -293,6 +354,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run tests and save results.")
     parser.add_argument("-t", "--test-file-path", required=True, help="Path to the test file")
     parser.add_argument("-r", "--result-file-path", required=True, help="Path to the result file")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="Number of test cases run at once")
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip test cases already recorded by an interrupted run"
+    )
 
     args = parser.parse_args()
-    tasks, results = asyncio.run(run_cuga(args.test_file_path, args.result_file_path))
+    tasks, results = asyncio.run(
+        run_cuga(args.test_file_path, args.result_file_path, concurrency=args.concurrency, resume=args.resume)
+    )
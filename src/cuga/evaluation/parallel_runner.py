@@ -0,0 +1,239 @@
+"""
+Parallel, resumable execution of evaluation tasks.
+
+``ParallelEvaluationRunner`` runs an async ``run_one(task_id) -> dict`` over many tasks with N
+workers. Each task gets its own ``ActivityTracker`` / ``VariablesManager`` session scope (the same
+mechanism that isolates demo-server sessions), so concurrent tasks don't share steps, variables
+or trajectory state. With ``use_processes=True`` every worker is a separate process instead, for
+environments that keep process-global state (e.g. AppWorld).
+
+Every finished task is appended as one JSON line to a ``ResultStore``; tasks that completed
+without an error (in the store, or passed as ``completed``, e.g. from an experiment's ``.progress``
+file) are skipped, so an interrupted run resumes where it stopped and retries the tasks that failed.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from cuga.backend.activity_tracker.tracker import ActivityTracker
+from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
+from cuga.config import settings
+
+RunOne = Callable[[str], Awaitable[Dict[str, Any]]]
+
+tracker = ActivityTracker()
+
+
+class ResultStore:
+    """Append-only JSON-lines file of task results, one record (with a ``task_id``) per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """All stored records; a later record for the same task replaces the earlier one."""
+        if not os.path.exists(self.path):
+            return []
+        records: Dict[str, Dict[str, Any]] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The run was killed mid-write; that task simply runs again
+                    logger.warning(f"Skipping truncated result record in {self.path}")
+                    continue
+                records[record.get("task_id")] = record
+        return list(records.values())
+
+    def completed_ids(self) -> set:
+        """Tasks whose latest record is a result, not an error."""
+        return {record.get("task_id") for record in self.load() if "error" not in record}
+
+    def failed_ids(self) -> set:
+        """Tasks whose latest record is an error (the task raised or its worker process died)."""
+        return {record.get("task_id") for record in self.load() if "error" in record}
+
+
+class ThroughputReport:
+    """Logs progress with the throughput of this run and an ETA for the remaining tasks."""
+
+    def __init__(self, total: int, already_done: int = 0):
+        self.total = total
+        self.done = already_done
+        self.failed = 0
+        self._started = time.monotonic()
+        self._finished_this_run = 0
+
+    def update(self, task_id: str, ok: bool):
+        self.done += 1
+        self._finished_this_run += 1
+        if not ok:
+            self.failed += 1
+        elapsed = time.monotonic() - self._started
+        rate = self._finished_this_run / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done
+        eta = remaining / rate if rate else float("inf")
+        logger.info(
+            f"[{self.done}/{self.total}] {task_id} {'done' if ok else 'failed'} | "
+            f"{rate * 60:.1f} tasks/min | ETA {format_duration(eta)} | {self.failed} failed"
+        )
+
+
+def format_duration(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "unknown"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+async def run_isolated(run_one: RunOne, task_id: str) -> Dict[str, Any]:
+    """Run one task in fresh tracker/variables scopes and return its record (errors included)."""
+    ActivityTracker.activate_session_scope(ActivityTracker.new_session_scope())
+    VariablesManager.activate_session_scope(VariablesManager.new_session_scope())
+    started = time.monotonic()
+    try:
+        record = await run_one(task_id)
+    except Exception as e:
+        logger.error(f"Task {task_id} failed: {e}\n{traceback.format_exc()}")
+        record = {"task_id": task_id, "error": str(e)}
+    finally:
+        if settings.advanced_features.tracker_enabled and tracker.experiment_folder:
+            tracker.flush_trajectory()
+    record.setdefault("task_id", task_id)
+    record.setdefault("duration", time.monotonic() - started)
+    if tracker.experiment_folder:
+        # Lets a resumed run reopen the experiment folder the task was recorded in
+        record.setdefault("experiment_folder", tracker.experiment_folder)
+    return record
+
+
+def _init_worker_process(experiment_folder: Optional[str], base_dir: str, settings_update: Dict[str, Any]):
+    # Spawned workers start from a fresh interpreter: restore what the parent set at runtime
+    settings.update(settings_update, merge=True)
+    tracker.set_base_dir(base_dir)
+    tracker.experiment_folder = experiment_folder
+
+
+def _run_in_process(run_one: RunOne, task_id: str) -> Dict[str, Any]:
+    return asyncio.run(run_isolated(run_one, task_id))
+
+
+class ParallelEvaluationRunner:
+    """
+    Runs evaluation tasks ``concurrency`` at a time and streams their records into ``store``.
+
+    ``on_result(record)`` is called in the calling process for every finished task, in completion
+    order (e.g. to call ``tracker.finish_task``, which keeps results.json and ``.progress``).
+    """
+
+    def __init__(
+        self,
+        store: ResultStore,
+        concurrency: int = 1,
+        use_processes: bool = False,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        self.use_processes = use_processes
+        self.on_result = on_result
+
+    async def run(
+        self, task_ids: Iterable[str], run_one: RunOne, completed: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every task not already completed and return the records of all tasks in ``task_ids``.
+
+        Tasks whose latest stored record is an error run again, even when listed in ``completed``.
+
+        With ``use_processes`` the ``run_one`` callable must be picklable (a module-level function
+        or a ``functools.partial`` of one).
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        done = (set(completed) | self.store.completed_ids()) - self.store.failed_ids()
+        pending = [task_id for task_id in task_ids if task_id not in done]
+        if len(pending) < len(task_ids):
+            logger.info(f"Resuming: {len(task_ids) - len(pending)} of {len(task_ids)} tasks already done")
+        logger.info(f"Running {len(pending)} tasks with {self.concurrency} workers")
+
+        report = ThroughputReport(total=len(task_ids), already_done=len(task_ids) - len(pending))
+        if self.use_processes:
+            await self._run_processes(pending, run_one, report)
+        else:
+            await self._run_tasks(pending, run_one, report)
+
+        wanted = set(task_ids)
+        return [record for record in self.store.load() if record.get("task_id") in wanted]
+
+    def _record(self, record: Dict[str, Any], report: ThroughputReport):
+        self.store.append(record)
+        if self.on_result is not None:
+            try:
+                self.on_result(record)
+            except Exception as e:
+                logger.error(f"Failed to record result of {record.get('task_id')}: {e}")
+        report.update(record.get("task_id"), ok="error" not in record)
+
+    async def _run_tasks(self, pending: List[str], run_one: RunOne, report: ThroughputReport):
+        queue: asyncio.Queue = asyncio.Queue()
+        for task_id in pending:
+            queue.put_nowait(task_id)
+
+        async def worker():
+            while True:
+                try:
+                    task_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                # A task of its own gets a copy of the context, so the scopes stay per task
+                record = await asyncio.create_task(run_isolated(run_one, task_id))
+                self._record(record, report)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)))))
+
+    async def _run_processes(self, pending: List[str], run_one: RunOne, report: ThroughputReport):
+        if not pending:
+            return
+        loop = asyncio.get_running_loop()
+        settings_update = {
+            "ADVANCED_FEATURES": {"TRACKER_ENABLED": settings.advanced_features.tracker_enabled}
+        }
+        with ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker_process,
+            initargs=(tracker.experiment_folder, tracker.get_base_dir(), settings_update),
+        ) as executor:
+
+            async def submit(task_id: str) -> Dict[str, Any]:
+                try:
+                    return await loop.run_in_executor(executor, _run_in_process, run_one, task_id)
+                except Exception as e:
+                    # Only reached when the worker process itself died or the record didn't pickle
+                    logger.error(f"Worker process for {task_id} failed: {e}")
+                    return {"task_id": task_id, "error": f"Worker process failed: {e}"}
+
+            for next_record in asyncio.as_completed([submit(task_id) for task_id in pending]):
+                self._record(await next_record, report)
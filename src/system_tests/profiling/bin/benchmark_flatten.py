@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Accessibility-tree / DOM-tree flattening micro-benchmark
+
+Times ``flatten_axtree_to_str`` over recorded AXTrees (and synthetic large and deeply nested ones),
+plus ``flatten_domtree_to_str`` over a synthetic DOM tree, so slowdowns in the page representation
+show up before they show up in agent latency.
+
+A recorded tree is a JSON file holding either a CDP AXTree (``{"nodes": [...]}``) or a dumped
+extraction result (``PUExtracted.model_dump()``, with ``accessibility_tree`` and ``extra_properties``).
+
+Usage:
+    python benchmark_flatten.py [RECORDED.json ...] [--runs N] [--max-ms MS]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add the src directory to the path so the benchmark runs from a checkout
+project_root = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from cuga.backend.browser_env.page_understanding.tranformer_utils.dom_transform_utils import (  # noqa: E402
+    flatten_domtree_to_str,
+)
+from cuga.backend.browser_env.page_understanding.tranformer_utils.transform_utils import (  # noqa: E402
+    cached_flatten,
+    flatten_axtree_to_str,
+    flatten_cache,
+)
+from cuga.backend.browser_env.page_understanding.types.dom_tree_types import DomTreeResult  # noqa: E402
+
+
+def load_recorded(path: Path) -> Tuple[Dict, Optional[Dict]]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if "nodes" in data:
+        return data, None
+    return data["accessibility_tree"], data.get("extra_properties")
+
+
+def synthetic_axtree(sections: int = 400, depth: int = 1) -> Tuple[Dict, Dict]:
+    """A page of ``sections`` cards (heading, text, link, button), each nested ``depth`` levels deep."""
+    nodes = [{"nodeId": "0", "role": {"value": "RootWebArea"}, "name": {"value": "Page"}, "childIds": []}]
+    extra_properties = {}
+
+    def add(parent: Dict, role: str, name: Optional[str], bid: Optional[str] = None, **fields) -> Dict:
+        node = {"nodeId": str(len(nodes)), "role": {"value": role}, "childIds": [], **fields}
+        if name is not None:
+            node["name"] = {"value": name}
+        if bid is not None:
+            node["browsergym_id"] = bid
+            extra_properties[bid] = {
+                "visibility": 1.0 if len(nodes) % 3 else 0.0,
+                "bbox": (10.0, float(len(nodes)), 120.0, 20.0),
+                "clickable": role in ("link", "button"),
+                "set_of_marks": role in ("link", "button"),
+            }
+        nodes.append(node)
+        parent["childIds"].append(node["nodeId"])
+        return node
+
+    for i in range(sections):
+        parent = nodes[0]
+        for level in range(depth):
+            parent = add(parent, "generic", "", properties=[{"name": "level", "value": {"value": level}}])
+        card = add(parent, "region", f"Card {i}", bid=f"r{i}")
+        heading = add(card, "heading", f"Product {i}", bid=f"h{i}")
+        add(heading, "StaticText", f"Product {i}")
+        add(card, "StaticText", f"Description of product {i} with some longer text")
+        add(
+            card,
+            "link",
+            f"Details {i}",
+            bid=f"l{i}",
+            properties=[{"name": "focused", "value": {"value": False}}],
+        )
+        add(card, "button", "Add to cart", bid=f"b{i}", value={"value": str(i)})
+        add(card, "LineBreak", "\n")
+    return {"nodes": nodes}, extra_properties
+
+
+def synthetic_domtree(sections: int = 400) -> DomTreeResult:
+    nodes = {"0": {"tagName": "body", "attributes": {}, "xpath": "/body", "children": []}}
+
+    def add(parent: str, **node) -> str:
+        node_id = str(len(nodes))
+        nodes[node_id] = node
+        nodes[parent]["children"].append(node_id)
+        return node_id
+
+    for i in range(sections):
+        card = add("0", tagName="div", attributes={"class": "card"}, xpath=f"/body/div[{i}]", children=[])
+        add(card, type="TEXT_NODE", text=f"Product {i}", isVisible=True)
+        add(
+            card,
+            tagName="a",
+            attributes={"href": f"/p/{i}", "title": f"Details {i}"},
+            xpath=f"/body/div[{i}]/a",
+            children=[],
+            domTreeId=2 * i,
+            highlightIndex=2 * i + 1,
+            isInteractive=True,
+            isVisible=True,
+        )
+        add(
+            card,
+            tagName="button",
+            attributes={"aria-label": "Add to cart", "style": "color: red"},
+            xpath=f"/body/div[{i}]/button",
+            children=[],
+            domTreeId=2 * i + 1,
+            highlightIndex=2 * i + 2,
+            isInteractive=True,
+            isVisible=i % 2 == 0,
+        )
+    return DomTreeResult(rootId="0", map=nodes)
+
+
+def time_runs(fn: Callable[[], str], runs: int) -> List[float]:
+    fn()  # warm-up
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark accessibility-tree / DOM-tree flattening")
+    parser.add_argument("recorded", nargs="*", type=Path, help="Recorded AXTree JSON files")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per case")
+    parser.add_argument(
+        "--max-ms", type=float, default=None, help="Exit with an error if a median exceeds this (ms)"
+    )
+    args = parser.parse_args()
+
+    cases = []
+    for path in args.recorded:
+        tree, extra_properties = load_recorded(path)
+        cases.append((path.name, flatten_axtree_to_str, tree, extra_properties))
+    for name, (tree, extra_properties) in (
+        ("synthetic-wide", synthetic_axtree(sections=2000)),
+        ("synthetic-deep", synthetic_axtree(sections=20, depth=2000)),
+    ):
+        cases.append((name, flatten_axtree_to_str, tree, extra_properties))
+    cases.append(("synthetic-dom", flatten_domtree_to_str, synthetic_domtree(sections=2000), {}))
+
+    print(f"{'case':<28} {'nodes':>8} {'chars':>9} {'median ms':>10} {'min ms':>8} {'cached ms':>10}")
+    slowest = 0.0
+    for name, flatten, tree, extra_properties in cases:
+        params = dict(extra_properties=extra_properties, filter_visible_only=extra_properties is not None)
+        size = len(tree["nodes"]) if isinstance(tree, dict) else len(tree.map)
+        output = flatten(tree, **params)
+        timings = time_runs(lambda: flatten(tree, **params), args.runs)
+        flatten_cache.clear()
+        cached = time_runs(lambda: cached_flatten(flatten, tree, **params), args.runs)
+        median = statistics.median(timings)
+        slowest = max(slowest, median)
+        print(
+            f"{name:<28} {size:>8} {len(output):>9} {median:>10.2f} {min(timings):>8.2f} "
+            f"{statistics.median(cached):>10.4f}"
+        )
+
+    if args.max_ms is not None and slowest > args.max_ms:
+        print(f"Slowest median {slowest:.2f} ms exceeds {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the delta updates graph nodes emit from AgentState.
+"""
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command
+
+from cuga.backend.cuga_graph.nodes.api.api_planner_agent.prompts.load_prompt import ApiDescription
+from cuga.backend.cuga_graph.state.agent_state import AgentState
+from cuga.backend.cuga_graph.state.api_planner_history import HistoricalAction
+
+
+def _state(**kwargs):
+    return AgentState(input="book a flight", url="", **kwargs)
+
+
+def test_fresh_state_has_no_changes():
+    state = _state(chat_agent_messages=[AIMessage(content="hi")], api_shortlister_all_filtered_apis={"a": {}})
+    assert state.changed_fields() == set()
+    assert state.model_dump_changes() == {}
+
+
+def test_assignments_and_in_place_mutations_are_tracked():
+    state = _state(
+        chat_agent_messages=[AIMessage(content="hi")],
+        api_planner_history=[HistoricalAction(action_taken="CoderAgent", input_to_agent="plan")],
+        coder_relevant_apis=[ApiDescription(app_name="travel", api_name="get_flights")],
+        read_page="a very long page",
+    )
+    state.final_answer = "done"
+    state.feedback.append({"status": "ok"})
+    state.append_to_last_chat_message(" there")
+    state.api_planner_history[-1].agent_output = "3 flights found"
+
+    assert state.changed_fields() == {
+        "final_answer",
+        "feedback",
+        "chat_agent_messages",
+        "api_planner_history",
+    }
+    changes = state.model_dump_changes()
+    assert changes["chat_agent_messages"][0]["content"] == "hi there"
+    assert "read_page" not in changes and "coder_relevant_apis" not in changes
+
+    state.mark_clean()
+    assert state.model_dump_changes() == {}
+
+
+def test_deep_mutations_are_tracked():
+    state = _state(
+        api_shortlister_all_filtered_apis={"travel": {"get_flights": {"params": {}}}},
+        api_planner_history=[HistoricalAction(action_taken="CoderAgent", agent_output={"rows": [{"id": 1}]})],
+    )
+    state.api_shortlister_all_filtered_apis["travel"]["get_flights"]["params"]["origin"] = "TLV"
+    state.api_planner_history[0].agent_output["rows"][0]["id"] = 2
+
+    assert state.changed_fields() == {"api_shortlister_all_filtered_apis", "api_planner_history"}
+    changes = state.model_dump_changes()
+    assert changes["api_shortlister_all_filtered_apis"]["travel"]["get_flights"]["params"] == {
+        "origin": "TLV"
+    }
+    assert changes["api_planner_history"][0]["agent_output"] == {"rows": [{"id": 2}]}
+
+
+def test_opaque_mutations_can_be_flagged():
+    class Opaque:
+        value = 1
+
+    state = _state(feedback=[{"cursor": Opaque()}])
+    state.feedback[0]["cursor"].value = 2
+    assert state.changed_fields() == set()
+
+    state.mark_dirty("feedback")
+    assert state.changed_fields() == {"feedback"}
+
+
+def test_from_update_validates_only_given_fields():
+    state = AgentState.from_update({"messages": [AIMessage(content="hello").model_dump()]})
+    assert state.messages[-1].content == "hello"
+
+
+def test_graph_merges_delta_updates():
+    def planner(state: AgentState):
+        state.api_planner_history.append(HistoricalAction(action_taken="CoderAgent"))
+        state.read_page = "page"
+        return Command(update=state.model_dump_changes(), goto="answer")
+
+    def answer(state: AgentState):
+        state.api_planner_history[-1].agent_output = "planned"
+        state.final_answer = state.read_page.upper()
+        return Command(update=state.model_dump_changes(), goto=END)
+
+    graph = StateGraph(AgentState)
+    graph.add_node("planner", planner)
+    graph.add_node("answer", answer)
+    graph.add_edge(START, "planner")
+    compiled = graph.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "t"}}
+
+    updates = list(compiled.stream(_state(), config=config, stream_mode="updates"))
+    assert set(updates[-1]["answer"]) == {"api_planner_history", "final_answer"}
+
+    final = AgentState(**compiled.get_state(config).values)
+    assert final.input == "book a flight"
+    assert final.final_answer == "PAGE"
+    assert final.api_planner_history[-1].agent_output == "planned"
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-page CDP session cache used by the page extraction utilities.
+"""
+
+import asyncio
+
+import playwright.async_api
+import pytest
+
+from cuga.backend.browser_env.page_understanding.extractor_utils import cdp_session
+from cuga.backend.browser_env.page_understanding.extractor_utils.cdp_session import (
+    cdp_send,
+    detach_cdp_session,
+    get_cdp_session,
+)
+from cuga.backend.browser_env.page_understanding.extractor_utils.extract_async import (
+    extract_all_frame_axtrees,
+)
+
+
+class FakeSession:
+    def __init__(self, responses, fail_with=None):
+        self.responses = responses
+        self.fail_with = fail_with
+        self.sent = []
+        self.detached = False
+        self.in_flight = 0
+        self.peak = 0
+
+    async def send(self, method, params):
+        if self.fail_with:
+            raise playwright.async_api.Error(self.fail_with)
+        self.sent.append((method, params))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        response = self.responses[method]
+        return response(params) if callable(response) else response
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakeContext:
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.opened = 0
+
+    async def new_cdp_session(self, page):
+        self.opened += 1
+        await asyncio.sleep(0.01)
+        return self.sessions.pop(0)
+
+
+class FakePage:
+    def __init__(self, *sessions):
+        self.context = FakeContext(sessions)
+        self.url = "http://example.com"
+        self.closed = False
+        self.listeners = {}
+
+    def once(self, event, callback):
+        self.listeners[event] = callback
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.listeners.pop("close")(self)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_session():
+    session = FakeSession({"Page.getFrameTree": {}})
+    page = FakePage(session)
+
+    sessions = await asyncio.gather(*(get_cdp_session(page) for _ in range(5)))
+
+    assert page.context.opened == 1
+    assert all(s is session for s in sessions)
+    await cdp_send(page, "Page.getFrameTree")
+    assert page.context.opened == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_session_is_reopened_once():
+    dead = FakeSession({}, fail_with="Target page, context or browser has been closed")
+    alive = FakeSession({"Page.getFrameTree": {"frameTree": {}}})
+    page = FakePage(dead, alive)
+
+    assert await cdp_send(page, "Page.getFrameTree") == {"frameTree": {}}
+    assert page.context.opened == 2
+    assert await get_cdp_session(page) is alive
+
+
+@pytest.mark.asyncio
+async def test_command_errors_are_not_retried():
+    session = FakeSession({}, fail_with="Protocol error: Invalid parameters")
+    page = FakePage(session)
+
+    with pytest.raises(playwright.async_api.Error):
+        await cdp_send(page, "DOM.describeNode", {"backendNodeId": 1})
+    assert page.context.opened == 1
+
+
+@pytest.mark.asyncio
+async def test_session_is_forgotten_when_page_closes_or_detaches():
+    first, second = FakeSession({}), FakeSession({})
+    page = FakePage(first, second)
+
+    await get_cdp_session(page)
+    page.close()
+    assert page not in cdp_session._sessions
+
+    await get_cdp_session(page)
+    await detach_cdp_session(page)
+    assert second.detached
+    assert page not in cdp_session._sessions
+
+
+@pytest.mark.asyncio
+async def test_frame_axtrees_are_requested_concurrently():
+    frame_tree = {
+        "frameTree": {
+            "frame": {"id": "main"},
+            "childFrames": [{"frame": {"id": "child-1"}}, {"frame": {"id": "child-2"}}],
+        }
+    }
+    session = FakeSession(
+        {
+            "Page.getFrameTree": frame_tree,
+            "Accessibility.getFullAXTree": lambda params: {
+                "nodes": [{"nodeId": params["frameId"], "properties": []}]
+            },
+        }
+    )
+    page = FakePage(session)
+
+    axtrees = await extract_all_frame_axtrees(page)
+
+    assert set(axtrees) == {"main", "child-1", "child-2"}
+    assert axtrees["child-1"]["nodes"][0]["nodeId"] == "child-1"
+    assert session.peak == 3
+    assert page.context.opened == 1
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the accessibility-tree and DOM-tree flatteners.
+"""
+
+import sys
+
+import pytest
+
+from cuga.backend.browser_env.page_understanding.tranformer_utils import transform_utils
+from cuga.backend.browser_env.page_understanding.tranformer_utils.dom_transform_utils import (
+    flatten_domtree_to_str,
+)
+from cuga.backend.browser_env.page_understanding.tranformer_utils.transform_utils import (
+    cached_flatten,
+    flatten_axtree_to_str,
+)
+from cuga.backend.browser_env.page_understanding.types.dom_tree_types import DomTreeResult
+
+
+def ax_node(node_id, role, name=None, children=(), **fields):
+    node = {"nodeId": node_id, "role": {"value": role}, "childIds": list(children), **fields}
+    if name is not None:
+        node["name"] = {"value": name}
+    return node
+
+
+@pytest.fixture
+def axtree():
+    return {
+        "nodes": [
+            ax_node("1", "RootWebArea", "Shop", children=["2", "6"]),
+            ax_node("2", "generic", "", children=["3", "4", "5", "missing"]),
+            ax_node(
+                "3",
+                "heading",
+                "Products",
+                children=["3a"],
+                browsergym_id="h1",
+                properties=[{"name": "level", "value": {"value": 1}}],
+            ),
+            ax_node("3a", "StaticText", "Products"),
+            ax_node(
+                "4",
+                "textbox",
+                "Search",
+                browsergym_id="t1",
+                value={"value": "shoes"},
+                properties=[
+                    {"name": "focused", "value": {"value": True}},
+                    {"name": "required", "value": {"value": False}},
+                    {"name": "autocomplete", "value": {"value": "list"}},
+                    {"name": "editable"},
+                ],
+            ),
+            ax_node("5", "button", "Hidden", browsergym_id="b1"),
+            ax_node("6", "LineBreak", "\n"),
+        ]
+    }
+
+
+EXTRA_PROPERTIES = {
+    "h1": {"visibility": 1.0, "bbox": (0, 0, 10, 10), "clickable": False, "set_of_marks": False},
+    "t1": {"visibility": 1.0, "bbox": (0, 20, 100, 10), "clickable": True, "set_of_marks": True},
+    "b1": {"visibility": 0.0, "bbox": None, "clickable": True, "set_of_marks": False},
+}
+
+
+def test_axtree_is_flattened_in_document_order(axtree):
+    assert flatten_axtree_to_str(axtree) == "\n".join(
+        [
+            "RootWebArea 'Shop'",
+            "\t[h1] heading 'Products'",
+            "\t[t1] textbox 'Search' value='shoes', focused, autocomplete='list'",
+            "\t[b1] button 'Hidden'",
+        ]
+    )
+    assert flatten_axtree_to_str(
+        axtree, EXTRA_PROPERTIES, with_clickable=True, filter_visible_only=True
+    ) == "\n".join(
+        [
+            "RootWebArea 'Shop'",
+            "\t[h1] heading 'Products'",
+            "\t[t1] textbox 'Search' value='shoes', clickable, focused, autocomplete='list'",
+        ]
+    )
+
+
+def test_axtree_filters_require_extra_properties(axtree):
+    with pytest.raises(ValueError):
+        flatten_axtree_to_str(axtree, filter_visible_only=True)
+
+
+def test_deep_trees_do_not_hit_the_recursion_limit():
+    depth = sys.getrecursionlimit() * 2
+    nodes = [ax_node(str(i), "group", f"g{i}", children=[str(i + 1)]) for i in range(depth)]
+    nodes.append(ax_node(str(depth), "StaticText", "leaf"))
+
+    lines = flatten_axtree_to_str({"nodes": nodes}).split("\n")
+
+    assert len(lines) == depth + 1
+    assert lines[-1] == "\t" * depth + "StaticText 'leaf'"
+
+
+def test_domtree_is_flattened_in_document_order():
+    dom_tree = DomTreeResult(
+        rootId="0",
+        map={
+            "0": {"tagName": "BODY", "attributes": {}, "xpath": "/body", "children": ["1", "3"]},
+            "1": {
+                "tagName": "a",
+                "attributes": {"title": "Home", "href": "/"},
+                "xpath": "/body/a",
+                "children": ["2"],
+                "domTreeId": 1,
+                "highlightIndex": 1,
+            },
+            "2": {"type": "TEXT_NODE", "text": " Go home ", "isVisible": True},
+            "3": {
+                "tagName": "button",
+                "attributes": {"aria-label": "Save"},
+                "xpath": "/body/button",
+                "children": [],
+                "domTreeId": 2,
+                "highlightIndex": 2,
+                "isVisible": False,
+            },
+        },
+    )
+
+    assert flatten_domtree_to_str(dom_tree) == "\n".join(
+        ["[1] a 'Home'", '\ttext "Go home"', "[2] button 'Save'"]
+    )
+    assert flatten_domtree_to_str(dom_tree, filter_visible_only=True) == "\n".join(
+        ["[1] a 'Home'", '\ttext "Go home"']
+    )
+
+
+def test_cached_flatten_reuses_output_per_tree_and_parameters(axtree, monkeypatch):
+    calls = []
+
+    def flatten(tree, **params):
+        calls.append(params)
+        return flatten_axtree_to_str(tree, **params)
+
+    monkeypatch.setattr(transform_utils, "flatten_cache", transform_utils._FlattenCache(maxsize=2))
+
+    first = cached_flatten(flatten, axtree, extra_properties={}, filter_visible_only=False)
+    assert cached_flatten(flatten, axtree, extra_properties={}, filter_visible_only=False) is first
+    assert len(calls) == 1
+
+    cached_flatten(flatten, axtree, extra_properties=EXTRA_PROPERTIES, filter_visible_only=True)
+    other_revision = {"nodes": list(axtree["nodes"])}
+    cached_flatten(flatten, other_revision, extra_properties={}, filter_visible_only=False)
+    assert len(calls) == 3
+
+    # the first entry was the least recently used one, and has been evicted
+    cached_flatten(flatten, axtree, extra_properties={}, filter_visible_only=False)
+    assert len(calls) == 4
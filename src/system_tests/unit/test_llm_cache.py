@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite LLM response cache attached by LLMManager.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from cuga.backend.llm.cache import LLMResponseCache
+from cuga.backend.llm.models import LLMManager
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    response_cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite"), max_entries=2)
+    yield response_cache
+    response_cache.close()
+
+
+def _messages(question):
+    return [SystemMessage(content="You are a planner."), HumanMessage(content=question)]
+
+
+def test_identical_prompts_are_served_from_cache(response_cache):
+    model = FakeListChatModel(responses=["first", "second"], cache=response_cache)
+
+    assert model.invoke(_messages("plan a trip")).content == "first"
+    assert model.invoke(_messages("plan a trip")).content == "first"
+    assert model.invoke(_messages("book a flight")).content == "second"
+
+    stats = response_cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_calls_share_the_cache(response_cache):
+    model = FakeListChatModel(responses=["first", "second"], cache=response_cache)
+
+    assert (await model.ainvoke(_messages("plan a trip"))).content == "first"
+    assert model.invoke(_messages("plan a trip")).content == "first"
+    assert response_cache.hits == 1
+
+
+def test_model_parameters_are_part_of_the_key(response_cache):
+    model = FakeListChatModel(responses=["first", "second"], cache=response_cache)
+    model.invoke(_messages("plan a trip"))
+    model.invoke(_messages("plan a trip"), stop=["\n"])
+
+    assert response_cache.hits == 0
+
+
+def test_lru_eviction_and_ttl(response_cache):
+    model = FakeListChatModel(responses=["a", "b", "c", "d"], cache=response_cache)
+    for question in ("one", "two", "three"):
+        model.invoke(_messages(question))
+    assert response_cache.get_stats()["entries"] == 2
+    assert response_cache.evictions == 1
+
+    response_cache.ttl = 60
+    with patch("cuga.backend.llm.cache.time.time", return_value=10**10):
+        assert model.invoke(_messages("three")).content == "d"
+    assert response_cache.hits == 0
+
+
+def test_clear_by_prompt_prefix(response_cache):
+    model = FakeListChatModel(responses=["a", "b"], cache=response_cache)
+    model.invoke(_messages("one"))
+    model.invoke([HumanMessage(content="unrelated")])
+    # Same system prompt, different question: same prefix key
+    _, prefix_key = response_cache.make_keys(dumps(_messages("two")), "")
+    response_cache.clear(prefix_key=prefix_key)
+
+    assert response_cache.get_stats()["entries"] == 1
+
+
+def test_llm_manager_attaches_cache_when_enabled(response_cache):
+    manager = LLMManager()
+    model = FakeListChatModel(responses=["a"])
+    with patch("cuga.backend.llm.models.get_llm_response_cache", return_value=response_cache):
+        manager.set_llm(model)
+        try:
+            assert manager.get_model({}).cache is response_cache
+            assert manager.get_cache_stats()["entries"] == 0
+        finally:
+            manager.clear_pre_instantiated_model()
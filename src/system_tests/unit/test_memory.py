@@ -6,8 +6,10 @@ Tests the Memory singleton and V1MemoryClient without requiring the memory servi
 Uses unittest.mock to simulate API responses.
 """
 
+import asyncio
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime
 import httpx
 
@@ -651,3 +653,100 @@ class TestEdgeCases:
         run = client.create_run("test_ns", run_id="run_empty")
 
         assert len(run.steps) == 0
+
+
+class TestFormattedTips:
+    """Test suite for the cached sync/async tip formatting used by agent nodes."""
+
+    @pytest.fixture
+    def tips_memory(self):
+        """Patch the Memory used by memory_tips_formatted and start every test with an empty cache."""
+        from cuga.backend.memory.agentic_memory.utils import memory_tips_formatted
+
+        memory_tips_formatted._tips_cache.clear()
+        with patch.object(memory_tips_formatted, 'Memory') as mock_memory_class:
+            mock_memory = MagicMock()
+            mock_memory.get_matching_tips.return_value = ["Tip 1: Validate inputs"]
+            mock_memory.aget_matching_tips = AsyncMock(return_value=["Tip 1: Validate inputs"])
+            mock_memory_class.return_value = mock_memory
+            yield memory_tips_formatted, mock_memory
+        memory_tips_formatted._tips_cache.clear()
+
+    def test_sync_tips_are_cached_per_agent_and_query(self, tips_memory):
+        """Repeated calls with the same agent and query reuse the formatted tips."""
+        tips, mock_memory = tips_memory
+
+        first = tips.get_formatted_tips("memory", "APIPlannerAgent", "API errors", 3)
+        second = tips.get_formatted_tips("memory", "APIPlannerAgent", "API errors", 3)
+        tips.get_formatted_tips("memory", "ShortlisterAgent", "API errors", 3)
+
+        assert "Tip 1: Validate inputs" in first
+        assert second == first
+        assert mock_memory.get_matching_tips.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_tips_share_one_retrieval(self, tips_memory):
+        """Concurrent async calls for the same tips make a single request and reuse the cache after it."""
+        tips, mock_memory = tips_memory
+
+        results = await asyncio.gather(
+            *(tips.aget_formatted_tips("memory", "APIPlannerAgent", "API errors", 3) for _ in range(3)),
+            tips.prefetch_formatted_tips("memory", "APIPlannerAgent", "API errors", 3),
+        )
+        cached = await tips.aget_formatted_tips("memory", "APIPlannerAgent", "API errors", 3)
+
+        assert len(set(results)) == 1
+        assert cached == results[0]
+        mock_memory.aget_matching_tips.assert_awaited_once()
+        mock_memory.get_matching_tips.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_no_tips_returns_none(self, tips_memory):
+        """No matching tips yields None, like the sync version."""
+        tips, mock_memory = tips_memory
+        mock_memory.aget_matching_tips.return_value = []
+
+        assert await tips.aget_formatted_tips("memory", "APIPlannerAgent", "unknown", 3) is None
+
+
+class TestV1MemoryClientAsync:
+    """Test suite for the async request path of V1MemoryClient."""
+
+    @pytest.mark.asyncio
+    async def test_asearch_for_facts_uses_pooled_async_client(self):
+        """asearch_for_facts goes through one AsyncClient per event loop and parses RecordedFacts."""
+        client = V1MemoryClient(base_url="http://localhost:8888")
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {
+                "id": "1",
+                "content": "Tip",
+                "metadata": {},
+                "created_at": datetime.now().isoformat(),
+                "run_id": None,
+            }
+        ]
+        mock_async_client = MagicMock()
+        mock_async_client.request = AsyncMock(return_value=mock_response)
+
+        with patch('httpx.AsyncClient', return_value=mock_async_client) as async_client_class:
+            facts = await client.asearch_for_facts("test_ns", query="tip", limit=2)
+            await client.asearch_for_facts("test_ns", query="tip", limit=2)
+
+        assert facts[0].content == "Tip"
+        async_client_class.assert_called_once()
+        assert mock_async_client.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_namespace_not_found(self):
+        """404s raise the same exceptions as the sync client."""
+        client = V1MemoryClient(base_url="http://localhost:8888")
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_async_client = MagicMock()
+        mock_async_client.request = AsyncMock(return_value=mock_response)
+
+        with patch('httpx.AsyncClient', return_value=mock_async_client):
+            with pytest.raises(NamespaceNotFoundException):
+                await client.asearch_for_facts("missing_ns", query="tip")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for backfilling agentic memory from saved trajectories, using a fake in-process backend.
+"""
+
+import functools
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cuga.backend.activity_tracker.trajectory_writer import append_records, step_record
+from cuga.backend.memory.agentic_memory import backfill as backfill_module
+from cuga.backend.memory.agentic_memory.backfill import backfill, iter_trajectory_files, trajectory_run_id
+from cuga.backend.memory.agentic_memory.db.sqlite_manager import SQLiteManager, close_connection_pools
+
+
+class FakeBackend:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.runs = {}
+        self.bulk_calls = []
+        self.deleted = []
+
+    def add_steps_bulk(self, namespace_id, runs, max_concurrency=8):
+        self.bulk_calls.append(sorted(runs))
+        if self.fail:
+            raise RuntimeError("embedding service down")
+        for run_id, steps in runs.items():
+            self.runs.setdefault(run_id, []).extend(item.step["name"] for item in steps)
+        return {run_id: [f"{run_id}-{i}" for i in range(len(steps))] for run_id, steps in runs.items()}
+
+    def delete_run(self, namespace_id, run_id):
+        self.deleted.append(run_id)
+        self.runs.pop(run_id, None)
+
+
+@pytest.fixture
+def trajectories(tmp_path):
+    exp = tmp_path / "exp1"
+    exp.mkdir()
+    # A compacted trajectory, one that only has its segment yet, and one without steps
+    (exp / "task_a.json").write_text(
+        json.dumps({"intent": "a", "steps": [{"name": "TaskAnalyzerAgent"}, {"name": "FinalAnswerAgent"}]})
+    )
+    append_records(str(exp / "task_b.json"), [step_record({"name": "PlanControllerAgent", "prompts": ["x"]})])
+    (exp / "empty.json").write_text(json.dumps({"intent": "nothing", "steps": []}))
+    return tmp_path
+
+
+@pytest.fixture
+def known_runs():
+    """Runs recorded in the memory database (run id -> ended), stubbing the SQLite manager."""
+    runs = {}
+    db_manager = MagicMock()
+    db_manager.all_runs.side_effect = lambda namespace_id, ended=None: [
+        SimpleNamespace(id=run_id, ended=run_ended)
+        for run_id, run_ended in runs.items()
+        if ended is None or run_ended == ended
+    ]
+    db_manager.create_runs.side_effect = lambda namespace_id, run_ids: runs.update(
+        dict.fromkeys(run_ids, False)
+    )
+    db_manager.end_runs.side_effect = lambda namespace_id, run_ids: runs.update(dict.fromkeys(run_ids, True))
+    db_manager.__enter__.return_value = db_manager
+    with patch.object(backfill_module, "SQLiteManager", return_value=db_manager):
+        yield runs
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """A real memory database for backfill to record its runs in."""
+    db_path = str(tmp_path / "agentic.db")
+    with SQLiteManager(db_path) as db_manager:
+        db_manager.create_namespace("memory", user_id="u1")
+    with patch.object(backfill_module, "SQLiteManager", functools.partial(SQLiteManager, db_path)):
+        yield db_path
+    close_connection_pools()
+
+
+def test_trajectory_files_and_run_ids(trajectories):
+    paths = list(iter_trajectory_files(str(trajectories)))
+
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["empty.json", "task_a.json", "task_b.json"]
+    assert trajectory_run_id(str(trajectories), paths[1]) == "backfill_exp1_task_a"
+
+
+def test_backfill_ingests_runs_in_batches(trajectories, known_runs):
+    backend = FakeBackend()
+
+    stats = backfill(backend, "memory", str(trajectories), runs_per_batch=1)
+
+    assert backend.runs == {
+        "backfill_exp1_task_a": ["TaskAnalyzerAgent", "FinalAnswerAgent"],
+        "backfill_exp1_task_b": ["PlanControllerAgent"],
+    }
+    assert backend.bulk_calls == [["backfill_exp1_task_a"], ["backfill_exp1_task_b"]]
+    assert known_runs == {"backfill_exp1_task_a": True, "backfill_exp1_task_b": True}
+    assert (stats.runs, stats.steps, stats.skipped_runs) == (2, 3, 0)
+
+
+def test_backfill_skips_ended_runs_and_redoes_open_ones(trajectories, known_runs):
+    # task_a was backfilled; task_b was interrupted after its run was recorded
+    known_runs.update({"backfill_exp1_task_a": True, "backfill_exp1_task_b": False})
+    backend = FakeBackend()
+
+    stats = backfill(backend, "memory", str(trajectories))
+
+    assert backend.deleted == ["backfill_exp1_task_b"]
+    assert backend.runs == {"backfill_exp1_task_b": ["PlanControllerAgent"]}
+    assert known_runs["backfill_exp1_task_b"] is True
+    assert (stats.runs, stats.skipped_runs) == (1, 1)
+
+
+def test_open_runs_are_recorded_after_their_steps(trajectories, known_runs):
+    known_runs["backfill_exp1_task_a"] = False
+    backend = FakeBackend()
+
+    stats = backfill(backend, "memory", str(trajectories), end_runs=False)
+
+    assert list(backend.runs) == ["backfill_exp1_task_b"]
+    assert known_runs == {"backfill_exp1_task_a": False, "backfill_exp1_task_b": False}
+    assert stats.skipped_runs == 1
+
+
+def test_failed_batch_is_rolled_back(trajectories, known_runs):
+    backend = FakeBackend(fail=True)
+
+    stats = backfill(backend, "memory", str(trajectories))
+
+    assert sorted(stats.failed_runs) == ["backfill_exp1_task_a", "backfill_exp1_task_b"]
+    assert sorted(backend.deleted) == sorted(stats.failed_runs)
+    assert backend.runs == {}
+    # the runs were opened, never ended, so the next backfill redoes them
+    assert not any(known_runs.values())
+
+
+def test_backfill_records_runs_in_the_memory_database(trajectories, sqlite_db):
+    stats = backfill(FakeBackend(), "memory", str(trajectories))
+
+    with SQLiteManager(sqlite_db) as db_manager:
+        assert [run.id for run in db_manager.all_runs("memory", ended=True)] == [
+            "backfill_exp1_task_a",
+            "backfill_exp1_task_b",
+        ]
+        assert db_manager.all_runs("memory", ended=False) == []
+    assert stats.runs == 2
+
+    backend = FakeBackend()
+    stats = backfill(backend, "memory", str(trajectories))
+
+    assert backend.bulk_calls == []
+    assert stats.skipped_runs == 2
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the background queue that ingests trajectory steps into agentic memory.
+"""
+
+import threading
+import time
+
+from cuga.backend.memory.ingestion import StepIngestionQueue
+
+
+class FakeMemory:
+    def __init__(self, delay: float = 0.0, gate: threading.Event = None):
+        self.delay = delay
+        self.gate = gate
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, call):
+        if self.gate is not None:
+            self.gate.wait()
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(call)
+
+    def add_step(self, namespace_id, run_id, step, prompt):
+        self._record(("step", run_id, [step["i"]]))
+
+    def add_steps(self, namespace_id, run_id, steps):
+        self._record(("step", run_id, [s["step"]["i"] for s in steps]))
+
+    def end_run(self, namespace_id, run_id):
+        self._record(("end", run_id, None))
+
+
+def _steps_of(calls, run_id):
+    return [i for kind, run, batch in calls if kind == "step" and run == run_id for i in batch]
+
+
+def test_add_step_does_not_wait_for_the_memory_service():
+    memory = FakeMemory(delay=0.2)
+    ingestion = StepIngestionQueue(memory, workers=1)
+
+    start = time.perf_counter()
+    for i in range(5):
+        assert ingestion.add_step("memory", "run", {"i": i}, "prompt")
+    assert time.perf_counter() - start < 0.1
+
+    ingestion.flush()
+    assert _steps_of(memory.calls, "run") == list(range(5))
+
+
+def test_steps_are_batched_in_order_and_end_run_comes_last():
+    gate = threading.Event()
+    memory = FakeMemory(gate=gate)
+    ingestion = StepIngestionQueue(memory, workers=2, batch_size=4)
+
+    for i in range(10):
+        ingestion.add_step("memory", "run-a", {"i": i}, "prompt")
+        ingestion.add_step("memory", "run-b", {"i": i}, "prompt")
+    ingestion.end_run("memory", "run-a")
+    ingestion.end_run("memory", "run-b")
+    gate.set()
+    ingestion.flush()
+
+    for run_id in ("run-a", "run-b"):
+        run_calls = [call for call in memory.calls if call[1] == run_id]
+        assert _steps_of(run_calls, run_id) == list(range(10))
+        assert run_calls[-1] == ("end", run_id, None)
+        assert all(len(batch) <= 4 for kind, _, batch in run_calls if kind == "step")
+    assert any(len(batch) > 1 for kind, _, batch in memory.calls if kind == "step")
+
+
+def test_full_queue_drops_steps_without_waiting_but_not_end_run():
+    gate = threading.Event()
+    memory = FakeMemory(gate=gate)
+    ingestion = StepIngestionQueue(memory, workers=1, max_pending=2)
+
+    start = time.perf_counter()
+    results = [ingestion.add_step("memory", "run", {"i": i}, "prompt") for i in range(4)]
+    assert time.perf_counter() - start < 0.05
+    ingestion.end_run("memory", "run")
+    gate.set()
+    ingestion.flush()
+
+    assert results == [True, True, False, False]
+    assert ingestion.dropped == 2
+    assert _steps_of(memory.calls, "run") == [0, 1]
+    assert memory.calls[-1] == ("end", "run", None)
+
+
+def test_failures_are_logged_and_do_not_stop_the_worker():
+    class FlakyMemory(FakeMemory):
+        def add_step(self, namespace_id, run_id, step, prompt):
+            if step["i"] == 0:
+                raise RuntimeError("service unavailable")
+            super().add_step(namespace_id, run_id, step, prompt)
+
+    memory = FlakyMemory()
+    ingestion = StepIngestionQueue(memory, workers=1)
+
+    ingestion.add_step("memory", "run", {"i": 0}, "prompt")
+    ingestion.flush()
+    ingestion.add_step("memory", "run", {"i": 1}, "prompt")
+    ingestion.flush()
+
+    assert _steps_of(memory.calls, "run") == [1]
+
+
+def test_flush_gives_up_after_the_timeout():
+    gate = threading.Event()
+    memory = FakeMemory(gate=gate)
+    ingestion = StepIngestionQueue(memory, workers=1)
+
+    ingestion.add_step("memory", "run", {"i": 0}, "prompt")
+    start = time.perf_counter()
+    assert ingestion.flush(timeout=0.1) is False
+    assert time.perf_counter() - start < 0.5
+
+    gate.set()
+    assert ingestion.flush(timeout=5) is True
+    assert _steps_of(memory.calls, "run") == [0]
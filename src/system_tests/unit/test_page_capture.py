@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass page observation capture of PageUnderstandingExtractor.
+"""
+
+import asyncio
+import base64
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import PIL.Image
+import pytest
+
+from cuga.backend.browser_env.page_understanding import pu_extractor
+from cuga.backend.browser_env.page_understanding.extractor_utils.extract_async import PageScreenshot
+from cuga.backend.browser_env.page_understanding.pu_extractor import PageUnderstandingExtractor
+
+
+def png_base64(width=4, height=2, color=(255, 0, 0)) -> str:
+    with io.BytesIO() as f:
+        PIL.Image.new("RGB", (width, height), color).save(f, format="PNG")
+        return base64.b64encode(f.getvalue()).decode()
+
+
+def test_screenshot_formats_are_decoded_lazily():
+    screenshot = PageScreenshot(png_base64())
+
+    assert "png" not in vars(screenshot) and "array" not in vars(screenshot)
+    assert screenshot.png.startswith(b"\x89PNG")
+    array = np.asarray(screenshot)
+    assert array.shape == (2, 4, 3)
+    assert tuple(array[0, 0]) == (255, 0, 0)
+    assert screenshot.array is array
+
+
+@pytest.mark.asyncio
+async def test_extract_captures_once_and_queries_concurrently():
+    running = 0
+    peak = 0
+    captures = []
+
+    def query(result):
+        async def run(page):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return result
+
+        return run
+
+    async def capture(page):
+        captures.append(page)
+        return PageScreenshot(png_base64())
+
+    page = MagicMock()
+    page.inner_html = AsyncMock(return_value="<p>Hello <b>world</b></p>")
+    with (
+        patch.object(pu_extractor, "_pre_extract", AsyncMock()),
+        patch.object(pu_extractor, "_post_extract", AsyncMock()) as post_extract,
+        patch.object(pu_extractor, "extract_dom_snapshot", query({"documents": [], "strings": []})),
+        patch.object(pu_extractor, "extract_merged_axtree", query({"nodes": []})),
+        patch.object(pu_extractor, "extract_focused_element_bid", query("a12")),
+        patch.object(pu_extractor, "extract_dom_extra_properties", return_value={}),
+        patch.object(pu_extractor, "capture_screenshot", capture),
+    ):
+        extracted = await PageUnderstandingExtractor().extract(context=MagicMock(), page=page)
+
+    assert captures == [page]
+    assert peak == 3
+    assert post_extract.await_count == 1
+    assert extracted.img is extracted.screenshot is extracted.capture.base64
+    assert extracted.focused_element_bid == "a12"
+    assert "Hello **world**" in extracted.page_content_as_str
+    assert "capture" not in extracted.model_dump()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the page diffs between consecutive observations ("delta" page representation).
+"""
+
+import pytest
+
+from cuga.backend.browser_env.page_understanding.pu_extractor import PUExtracted
+from cuga.backend.browser_env.page_understanding.pu_transform import PageUnderstandingV1
+from cuga.backend.browser_env.page_understanding.tranformer_utils.diff_utils import (
+    PageSnapshot,
+    diff_pages,
+)
+
+PAGE = "\n".join(
+    [
+        "RootWebArea 'Shop'",
+        "\t[f1] form 'Checkout'",
+        "\t\t[t1] textbox 'Name'",
+        "\t\tStaticText 'Fill in your name'",
+        "\t\t[b1] button 'Save'",
+        "\t[l1] link 'Back'",
+    ]
+)
+
+
+def test_snapshot_groups_lines_by_bid():
+    snapshot = PageSnapshot.from_rendering(PAGE, "Checkout\nFill in your name")
+
+    assert snapshot.elements == {
+        "": (None, ["RootWebArea 'Shop'"]),
+        "f1": ("", ["form 'Checkout'", "StaticText 'Fill in your name'"]),
+        "t1": ("f1", ["textbox 'Name'"]),
+        "b1": ("f1", ["button 'Save'"]),
+        "l1": ("", ["link 'Back'"]),
+    }
+    assert snapshot.content_lines == ["Checkout", "Fill in your name"]
+
+
+def test_diff_reports_added_removed_and_changed_elements():
+    previous = PageSnapshot.from_rendering(PAGE, "Checkout\nFill in your name")
+    current = PageSnapshot.from_rendering(
+        "\n".join(
+            [
+                "RootWebArea 'Shop'",
+                "\t[f1] form 'Checkout'",
+                "\t\t[t1] textbox 'Name' value='Ada'",
+                "\t\tStaticText 'Fill in your name'",
+                "\t\t[b1] button 'Save'",
+                "\t\t[s1] status 'Saved'",
+            ]
+        ),
+        "Checkout\nFill in your name\nSaved",
+    )
+
+    delta = diff_pages(previous, current)
+
+    assert delta.added == ["[s1] status 'Saved'"]
+    assert delta.changed == ["[t1] textbox 'Name' value='Ada'"]
+    assert delta.removed == ["[l1] link 'Back'"]
+    assert delta.unchanged == 3
+    assert delta.content_added == ["Saved"]
+    assert delta.content_removed == []
+    assert delta.to_str().splitlines()[0].startswith("Changes since the previous observation (3 unchanged")
+    assert diff_pages(current, current).empty
+
+
+def axtree_extraction(button_names):
+    nodes = [{"nodeId": "0", "role": {"value": "RootWebArea"}, "name": {"value": "Shop"}, "childIds": []}]
+    for i, name in enumerate(button_names):
+        nodes.append(
+            {
+                "nodeId": str(i + 1),
+                "role": {"value": "button"},
+                "name": {"value": name},
+                "childIds": [],
+                "browsergym_id": f"b{i}",
+            }
+        )
+        nodes[0]["childIds"].append(str(i + 1))
+    return PUExtracted(
+        accessibility_tree={"nodes": nodes},
+        extra_properties={},
+        page_content_as_str="\n".join(button_names),
+        img="",
+        screenshot="",
+    )
+
+
+@pytest.mark.asyncio
+async def test_delta_representation_adds_changes_to_the_full_tree():
+    transformer = PageUnderstandingV1()
+    names = [f"Product {i}" for i in range(20)]
+    first = axtree_extraction(names)
+
+    full = await transformer.transform(first, filter_visible_only=False, representation="delta")
+    assert full.delta is None
+    assert full.string_representation.count("button") == 20
+    # the same extraction rendered again is the same observation, not an empty delta
+    assert await transformer.transform(first, filter_visible_only=False, representation="delta") is full
+
+    second = axtree_extraction(names[:19] + ["Product 19 (in cart)"])
+    answer = await transformer.transform(second, filter_visible_only=False, representation="delta")
+    assert answer.delta is not None
+    assert answer.delta.changed == ["[b19] button 'Product 19 (in cart)'"]
+    # the prompts still get the whole page
+    assert answer.string_representation.count("button") == 20
+    assert answer.page_content == second.page_content_as_str
+
+    # after navigating, the delta is not smaller than the page: no delta
+    third = axtree_extraction([f"Article {i}" for i in range(20)])
+    answer = await transformer.transform(third, filter_visible_only=False, representation="delta")
+    assert answer.delta is None
+    assert answer.string_representation.count("Article") == 20
+
+
+@pytest.mark.asyncio
+async def test_page_histories_are_separate_and_reset():
+    transformer = PageUnderstandingV1()
+    names = [f"Product {i}" for i in range(20)]
+    params = dict(filter_visible_only=False, representation="delta")
+
+    await transformer.transform(axtree_extraction(names), history="session-a", **params)
+    # another session's first observation is not diffed against session-a's page
+    other = await transformer.transform(
+        axtree_extraction(names[:19] + ["Sold out"]), history="session-b", **params
+    )
+    assert other.delta is None
+
+    changed = axtree_extraction(names[:19] + ["Product 19 (in cart)"])
+    assert (await transformer.transform(changed, history="session-a", **params)).delta is not None
+
+    # a new task in session-a starts from a full observation; session-b keeps its history
+    transformer.reset_page_history("session-a")
+    assert (
+        await transformer.transform(axtree_extraction(names), history="session-a", **params)
+    ).delta is None
+    assert (
+        await transformer.transform(axtree_extraction(names), history="session-b", **params)
+    ).delta is not None
+
+    transformer.reset_page_history()
+    assert (await transformer.transform(changed, history="session-b", **params)).delta is None
+
+
+@pytest.mark.asyncio
+async def test_full_representation_is_unchanged():
+    transformer = PageUnderstandingV1()
+    answer = await transformer.transform(axtree_extraction(["Save"]), filter_visible_only=False)
+    assert answer.string_representation == "RootWebArea 'Shop'\n\t[b0] button 'Save'"
+    assert answer.delta is None
+
+    with pytest.raises(ValueError):
+        await transformer.transform(axtree_extraction(["Save"]), representation="summary")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel, resumable evaluation runner.
+"""
+
+import asyncio
+import functools
+
+import pytest
+
+from cuga.backend.activity_tracker.tracker import ActivityTracker, Step
+from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
+from cuga.evaluation.parallel_runner import ParallelEvaluationRunner, ResultStore
+
+
+async def square_task(task_id: str, fail_on: str = "") -> dict:
+    if task_id == fail_on:
+        raise RuntimeError(f"{task_id} broke")
+    return {"task_id": task_id, "value": int(task_id.rsplit("_", 1)[1]) ** 2}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "results.jsonl"))
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_concurrently_with_isolated_state(store):
+    tracker = ActivityTracker()
+    var_manager = VariablesManager()
+    running = 0
+    peak = 0
+
+    async def run_one(task_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        tracker.reset(intent=f"intent of {task_id}", task_id=task_id)
+        var_manager.reset()
+        for i in range(3):
+            tracker.collect_step(Step(name=f"{task_id}_{i}"))
+            var_manager.add_variable(i, name=f"{task_id}_var_{i}")
+            await asyncio.sleep(0.01)
+        running -= 1
+        return {"steps": [step.name for step in tracker.steps], "variables": var_manager.get_variable_names()}
+
+    task_ids = [f"task_{i}" for i in range(6)]
+    records = await ParallelEvaluationRunner(store, concurrency=3).run(task_ids, run_one)
+
+    assert peak == 3
+    assert sorted(record["task_id"] for record in records) == task_ids
+    for record in records:
+        task_id = record["task_id"]
+        assert record["steps"] == [f"{task_id}_{i}" for i in range(3)]
+        assert record["variables"] == [f"{task_id}_var_{i}" for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_recorded_and_reported(store):
+    finished = []
+    runner = ParallelEvaluationRunner(store, concurrency=2, on_result=finished.append)
+
+    records = await runner.run(["task_1", "task_2"], functools.partial(square_task, fail_on="task_2"))
+
+    by_id = {record["task_id"]: record for record in records}
+    assert by_id["task_1"]["value"] == 1
+    assert by_id["task_2"]["error"] == "task_2 broke"
+    assert sorted(record["task_id"] for record in finished) == ["task_1", "task_2"]
+    assert {record["task_id"] for record in store.load()} == {"task_1", "task_2"}
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_tasks(store):
+    store.append({"task_id": "task_1", "value": 1})
+    ran = []
+
+    async def run_one(task_id):
+        ran.append(task_id)
+        return await square_task(task_id)
+
+    records = await ParallelEvaluationRunner(store, concurrency=2).run(
+        ["task_1", "task_2", "task_3"], run_one, completed=["task_3"]
+    )
+
+    assert ran == ["task_2"]
+    # Tasks only known from ``completed`` (e.g. a tracker .progress file) have no record to return
+    assert sorted(record["task_id"] for record in records) == ["task_1", "task_2"]
+
+
+@pytest.mark.asyncio
+async def test_resume_retries_failed_tasks(store):
+    store.append({"task_id": "task_1", "error": "task_1 broke"})
+    store.append({"task_id": "task_2", "error": "Worker process failed: killed"})
+    store.append({"task_id": "task_2", "value": 4})
+    store.append({"task_id": "task_3", "error": "task_3 broke"})
+    ran = []
+
+    async def run_one(task_id):
+        ran.append(task_id)
+        return await square_task(task_id)
+
+    # task_3 finished with an error, so it runs again although the .progress file lists it
+    records = await ParallelEvaluationRunner(store).run(
+        ["task_1", "task_2", "task_3"], run_one, completed=["task_3"]
+    )
+
+    assert sorted(ran) == ["task_1", "task_3"]
+    assert store.completed_ids() == {"task_1", "task_2", "task_3"}
+    assert store.failed_ids() == set()
+    assert all("error" not in record for record in records)
+
+
+def test_store_ignores_truncated_lines(store):
+    store.append({"task_id": "task_1", "value": 1})
+    with open(store.path, "a", encoding="utf-8") as f:
+        f.write('{"task_id": "task_2", "val')
+
+    assert store.completed_ids() == {"task_1"}
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_in_worker_processes(store):
+    runner = ParallelEvaluationRunner(store, concurrency=2, use_processes=True)
+
+    records = await runner.run(["task_2", "task_3"], functools.partial(square_task, fail_on="task_3"))
+
+    by_id = {record["task_id"]: record for record in records}
+    assert by_id["task_2"]["value"] == 4
+    assert by_id["task_3"]["error"] == "task_3 broke"
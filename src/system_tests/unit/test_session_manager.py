@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the demo server's session manager and the per-session tracker / variables scopes.
+"""
+
+import asyncio
+
+import pytest
+
+from cuga.backend.activity_tracker.tracker import ActivityTracker, Step
+from cuga.backend.cuga_graph.nodes.api.variables_manager.manager import VariablesManager
+from cuga.backend.server.session_manager import SessionLimitError, SessionManager
+
+
+@pytest.fixture
+def sessions():
+    evicted = []
+    manager = SessionManager(
+        graph_getter=lambda: None, max_sessions=2, idle_timeout=60, on_evict=evicted.append
+    )
+    manager.evicted = evicted
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_sessions_have_separate_tracker_and_variables(sessions):
+    tracker = ActivityTracker()
+    var_manager = VariablesManager()
+    global_steps = list(tracker.steps)
+
+    async def run(session_id):
+        session = sessions.get_or_create(session_id)
+        session.activate()
+        tracker.intent = f"task of {session_id}"
+        for i in range(3):
+            tracker.collect_step(Step(name=f"{session_id}_{i}"))
+            var_manager.add_variable(i, name=f"{session_id}_var_{i}")
+            await asyncio.sleep(0)
+        return tracker.intent, [step.name for step in tracker.steps], var_manager.get_variable_names()
+
+    alice, bob = await asyncio.gather(run("alice"), run("bob"))
+
+    assert alice == (
+        "task of alice",
+        ["alice_0", "alice_1", "alice_2"],
+        ["alice_var_0", "alice_var_1", "alice_var_2"],
+    )
+    assert bob[1] == ["bob_0", "bob_1", "bob_2"]
+    assert bob[2] == ["bob_var_0", "bob_var_1", "bob_var_2"]
+    assert tracker.steps == global_steps
+    assert "alice_var_0" not in var_manager.get_variable_names()
+
+
+def test_sessions_are_reused_and_reset(sessions):
+    session = sessions.get_or_create("alice")
+    thread_id = session.thread_id
+    session.variables_scope.variables["x"] = 1
+
+    assert sessions.get_or_create("alice") is session
+    session.reset()
+    assert session.thread_id != thread_id
+    assert session.variables_scope.variables == {}
+    assert sessions.get_or_create(None).task_id == "demo"
+    assert session.task_id == "demo_alice"
+
+
+def test_idle_sessions_are_evicted(sessions):
+    session = sessions.get_or_create("alice")
+    session.last_active -= 120
+    sessions.get_or_create("bob")
+
+    assert "alice" not in sessions
+    assert sessions.evicted == [session]
+
+
+@pytest.mark.asyncio
+async def test_limit_evicts_least_recently_used_idle_session(sessions):
+    alice = sessions.get_or_create("alice")
+    sessions.get_or_create("bob")
+    sessions.get_or_create("alice")
+
+    sessions.get_or_create("carol")
+    assert "bob" not in sessions and "alice" in sessions
+
+    async with alice.lock, sessions.get("carol").lock:
+        with pytest.raises(SessionLimitError):
+            sessions.get_or_create("dave")
+    assert sessions.get_or_create("dave") is not None
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled SQLiteManager used by the agentic memory backends.
+"""
+
+import threading
+
+import pytest
+
+from cuga.backend.memory.agentic_memory.db.sqlite_manager import SQLiteManager, close_connection_pools
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "agentic.db")
+    close_connection_pools()
+
+
+def test_connections_are_pooled_and_use_wal(db_path):
+    with SQLiteManager(db_path) as db_manager:
+        first = db_manager.connection
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with SQLiteManager(db_path) as db_manager:
+        assert db_manager.connection is first
+        indexes = [row[1] for row in db_manager.connection.execute("PRAGMA index_list(runs)")]
+    assert "runs_namespace_ended" in indexes
+
+
+def test_runs_are_created_and_ended_in_batches(db_path):
+    with SQLiteManager(db_path) as db_manager:
+        db_manager.create_namespace("memory", user_id="u1")
+        db_manager.create_runs("memory", ["run_1", "run_2", "run_3"])
+        db_manager.end_runs("memory", ["run_1", "run_3"])
+
+        assert [run.id for run in db_manager.all_runs("memory")] == ["run_1", "run_2", "run_3"]
+        assert [run.id for run in db_manager.all_runs("memory", ended=True)] == ["run_1", "run_3"]
+        assert [run.id for run in db_manager.all_runs("memory", ended=False)] == ["run_2"]
+        assert db_manager.get_run("memory", "run_2").ended is False
+
+
+def test_duplicate_insert_rolls_back(db_path):
+    with SQLiteManager(db_path) as db_manager:
+        db_manager.create_namespace("memory")
+        with pytest.raises(RuntimeError, match="already exists"):
+            db_manager.create_namespace("memory")
+        assert not db_manager.connection.in_transaction
+
+        with pytest.raises(RuntimeError):
+            db_manager.create_runs("memory", ["run_1", "run_1"])
+        assert db_manager.all_runs("memory") == []
+
+
+def test_search_namespaces(db_path):
+    with SQLiteManager(db_path) as db_manager:
+        db_manager.create_namespace("ns_a", user_id="u1", agent_id="cuga")
+        db_manager.create_namespace("ns_b", user_id="u2", agent_id="cuga")
+
+        assert [ns.id for ns in db_manager.search_namespaces(agent_id="cuga", user_id="u2")] == ["ns_b"]
+        with pytest.raises(ValueError):
+            db_manager.search_namespaces()
+
+
+def test_concurrent_writers(db_path):
+    with SQLiteManager(db_path) as db_manager:
+        db_manager.create_namespace("memory")
+
+    def worker(worker_id):
+        for i in range(20):
+            with SQLiteManager(db_path) as db_manager:
+                db_manager.create_run("memory", f"run_{worker_id}_{i}")
+                db_manager.end_run("memory", f"run_{worker_id}_{i}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with SQLiteManager(db_path) as db_manager:
+        assert len(db_manager.all_runs("memory", ended=True)) == 160
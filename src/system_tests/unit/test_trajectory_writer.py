@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only trajectory segments written by ActivityTracker.
+"""
+
+import base64
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cuga.backend.activity_tracker.blob_store import ImageBlobStore, is_blob_ref
+from cuga.backend.activity_tracker.render_helper import RenderHelper
+from cuga.backend.activity_tracker.tracker import MAX_RETAINED_IMAGES, ActivityTracker, Step
+from cuga.backend.activity_tracker.trajectory_writer import (
+    TrajectoryWriter,
+    compact_trajectory,
+    load_trajectory,
+    segment_path,
+    step_record,
+    trajectory_writer,
+)
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = ActivityTracker()
+    saved = (tracker._base_dir, tracker.experiment_folder, tracker.task_id)
+    tracker.set_base_dir(str(tmp_path))
+    tracker.experiment_folder = "experiment"
+    tracker.reset(intent="find the cheapest flight", task_id="task_1")
+    with patch("cuga.backend.activity_tracker.tracker.settings.advanced_features.tracker_enabled", True):
+        yield tracker
+    tracker._base_dir, tracker.experiment_folder, tracker.task_id = saved
+    tracker.reset(intent="")
+
+
+def test_steps_are_appended_not_rewritten(tracker):
+    tracker.collect_step(Step(name="PlannerAgent", data="plan"))
+    tracker.collect_step(Step(name="CodeAgent", data="code"))
+    tracker.collect_score(0.5)
+    tracker.flush_trajectory()
+    path = tracker.get_current_trajectory_path()
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert list(data) == ["intent", "dataset_name", "actions_count", "task_id", "eval", "steps", "score"]
+    assert [step["name"] for step in data["steps"]] == ["PlannerAgent", "CodeAgent"]
+    assert data["score"] == 0.5
+    assert not os.path.exists(segment_path(path))
+
+
+def test_segment_holds_only_new_records(tracker):
+    tracker.collect_step(Step(name="PlannerAgent", data="plan"))
+    tracker.collect_step(Step(name="CodeAgent", data="code"))
+    tracker.flush_trajectory()
+    tracker.collect_step(Step(name="FinalAnswerAgent", data="done"))
+
+    trajectory_writer.flush()
+    path = tracker.get_current_trajectory_path()
+    with open(segment_path(path), encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["kind"] for record in records] == ["step"]
+    assert [step["name"] for step in load_trajectory(path)["steps"]] == [
+        "PlannerAgent",
+        "CodeAgent",
+        "FinalAnswerAgent",
+    ]
+
+
+def test_reload_steps_includes_external_steps(tracker):
+    tracker.collect_step(Step(name="CodeAgent", data="code"))
+    path = tracker.get_current_trajectory_path()
+    tracker._to_file_external_append(path, Step(name="api_call", data="{}"))
+
+    assert tracker.reload_steps("task_1")
+    assert [step.name for step in tracker.steps] == ["CodeAgent", "api_call"]
+
+    # Reloaded steps are already persisted and must not be appended twice
+    tracker.collect_step(Step(name="FinalAnswerAgent", data="done"))
+    tracker.flush_trajectory()
+    assert [step["name"] for step in load_trajectory(path)["steps"]] == [
+        "CodeAgent",
+        "api_call",
+        "FinalAnswerAgent",
+    ]
+
+
+def test_rerunning_a_task_replaces_its_trajectory(tracker):
+    tracker.collect_step(Step(name="PlannerAgent", data="first attempt"))
+    tracker.flush_trajectory()
+    tracker.collect_step(Step(name="CodeAgent", data="first attempt, not compacted"))
+    trajectory_writer.flush()
+
+    tracker.reset(intent="find the cheapest flight", task_id="task_1")
+    tracker.collect_step(Step(name="PlannerAgent", data="second attempt"))
+    tracker.flush_trajectory()
+
+    path = tracker.get_current_trajectory_path()
+    assert [step["data"] for step in load_trajectory(path)["steps"]] == ["second attempt"]
+    assert tracker.reload_steps("task_1")
+    assert [step.data for step in tracker.steps] == ["second attempt"]
+
+
+def test_compaction_keeps_records_appended_later(tmp_path):
+    path = str(tmp_path / "task.json")
+    with open(segment_path(path), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"kind": "step", "step": {"name": "first"}}) + "\n")
+        f.write('{"kind": "step", "st')
+
+    assert compact_trajectory(path)
+    with open(segment_path(path), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"kind": "step", "step": {"name": "second"}}) + "\n")
+
+    assert [step["name"] for step in load_trajectory(path)["steps"]] == ["first", "second"]
+
+
+def _compacted_steps(path):
+    with open(path, encoding="utf-8") as f:
+        return [step["name"] for step in json.load(f)["steps"]]
+
+
+def test_writer_compacts_every_few_steps(tmp_path):
+    path = str(tmp_path / "task.json")
+    writer = TrajectoryWriter(compact_every=2)
+    for name in ("first", "second", "third"):
+        writer.append(path, [step_record({"name": name})])
+    writer.flush()
+
+    assert _compacted_steps(path) == ["first", "second"]
+    assert [step["name"] for step in load_trajectory(path)["steps"]] == ["first", "second", "third"]
+
+
+def test_writer_compacts_when_idle(tmp_path):
+    path = str(tmp_path / "task.json")
+    writer = TrajectoryWriter(compact_idle=0.05)
+    writer.append(path, [step_record({"name": "first"})])
+    writer.flush()
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _compacted_steps(path) == ["first"]
+
+
+def test_screenshots_are_stored_once_as_blobs(tracker):
+    screenshot = "data:image/png;base64," + base64.b64encode(b"\x89PNG fake screenshot").decode()
+    for i in range(MAX_RETAINED_IMAGES + 3):
+        tracker.collect_image(screenshot)
+    tracker.collect_step(Step(name="BrowserPlannerAgent", data="click"))
+    tracker.collect_step(Step(name="ActionAgent", data="type"))
+    tracker.flush_trajectory()
+
+    assert len(tracker.images) == MAX_RETAINED_IMAGES
+    path = tracker.get_current_trajectory_path()
+    steps = load_trajectory(path)["steps"]
+    refs = {step["image_before"] for step in steps}
+    assert len(refs) == 1
+    ref = refs.pop()
+    assert is_blob_ref(ref)
+    assert os.listdir(os.path.join(os.path.dirname(path), "blobs")) == [os.path.basename(ref)]
+    assert ImageBlobStore.load(os.path.dirname(path), ref) == screenshot
+    assert {step["image_before"] for step in load_trajectory(path, resolve_images=True)["steps"]} == {
+        screenshot
+    }
+    # Only the written records carry the ref; the collected steps keep the screenshot itself
+    assert {step.image_before for step in tracker.steps} == {screenshot}
+    assert tracker.reload_steps("task_1")
+    assert {step.image_before for step in tracker.steps} == {screenshot}
+
+
+def test_rendered_trajectory_embeds_stored_screenshots(tracker, tmp_path):
+    screenshot = "data:image/png;base64," + base64.b64encode(b"\x89PNG fake screenshot").decode()
+    tracker.collect_image(screenshot)
+    tracker.collect_step(
+        Step(name="BrowserPlannerAgent", data='{"instruction": "click"}', observation_before="[1] button")
+    )
+    tracker.flush_trajectory()
+
+    renderer = RenderHelper(tracker.get_current_trajectory_path(), str(tmp_path / "render"))
+    renderer.render()
+    renderer.close()
+
+    with open(tmp_path / "render" / "render_task_1.html", encoding="utf-8") as f:
+        html = f.read()
+    assert f"<img src='{screenshot}'" in html